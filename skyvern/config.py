@@ -29,14 +29,47 @@ class Settings(BaseSettings):
     MAX_STEPS_PER_TASK_V2: int = 25
     MAX_ITERATIONS_PER_TASK_V2: int = 10
     MAX_NUM_SCREENSHOTS: int = 10
+    # Supported strategies: scroll (one screenshot per scrolled viewport), full_page (one capture sliced into viewports)
+    SCREENSHOT_CAPTURE_STRATEGY: str = "scroll"
+    # Supported formats of the screenshots sent to the LLM: png, jpeg, webp
+    LLM_SCREENSHOT_FORMAT: str = "png"
+    LLM_SCREENSHOT_QUALITY: int = 80
+    # the threads decoding, stitching, resizing and encoding the screenshots off the event loop
+    IMAGE_PIPELINE_WORKERS: int = 4
+    # wait until the network is idle and the DOM stops changing, instead of sleeping for the whole timeout
+    ENABLE_PAGE_STABLE_WAIT: bool = True
+    PAGE_STABLE_QUIET_MS: int = 500
+    # re-scrape only the DOM subtrees changed since the previous scrape of the same page
+    ENABLE_INCREMENTAL_SCRAPE: bool = False
+    INCREMENTAL_SCRAPE_MAX_DIRTY_SUBTREES: int = 50
+    # force a full scrape after this many consecutive incremental scrapes
+    INCREMENTAL_SCRAPE_MAX_CONSECUTIVE: int = 5
+    # the iframes of a page are scraped concurrently, an iframe that doesn't answer in time is left out of the scrape
+    SCRAPE_FRAME_CONCURRENCY: int = 8
+    SCRAPE_FRAME_TIMEOUT_MS: int = 15000
     # Ratio should be between 0 and 1.
     # If the task has been running for more steps than this ratio of the max steps per run, then we'll log a warning.
     LONG_RUNNING_TASK_WARNING_RATIO: float = 0.95
     MAX_RETRIES_PER_STEP: int = 5
     DEBUG_MODE: bool = False
+    # cache the compiled prompt templates on disk so new workers don't compile them again
+    PROMPT_BYTECODE_CACHE_ENABLED: bool = True
     DATABASE_STRING: str = "postgresql+psycopg://skyvern@localhost/skyvern"
     DATABASE_STATEMENT_TIMEOUT_MS: int = 60000
     DISABLE_CONNECTION_POOL: bool = False
+    # connection pool, ignored when DISABLE_CONNECTION_POOL is set
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT_SECONDS: int = 30
+    DATABASE_POOL_RECYCLE_SECONDS: int = -1
+    # test each connection with a round trip when it's checked out, for proxies or failovers that drop idle connections
+    DATABASE_POOL_PRE_PING: bool = False
+    # prepared statements: psycopg prepares a query after this many executions (None disables it),
+    # asyncpg caches this many prepared statements per connection (0 disables it)
+    DATABASE_PREPARE_THRESHOLD: int | None = 5
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    # queries slower than this are logged, None disables the slow query log
+    DATABASE_SLOW_QUERY_THRESHOLD_MS: int | None = 1000
     PROMPT_ACTION_HISTORY_WINDOW: int = 1
     TASK_RESPONSE_ACTION_SCREENSHOT_COUNT: int = 3
 
@@ -70,8 +103,38 @@ class Settings(BaseSettings):
     # Supported storage types: local, s3
     SKYVERN_STORAGE_TYPE: str = "local"
 
+    # Supported cache types: local, redis
+    CACHE_TYPE: str = "local"
+    CACHE_MAX_ITEMS: int = 1000
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Supported pubsub types: local, redis. Use redis when the runs and the streaming routes live in different processes
+    PUBSUB_TYPE: str = "local"
+    PUBSUB_REDIS_URL: str = "redis://localhost:6379/0"
+    # the subscribers re-read the state from the database if they got no event for this long
+    PUBSUB_FALLBACK_REFRESH_SECONDS: int = 60
+
+    # artifact upload pipeline
+    ARTIFACT_UPLOAD_QUEUE_SIZE: int = 1000
+    ARTIFACT_UPLOAD_WORKERS: int = 4
+    ARTIFACT_UPLOAD_BATCH_SIZE: int = 50
+    # max concurrent uploads per storage backend
+    ARTIFACT_UPLOAD_CONCURRENCY: int = 10
+    ARTIFACT_UPLOAD_S3_CONCURRENCY: int = 50
+    # store identical screenshots and prompts once per organization
+    ENABLE_ARTIFACT_DEDUPLICATION: bool = True
+    # the recordings are uploaded in parts of at least this size while the browser writes them (S3 requires >= 5MB)
+    ARTIFACT_STREAM_PART_SIZE: int = 8 * 1024 * 1024
+    # while the parts can't be read yet, the whole recording is stored this often so a running task can be watched (0
+    # to turn it off)
+    ARTIFACT_RECORDING_SNAPSHOT_SECONDS: int = 60
+    # the uploads of the recordings not synced for this long are aborted, their run ended without finalizing them
+    ARTIFACT_RECORDING_UPLOAD_IDLE_TIMEOUT_SECONDS: int = 60 * 60
+
     # S3 bucket settings
     AWS_REGION: str = "us-east-1"
+    # connections per pooled AWS client, enough for ARTIFACT_UPLOAD_S3_CONCURRENCY uploads at once
+    AWS_MAX_POOL_CONNECTIONS: int = 50
     AWS_S3_BUCKET_UPLOADS: str = "skyvern-uploads"
     MAX_UPLOAD_FILE_SIZE: int = 10 * 1024 * 1024  # 10 MB
     PRESIGNED_URL_EXPIRATION: int = 60 * 60 * 24  # 24 hours
@@ -85,6 +148,30 @@ class Settings(BaseSettings):
     BROWSER_WIDTH: int = 1920
     BROWSER_HEIGHT: int = 1080
     BROWSER_POLICY_FILE: str = "/etc/chromium/policies/managed/policies.json"
+    # share one Playwright driver and a few launched browsers between the runs of the worker, each run gets an isolated
+    # context, pre-warmed per proxy location and headers and recycled after the run. Only for the chromium browser
+    # types. Pooled contexts don't record HAR: a HAR file is only written when its context is closed.
+    BROWSER_POOL_ENABLED: bool = False
+    BROWSER_POOL_MAX_BROWSERS: int = 2
+    BROWSER_POOL_MAX_CONTEXTS_PER_BROWSER: int = 8
+    # idle contexts kept ready per proxy location and headers
+    BROWSER_POOL_WARM_CONTEXTS: int = 2
+    # a browser is relaunched after serving this many runs, a context is closed after this many runs
+    BROWSER_POOL_BROWSER_MAX_USES: int = 100
+    BROWSER_POOL_CONTEXT_MAX_USES: int = 20
+    # "sequential" takes the screenshot, the html and the video after each action one after the other. "concurrent"
+    # waits for the page to settle instead of the blind delay between actions, then captures the screenshot and the
+    # html concurrently within the budget and uploads the video in the background
+    POST_ACTION_CAPTURE_MODE: str = "sequential"
+    POST_ACTION_CAPTURE_BUDGET_MS: int = 2000
+    # the actions handled during a step are inserted in one transaction at the end of the step, or earlier once this
+    # many are waiting or the oldest has waited this long
+    ACTION_WRITE_BUFFER_ENABLED: bool = True
+    ACTION_WRITE_BUFFER_MAX_SIZE: int = 20
+    ACTION_WRITE_BUFFER_MAX_AGE_SECONDS: float = 5
+    # the actions of completed workflow tasks are indexed by url pattern (the url without its query values) and goal
+    # hash, so the blocks that cache actions find their plan with one indexed lookup
+    ACTION_PLAN_INDEX_ENABLED: bool = True
 
     # Add extension folders name here to load extension in your browser
     EXTENSIONS_BASE_PATH: str = "./extensions"
@@ -102,6 +189,8 @@ class Settings(BaseSettings):
     #####################
     BITWARDEN_TIMEOUT_SECONDS: int = 60
     BITWARDEN_MAX_RETRIES: int = 2
+    # secret parameters resolved at the same time when a workflow run starts
+    WORKFLOW_SECRET_RESOLUTION_CONCURRENCY: int = 5
 
     # task generation settings
     PROMPT_CACHE_WINDOW_HOURS: int = 24
@@ -118,10 +207,21 @@ class Settings(BaseSettings):
     PROMPT_BLOCK_LLM_KEY: str | None = None
     # COMMON
     LLM_CONFIG_TIMEOUT: int = 300
+    # stream the extract-action responses and run each action as soon as it's parsed, instead of waiting for the
+    # whole response. Only for the LLM configs handled by litellm directly, the router configs don't stream
+    LLM_STREAM_ACTIONS: bool = False
     LLM_CONFIG_MAX_TOKENS: int = 4096
     LLM_CONFIG_TEMPERATURE: float = 0
     LLM_CONFIG_SUPPORT_VISION: bool = True  # Whether the model supports vision
     LLM_CONFIG_ADD_ASSISTANT_PREFIX: bool = False  # Whether to add assistant prefix
+    # LLM response cache modes: off, cache, record, replay
+    LLM_RESPONSE_CACHE_MODE: str = "off"
+    # on-disk tier of the cache, and the fixture store of the record and replay modes
+    LLM_RESPONSE_CACHE_DIR: str | None = f"{SKYVERN_DIR}/llm_response_cache"
+    LLM_RESPONSE_CACHE_MAX_ITEMS: int = 1000
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 60 * 60
+    # prompt_name -> ttl in seconds, overrides LLM_RESPONSE_CACHE_TTL_SECONDS
+    LLM_RESPONSE_CACHE_PROMPT_TTL_SECONDS: dict[str, int] = {}
     # LLM PROVIDER SPECIFIC
     ENABLE_OPENAI: bool = False
     ENABLE_ANTHROPIC: bool = False
@@ -264,10 +364,18 @@ class Settings(BaseSettings):
 
     BITWARDEN_SERVER: str = "http://localhost"
     BITWARDEN_SERVER_PORT: int = 8002
+    # serve the Bitwarden lookups of the workflow parameters from long-lived `bw serve` processes, one per set of
+    # credentials, instead of a CLI login per lookup
+    BITWARDEN_SESSION_BROKER_ENABLED: bool = False
+    BITWARDEN_ITEM_CACHE_TTL_SECONDS: float = 30
+    # the vaults of the `bw serve` processes started by the broker are synced again on a cache miss after this long
+    BITWARDEN_SYNC_INTERVAL_SECONDS: float = 30
 
     SVG_MAX_LENGTH: int = 100000
 
     ENABLE_LOG_ARTIFACTS: bool = False
+    # log entries kept in memory per run before the older ones are spilled to a temporary file
+    LOG_BUFFER_MAX_ENTRIES: int = 5000
     ENABLE_CODE_BLOCK: bool = False
 
     TASK_BLOCKED_SITE_FALLBACK_URL: str = "https://www.google.com"
@@ -160,6 +160,11 @@ class WorkflowRunNotFound(SkyvernHTTPException):
         super().__init__(f"WorkflowRun {workflow_run_id} not found", status_code=status.HTTP_404_NOT_FOUND)
 
 
+class WorkflowRunBlockNotFound(SkyvernHTTPException):
+    def __init__(self, workflow_run_block_id: str) -> None:
+        super().__init__(f"WorkflowRunBlock {workflow_run_block_id} not found", status_code=status.HTTP_404_NOT_FOUND)
+
+
 class MissingValueForParameter(SkyvernHTTPException):
     def __init__(self, parameter_key: str, workflow_id: str, workflow_run_id: str) -> None:
         super().__init__(
@@ -225,6 +230,21 @@ class UnknownBrowserType(SkyvernException):
         super().__init__(f"Unknown browser type {browser_type}")
 
 
+class UnknownCacheType(SkyvernException):
+    def __init__(self, cache_type: str) -> None:
+        super().__init__(f"Unknown cache type {cache_type}")
+
+
+class CacheLoadCancelled(SkyvernException):
+    def __init__(self, key: str) -> None:
+        super().__init__(f"The load of the cache key {key} was cancelled, it can be retried")
+
+
+class UnknownPubSubType(SkyvernException):
+    def __init__(self, pubsub_type: str) -> None:
+        super().__init__(f"Unknown pubsub type {pubsub_type}")
+
+
 class UnknownErrorWhileCreatingBrowserContext(SkyvernException):
     def __init__(self, browser_type: str, exception: Exception) -> None:
         super().__init__(
@@ -7,7 +7,7 @@ import string
 from asyncio.exceptions import CancelledError
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Tuple, cast
+from typing import Any, AsyncIterator, Tuple, cast
 
 import httpx
 import structlog
@@ -52,6 +52,7 @@ from skyvern.exceptions import (
 )
 from skyvern.forge import app
 from skyvern.forge.async_operations import AgentPhase, AsyncOperationPool
+from skyvern.forge.post_action_capture import PostActionCaptureMode, capture_after_action
 from skyvern.forge.prompts import prompt_engine
 from skyvern.forge.sdk.api.files import (
     get_path_for_workflow_download_directory,
@@ -80,6 +81,7 @@ from skyvern.services import run_service
 from skyvern.services.task_v1_service import is_cua_task
 from skyvern.utils.image_resizer import Resolution
 from skyvern.utils.prompt_engine import load_prompt_with_elements
+from skyvern.webeye.actions import write_buffer
 from skyvern.webeye.actions.action_types import ActionType
 from skyvern.webeye.actions.actions import (
     Action,
@@ -93,7 +95,7 @@ from skyvern.webeye.actions.actions import (
     UserDefinedError,
     WebAction,
 )
-from skyvern.webeye.actions.caching import retrieve_action_plan
+from skyvern.webeye.actions.caching import record_action_plan, retrieve_action_plan
 from skyvern.webeye.actions.handler import ActionHandler, poll_verification_code
 from skyvern.webeye.actions.models import AgentStepOutput, DetailedAgentStepOutput
 from skyvern.webeye.actions.parse_actions import (
@@ -103,8 +105,10 @@ from skyvern.webeye.actions.parse_actions import (
     parse_ui_tars_actions,
 )
 from skyvern.webeye.actions.responses import ActionResult, ActionSuccess
+from skyvern.webeye.actions.streamed_actions import StreamedActions
 from skyvern.webeye.browser_factory import BrowserState
 from skyvern.webeye.scraper.scraper import ElementTreeFormat, ScrapedPage, scrape_website
+from skyvern.webeye.utils.dom import resolve_locators
 from skyvern.webeye.utils.page import SkyvernFrame
 
 LOG = structlog.get_logger()
@@ -860,6 +864,10 @@ class ForgeAgent:
             actions_and_results=None,
             cua_response=None,
         )
+        context = skyvern_context.current()
+        if context and settings.ACTION_WRITE_BUFFER_ENABLED:
+            context.action_write_buffer = write_buffer.ActionWriteBuffer()
+        streamed_actions: StreamedActions | None = None
         try:
             LOG.info(
                 "Starting agent step",
@@ -937,38 +945,55 @@ class ForgeAgent:
                     llm_api_handler = LLMAPIHandlerFactory.get_override_llm_api_handler(
                         llm_key_override, default=app.LLM_API_HANDLER
                     )
-                    json_response = await llm_api_handler(
-                        prompt=extract_action_prompt,
-                        prompt_name="extract-actions",
-                        step=step,
-                        screenshots=scraped_page.screenshots,
-                    )
-                    try:
-                        json_response = await self.handle_potential_verification_code(
-                            task,
-                            step,
-                            scraped_page,
-                            browser_state,
-                            json_response,
+                    # the verification code check needs the whole response before running any action
+                    if settings.LLM_STREAM_ACTIONS and not (task.totp_verification_url or task.totp_identifier):
+                        streamed_actions = StreamedActions(task, step, scraped_page)
+                        streamed_actions.start(
+                            llm_api_handler(
+                                prompt=extract_action_prompt,
+                                prompt_name="extract-actions",
+                                step=step,
+                                screenshots=scraped_page.screenshots,
+                                on_streamed_action=streamed_actions.on_streamed_action,
+                            )
                         )
-                        detailed_agent_step_output.llm_response = json_response
-                        actions = parse_actions(task, step.step_id, step.order, scraped_page, json_response["actions"])
-                    except NoTOTPVerificationCodeFound:
-                        actions = [
-                            TerminateAction(
-                                organization_id=task.organization_id,
-                                workflow_run_id=task.workflow_run_id,
-                                task_id=task.task_id,
-                                step_id=step.step_id,
-                                step_order=step.order,
-                                action_order=0,
-                                reasoning="No TOTP verification code found. Going to terminate.",
-                                intention="No TOTP verification code found. Going to terminate.",
+                        actions = []
+                    else:
+                        json_response = await llm_api_handler(
+                            prompt=extract_action_prompt,
+                            prompt_name="extract-actions",
+                            step=step,
+                            screenshots=scraped_page.screenshots,
+                        )
+                        try:
+                            json_response = await self.handle_potential_verification_code(
+                                task,
+                                step,
+                                scraped_page,
+                                browser_state,
+                                json_response,
                             )
-                        ]
+                            detailed_agent_step_output.llm_response = json_response
+                            actions = parse_actions(
+                                task, step.step_id, step.order, scraped_page, json_response["actions"]
+                            )
+                        except NoTOTPVerificationCodeFound:
+                            actions = [
+                                TerminateAction(
+                                    organization_id=task.organization_id,
+                                    workflow_run_id=task.workflow_run_id,
+                                    task_id=task.task_id,
+                                    step_id=step.step_id,
+                                    step_order=step.order,
+                                    action_order=0,
+                                    reasoning="No TOTP verification code found. Going to terminate.",
+                                    intention="No TOTP verification code found. Going to terminate.",
+                                )
+                            ]
 
             detailed_agent_step_output.actions = actions
-            if len(actions) == 0:
+            # the streamed actions are checked once the whole response is in
+            if len(actions) == 0 and streamed_actions is None:
                 LOG.info(
                     "No actions to execute, marking step as failed",
                     task_id=task.task_id,
@@ -994,6 +1019,11 @@ class ForgeAgent:
             )
             action_results: list[ActionResult] = []
             detailed_agent_step_output.action_results = action_results
+            # resolve the iframes of all the actions at once, the action handlers find them in the frame path cache
+            if element_ids := [
+                action.element_id for action in actions if isinstance(action, WebAction) and action.element_id
+            ]:
+                await resolve_locators(scraped_page, await browser_state.must_get_working_page(), element_ids)
             # filter out wait action if there are other actions in the list
             # we do this because WAIT action is considered as a failure
             # which will block following actions if we don't remove it from the list
@@ -1033,7 +1063,9 @@ class ForgeAgent:
                 element_id_to_action_index[action.element_id] = action_idx
 
             element_id_to_last_action: dict[str, int] = dict()
-            for action_idx, action_node in enumerate(action_linked_list):
+            async for action_idx, action_node in self._iterate_action_nodes(
+                action_linked_list, streamed_actions, detailed_agent_step_output
+            ):
                 context = skyvern_context.ensure_context()
                 if context.refresh_working_page:
                     LOG.warning(
@@ -1058,7 +1090,7 @@ class ForgeAgent:
                         action_order=action_idx,
                     )
                     detailed_agent_step_output.actions_and_results[action_idx] = (action, [action_result])
-                    await app.DATABASE.create_action(action=action)
+                    await write_buffer.create_action(action)
                     await self.record_artifacts_after_action(task, step, browser_state, engine)
                     break
 
@@ -1111,8 +1143,9 @@ class ForgeAgent:
                     results,
                 )
                 # wait random time between actions to avoid detection
-                await asyncio.sleep(random.uniform(0.5, 1.0))
-                await self.record_artifacts_after_action(task, step, browser_state, engine)
+                await self.record_artifacts_after_action(
+                    task, step, browser_state, engine, delay_seconds=random.uniform(0.5, 1.0)
+                )
                 for result in results:
                     result.step_retry_number = step.retry_index
                     result.step_order = step.order
@@ -1166,6 +1199,10 @@ class ForgeAgent:
                         action_result=results,
                     )
                 else:
+                    if streamed_actions is not None:
+                        # the actions after this one decide whether the step fails
+                        if later_action := await streamed_actions.get_later_action_on_element(action):
+                            action_node.next = ActionLinkedNode(action=later_action)
                     if action_node.next is not None:
                         LOG.warning(
                             "Action failed, but have duplicated element id in the action list. Continue excuting.",
@@ -1199,6 +1236,24 @@ class ForgeAgent:
                     )
                     return failed_step, detailed_agent_step_output.get_clean_detailed_output()
 
+            if streamed_actions is not None:
+                detailed_agent_step_output.actions = await streamed_actions.complete()
+                detailed_agent_step_output.llm_response = streamed_actions.json_response
+                if not detailed_agent_step_output.actions:
+                    LOG.info(
+                        "No actions to execute, marking step as failed",
+                        task_id=task.task_id,
+                        step_id=step.step_id,
+                        step_order=step.order,
+                        step_retry=step.retry_index,
+                    )
+                    step = await self.update_step(
+                        step=step,
+                        status=StepStatus.failed,
+                        output=detailed_agent_step_output.to_agent_step_output(),
+                    )
+                    return step, detailed_agent_step_output
+
             LOG.info(
                 "Actions executed successfully, marking step as completed",
                 task_id=task.task_id,
@@ -1269,6 +1324,7 @@ class ForgeAgent:
                 )
                 detailed_agent_step_output.actions_and_results.append((extract_action, extract_results))
 
+            await write_buffer.flush_action_writes()
             # If no action errors return the agent state and output
             completed_step = await self.update_step(
                 step=step,
@@ -1314,6 +1370,28 @@ class ForgeAgent:
                 output=detailed_agent_step_output.to_agent_step_output(),
             )
             return failed_step, detailed_agent_step_output.get_clean_detailed_output()
+        finally:
+            if streamed_actions is not None:
+                streamed_actions.cancel()
+            await write_buffer.flush_action_writes()
+            if context:
+                context.action_write_buffer = None
+
+    @staticmethod
+    async def _iterate_action_nodes(
+        action_linked_list: list[ActionLinkedNode],
+        streamed_actions: StreamedActions | None,
+        detailed_agent_step_output: DetailedAgentStepOutput,
+    ) -> AsyncIterator[tuple[int, ActionLinkedNode]]:
+        for action_idx, action_node in enumerate(action_linked_list):
+            yield action_idx, action_node
+
+        if streamed_actions is None:
+            return
+        assert detailed_agent_step_output.actions_and_results is not None
+        async for action in streamed_actions:
+            detailed_agent_step_output.actions_and_results.append((action, []))
+            yield len(detailed_agent_step_output.actions_and_results) - 1, ActionLinkedNode(action=action)
 
     async def _generate_cua_actions(
         self,
@@ -1690,6 +1768,7 @@ class ForgeAgent:
         step: Step,
         browser_state: BrowserState,
         engine: RunEngine,
+        delay_seconds: float = 0,
     ) -> None:
         working_page = await browser_state.get_working_page()
         if not working_page:
@@ -1703,14 +1782,28 @@ class ForgeAgent:
         if engine in CUA_ENGINES:
             scrolling_number = 0
 
+        use_playwright_fullpage = app.EXPERIMENTATION_PROVIDER.is_feature_enabled_cached(
+            "ENABLE_PLAYWRIGHT_FULLPAGE",
+            task.workflow_run_id or task.task_id,
+            properties={"organization_id": task.organization_id},
+        )
+        if settings.POST_ACTION_CAPTURE_MODE == PostActionCaptureMode.concurrent:
+            await capture_after_action(
+                task=task,
+                step=step,
+                browser_state=browser_state,
+                scrolling_number=scrolling_number,
+                use_playwright_fullpage=use_playwright_fullpage,
+                delay_seconds=delay_seconds,
+                budget_ms=settings.POST_ACTION_CAPTURE_BUDGET_MS,
+            )
+            return
+
+        await asyncio.sleep(delay_seconds)
         try:
             screenshot = await browser_state.take_post_action_screenshot(
                 scrolling_number=scrolling_number,
-                use_playwright_fullpage=app.EXPERIMENTATION_PROVIDER.is_feature_enabled_cached(
-                    "ENABLE_PLAYWRIGHT_FULLPAGE",
-                    task.workflow_run_id or task.task_id,
-                    properties={"organization_id": task.organization_id},
-                ),
+                use_playwright_fullpage=use_playwright_fullpage,
             )
             await app.ARTIFACT_MANAGER.create_artifact(
                 step=step,
@@ -1746,10 +1839,10 @@ class ForgeAgent:
                 task_id=task.task_id, browser_state=browser_state
             )
             for video_artifact in video_artifacts:
-                await app.ARTIFACT_MANAGER.update_artifact_data(
+                await app.ARTIFACT_MANAGER.stream_recording(
                     artifact_id=video_artifact.video_artifact_id,
                     organization_id=task.organization_id,
-                    data=video_artifact.video_data,
+                    path=video_artifact.video_path,
                 )
         except Exception:
             LOG.error(
@@ -1788,7 +1881,7 @@ class ForgeAgent:
                 video_artifact_id = await app.ARTIFACT_MANAGER.create_artifact(
                     step=step,
                     artifact_type=ArtifactType.RECORDING,
-                    data=video_artifact.video_data,
+                    data=b"",
                 )
                 video_artifacts[idx].video_artifact_id = video_artifact_id
             app.BROWSER_MANAGER.set_video_artifact_for_task(task, video_artifacts)
@@ -2443,16 +2536,23 @@ class ForgeAgent:
             task.organization_id,
         )
         if browser_state:
-            # Update recording artifact after closing the browser, so we can get an accurate recording
+            # Complete the recording artifact after closing the browser, so we can get an accurate recording
             video_artifacts = await app.BROWSER_MANAGER.get_video_artifacts(
                 task_id=task.task_id, browser_state=browser_state
             )
             for video_artifact in video_artifacts:
-                await app.ARTIFACT_MANAGER.update_artifact_data(
-                    artifact_id=video_artifact.video_artifact_id,
-                    organization_id=task.organization_id,
-                    data=video_artifact.video_data,
-                )
+                try:
+                    await app.ARTIFACT_MANAGER.finalize_recording(
+                        artifact_id=video_artifact.video_artifact_id,
+                        organization_id=task.organization_id,
+                        path=video_artifact.video_path,
+                    )
+                except Exception:
+                    LOG.exception(
+                        "Failed to upload the recording",
+                        task_id=task.task_id,
+                        artifact_id=video_artifact.video_artifact_id,
+                    )
 
             har_data = await app.BROWSER_MANAGER.get_har_data(task_id=task.task_id, browser_state=browser_state)
             if har_data:
@@ -2484,6 +2584,9 @@ class ForgeAgent:
                 "BrowserState is missing before sending response to webhook_callback_url",
                 web_hook_url=task.webhook_callback_url,
             )
+            if not task.workflow_run_id:
+                # the recording can't be finalized without the browser, the workflow run cleans up its own
+                await app.ARTIFACT_MANAGER.abort_recording_uploads(task_ids=[task.task_id])
 
     async def update_step(
         self,
@@ -2527,7 +2630,7 @@ class ForgeAgent:
                 organization_id=step.organization_id,
             )
 
-        await save_step_logs(step.step_id)
+        await save_step_logs(step.step_id, release=status is not None and status.is_terminal())
 
         return await app.DATABASE.update_step(
             task_id=step.task_id,
@@ -2574,13 +2677,22 @@ class ForgeAgent:
                 organization_id=task.organization_id,
             )
 
-        await save_task_logs(task.task_id)
+        await save_task_logs(task.task_id, release=status is not None and status.is_final())
         LOG.info("Updating task in db", task_id=task.task_id, diff=update_comparison)
-        return await app.DATABASE.update_task(
+        updated_task = await app.DATABASE.update_task(
             task.task_id,
             organization_id=task.organization_id,
             **updates,
         )
+        # only the task blocks of workflows cache actions
+        if (
+            status == TaskStatus.completed
+            and settings.ACTION_PLAN_INDEX_ENABLED
+            and task.workflow_run_id
+            and task.navigation_goal
+        ):
+            await record_action_plan(updated_task)
+        return updated_task
 
     async def handle_failed_step(self, organization: Organization, task: Task, step: Step) -> Step | None:
         max_retries_per_step = (
@@ -2780,13 +2892,15 @@ class ForgeAgent:
                 step_retry=step.retry_index,
                 output=step.output,
             )
-            last_step = await self.update_step(step, is_last=True)
             extracted_information = await self.get_extracted_information_for_task(task)
-            await self.update_task(
-                task,
-                status=TaskStatus.completed,
-                extracted_information=extracted_information,
-            )
+            # one transaction for the last step and the task status
+            async with app.DATABASE.unit_of_work():
+                last_step = await self.update_step(step, is_last=True)
+                await self.update_task(
+                    task,
+                    status=TaskStatus.completed,
+                    extracted_information=extracted_information,
+                )
             return True, last_step, None
         if step.is_terminated():
             LOG.info(
@@ -2797,9 +2911,10 @@ class ForgeAgent:
                 step_retry=step.retry_index,
                 output=step.output,
             )
-            last_step = await self.update_step(step, is_last=True)
             failure_reason = await self.get_failure_reason_for_task(task)
-            await self.update_task(task, status=TaskStatus.terminated, failure_reason=failure_reason)
+            async with app.DATABASE.unit_of_work():
+                last_step = await self.update_step(step, is_last=True)
+                await self.update_task(task, status=TaskStatus.terminated, failure_reason=failure_reason)
             return False, last_step, None
         # If the max steps are exceeded, mark the current step as the last step and conclude the task
         context = skyvern_context.current()
@@ -2821,11 +2936,12 @@ class ForgeAgent:
                 step_retry=step.retry_index,
                 output=step.output,
             )
-            last_step = await self.update_step(step, is_last=True)
-            await self.update_task(
-                task,
-                status=TaskStatus.completed,
-            )
+            async with app.DATABASE.unit_of_work():
+                last_step = await self.update_step(step, is_last=True)
+                await self.update_task(
+                    task,
+                    status=TaskStatus.completed,
+                )
             return True, last_step, None
 
         if step.order + 1 >= max_steps_per_run:
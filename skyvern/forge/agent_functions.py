@@ -458,12 +458,13 @@ async def _convert_css_shape_to_string(
             _add_to_dropped_css_svg_element_map(shape_key)
             return None
 
-    if "attributes" not in element:
-        element["attributes"] = dict()
     if css_shape != INVALID_SHAPE:
         # refresh the cache expiration
         await app.CACHE.set(shape_key, css_shape)
-        element["attributes"]["shape-description"] = css_shape
+        # a new dict, the attributes may be shared with the tree the element was copied from
+        element["attributes"] = {**element.get("attributes", {}), "shape-description": css_shape}
+    elif "attributes" not in element:
+        element["attributes"] = dict()
     return None
 
 
@@ -546,6 +547,7 @@ class AgentFunction:
             The reason we're doing it is to
             1. reduce unnecessary data so that llm get less distrction
             TODO later: 2. reduce tokens sent to llm to save money
+            The element dicts are copied as they're walked, the given tree is left as it is.
             :param elements: List of elements to remove xpaths from.
             :return: List of elements without xpaths.
             """
@@ -558,6 +560,7 @@ class AgentFunction:
             element_cnt = 0
             eligible_svgs = []  # List to store eligible SVGs and their frames
 
+            element_tree = [dict(element) for element in element_tree]
             for element in element_tree:
                 queue.append(element)
 
@@ -596,6 +599,7 @@ class AgentFunction:
                 # from element attributes to make sure this won't increase hallucination
                 # _remove_unique_id(queue_ele)
                 if "children" in queue_ele:
+                    queue_ele["children"] = [dict(child) for child in queue_ele["children"]]
                     queue.extend(queue_ele["children"])
 
             # Convert all eligible SVGs in parallel
@@ -1,6 +1,7 @@
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Awaitable, Callable
+from typing import AsyncIterator, Awaitable, Callable
 
 import structlog
 from fastapi import FastAPI, Response, status
@@ -16,10 +17,12 @@ from skyvern.config import settings
 from skyvern.exceptions import SkyvernHTTPException
 from skyvern.forge import app as forge_app
 from skyvern.forge.request_logging import log_raw_request_middleware
+from skyvern.forge.sdk.api.aws import aws_client_manager
 from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
 from skyvern.forge.sdk.db.exceptions import NotFoundError
 from skyvern.forge.sdk.routes.routers import base_router, legacy_base_router, legacy_v2_router
+from skyvern.forge.sdk.services.bitwarden_broker import bitwarden_session_broker
 
 LOG = structlog.get_logger()
 
@@ -49,12 +52,23 @@ def custom_openapi() -> dict:
     return app.openapi_schema
 
 
+@asynccontextmanager
+async def lifespan(fastapi_app: FastAPI) -> AsyncIterator[None]:
+    yield
+    LOG.info("Shutting down the agent server")
+    # store the queued artifacts before the clients they're uploaded with are closed
+    await forge_app.ARTIFACT_MANAGER.upload_pipeline.close()
+    await forge_app.ARTIFACT_MANAGER.abort_recording_uploads()
+    await aws_client_manager.close()
+    await bitwarden_session_broker.close()
+
+
 def get_agent_app() -> FastAPI:
     """
     Start the agent server.
     """
 
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
 
     # Add CORS middleware
     app.add_middleware(
@@ -7,12 +7,14 @@ from openai import AsyncAzureOpenAI, AsyncOpenAI
 from skyvern.forge.agent import ForgeAgent
 from skyvern.forge.agent_functions import AgentFunction
 from skyvern.forge.sdk.api.llm.api_handler_factory import LLMAPIHandlerFactory
+from skyvern.forge.sdk.api.llm.response_cache import LLMResponseCache
 from skyvern.forge.sdk.artifact.manager import ArtifactManager
 from skyvern.forge.sdk.artifact.storage.factory import StorageFactory
 from skyvern.forge.sdk.artifact.storage.s3 import S3Storage
 from skyvern.forge.sdk.cache.factory import CacheFactory
 from skyvern.forge.sdk.db.client import AgentDB
 from skyvern.forge.sdk.experimentation.providers import BaseExperimentationProvider, NoOpExperimentationProvider
+from skyvern.forge.sdk.pubsub.factory import PubSubFactory
 from skyvern.forge.sdk.schemas.organizations import Organization
 from skyvern.forge.sdk.settings_manager import SettingsManager
 from skyvern.forge.sdk.trace import TraceManager
@@ -31,10 +33,22 @@ DATABASE = AgentDB(
 if SettingsManager.get_settings().SKYVERN_STORAGE_TYPE == "s3":
     StorageFactory.set_storage(S3Storage())
 STORAGE = StorageFactory.get_storage()
+if SettingsManager.get_settings().CACHE_TYPE != "local":
+    CacheFactory.set_cache(CacheFactory.create_cache(SettingsManager.get_settings().CACHE_TYPE))
 CACHE = CacheFactory.get_cache()
+if SettingsManager.get_settings().PUBSUB_TYPE != "local":
+    PubSubFactory.set_pubsub(PubSubFactory.create_pubsub(SettingsManager.get_settings().PUBSUB_TYPE))
+PUBSUB = PubSubFactory.get_pubsub()
 ARTIFACT_MANAGER = ArtifactManager()
 BROWSER_MANAGER = BrowserManager()
 EXPERIMENTATION_PROVIDER: BaseExperimentationProvider = NoOpExperimentationProvider()
+LLM_RESPONSE_CACHE = LLMResponseCache(
+    mode=SettingsManager.get_settings().LLM_RESPONSE_CACHE_MODE,
+    cache_dir=SettingsManager.get_settings().LLM_RESPONSE_CACHE_DIR,
+    ttl_seconds=SettingsManager.get_settings().LLM_RESPONSE_CACHE_TTL_SECONDS,
+    prompt_ttl_seconds=SettingsManager.get_settings().LLM_RESPONSE_CACHE_PROMPT_TTL_SECONDS,
+    max_items=SettingsManager.get_settings().LLM_RESPONSE_CACHE_MAX_ITEMS,
+)
 LLM_API_HANDLER = LLMAPIHandlerFactory.get_llm_api_handler(SettingsManager.get_settings().LLM_KEY)
 OPENAI_CLIENT = AsyncOpenAI(api_key=SettingsManager.get_settings().OPENAI_API_KEY or "")
 if SettingsManager.get_settings().ENABLE_AZURE_CUA:
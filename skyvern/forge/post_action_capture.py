@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import time
+from enum import StrEnum
+from typing import Awaitable, TypeVar
+
+import structlog
+from playwright.async_api import Page
+from pydantic import BaseModel
+
+from skyvern.forge import app
+from skyvern.forge.sdk.artifact.models import ArtifactType
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.models import Step
+from skyvern.forge.sdk.schemas.tasks import Task
+from skyvern.webeye.browser_factory import BrowserState
+from skyvern.webeye.utils.page import SkyvernFrame, wait_for_page_stable
+
+LOG = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+class PostActionCaptureMode(StrEnum):
+    # the screenshot, the html and the video one after the other, after the delay between actions
+    sequential = "sequential"
+    # the screenshot and the html concurrently under a time budget, overlapped with the delay between actions. The
+    # video is uploaded in the background
+    concurrent = "concurrent"
+
+
+class ScreenshotCaptureMode(StrEnum):
+    scrolling = "scrolling"
+    # the last scrolling screenshot of the run didn't fit in the budget
+    viewport = "viewport"
+
+
+class PostActionCaptureTimings(BaseModel):
+    screenshot_mode: ScreenshotCaptureMode
+    screenshot_ms: float | None = None
+    html_ms: float | None = None
+    # the html didn't change since the previous capture, it's not stored again
+    html_unchanged: bool = False
+    # captures cancelled because they ran out of budget
+    skipped: list[str] = []
+    # how long the action loop waited, the delay between actions included
+    critical_path_ms: float = 0
+    # what the same captures would have cost in the sequential mode: the delay, then each capture in turn
+    sequential_ms: float = 0
+
+    @property
+    def saved_ms(self) -> float:
+        return self.sequential_ms - self.critical_path_ms
+
+
+async def _timed(awaitable: Awaitable[T]) -> tuple[T, float]:
+    start = time.monotonic()
+    result = await awaitable
+    return result, (time.monotonic() - start) * 1000
+
+
+async def _get_html(page: Page) -> str:
+    skyvern_frame = await SkyvernFrame.create_instance(frame=page)
+    return await skyvern_frame.get_content()
+
+
+async def _stream_recordings(task: Task, browser_state: BrowserState) -> None:
+    try:
+        video_artifacts = await app.BROWSER_MANAGER.get_video_artifacts(
+            task_id=task.task_id, browser_state=browser_state
+        )
+        for video_artifact in video_artifacts:
+            await app.ARTIFACT_MANAGER.stream_recording(
+                artifact_id=video_artifact.video_artifact_id,
+                organization_id=task.organization_id,
+                path=video_artifact.video_path,
+            )
+    except Exception:
+        LOG.error("Failed to record video after action", task_id=task.task_id, exc_info=True)
+
+
+async def capture_after_action(
+    task: Task,
+    step: Step,
+    browser_state: BrowserState,
+    scrolling_number: int,
+    use_playwright_fullpage: bool,
+    delay_seconds: float,
+    budget_ms: float,
+) -> PostActionCaptureTimings:
+    """
+    Record the artifacts of the page after an action in the concurrent mode. The delay between actions is spent
+    waiting for the page to settle instead of sleeping, then the screenshot and the html are captured concurrently
+    within budget_ms. A scrolling screenshot that took longer than the budget last time is downgraded to the viewport.
+    """
+    start = time.monotonic()
+    page = await browser_state.must_get_working_page()
+    context = skyvern_context.ensure_context()
+
+    await wait_for_page_stable(page, timeout_ms=delay_seconds * 1000)
+
+    remaining_ms = budget_ms - (time.monotonic() - start) * 1000
+    screenshot_mode = ScreenshotCaptureMode.scrolling
+    if scrolling_number > 0 and (context.last_scrolling_screenshot_ms or 0) > remaining_ms:
+        screenshot_mode = ScreenshotCaptureMode.viewport
+        scrolling_number = 0
+    timings = PostActionCaptureTimings(screenshot_mode=screenshot_mode)
+
+    screenshot_capture = asyncio.create_task(
+        _timed(
+            browser_state.take_post_action_screenshot(
+                scrolling_number=scrolling_number, use_playwright_fullpage=use_playwright_fullpage
+            )
+        )
+    )
+    html_capture = asyncio.create_task(_timed(_get_html(page)))
+    captures = {"screenshot": screenshot_capture, "html": html_capture}
+    _, pending = await asyncio.wait(captures.values(), timeout=max(remaining_ms, 0) / 1000)
+    for capture in pending:
+        capture.cancel()
+    # let the cancelled captures clean up, e.g. scroll the page back
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    # the video only needs to be uploaded before the run ends
+    app.ARTIFACT_MANAGER.upload_aiotasks_map[task.task_id].append(
+        asyncio.create_task(_stream_recordings(task, browser_state))
+    )
+
+    for name, capture in captures.items():
+        if capture in pending:
+            timings.skipped.append(name)
+            continue
+        if capture.exception() is not None:
+            LOG.error(
+                f"Failed to record {name} after action",
+                task_id=task.task_id,
+                step_id=step.step_id,
+                exc_info=capture.exception(),
+            )
+            continue
+        if name == "screenshot":
+            screenshot, timings.screenshot_ms = screenshot_capture.result()
+            if screenshot_mode == ScreenshotCaptureMode.scrolling and scrolling_number > 0:
+                context.last_scrolling_screenshot_ms = timings.screenshot_ms
+            await app.ARTIFACT_MANAGER.create_artifact(
+                step=step, artifact_type=ArtifactType.SCREENSHOT_ACTION, data=screenshot
+            )
+        else:
+            html, timings.html_ms = html_capture.result()
+            html_hash = hashlib.sha256(html.encode()).hexdigest()
+            if html_hash == context.last_action_html_hash:
+                timings.html_unchanged = True
+                continue
+            context.last_action_html_hash = html_hash
+            await app.ARTIFACT_MANAGER.create_artifact(
+                step=step, artifact_type=ArtifactType.HTML_ACTION, data=html.encode()
+            )
+
+    # keep the random delay between actions
+    elapsed = time.monotonic() - start
+    if elapsed < delay_seconds:
+        await asyncio.sleep(delay_seconds - elapsed)
+
+    timings.critical_path_ms = (time.monotonic() - start) * 1000
+    timings.sequential_ms = delay_seconds * 1000 + (timings.screenshot_ms or 0) + (timings.html_ms or 0)
+    LOG.info(
+        "Recorded artifacts after action",
+        task_id=task.task_id,
+        step_id=step.step_id,
+        saved_ms=timings.saved_ms,
+        **timings.model_dump(),
+    )
+    return timings
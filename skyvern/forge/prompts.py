@@ -2,3 +2,4 @@ from skyvern.forge.sdk.prompting import PromptEngine
 
 # Initialize the prompt engine
 prompt_engine = PromptEngine("skyvern")
+prompt_engine.precompile()
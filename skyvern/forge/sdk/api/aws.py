@@ -1,15 +1,23 @@
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
 from enum import StrEnum
-from typing import IO, Any
+from typing import IO, Any, AsyncIterator
 from urllib.parse import urlparse
 
 import aioboto3
 import structlog
+from botocore.config import Config
+from pydantic import BaseModel, Field
 from types_boto3_ec2.client import EC2Client
 from types_boto3_ecs.client import ECSClient
 from types_boto3_s3.client import S3Client
 from types_boto3_secretsmanager.client import SecretsManagerClient
 
 from skyvern.config import settings
+from skyvern.forge.sdk.core.metrics import LATENCY_BUCKETS_MS, Histogram
 
 LOG = structlog.get_logger()
 
@@ -33,6 +41,96 @@ class AWSClientType(StrEnum):
     EC2 = "ec2"
 
 
+class AWSOperationMetrics(BaseModel):
+    calls: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    latency_ms: Histogram = Field(default_factory=lambda: Histogram(buckets=LATENCY_BUCKETS_MS))
+
+
+@dataclass
+class _PooledClient:
+    loop: asyncio.AbstractEventLoop
+    exit_stack: AsyncExitStack
+    client: Any
+
+
+class AWSClientManager:
+    """
+    One long-lived client per service, region and endpoint, shared by the AsyncAWSClient instances of the process.
+    Opening a client resolves the credentials and creates a new connection pool, which used to happen on every call.
+
+    The clients hold aiohttp sessions bound to the event loop they were opened in, so a client is only reused in
+    its own loop.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[tuple[str, str, str | None], _PooledClient] = {}
+        self.metrics: dict[str, AWSOperationMetrics] = defaultdict(AWSOperationMetrics)
+
+    async def get_client(
+        self, session: aioboto3.Session, client_type: AWSClientType, region_name: str, endpoint_url: str | None
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        key = (str(client_type), region_name, endpoint_url)
+        pooled_client = self._clients.get(key)
+        if pooled_client and pooled_client.loop is loop:
+            return pooled_client.client
+
+        exit_stack = AsyncExitStack()
+        client = await exit_stack.enter_async_context(
+            session.client(
+                client_type,
+                region_name=region_name,
+                endpoint_url=endpoint_url,
+                config=Config(max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS),
+            )
+        )
+        pooled_client = self._clients.get(key)
+        if pooled_client and pooled_client.loop is loop:
+            # another call opened the same client meanwhile
+            await exit_stack.aclose()
+            return pooled_client.client
+        # a client of a closed loop can't be closed anymore, it's dropped
+        self._clients[key] = _PooledClient(loop=loop, exit_stack=exit_stack, client=client)
+        LOG.debug("Opened a pooled AWS client", client_type=client_type, region_name=region_name)
+        return client
+
+    @asynccontextmanager
+    async def track(self, operation: str) -> AsyncIterator[None]:
+        metrics = self.metrics[operation]
+        metrics.calls += 1
+        metrics.in_flight += 1
+        metrics.max_in_flight = max(metrics.max_in_flight, metrics.in_flight)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.in_flight -= 1
+            metrics.latency_ms.observe((time.perf_counter() - start) * 1000)
+
+    def get_metrics(self) -> dict[str, AWSOperationMetrics]:
+        return {operation: metrics.model_copy(deep=True) for operation, metrics in self.metrics.items()}
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        clients, self._clients = self._clients, {}
+        for pooled_client in clients.values():
+            if pooled_client.loop is not loop:
+                continue
+            try:
+                await pooled_client.exit_stack.aclose()
+            except Exception:
+                LOG.warning("Failed to close a pooled AWS client", exc_info=True)
+
+
+aws_client_manager = AWSClientManager()
+
+
 class AsyncAWSClient:
     def __init__(
         self,
@@ -47,20 +145,33 @@ class AsyncAWSClient:
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
         )
+        # the clients with explicit credentials, e.g. the ones of a workflow block, aren't kept around
+        self._pooled = aws_access_key_id is None and aws_secret_access_key is None
+
+    @asynccontextmanager
+    async def _client(self, client_type: AWSClientType, operation: str) -> AsyncIterator[Any]:
+        async with aws_client_manager.track(f"{client_type}.{operation}"):
+            if self._pooled:
+                yield await aws_client_manager.get_client(
+                    self.session, client_type, self.region_name, self._endpoint_url
+                )
+            else:
+                async with self.session.client(
+                    client_type, region_name=self.region_name, endpoint_url=self._endpoint_url
+                ) as client:
+                    yield client
 
-    def _ecs_client(self) -> ECSClient:
-        return self.session.client(AWSClientType.ECS, region_name=self.region_name, endpoint_url=self._endpoint_url)
+    def _ecs_client(self, operation: str) -> AbstractAsyncContextManager[ECSClient]:
+        return self._client(AWSClientType.ECS, operation)
 
-    def _secrets_manager_client(self) -> SecretsManagerClient:
-        return self.session.client(
-            AWSClientType.SECRETS_MANAGER, region_name=self.region_name, endpoint_url=self._endpoint_url
-        )
+    def _secrets_manager_client(self, operation: str) -> AbstractAsyncContextManager[SecretsManagerClient]:
+        return self._client(AWSClientType.SECRETS_MANAGER, operation)
 
-    def _s3_client(self) -> S3Client:
-        return self.session.client(AWSClientType.S3, region_name=self.region_name, endpoint_url=self._endpoint_url)
+    def _s3_client(self, operation: str) -> AbstractAsyncContextManager[S3Client]:
+        return self._client(AWSClientType.S3, operation)
 
-    def _ec2_client(self) -> EC2Client:
-        return self.session.client(AWSClientType.EC2, region_name=self.region_name, endpoint_url=self._endpoint_url)
+    def _ec2_client(self, operation: str) -> AbstractAsyncContextManager[EC2Client]:
+        return self._client(AWSClientType.EC2, operation)
 
     def _create_tag_string(self, tags: dict[str, str]) -> str:
         return "&".join([f"{k}={v}" for k, v in tags.items()])
@@ -68,7 +179,7 @@ class AsyncAWSClient:
     async def get_secret(self, secret_name: str) -> str | None:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/secretsmanager/client/get_secret_value.html
         try:
-            async with self._secrets_manager_client() as client:
+            async with self._secrets_manager_client("get_secret") as client:
                 response = await client.get_secret_value(SecretId=secret_name)
                 return response["SecretString"]
         except Exception as e:
@@ -82,7 +193,7 @@ class AsyncAWSClient:
     async def create_secret(self, secret_name: str, secret_value: str) -> None:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/secretsmanager/client/create_secret.html
         try:
-            async with self._secrets_manager_client() as client:
+            async with self._secrets_manager_client("create_secret") as client:
                 await client.create_secret(Name=secret_name, SecretString=secret_value)
         except Exception as e:
             LOG.exception("Failed to create secret.", secret_name=secret_name)
@@ -91,7 +202,7 @@ class AsyncAWSClient:
     async def set_secret(self, secret_name: str, secret_value: str) -> None:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/secretsmanager/client/put_secret_value.html
         try:
-            async with self._secrets_manager_client() as client:
+            async with self._secrets_manager_client("set_secret") as client:
                 await client.put_secret_value(SecretId=secret_name, SecretString=secret_value)
         except Exception as e:
             LOG.exception("Failed to set secret.", secret_name=secret_name)
@@ -100,7 +211,7 @@ class AsyncAWSClient:
     async def delete_secret(self, secret_name: str) -> None:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/secretsmanager/client/delete_secret.html
         try:
-            async with self._secrets_manager_client() as client:
+            async with self._secrets_manager_client("delete_secret") as client:
                 await client.delete_secret(SecretId=secret_name)
         except Exception as e:
             LOG.exception("Failed to delete secret.", secret_name=secret_name)
@@ -117,7 +228,7 @@ class AsyncAWSClient:
         if storage_class not in S3StorageClass:
             raise ValueError(f"Invalid storage class: {storage_class}. Must be one of {list(S3StorageClass)}")
         try:
-            async with self._s3_client() as client:
+            async with self._s3_client("upload_file") as client:
                 parsed_uri = S3Uri(uri)
                 extra_args = {"Tagging": self._create_tag_string(tags)} if tags else {}
                 await client.put_object(
@@ -143,7 +254,7 @@ class AsyncAWSClient:
         if storage_class not in S3StorageClass:
             raise ValueError(f"Invalid storage class: {storage_class}. Must be one of {list(S3StorageClass)}")
         try:
-            async with self._s3_client() as client:
+            async with self._s3_client("upload_file_stream") as client:
                 parsed_uri = S3Uri(uri)
                 extra_args: dict[str, Any] = {"StorageClass": str(storage_class)}
                 if tags:
@@ -171,7 +282,7 @@ class AsyncAWSClient:
     ) -> None:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/upload_file.html
         try:
-            async with self._s3_client() as client:
+            async with self._s3_client("upload_file_from_path") as client:
                 parsed_uri = S3Uri(uri)
                 extra_args: dict[str, Any] = {"StorageClass": str(storage_class)}
                 if metadata:
@@ -189,10 +300,79 @@ class AsyncAWSClient:
             if raise_exception:
                 raise e
 
+    async def create_multipart_upload(
+        self,
+        uri: str,
+        storage_class: S3StorageClass = S3StorageClass.STANDARD,
+        tags: dict[str, str] | None = None,
+    ) -> str:
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/create_multipart_upload.html
+        if storage_class not in S3StorageClass:
+            raise ValueError(f"Invalid storage class: {storage_class}. Must be one of {list(S3StorageClass)}")
+        try:
+            async with self._s3_client("create_multipart_upload") as client:
+                parsed_uri = S3Uri(uri)
+                extra_args = {"Tagging": self._create_tag_string(tags)} if tags else {}
+                response = await client.create_multipart_upload(
+                    Bucket=parsed_uri.bucket,
+                    Key=parsed_uri.key,
+                    StorageClass=str(storage_class),
+                    **extra_args,
+                )
+                return response["UploadId"]
+        except Exception as e:
+            LOG.exception("Failed to create S3 multipart upload.", uri=uri)
+            raise e
+
+    async def upload_part(self, uri: str, upload_id: str, part_number: int, data: bytes) -> str:
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/upload_part.html
+        try:
+            async with self._s3_client("upload_part") as client:
+                parsed_uri = S3Uri(uri)
+                response = await client.upload_part(
+                    Body=data,
+                    Bucket=parsed_uri.bucket,
+                    Key=parsed_uri.key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                )
+                return response["ETag"]
+        except Exception as e:
+            LOG.exception("Failed to upload S3 part.", uri=uri, upload_id=upload_id, part_number=part_number)
+            raise e
+
+    async def complete_multipart_upload(self, uri: str, upload_id: str, etags: dict[int, str]) -> None:
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/complete_multipart_upload.html
+        try:
+            async with self._s3_client("complete_multipart_upload") as client:
+                parsed_uri = S3Uri(uri)
+                await client.complete_multipart_upload(
+                    Bucket=parsed_uri.bucket,
+                    Key=parsed_uri.key,
+                    UploadId=upload_id,
+                    MultipartUpload={
+                        "Parts": [
+                            {"PartNumber": part_number, "ETag": etag} for part_number, etag in sorted(etags.items())
+                        ]
+                    },
+                )
+        except Exception as e:
+            LOG.exception("Failed to complete S3 multipart upload.", uri=uri, upload_id=upload_id)
+            raise e
+
+    async def abort_multipart_upload(self, uri: str, upload_id: str) -> None:
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/abort_multipart_upload.html
+        try:
+            async with self._s3_client("abort_multipart_upload") as client:
+                parsed_uri = S3Uri(uri)
+                await client.abort_multipart_upload(Bucket=parsed_uri.bucket, Key=parsed_uri.key, UploadId=upload_id)
+        except Exception:
+            LOG.exception("Failed to abort S3 multipart upload.", uri=uri, upload_id=upload_id)
+
     async def download_file(self, uri: str, log_exception: bool = True) -> bytes | None:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/get_object.html
         try:
-            async with self._s3_client() as client:
+            async with self._s3_client("download_file") as client:
                 parsed_uri = S3Uri(uri)
 
                 # Get full object including body
@@ -204,7 +384,7 @@ class AsyncAWSClient:
             return None
 
     async def get_object_info(self, uri: str) -> dict:
-        async with self._s3_client() as client:
+        async with self._s3_client("get_object_info") as client:
             parsed_uri = S3Uri(uri)
             # Only get object metadata without the body
             return await client.head_object(Bucket=parsed_uri.bucket, Key=parsed_uri.key)
@@ -238,7 +418,7 @@ class AsyncAWSClient:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/generate_presigned_url.html
         presigned_urls = []
         try:
-            async with self._s3_client() as client:
+            async with self._s3_client("create_presigned_urls") as client:
                 for uri in uris:
                     parsed_uri = S3Uri(uri)
                     url = await client.generate_presigned_url(
@@ -257,7 +437,7 @@ class AsyncAWSClient:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/paginator/ListObjectsV2.html
         object_keys: list[str] = []
         parsed_uri = S3Uri(uri)
-        async with self._s3_client() as client:
+        async with self._s3_client("list_files") as client:
             async for page in client.get_paginator("list_objects_v2").paginate(
                 Bucket=parsed_uri.bucket, Prefix=parsed_uri.key
             ):
@@ -277,7 +457,7 @@ class AsyncAWSClient:
         enable_execute_command: bool = False,
     ) -> dict:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ecs/client/run_task.html
-        async with self._ecs_client() as client:
+        async with self._ecs_client("run_task") as client:
             return await client.run_task(
                 cluster=cluster,
                 launchType=launch_type,
@@ -294,33 +474,33 @@ class AsyncAWSClient:
 
     async def stop_task(self, cluster: str, task: str, reason: str | None = None) -> dict:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ecs/client/stop_task.html
-        async with self._ecs_client() as client:
+        async with self._ecs_client("stop_task") as client:
             return await client.stop_task(cluster=cluster, task=task, reason=reason)
 
     async def describe_tasks(self, cluster: str, tasks: list[str]) -> dict:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ecs/client/describe_tasks.html
-        async with self._ecs_client() as client:
+        async with self._ecs_client("describe_tasks") as client:
             return await client.describe_tasks(cluster=cluster, tasks=tasks)
 
     async def list_tasks(self, cluster: str) -> dict:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ecs/client/list_tasks.html
-        async with self._ecs_client() as client:
+        async with self._ecs_client("list_tasks") as client:
             return await client.list_tasks(cluster=cluster)
 
     async def describe_task_definition(self, task_definition: str) -> dict:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ecs/client/describe_task_definition.html
-        async with self._ecs_client() as client:
+        async with self._ecs_client("describe_task_definition") as client:
             return await client.describe_task_definition(taskDefinition=task_definition)
 
     async def deregister_task_definition(self, task_definition: str) -> dict:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ecs/client/deregister_task_definition.html
-        async with self._ecs_client() as client:
+        async with self._ecs_client("deregister_task_definition") as client:
             return await client.deregister_task_definition(taskDefinition=task_definition)
 
     ###### EC2 ######
     async def describe_network_interfaces(self, network_interface_ids: list[str]) -> dict:
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/ec2/client/describe_network_interfaces.html
-        async with self._ec2_client() as client:
+        async with self._ec2_client("describe_network_interfaces") as client:
             return await client.describe_network_interfaces(NetworkInterfaceIds=network_interface_ids)
 
 
@@ -2,7 +2,7 @@ import dataclasses
 import json
 import time
 from asyncio import CancelledError
-from typing import Any, AsyncIterator
+from typing import Any, AsyncIterator, Callable
 
 import litellm
 import structlog
@@ -22,17 +22,25 @@ from skyvern.forge.sdk.api.llm.exceptions import (
     InvalidLLMConfigError,
     LLMProviderError,
     LLMProviderErrorRetryableTask,
+    LLMResponseNotRecordedError,
 )
 from skyvern.forge.sdk.api.llm.models import LLMAPIHandler, LLMConfig, LLMRouterConfig, dummy_llm_api_handler
+from skyvern.forge.sdk.api.llm.response_cache import LLMResponseCache
+from skyvern.forge.sdk.api.llm.streaming import acompletion_with_streamed_items
 from skyvern.forge.sdk.api.llm.ui_tars_response import UITarsResponse
-from skyvern.forge.sdk.api.llm.utils import llm_messages_builder, llm_messages_builder_with_history, parse_api_response
+from skyvern.forge.sdk.api.llm.utils import (
+    get_prompt_cache_prefix,
+    llm_messages_builder,
+    llm_messages_builder_with_history,
+    parse_api_response,
+)
 from skyvern.forge.sdk.artifact.models import ArtifactType
 from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.task_v2 import TaskV2, Thought
 from skyvern.forge.sdk.trace import TraceManager
-from skyvern.utils.image_resizer import Resolution, get_resize_target_dimension, resize_screenshots
+from skyvern.utils.image_resizer import Resolution, get_resize_target_dimension, resize_screenshots_async
 
 LOG = structlog.get_logger()
 
@@ -45,6 +53,13 @@ class LLMCallStats(BaseModel):
     llm_cost: float | None = None
 
 
+def _render_hashed_hrefs(parsed: dict[str, Any]) -> dict[str, Any]:
+    context = skyvern_context.current()
+    if not context or not context.hashed_href_map:
+        return parsed
+    return json.loads(Template(json.dumps(parsed)).render(context.hashed_href_map))
+
+
 class LLMAPIHandlerFactory:
     _custom_handlers: dict[str, LLMAPIHandler] = {}
 
@@ -100,6 +115,7 @@ class LLMAPIHandlerFactory:
             ai_suggestion: AISuggestion | None = None,
             screenshots: list[bytes] | None = None,
             parameters: dict[str, Any] | None = None,
+            on_streamed_action: Callable[[dict[str, Any]], None] | None = None,
         ) -> dict[str, Any]:
             """
             Custom LLM API handler that utilizes the LiteLLM router and fallbacks to OpenAI GPT-4 Vision.
@@ -137,7 +153,12 @@ class LLMAPIHandlerFactory:
                 task_v2=task_v2,
                 thought=thought,
             )
-            messages = await llm_messages_builder(prompt, screenshots, llm_config.add_assistant_prefix)
+            messages = await llm_messages_builder(
+                prompt,
+                screenshots,
+                llm_config.add_assistant_prefix,
+                prompt_cache_prefix=get_prompt_cache_prefix(llm_config.model_name, prompt),
+            )
 
             await app.ARTIFACT_MANAGER.create_llm_artifact(
                 data=json.dumps(
@@ -153,10 +174,24 @@ class LLMAPIHandlerFactory:
                 thought=thought,
                 ai_suggestion=ai_suggestion,
             )
+            element_ids = LLMResponseCache.get_element_ids(messages) if app.LLM_RESPONSE_CACHE.enabled else {}
+            # the key hashes the whole prompt and the screenshots, it's only built when the cache is on
+            cache_key = (
+                app.LLM_RESPONSE_CACHE.build_key(llm_key, messages, screenshots, parameters, element_ids)
+                if app.LLM_RESPONSE_CACHE.enabled
+                else ""
+            )
             try:
-                response = await router.acompletion(
-                    model=main_model_group, messages=messages, timeout=settings.LLM_CONFIG_TIMEOUT, **parameters
+                response, cache_hit = await app.LLM_RESPONSE_CACHE.get_or_call(
+                    cache_key,
+                    prompt_name,
+                    lambda: router.acompletion(
+                        model=main_model_group, messages=messages, timeout=settings.LLM_CONFIG_TIMEOUT, **parameters
+                    ),
+                    element_ids=element_ids,
                 )
+            except LLMResponseNotRecordedError:
+                raise
             except litellm.exceptions.APIError as e:
                 raise LLMProviderErrorRetryableTask(llm_key) from e
             except litellm.exceptions.ContextWindowExceededError as e:
@@ -198,7 +233,8 @@ class LLMAPIHandlerFactory:
                 thought=thought,
                 ai_suggestion=ai_suggestion,
             )
-            if step or thought:
+            # a cached response didn't cost anything
+            if (step or thought) and not cache_hit:
                 try:
                     # FIXME: volcengine doesn't support litellm cost calculation.
                     llm_cost = litellm.completion_cost(completion_response=response)
@@ -267,6 +303,7 @@ class LLMAPIHandlerFactory:
                 model=main_model_group,
                 prompt_name=prompt_name,
                 duration_seconds=duration_seconds,
+                cache_hit=cache_hit,
                 step_id=step.step_id if step else None,
                 thought_id=thought.observer_thought_id if thought else None,
                 organization_id=step.organization_id if step else (thought.organization_id if thought else None),
@@ -298,6 +335,7 @@ class LLMAPIHandlerFactory:
             ai_suggestion: AISuggestion | None = None,
             screenshots: list[bytes] | None = None,
             parameters: dict[str, Any] | None = None,
+            on_streamed_action: Callable[[dict[str, Any]], None] | None = None,
         ) -> dict[str, Any]:
             start_time = time.time()
             active_parameters = base_parameters or {}
@@ -334,7 +372,12 @@ class LLMAPIHandlerFactory:
 
             model_name = llm_config.model_name
 
-            messages = await llm_messages_builder(prompt, screenshots, llm_config.add_assistant_prefix)
+            messages = await llm_messages_builder(
+                prompt,
+                screenshots,
+                llm_config.add_assistant_prefix,
+                prompt_cache_prefix=get_prompt_cache_prefix(llm_config.model_name, prompt),
+            )
             await app.ARTIFACT_MANAGER.create_llm_artifact(
                 data=json.dumps(
                     {
@@ -351,16 +394,40 @@ class LLMAPIHandlerFactory:
                 ai_suggestion=ai_suggestion,
             )
             t_llm_request = time.perf_counter()
+            # we're not using active_parameters in the key because it may contain sensitive information
+            element_ids = LLMResponseCache.get_element_ids(messages) if app.LLM_RESPONSE_CACHE.enabled else {}
+            cache_key = (
+                app.LLM_RESPONSE_CACHE.build_key(model_name, messages, screenshots, parameters, element_ids)
+                if app.LLM_RESPONSE_CACHE.enabled
+                else ""
+            )
             try:
                 # TODO (kerem): add a timeout to this call
                 # TODO (kerem): add a retry mechanism to this call (acompletion_with_retries)
                 # TODO (kerem): use litellm fallbacks? https://litellm.vercel.app/docs/tutorials/fallbacks#how-does-completion_with_fallbacks-work
-                response = await litellm.acompletion(
-                    model=model_name,
-                    messages=messages,
-                    timeout=settings.LLM_CONFIG_TIMEOUT,
-                    **active_parameters,
+                response, cache_hit = await app.LLM_RESPONSE_CACHE.get_or_call(
+                    cache_key,
+                    prompt_name,
+                    lambda: litellm.acompletion(
+                        model=model_name,
+                        messages=messages,
+                        timeout=settings.LLM_CONFIG_TIMEOUT,
+                        **active_parameters,
+                    )
+                    if on_streamed_action is None
+                    else acompletion_with_streamed_items(
+                        "actions",
+                        lambda action: on_streamed_action(_render_hashed_hrefs(action)),
+                        assistant_prefix="{" if llm_config.add_assistant_prefix else "",
+                        model=model_name,
+                        messages=messages,
+                        timeout=settings.LLM_CONFIG_TIMEOUT,
+                        **active_parameters,
+                    ),
+                    element_ids=element_ids,
                 )
+            except LLMResponseNotRecordedError:
+                raise
             except litellm.exceptions.APIError as e:
                 raise LLMProviderErrorRetryableTask(llm_key) from e
             except litellm.exceptions.ContextWindowExceededError as e:
@@ -403,7 +470,8 @@ class LLMAPIHandlerFactory:
                 ai_suggestion=ai_suggestion,
             )
 
-            if step or thought:
+            # a cached response didn't cost anything
+            if (step or thought) and not cache_hit:
                 try:
                     # FIXME: volcengine doesn't support litellm cost calculation.
                     llm_cost = litellm.completion_cost(completion_response=response)
@@ -472,6 +540,7 @@ class LLMAPIHandlerFactory:
                 prompt_name=prompt_name,
                 model=llm_config.model_name,
                 duration_seconds=duration_seconds,
+                cache_hit=cache_hit,
                 step_id=step.step_id if step else None,
                 thought_id=thought.observer_thought_id if thought else None,
                 organization_id=step.organization_id if step else (thought.organization_id if thought else None),
@@ -587,7 +656,7 @@ class LLMCaller:
                         tool["display_height_px"] = target_dimension["height"]
                     if "display_width_px" in tool:
                         tool["display_width_px"] = target_dimension["width"]
-            screenshots = resize_screenshots(screenshots, target_dimension)
+            screenshots = await resize_screenshots_async(screenshots, target_dimension)
 
         if prompt:
             await app.ARTIFACT_MANAGER.create_llm_artifact(
@@ -637,16 +706,42 @@ class LLMCaller:
             ai_suggestion=ai_suggestion,
         )
         t_llm_request = time.perf_counter()
+        cache_hit = False
         try:
-            response = await self._dispatch_llm_call(
-                messages=messages,
-                tools=tools,
-                timeout=settings.LLM_CONFIG_TIMEOUT,
-                **active_parameters,
-            )
+            if "ANTHROPIC" in self.llm_key:
+                # the Anthropic messages aren't ModelResponses, they're not cached
+                response = await self._dispatch_llm_call(
+                    messages=messages,
+                    tools=tools,
+                    timeout=settings.LLM_CONFIG_TIMEOUT,
+                    **active_parameters,
+                )
+            else:
+                element_ids = LLMResponseCache.get_element_ids(messages) if app.LLM_RESPONSE_CACHE.enabled else {}
+                # we're not using active_parameters in the key because it may contain sensitive information
+                cache_key = (
+                    app.LLM_RESPONSE_CACHE.build_key(
+                        self.llm_config.model_name, messages, screenshots, {**parameters, "tools": tools}, element_ids
+                    )
+                    if app.LLM_RESPONSE_CACHE.enabled
+                    else ""
+                )
+                response, cache_hit = await app.LLM_RESPONSE_CACHE.get_or_call(
+                    cache_key,
+                    prompt_name or "",
+                    lambda: self._dispatch_llm_call(
+                        messages=messages,
+                        tools=tools,
+                        timeout=settings.LLM_CONFIG_TIMEOUT,
+                        **active_parameters,
+                    ),
+                    element_ids=element_ids,
+                )
             if use_message_history:
                 # only update message_history when the request is successful
                 self.message_history = messages
+        except LLMResponseNotRecordedError:
+            raise
         except litellm.exceptions.APIError as e:
             raise LLMProviderErrorRetryableTask(self.llm_key) from e
         except litellm.exceptions.ContextWindowExceededError as e:
@@ -678,7 +773,8 @@ class LLMCaller:
             ai_suggestion=ai_suggestion,
         )
 
-        if step or thought:
+        # a cached response didn't cost anything
+        if (step or thought) and not cache_hit:
             call_stats = await self.get_call_stats(response)
             if step:
                 await app.DATABASE.update_step(
@@ -709,6 +805,7 @@ class LLMCaller:
             prompt_name=prompt_name,
             model=self.llm_config.model_name,
             duration_seconds=duration_seconds,
+            cache_hit=cache_hit,
             step_id=step.step_id if step else None,
             thought_id=thought.observer_thought_id if thought else None,
             organization_id=step.organization_id if step else (thought.organization_id if thought else None),
@@ -51,3 +51,11 @@ class NoProviderEnabledError(BaseLLMError):
             "At least one LLM provider must be enabled. Run setup.sh and follow through the LLM provider setup, or "
             "update the .env file (check out .env.example to see the required environment variables)."
         )
+
+
+class LLMResponseNotRecordedError(BaseLLMError):
+    def __init__(self, prompt_name: str, cache_key: str) -> None:
+        super().__init__(
+            f"No recorded LLM response for prompt {prompt_name} (cache key {cache_key}) in replay mode. "
+            "Record the run with LLM_RESPONSE_CACHE_MODE=record first."
+        )
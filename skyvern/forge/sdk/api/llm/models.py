@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Literal, Optional, Protocol, TypedDict
+from typing import Any, Awaitable, Callable, Literal, Optional, Protocol, TypedDict
 
 from litellm import AllowedFailsPolicy
 
@@ -94,6 +94,9 @@ class LLMAPIHandler(Protocol):
         ai_suggestion: AISuggestion | None = None,
         screenshots: list[bytes] | None = None,
         parameters: dict[str, Any] | None = None,
+        # called with each object of the "actions" array of the response as soon as it's streamed in, by the
+        # handlers which stream. All the actions are in the returned response either way
+        on_streamed_action: Callable[[dict[str, Any]], None] | None = None,
     ) -> Awaitable[dict[str, Any]]: ...
 
 
@@ -106,5 +109,6 @@ async def dummy_llm_api_handler(
     ai_suggestion: AISuggestion | None = None,
     screenshots: list[bytes] | None = None,
     parameters: dict[str, Any] | None = None,
+    on_streamed_action: Callable[[dict[str, Any]], None] | None = None,
 ) -> dict[str, Any]:
     raise NotImplementedError("Your LLM provider is not configured. Please configure it in the .env file.")
@@ -0,0 +1,251 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator
+
+import structlog
+from litellm.utils import ModelResponse
+from pydantic import BaseModel
+
+from skyvern.forge.sdk.api.llm.exceptions import LLMResponseNotRecordedError
+from skyvern.forge.sdk.cache.local import LocalCache
+
+LOG = structlog.get_logger()
+
+IMAGE_CONTENT_TYPES = {"image_url", "image"}
+# the elements of the main frame get an id whose first character is random, see uniqueId() in domUtils.js
+MAIN_FRAME_ELEMENT_ID_RE = re.compile(r'\bid="([~!@#$%^&*()\-_+=][A-Za-z0-9]{3})"')
+# the local_datetime of the prompts
+ISO_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?")
+NORMALIZED_DATETIME = "<datetime>"
+
+
+class LLMResponseCacheMode(StrEnum):
+    # every call goes to the LLM provider
+    OFF = "off"
+    # responses are served from the memory and disk tiers until their prompt's ttl expires
+    CACHE = "cache"
+    # every call goes to the LLM provider and the responses are written to the fixture store
+    RECORD = "record"
+    # responses are only served from the fixture store, a missing response is an error
+    REPLAY = "replay"
+
+
+class LLMResponseCacheStats(BaseModel):
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+
+def _normalize_element_id(element_id: str) -> str:
+    return f"~{element_id[1:]}"
+
+
+def _replace_element_ids(text: str, element_ids: dict[str, str]) -> str:
+    if not element_ids:
+        return text
+    pattern = re.compile(
+        r"(?<![A-Za-z0-9])(?:" + "|".join(re.escape(element_id) for element_id in element_ids) + r")(?![A-Za-z0-9])"
+    )
+    return pattern.sub(lambda match: element_ids[match.group(0)], text)
+
+
+def _normalize_messages(value: Any, element_ids: dict[str, str]) -> Any:
+    # the screenshots are part of the key through their hashes, not their base64 payload. the datetime and the random
+    # part of the element ids change on every run, they're normalized so a recorded run can be replayed
+    if isinstance(value, dict):
+        if value.get("type") in IMAGE_CONTENT_TYPES:
+            return {"type": value["type"]}
+        return {key: _normalize_messages(item, element_ids) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize_messages(item, element_ids) for item in value]
+    if isinstance(value, str):
+        return _replace_element_ids(ISO_DATETIME_RE.sub(NORMALIZED_DATETIME, value), element_ids)
+    return value
+
+
+def _iter_strings(value: Any) -> Iterator[str]:
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_strings(item)
+    elif isinstance(value, str):
+        yield value
+
+
+class LLMResponseCache:
+    """
+    An opt-in cache of the LLM responses, keyed on the model, the rendered messages and the screenshot hashes.
+    Responses are kept in memory and in a directory on disk, which doubles as the fixture store of the record and
+    replay modes.
+    """
+
+    def __init__(
+        self,
+        mode: LLMResponseCacheMode | str = LLMResponseCacheMode.OFF,
+        cache_dir: str | None = None,
+        ttl_seconds: int | None = None,
+        prompt_ttl_seconds: dict[str, int] | None = None,
+        max_items: int = 1000,
+    ) -> None:
+        self.mode = LLMResponseCacheMode(mode)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.ttl_seconds = ttl_seconds
+        self.prompt_ttl_seconds = prompt_ttl_seconds or {}
+        self.memory = LocalCache(max_items=max_items)
+        self.stats = LLMResponseCacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != LLMResponseCacheMode.OFF
+
+    def get_ttl_seconds(self, prompt_name: str) -> int | None:
+        """
+        :return: the ttl of the responses of the prompt, None means they never expire
+        """
+        if self.mode != LLMResponseCacheMode.CACHE:
+            # recorded fixtures are replayed as long as they exist
+            return None
+        return self.prompt_ttl_seconds.get(prompt_name, self.ttl_seconds)
+
+    @staticmethod
+    def get_element_ids(messages: list[dict[str, Any]]) -> dict[str, str]:
+        """
+        :return: the normalized id of each main frame element id of the messages
+        """
+        element_ids: dict[str, str] = {}
+        for text in _iter_strings(messages):
+            for element_id in MAIN_FRAME_ELEMENT_ID_RE.findall(text):
+                element_ids[element_id] = _normalize_element_id(element_id)
+        return element_ids
+
+    @staticmethod
+    def build_key(
+        model: str,
+        messages: list[dict[str, Any]],
+        screenshots: list[bytes] | None = None,
+        parameters: dict[str, Any] | None = None,
+        element_ids: dict[str, str] | None = None,
+    ) -> str:
+        if element_ids is None:
+            element_ids = LLMResponseCache.get_element_ids(messages)
+        key_data = {
+            "model": model,
+            "messages": _normalize_messages(messages, element_ids),
+            "screenshots": [hashlib.sha256(screenshot).hexdigest() for screenshot in screenshots or []],
+            "parameters": parameters or {},
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    async def get_or_call(
+        self,
+        key: str,
+        prompt_name: str,
+        call: Callable[[], Awaitable[ModelResponse]],
+        element_ids: dict[str, str] | None = None,
+    ) -> tuple[ModelResponse, bool]:
+        """
+        :param key: see build_key(), unused when the cache is off
+        :param element_ids: the element ids of the messages and their normalized ids, see get_element_ids(). The
+            responses are stored with the normalized ids and served with the element ids of the current messages.
+        :return: the response and whether it was served from the cache
+        """
+        if self.mode in (LLMResponseCacheMode.CACHE, LLMResponseCacheMode.REPLAY):
+            response = await self.get(key, prompt_name)
+            if response is not None:
+                if element_ids:
+                    normalized_to_current = {normalized: element_id for element_id, normalized in element_ids.items()}
+                    response = self._rewrite_element_ids(response, normalized_to_current)
+                return response, True
+            if self.mode == LLMResponseCacheMode.REPLAY:
+                raise LLMResponseNotRecordedError(prompt_name, key)
+
+        response = await call()
+        if self.enabled:
+            await self.set(
+                key, prompt_name, self._rewrite_element_ids(response, element_ids) if element_ids else response
+            )
+        return response, False
+
+    @staticmethod
+    def _rewrite_element_ids(response: ModelResponse, element_ids: dict[str, str]) -> ModelResponse:
+        data = json.dumps(response.model_dump(), default=str)
+        return ModelResponse(**json.loads(_replace_element_ids(data, element_ids)))
+
+    async def get(self, key: str, prompt_name: str) -> ModelResponse | None:
+        data = await self.memory.get(key)
+        if data is not None:
+            self.stats.memory_hits += 1
+            return ModelResponse(**data)
+
+        entry = await asyncio.to_thread(self._read_entry, prompt_name, key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and self.mode == LLMResponseCacheMode.CACHE and expires_at <= time.time():
+            self.stats.misses += 1
+            return None
+
+        self.stats.disk_hits += 1
+        await self.memory.set(key, entry["response"], ex=self._remaining_seconds(expires_at))
+        return ModelResponse(**entry["response"])
+
+    async def set(self, key: str, prompt_name: str, response: ModelResponse) -> None:
+        data = response.model_dump()
+        ttl_seconds = self.get_ttl_seconds(prompt_name)
+        await self.memory.set(key, data, ex=ttl_seconds)
+        self.stats.stores += 1
+        if self.cache_dir is None:
+            return
+        entry = {
+            "prompt_name": prompt_name,
+            "stored_at": time.time(),
+            "expires_at": time.time() + ttl_seconds if ttl_seconds is not None else None,
+            "response": data,
+        }
+        try:
+            await asyncio.to_thread(self._write_entry, prompt_name, key, entry)
+        except Exception:
+            LOG.warning("Failed to write the LLM response to the cache", prompt_name=prompt_name, exc_info=True)
+
+    def get_stats(self) -> LLMResponseCacheStats:
+        return self.stats.model_copy()
+
+    @staticmethod
+    def _remaining_seconds(expires_at: float | None) -> int | None:
+        if expires_at is None:
+            return None
+        return max(1, int(expires_at - time.time()))
+
+    def _get_path(self, prompt_name: str, key: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / (prompt_name or "unnamed") / f"{key}.json"
+
+    def _read_entry(self, prompt_name: str, key: str) -> dict[str, Any] | None:
+        if self.cache_dir is None:
+            return None
+        path = self._get_path(prompt_name, key)
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            LOG.warning("Failed to read the cached LLM response", path=str(path), exc_info=True)
+            return None
+
+    def _write_entry(self, prompt_name: str, key: str, entry: dict[str, Any]) -> None:
+        path = self._get_path(prompt_name, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write and rename, so concurrent readers never see a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entry, indent=2, default=str))
+        os.replace(tmp_path, path)
@@ -0,0 +1,119 @@
+import json
+from typing import Any, Callable
+
+import litellm
+import structlog
+
+LOG = structlog.get_logger()
+
+
+class IncrementalJSONArrayParser:
+    """
+    Parse the objects of an array of the top level JSON object as the response streams in, e.g. the "actions" of
+    {"user_goal_stage": "...", "actions": [{...}, {...}]}. Text around the object, like a markdown fence, is skipped.
+    Once an object doesn't parse as strict JSON, the parser stops: it and the rest are left to the repair of the
+    complete response.
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.text = ""
+        self.position = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.string_start = 0
+        # the last string closed in the top level object, and the key it became when followed by a colon
+        self.last_string: str | None = None
+        self.current_key: str | None = None
+        self.in_array = False
+        self.item_start: int | None = None
+        self.stopped = False
+        self.items_parsed = 0
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        """
+        Add the next chunk of the response.
+
+        Returns:
+            list[dict[str, Any]]: The objects of the array completed by the chunk.
+        """
+        self.text += chunk
+        items: list[dict[str, Any]] = []
+        while self.position < len(self.text) and not self.stopped:
+            char = self.text[self.position]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    if self.depth == 1:
+                        self.last_string = self.text[self.string_start + 1 : self.position]
+            elif char == '"':
+                self.in_string = True
+                self.string_start = self.position
+            elif char == ":" and self.depth == 1:
+                self.current_key = self.last_string
+            elif char == "," and self.depth == 1:
+                self.current_key = None
+            elif char in "{[":
+                self.depth += 1
+                if char == "[" and self.depth == 2 and self.current_key == self.key:
+                    self.in_array = True
+                elif char == "{" and self.depth == 3 and self.in_array:
+                    self.item_start = self.position
+            elif char in "}]":
+                if char == "}" and self.depth == 3 and self.in_array and self.item_start is not None:
+                    item = self._parse_item(self.text[self.item_start : self.position + 1])
+                    if item is None:
+                        self.stopped = True
+                        break
+                    items.append(item)
+                    self.item_start = None
+                self.depth -= 1
+                if self.depth == 1:
+                    self.in_array = False
+            self.position += 1
+        return items
+
+    def _parse_item(self, text: str) -> dict[str, Any] | None:
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            LOG.info("Failed to parse a streamed item, leaving the rest to the complete response", item=text)
+            return None
+        if not isinstance(item, dict):
+            return None
+        self.items_parsed += 1
+        return item
+
+
+async def acompletion_with_streamed_items(
+    key: str,
+    on_item: Callable[[dict[str, Any]], None],
+    assistant_prefix: str = "",
+    **completion_kwargs: Any,
+) -> litellm.ModelResponse:
+    """
+    Call litellm.acompletion with a streamed response and hand every object of the `key` array of the response to
+    on_item as soon as it's complete.
+
+    Returns:
+        litellm.ModelResponse: The complete response, as if it wasn't streamed.
+    """
+    parser = IncrementalJSONArrayParser(key)
+    parser.feed(assistant_prefix)
+    chunks = []
+    stream = await litellm.acompletion(stream=True, **completion_kwargs)
+    async for chunk in stream:
+        chunks.append(chunk)
+        content = chunk.choices[0].delta.content if chunk.choices else None
+        if content:
+            for item in parser.feed(content):
+                on_item(item)
+    response = litellm.stream_chunk_builder(chunks, messages=completion_kwargs.get("messages"))
+    if response is None:
+        raise ValueError("Empty streamed LLM response")
+    return response
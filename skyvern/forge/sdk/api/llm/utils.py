@@ -8,18 +8,50 @@ import json_repair
 import litellm
 import structlog
 
+from skyvern.config import settings
 from skyvern.constants import MAX_IMAGE_MESSAGES
+from skyvern.forge.prompts import prompt_engine
 from skyvern.forge.sdk.api.llm import commentjson
 from skyvern.forge.sdk.api.llm.exceptions import EmptyLLMResponseError, InvalidLLMResponseFormat
+from skyvern.utils.image_resizer import ScreenshotFormat, encode_screenshots_async, get_image_media_type
 
 LOG = structlog.get_logger()
 
+# the providers which only cache the prompt up to the cache_control breakpoints
+PROMPT_CACHE_BREAKPOINT_PROVIDERS = {"anthropic", "bedrock", "vertex_ai"}
+
+
+async def _encode_llm_screenshots(screenshots: list[bytes]) -> list[bytes]:
+    """
+    Re-encode the screenshots with LLM_SCREENSHOT_FORMAT. The screenshot artifacts keep the original PNGs.
+    """
+    return await encode_screenshots_async(
+        screenshots,
+        image_format=ScreenshotFormat(settings.LLM_SCREENSHOT_FORMAT),
+        quality=settings.LLM_SCREENSHOT_QUALITY,
+    )
+
+
+def get_prompt_cache_prefix(model_name: str, prompt: str) -> str | None:
+    """
+    The static prefix of the prompt template to mark as a prompt cache breakpoint, if the provider of the model takes
+    explicit breakpoints. The other providers cache the prefixes on their own.
+    """
+    try:
+        _, provider, _, _ = litellm.get_llm_provider(model_name)
+        if provider not in PROMPT_CACHE_BREAKPOINT_PROVIDERS or not litellm.utils.supports_prompt_caching(model_name):
+            return None
+    except Exception:
+        return None
+    return prompt_engine.find_static_prefix(prompt) or None
+
 
 async def llm_messages_builder(
     prompt: str,
     screenshots: list[bytes] | None = None,
     add_assistant_prefix: bool = False,
     message_pattern: str = "openai",
+    prompt_cache_prefix: str | None = None,
 ) -> list[dict[str, Any]]:
     messages: list[dict[str, Any]] = [
         {
@@ -27,16 +59,29 @@ async def llm_messages_builder(
             "text": prompt,
         }
     ]
+    if prompt_cache_prefix and prompt.startswith(prompt_cache_prefix) and prompt != prompt_cache_prefix:
+        messages = [
+            {
+                "type": "text",
+                "text": prompt_cache_prefix,
+                "cache_control": {"type": "ephemeral"},
+            },
+            {
+                "type": "text",
+                "text": prompt.removeprefix(prompt_cache_prefix),
+            },
+        ]
 
     if screenshots:
-        for screenshot in screenshots:
+        for screenshot in await _encode_llm_screenshots(screenshots):
             encoded_image = base64.b64encode(screenshot).decode("utf-8")
+            media_type = get_image_media_type(screenshot)
             if message_pattern == "anthropic":
                 message = {
                     "type": "image",
                     "source": {
                         "type": "base64",
-                        "media_type": "image/png",
+                        "media_type": media_type,
                         "data": encoded_image,
                     },
                 }
@@ -44,7 +89,7 @@ async def llm_messages_builder(
                 message = {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/png;base64,{encoded_image}",
+                        "url": f"data:{media_type};base64,{encoded_image}",
                     },
                 }
             messages.append(message)
@@ -77,15 +122,16 @@ async def llm_messages_builder_with_history(
         )
 
     if screenshots:
-        for screenshot in screenshots:
+        for screenshot in await _encode_llm_screenshots(screenshots):
             encoded_image = base64.b64encode(screenshot).decode("utf-8")
+            media_type = get_image_media_type(screenshot)
             message: dict[str, Any]
             if message_pattern == "anthropic":
                 message = {
                     "type": "image",
                     "source": {
                         "type": "base64",
-                        "media_type": "image/png",
+                        "media_type": media_type,
                         "data": encoded_image,
                     },
                 }
@@ -93,7 +139,7 @@ async def llm_messages_builder_with_history(
                 message = {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/png;base64,{encoded_image}",
+                        "url": f"data:{media_type};base64,{encoded_image}",
                     },
                 }
             current_user_messages.append(message)
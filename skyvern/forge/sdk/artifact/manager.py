@@ -1,11 +1,17 @@
 import asyncio
+import hashlib
+import os
 import time
 from collections import defaultdict
 
 import structlog
 
+from skyvern.config import settings
 from skyvern.forge import app
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
+from skyvern.forge.sdk.artifact.recording import RecordingUpload
+from skyvern.forge.sdk.artifact.storage.base import CONTENT_ADDRESSED_ARTIFACT_TYPES
+from skyvern.forge.sdk.artifact.upload_pipeline import ArtifactUploadMetrics, ArtifactUploadPipeline
 from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.db.id import generate_artifact_id
 from skyvern.forge.sdk.models import Step
@@ -17,8 +23,17 @@ LOG = structlog.get_logger(__name__)
 
 
 class ArtifactManager:
-    # task_id -> list of aio_tasks for uploading artifacts
-    upload_aiotasks_map: dict[str, list[asyncio.Task[None]]] = defaultdict(list)
+    # task_id -> list of futures resolved once the artifacts are uploaded
+    upload_aiotasks_map: dict[str, list[asyncio.Future[None]]] = defaultdict(list)
+
+    def __init__(self) -> None:
+        self.upload_pipeline = ArtifactUploadPipeline(
+            queue_size=settings.ARTIFACT_UPLOAD_QUEUE_SIZE,
+            num_workers=settings.ARTIFACT_UPLOAD_WORKERS,
+            batch_size=settings.ARTIFACT_UPLOAD_BATCH_SIZE,
+        )
+        # artifact_id -> the upload of the recording the browser is still writing
+        self.recording_uploads: dict[str, RecordingUpload] = {}
 
     async def _create_artifact(
         self,
@@ -53,6 +68,17 @@ class ArtifactManager:
         if not run_id and context:
             run_id = context.run_id
 
+        deduplicate = False
+        if data and settings.ENABLE_ARTIFACT_DEDUPLICATION and artifact_type in CONTENT_ADDRESSED_ARTIFACT_TYPES:
+            # point the artifact to the blob shared by the identical payloads
+            uri = app.STORAGE.build_content_addressed_uri(
+                organization_id=organization_id,
+                digest=hashlib.sha256(data).hexdigest(),
+                artifact_type=artifact_type,
+            )
+            deduplicate = True
+
+        # the row is inserted right away so the artifact can be read as soon as its id is returned
         artifact = await app.DATABASE.create_artifact(
             artifact_id,
             artifact_type,
@@ -67,14 +93,14 @@ class ArtifactManager:
             organization_id=organization_id,
             ai_suggestion_id=ai_suggestion_id,
         )
-        if data:
-            # Fire and forget
-            aio_task = asyncio.create_task(app.STORAGE.store_artifact(artifact, data))
-            self.upload_aiotasks_map[aio_task_primary_key].append(aio_task)
-        elif path:
-            # Fire and forget
-            aio_task = asyncio.create_task(app.STORAGE.store_artifact_from_path(artifact, path))
-            self.upload_aiotasks_map[aio_task_primary_key].append(aio_task)
+        # the data is uploaded in the background, this waits only when the upload queue is full
+        upload_future = await self.upload_pipeline.enqueue(
+            artifact=artifact,
+            data=data,
+            path=path,
+            deduplicate=deduplicate,
+        )
+        self.upload_aiotasks_map[aio_task_primary_key].append(upload_future)
 
         return artifact_id
 
@@ -306,15 +332,80 @@ class ArtifactManager:
     ) -> None:
         if not artifact_id or not organization_id:
             return None
+        # a previous upload of the artifact still in the pipeline mustn't overwrite the new data
+        await self.upload_pipeline.wait_for_artifact(artifact_id)
         artifact = await app.DATABASE.get_artifact_by_id(artifact_id, organization_id)
         if not artifact:
             return
-        # Fire and forget
-        aio_task = asyncio.create_task(app.STORAGE.store_artifact(artifact, data))
-
         if not artifact[primary_key]:
             raise ValueError(f"{primary_key} is required to update artifact data.")
-        self.upload_aiotasks_map[artifact[primary_key]].append(aio_task)
+
+        upload_future = await self.upload_pipeline.enqueue(artifact=artifact, data=data)
+        self.upload_aiotasks_map[artifact[primary_key]].append(upload_future)
+
+    async def _get_recording_upload(
+        self, artifact_id: str | None, organization_id: str | None, path: str | None
+    ) -> RecordingUpload | None:
+        if not artifact_id or not organization_id or not path or not os.path.exists(path):
+            return None
+        await self.abort_recording_uploads(idle_seconds=settings.ARTIFACT_RECORDING_UPLOAD_IDLE_TIMEOUT_SECONDS)
+        recording_upload = self.recording_uploads.get(artifact_id)
+        if recording_upload is not None:
+            if recording_upload.path == path:
+                return recording_upload
+            await recording_upload.abort()
+        # the initial (empty) data of the artifact must be stored before the stream starts overwriting it
+        await self.upload_pipeline.wait_for_artifact(artifact_id)
+        artifact = await app.DATABASE.get_artifact_by_id(artifact_id, organization_id)
+        if not artifact:
+            return None
+        recording_upload = RecordingUpload(app.STORAGE, artifact, path)
+        self.recording_uploads[artifact_id] = recording_upload
+        return recording_upload
+
+    async def stream_recording(self, artifact_id: str | None, organization_id: str | None, path: str | None) -> None:
+        """
+        Upload the part of the recording written since the last call.
+        """
+        recording_upload = await self._get_recording_upload(artifact_id, organization_id, path)
+        if recording_upload is not None:
+            await recording_upload.sync()
+
+    async def finalize_recording(self, artifact_id: str | None, organization_id: str | None, path: str | None) -> None:
+        """
+        Upload the rest of the recording and complete the artifact, once the browser stopped recording.
+        """
+        recording_upload = await self._get_recording_upload(artifact_id, organization_id, path)
+        if recording_upload is None:
+            return
+        try:
+            await recording_upload.finalize()
+        finally:
+            self.recording_uploads.pop(recording_upload.artifact.artifact_id, None)
+
+    async def abort_recording_uploads(
+        self, task_ids: list[str] | None = None, idle_seconds: float | None = None
+    ) -> None:
+        """
+        Abort the uploads of the recordings that won't be finalized: the ones of task_ids, the ones not synced for
+        idle_seconds, or all of them without a filter. What they streamed is dropped from the storage.
+        """
+        now = time.monotonic()
+        for artifact_id, recording_upload in list(self.recording_uploads.items()):
+            if task_ids is not None and recording_upload.artifact.task_id not in task_ids:
+                continue
+            if idle_seconds is not None and now - recording_upload.last_sync_time < idle_seconds:
+                continue
+            self.recording_uploads.pop(artifact_id, None)
+            LOG.info(
+                "Aborting the upload of a recording that wasn't finalized",
+                artifact_id=artifact_id,
+                task_id=recording_upload.artifact.task_id,
+            )
+            try:
+                await recording_upload.abort()
+            except Exception:
+                LOG.warning("Failed to abort the upload of a recording", artifact_id=artifact_id, exc_info=True)
 
     async def retrieve_artifact(self, artifact: Artifact) -> bytes | None:
         return await app.STORAGE.retrieve_artifact(artifact)
@@ -325,13 +416,17 @@ class ArtifactManager:
     async def get_share_links(self, artifacts: list[Artifact]) -> list[str] | None:
         return await app.STORAGE.get_share_links(artifacts)
 
+    def get_upload_metrics(self) -> ArtifactUploadMetrics:
+        return self.upload_pipeline.get_metrics()
+
     async def wait_for_upload_aiotasks(self, primary_keys: list[str]) -> None:
         try:
             st = time.time()
             async with asyncio.timeout(30):
+                # the uploads are shielded, a timeout stops the wait without cancelling them
                 await asyncio.gather(
                     *[
-                        aio_task
+                        asyncio.shield(aio_task)
                         for primary_key in primary_keys
                         for aio_task in self.upload_aiotasks_map[primary_key]
                         if not aio_task.done()
@@ -341,6 +436,7 @@ class ArtifactManager:
                 f"S3 upload aio tasks for primary_keys={primary_keys} completed in {time.time() - st:.2f}s",
                 primary_keys=primary_keys,
                 duration=time.time() - st,
+                upload_metrics=self.get_upload_metrics().model_dump(),
             )
         except asyncio.TimeoutError:
             LOG.error(
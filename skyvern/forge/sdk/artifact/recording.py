@@ -0,0 +1,134 @@
+import asyncio
+import os
+import time
+
+import structlog
+
+from skyvern.config import settings
+from skyvern.forge.sdk.artifact.models import Artifact
+from skyvern.forge.sdk.artifact.storage.base import ArtifactStreamWriter, BaseStorage
+
+LOG = structlog.get_logger(__name__)
+
+# max bytes read from the recording file at once
+READ_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _read_file_range(path: str, offset: int, size: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+class RecordingUpload:
+    """
+    Tails the recording file the browser is writing and streams the bytes appended since the last sync to the
+    storage, so each sync costs the size of the new video rather than of the whole recording. The file is read off the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        artifact: Artifact,
+        path: str,
+        snapshot_interval: float | None = None,
+    ) -> None:
+        self.storage = storage
+        self.artifact = artifact
+        self.path = path
+        # how often the whole recording is stored while the writer keeps it out of sight, 0 to never do it
+        self.snapshot_interval = (
+            snapshot_interval if snapshot_interval is not None else settings.ARTIFACT_RECORDING_SNAPSHOT_SECONDS
+        )
+        self.writer: ArtifactStreamWriter | None = None
+        # number of bytes of the file already handed to the writer
+        self.offset = 0
+        # bytes read from the file, including the head read again on completion
+        self.bytes_read = 0
+        self.restarts = 0
+        self.snapshots = 0
+        self.last_sync_time = time.monotonic()
+        self._last_snapshot_time: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def _read(self, offset: int, size: int) -> bytes:
+        data = await asyncio.to_thread(_read_file_range, self.path, offset, size)
+        self.bytes_read += len(data)
+        return data
+
+    async def _restart(self) -> None:
+        if self.writer is not None:
+            await self.writer.abort()
+            self.restarts += 1
+        self.writer = await self.storage.open_artifact_stream(self.artifact)
+        self.offset = 0
+
+    async def _sync(self) -> ArtifactStreamWriter:
+        file_size = await asyncio.to_thread(os.path.getsize, self.path)
+        if self.writer is None or file_size < self.offset:
+            # the file was replaced or truncated, what was streamed isn't a prefix of it anymore
+            await self._restart()
+        assert self.writer is not None
+        while self.offset < file_size:
+            data = await self._read(self.offset, min(READ_CHUNK_SIZE, file_size - self.offset))
+            if not data:
+                break
+            await self.writer.append(data)
+            self.offset += len(data)
+        return self.writer
+
+    async def sync(self) -> int:
+        """
+        Stream the bytes appended to the recording since the last sync.
+        :return: the number of bytes streamed so far
+        """
+        async with self._lock:
+            writer = await self._sync()
+            self.last_sync_time = time.monotonic()
+            if (
+                self.snapshot_interval
+                and not writer.visible_while_writing
+                and (
+                    self._last_snapshot_time is None
+                    or self.last_sync_time - self._last_snapshot_time >= self.snapshot_interval
+                )
+            ):
+                # so the recording of a running task can be watched
+                await writer.snapshot(self.path)
+                self._last_snapshot_time = self.last_sync_time
+                self.snapshots += 1
+            return self.offset
+
+    async def finalize(self) -> None:
+        """
+        Stream the rest of the recording and complete the artifact. Call it once the browser stopped writing the file.
+        """
+        async with self._lock:
+            start = time.monotonic()
+            writer = await self._sync()
+            head = await self._read(0, writer.head_size)
+            try:
+                await writer.complete(head)
+            except BaseException:
+                await writer.abort()
+                self.writer = None
+                raise
+            LOG.info(
+                "Recording uploaded",
+                artifact_id=self.artifact.artifact_id,
+                size=self.offset,
+                bytes_read=self.bytes_read,
+                restarts=self.restarts,
+                snapshots=self.snapshots,
+                finalize_duration=time.monotonic() - start,
+            )
+
+    async def abort(self) -> None:
+        """
+        Drop what was streamed, for a recording that won't be finalized.
+        """
+        async with self._lock:
+            if self.writer is not None:
+                await self.writer.abort()
+                self.writer = None
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import BinaryIO
 
+from skyvern.config import settings
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
@@ -36,12 +37,101 @@ FILE_EXTENTSION_MAP: dict[ArtifactType, str] = {
     ArtifactType.VISIBLE_ELEMENTS_ID_XPATH_MAP: "json",
 }
 
+# identical payloads of these artifact types are stored once and shared by the artifacts, see
+# BaseStorage.build_content_addressed_uri
+CONTENT_ADDRESSED_ARTIFACT_TYPES: set[ArtifactType] = {
+    ArtifactType.SCREENSHOT_LLM,
+    ArtifactType.SCREENSHOT_ACTION,
+    ArtifactType.SCREENSHOT_FINAL,
+    ArtifactType.LLM_PROMPT,
+}
+
+
+class ArtifactStreamWriter(ABC):
+    """
+    Writes an artifact whose data is produced over time, like the recording of a browser, by appending the new bytes
+    instead of storing the whole data again. The producer may still rewrite the first head_size bytes (e.g. the webm
+    header is rewritten when the recording ends), they are passed again to complete().
+    """
+
+    def __init__(self, artifact: Artifact) -> None:
+        self.artifact = artifact
+        # number of bytes appended so far
+        self.size = 0
+
+    @property
+    @abstractmethod
+    def head_size(self) -> int:
+        pass
+
+    @property
+    def visible_while_writing(self) -> bool:
+        """
+        Whether the appended data can be read from the storage before the artifact is complete.
+        """
+        return False
+
+    @abstractmethod
+    async def append(self, data: bytes) -> None:
+        pass
+
+    @abstractmethod
+    async def complete(self, head: bytes) -> None:
+        """
+        :param head: the final version of the first head_size bytes
+        """
+        pass
+
+    async def snapshot(self, path: str) -> None:
+        """
+        Store the whole data written so far, read from path, where it can be read before the artifact is complete.
+        complete() replaces it.
+        """
+        pass
+
+    async def abort(self) -> None:
+        pass
+
+
+class StoreOnCompleteArtifactStreamWriter(ArtifactStreamWriter):
+    """
+    For the backends that can't append: nothing is written until the artifact is complete, then the whole data, all
+    of it being the head, is stored at once.
+    """
+
+    def __init__(self, storage: "BaseStorage", artifact: Artifact) -> None:
+        super().__init__(artifact)
+        self.storage = storage
+
+    @property
+    def head_size(self) -> int:
+        return self.size
+
+    async def append(self, data: bytes) -> None:
+        self.size += len(data)
+
+    async def complete(self, head: bytes) -> None:
+        await self.storage.store_artifact(self.artifact, head)
+
 
 class BaseStorage(ABC):
+    def get_upload_concurrency(self) -> int:
+        """
+        The max number of artifacts the upload pipeline stores into this backend concurrently.
+        """
+        return settings.ARTIFACT_UPLOAD_CONCURRENCY
+
     @abstractmethod
     def build_uri(self, *, organization_id: str, artifact_id: str, step: Step, artifact_type: ArtifactType) -> str:
         pass
 
+    @abstractmethod
+    def build_content_addressed_uri(self, *, organization_id: str, digest: str, artifact_type: ArtifactType) -> str:
+        """
+        The uri of a blob shared by all the artifacts of the organization with the same content digest.
+        """
+        pass
+
     @abstractmethod
     async def retrieve_global_workflows(self) -> list[str]:
         pass
@@ -89,6 +179,10 @@ class BaseStorage(ABC):
     async def retrieve_artifact(self, artifact: Artifact) -> bytes | None:
         pass
 
+    @abstractmethod
+    async def artifact_uri_exists(self, uri: str) -> bool:
+        pass
+
     @abstractmethod
     async def get_share_link(self, artifact: Artifact) -> str | None:
         pass
@@ -101,6 +195,12 @@ class BaseStorage(ABC):
     async def store_artifact_from_path(self, artifact: Artifact, path: str) -> None:
         pass
 
+    async def open_artifact_stream(self, artifact: Artifact) -> ArtifactStreamWriter:
+        """
+        Start writing the artifact from scratch, see ArtifactStreamWriter.
+        """
+        return StoreOnCompleteArtifactStreamWriter(self, artifact)
+
     @abstractmethod
     async def save_streaming_file(self, organization_id: str, file_name: str) -> None:
         pass
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import shutil
 from datetime import datetime
@@ -14,7 +15,7 @@ from skyvern.forge.sdk.api.files import (
     parse_uri_to_path,
 )
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
-from skyvern.forge.sdk.artifact.storage.base import FILE_EXTENTSION_MAP, BaseStorage
+from skyvern.forge.sdk.artifact.storage.base import FILE_EXTENTSION_MAP, ArtifactStreamWriter, BaseStorage
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.files import FileInfo
@@ -24,6 +25,39 @@ from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock
 LOG = structlog.get_logger()
 
 
+class LocalArtifactStreamWriter(ArtifactStreamWriter):
+    """
+    Appends to the artifact file, the head is overwritten in place on completion.
+    """
+
+    def __init__(self, artifact: Artifact, file_path: Path, head_size: int) -> None:
+        super().__init__(artifact)
+        self.file_path = file_path
+        self._head_size = head_size
+
+    @property
+    def head_size(self) -> int:
+        return min(self.size, self._head_size)
+
+    @property
+    def visible_while_writing(self) -> bool:
+        return True
+
+    def _write(self, data: bytes, offset: int | None = None) -> None:
+        with open(self.file_path, "ab" if offset is None else "r+b") as f:
+            if offset is not None:
+                f.seek(offset)
+            f.write(data)
+
+    async def append(self, data: bytes) -> None:
+        await asyncio.to_thread(self._write, data)
+        self.size += len(data)
+
+    async def complete(self, head: bytes) -> None:
+        if head:
+            await asyncio.to_thread(self._write, head, 0)
+
+
 class LocalStorage(BaseStorage):
     def __init__(self, artifact_path: str = settings.ARTIFACT_STORAGE_PATH) -> None:
         self.artifact_path = artifact_path
@@ -32,6 +66,10 @@ class LocalStorage(BaseStorage):
         file_ext = FILE_EXTENTSION_MAP[artifact_type]
         return f"file://{self.artifact_path}/{organization_id}/{step.task_id}/{step.order:02d}_{step.retry_index}_{step.step_id}/{datetime.utcnow().isoformat()}_{artifact_id}_{artifact_type}.{file_ext}"
 
+    def build_content_addressed_uri(self, *, organization_id: str, digest: str, artifact_type: ArtifactType) -> str:
+        file_ext = FILE_EXTENTSION_MAP[artifact_type]
+        return f"file://{self.artifact_path}/{settings.ENV}/{organization_id}/blobs/{digest[:2]}/{digest}.{file_ext}"
+
     async def retrieve_global_workflows(self) -> list[str]:
         file_path = Path(f"{self.artifact_path}/{settings.ENV}/global_workflows.txt")
         self._create_directories_if_not_exists(file_path)
@@ -92,6 +130,9 @@ class LocalStorage(BaseStorage):
                 artifact=artifact,
             )
 
+    async def artifact_uri_exists(self, uri: str) -> bool:
+        return Path(parse_uri_to_path(uri)).exists()
+
     async def store_artifact_from_path(self, artifact: Artifact, path: str) -> None:
         file_path = None
         try:
@@ -105,6 +146,12 @@ class LocalStorage(BaseStorage):
                 artifact=artifact,
             )
 
+    async def open_artifact_stream(self, artifact: Artifact) -> ArtifactStreamWriter:
+        file_path = Path(parse_uri_to_path(artifact.uri))
+        self._create_directories_if_not_exists(file_path)
+        file_path.write_bytes(b"")
+        return LocalArtifactStreamWriter(artifact, file_path, head_size=settings.ARTIFACT_STREAM_PART_SIZE)
+
     async def retrieve_artifact(self, artifact: Artifact) -> bytes | None:
         file_path = None
         try:
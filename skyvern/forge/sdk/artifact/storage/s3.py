@@ -18,7 +18,7 @@ from skyvern.forge.sdk.api.files import (
     unzip_files,
 )
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
-from skyvern.forge.sdk.artifact.storage.base import FILE_EXTENTSION_MAP, BaseStorage
+from skyvern.forge.sdk.artifact.storage.base import FILE_EXTENTSION_MAP, ArtifactStreamWriter, BaseStorage
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.files import FileInfo
@@ -27,6 +27,78 @@ from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock
 
 LOG = structlog.get_logger()
 
+# S3 rejects the parts smaller than this, except the last one
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class S3ArtifactStreamWriter(ArtifactStreamWriter):
+    """
+    Uploads the appended bytes as the parts of a multipart upload. Part 1 is the head: it's only uploaded, from the
+    bytes passed to complete(), when the artifact is complete. The parts can't be read before that, the snapshots are
+    what can be read meanwhile. Data that never outgrows the head is stored with a single put.
+    """
+
+    def __init__(
+        self,
+        artifact: Artifact,
+        async_client: AsyncAWSClient,
+        storage_class: S3StorageClass,
+        tags: dict[str, str],
+        part_size: int,
+    ) -> None:
+        super().__init__(artifact)
+        self.async_client = async_client
+        self.storage_class = storage_class
+        self.tags = tags
+        self.part_size = max(part_size, S3_MIN_PART_SIZE)
+        self.upload_id: str | None = None
+        # part number -> etag
+        self.etags: dict[int, str] = {}
+        self._pending = bytearray()
+
+    @property
+    def head_size(self) -> int:
+        return min(self.size, self.part_size)
+
+    async def append(self, data: bytes) -> None:
+        head_remaining = max(self.part_size - self.size, 0)
+        self.size += len(data)
+        self._pending += data[head_remaining:]
+        if len(self._pending) >= self.part_size:
+            await self._upload_pending()
+
+    async def _upload_pending(self) -> None:
+        if self.upload_id is None:
+            self.upload_id = await self.async_client.create_multipart_upload(
+                self.artifact.uri, storage_class=self.storage_class, tags=self.tags
+            )
+        part_number = len(self.etags) + 2
+        self.etags[part_number] = await self.async_client.upload_part(
+            self.artifact.uri, self.upload_id, part_number, bytes(self._pending)
+        )
+        self._pending.clear()
+
+    async def complete(self, head: bytes) -> None:
+        if self.upload_id is None:
+            await self.async_client.upload_file(
+                self.artifact.uri, head + self._pending, storage_class=self.storage_class, tags=self.tags
+            )
+            return
+        if self._pending:
+            await self._upload_pending()
+        self.etags[1] = await self.async_client.upload_part(self.artifact.uri, self.upload_id, 1, head)
+        await self.async_client.complete_multipart_upload(self.artifact.uri, self.upload_id, self.etags)
+
+    async def snapshot(self, path: str) -> None:
+        await self.async_client.upload_file_from_path(
+            self.artifact.uri, path, storage_class=self.storage_class, tags=self.tags
+        )
+
+    async def abort(self) -> None:
+        if self.upload_id is not None:
+            await self.async_client.abort_multipart_upload(self.artifact.uri, self.upload_id)
+            self.upload_id = None
+
 
 class S3Storage(BaseStorage):
     _PATH_VERSION = "v1"
@@ -35,10 +107,17 @@ class S3Storage(BaseStorage):
         self.async_client = AsyncAWSClient(endpoint_url=endpoint_url)
         self.bucket = bucket or settings.AWS_S3_BUCKET_ARTIFACTS
 
+    def get_upload_concurrency(self) -> int:
+        return settings.ARTIFACT_UPLOAD_S3_CONCURRENCY
+
     def build_uri(self, *, organization_id: str, artifact_id: str, step: Step, artifact_type: ArtifactType) -> str:
         file_ext = FILE_EXTENTSION_MAP[artifact_type]
         return f"{self._build_base_uri(organization_id)}/{step.task_id}/{step.order:02d}_{step.retry_index}_{step.step_id}/{datetime.utcnow().isoformat()}_{artifact_id}_{artifact_type}.{file_ext}"
 
+    def build_content_addressed_uri(self, *, organization_id: str, digest: str, artifact_type: ArtifactType) -> str:
+        file_ext = FILE_EXTENTSION_MAP[artifact_type]
+        return f"{self._build_base_uri(organization_id)}/blobs/{digest[:2]}/{digest}.{file_ext}"
+
     async def retrieve_global_workflows(self) -> list[str]:
         uri = f"s3://{self.bucket}/{settings.ENV}/global_workflows.txt"
         data = await self.async_client.download_file(uri, log_exception=False)
@@ -97,6 +176,15 @@ class S3Storage(BaseStorage):
         )
         await self.async_client.upload_file(artifact.uri, data, storage_class=sc, tags=tags)
 
+    async def open_artifact_stream(self, artifact: Artifact) -> ArtifactStreamWriter:
+        return S3ArtifactStreamWriter(
+            artifact,
+            self.async_client,
+            storage_class=await self._get_storage_class_for_org(artifact.organization_id),
+            tags=await self._get_tags_for_org(artifact.organization_id),
+            part_size=settings.ARTIFACT_STREAM_PART_SIZE,
+        )
+
     async def _get_storage_class_for_org(self, organization_id: str) -> S3StorageClass:
         return S3StorageClass.STANDARD
 
@@ -106,6 +194,9 @@ class S3Storage(BaseStorage):
     async def retrieve_artifact(self, artifact: Artifact) -> bytes | None:
         return await self.async_client.download_file(artifact.uri)
 
+    async def artifact_uri_exists(self, uri: str) -> bool:
+        return await self.async_client.get_file_metadata(uri, log_exception=False) is not None
+
     async def get_share_link(self, artifact: Artifact) -> str | None:
         share_urls = await self.async_client.create_presigned_urls([artifact.uri])
         return share_urls[0] if share_urls else None
@@ -1,8 +1,11 @@
+from datetime import datetime
+from pathlib import Path
+
 import pytest
 from freezegun import freeze_time
 
 from skyvern.config import settings
-from skyvern.forge.sdk.artifact.models import ArtifactType, LogEntityType
+from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
 from skyvern.forge.sdk.artifact.storage.local import LocalStorage
 from skyvern.forge.sdk.artifact.storage.test_helpers import (
     create_fake_for_ai_suggestion,
@@ -105,3 +108,34 @@ class TestLocalStorageBuildURIs:
             uri
             == f"file://{local_storage.artifact_path}/{settings.ENV}/{TEST_ORGANIZATION_ID}/ai_suggestions/{TEST_AI_SUGGESTION_ID}/2025-06-09T12:00:00_artifact123_screenshot_llm.png"
         )
+
+    def test_build_content_addressed_uri(self, local_storage: LocalStorage) -> None:
+        uri = local_storage.build_content_addressed_uri(
+            organization_id=TEST_ORGANIZATION_ID,
+            digest="abcdef123456",
+            artifact_type=ArtifactType.LLM_PROMPT,
+        )
+        assert (
+            uri
+            == f"file://{local_storage.artifact_path}/{settings.ENV}/{TEST_ORGANIZATION_ID}/blobs/ab/abcdef123456.txt"
+        )
+
+
+@pytest.mark.asyncio
+async def test_artifact_uri_exists(tmp_path: Path) -> None:
+    local_storage = LocalStorage(artifact_path=str(tmp_path))
+    uri = local_storage.build_content_addressed_uri(
+        organization_id=TEST_ORGANIZATION_ID, digest="abcdef123456", artifact_type=ArtifactType.SCREENSHOT_LLM
+    )
+    artifact = Artifact(
+        artifact_id="artifact123",
+        artifact_type=ArtifactType.SCREENSHOT_LLM,
+        uri=uri,
+        organization_id=TEST_ORGANIZATION_ID,
+        created_at=datetime.utcnow(),
+        modified_at=datetime.utcnow(),
+    )
+    assert not await local_storage.artifact_uri_exists(uri)
+
+    await local_storage.store_artifact(artifact, b"screenshot")
+    assert await local_storage.artifact_uri_exists(uri)
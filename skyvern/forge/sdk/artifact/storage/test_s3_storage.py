@@ -1,15 +1,17 @@
+import asyncio
 from datetime import datetime
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 import boto3
 import pytest
+import pytest_asyncio
 from freezegun import freeze_time
 from moto.server import ThreadedMotoServer
 from types_boto3_s3.client import S3Client
 
 from skyvern.config import settings
-from skyvern.forge.sdk.api.aws import S3StorageClass, S3Uri, tag_set_to_dict
+from skyvern.forge.sdk.api.aws import S3StorageClass, S3Uri, aws_client_manager, tag_set_to_dict
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType, LogEntityType
 from skyvern.forge.sdk.artifact.storage.s3 import S3Storage
 from skyvern.forge.sdk.artifact.storage.test_helpers import (
@@ -39,9 +41,11 @@ class S3StorageForTests(S3Storage):
         return S3StorageClass.ONEZONE_IA
 
 
-@pytest.fixture
-def s3_storage(moto_server: str) -> S3Storage:
-    return S3StorageForTests(bucket=TEST_BUCKET, endpoint_url=moto_server)
+@pytest_asyncio.fixture
+async def s3_storage(moto_server: str) -> AsyncGenerator[S3Storage, None]:
+    yield S3StorageForTests(bucket=TEST_BUCKET, endpoint_url=moto_server)
+    # the pooled clients belong to the event loop of the test
+    await aws_client_manager.close()
 
 
 @pytest.fixture(autouse=True)
@@ -153,6 +157,14 @@ class TestS3StorageBuildURIs:
             == f"s3://{TEST_BUCKET}/v1/{settings.ENV}/{TEST_ORGANIZATION_ID}/ai_suggestions/{TEST_AI_SUGGESTION_ID}/2025-06-09T12:00:00_artifact123_screenshot_llm.png"
         )
 
+    def test_build_content_addressed_uri(self, s3_storage: S3Storage) -> None:
+        uri = s3_storage.build_content_addressed_uri(
+            organization_id=TEST_ORGANIZATION_ID,
+            digest="abcdef123456",
+            artifact_type=ArtifactType.SCREENSHOT_LLM,
+        )
+        assert uri == f"s3://{TEST_BUCKET}/v1/{settings.ENV}/{TEST_ORGANIZATION_ID}/blobs/ab/abcdef123456.png"
+
 
 def _assert_object_meta(boto3_test_client: S3Client, uri: str) -> None:
     s3uri = S3Uri(uri)
@@ -221,3 +233,34 @@ class TestS3StorageStore:
         await s3_storage.store_artifact(artifact, test_data)
         _assert_object_content(boto3_test_client, artifact.uri, test_data)
         _assert_object_meta(boto3_test_client, artifact.uri)
+
+    async def test_artifact_uri_exists(self, s3_storage: S3Storage) -> None:
+        artifact = self._create_artifact_for_ai_suggestion(s3_storage, ArtifactType.LLM_PROMPT, TEST_AI_SUGGESTION_ID)
+        assert not await s3_storage.artifact_uri_exists(artifact.uri)
+
+        await s3_storage.store_artifact(artifact, b"prompt")
+        assert await s3_storage.artifact_uri_exists(artifact.uri)
+
+
+@pytest.mark.asyncio
+async def test_uploads_share_one_pooled_client(s3_storage: S3Storage, boto3_test_client: S3Client) -> None:
+    calls_before = aws_client_manager.get_metrics().get("s3.upload_file")
+    artifacts = [
+        TestS3StorageStore()._create_artifact_for_ai_suggestion(
+            s3_storage, ArtifactType.LLM_PROMPT, f"{TEST_AI_SUGGESTION_ID}_{i}"
+        )
+        for i in range(20)
+    ]
+    await asyncio.gather(*(s3_storage.store_artifact(artifact, b"prompt") for artifact in artifacts))
+
+    for artifact in artifacts:
+        _assert_object_content(boto3_test_client, artifact.uri, b"prompt")
+    assert len(aws_client_manager._clients) == 1
+    metrics = aws_client_manager.get_metrics()["s3.upload_file"]
+    assert metrics.calls - (calls_before.calls if calls_before else 0) == 20
+    assert metrics.errors == 0 and metrics.in_flight == 0
+    assert metrics.max_in_flight > 1
+    assert metrics.latency_ms.count == metrics.calls
+
+    await aws_client_manager.close()
+    assert not aws_client_manager._clients
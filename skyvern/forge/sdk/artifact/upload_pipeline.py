@@ -0,0 +1,232 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+import structlog
+from cachetools import LRUCache
+from pydantic import BaseModel
+
+from skyvern.forge import app
+from skyvern.forge.sdk.artifact.models import Artifact
+from skyvern.forge.sdk.artifact.storage.base import BaseStorage
+
+LOG = structlog.get_logger(__name__)
+
+
+class ArtifactUploadMetrics(BaseModel):
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    enqueued: int = 0
+    stored: int = 0
+    failed: int = 0
+    batches: int = 0
+    # content-addressed artifacts whose blob was already stored
+    deduplicated: int = 0
+    deduplicated_bytes: int = 0
+    # number of times a producer had to wait because the queue was full
+    backpressure_waits: int = 0
+    # time spent in storage.store_artifact
+    upload_seconds_total: float = 0
+    upload_seconds_max: float = 0
+    # time from enqueueing the artifact until it's stored
+    latency_seconds_total: float = 0
+    latency_seconds_max: float = 0
+
+
+@dataclass
+class ArtifactUpload:
+    future: asyncio.Future[None]
+    artifact: Artifact
+    data: bytes | None = None
+    path: str | None = None
+    # the artifact uri is content-addressed, the blob only needs to be stored once
+    deduplicate: bool = False
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def artifact_id(self) -> str:
+        return self.artifact.artifact_id
+
+
+class ArtifactUploadPipeline:
+    """
+    A bounded queue drained by a pool of workers. Each worker takes a batch of artifacts, whose rows are already in
+    the database, and stores their data, with at most storage.get_upload_concurrency() uploads in flight per backend.
+    Producers wait when the queue is full, so pending artifact data can't grow without limit.
+    """
+
+    def __init__(self, queue_size: int, num_workers: int, batch_size: int) -> None:
+        self.queue_size = queue_size
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self.metrics = ArtifactUploadMetrics()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[ArtifactUpload] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        # artifact_id -> the future resolved once the artifact is stored
+        self._pending: dict[str, asyncio.Future[None]] = {}
+        # storage class name -> semaphore
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        # uris of the content-addressed blobs known to be stored. the stored objects are never deleted, deleting
+        # the artifact rows leaves them in storage
+        self._stored_blob_uris: LRUCache[str, bool] = LRUCache(maxsize=10000)
+        # uri -> the future of the in-flight upload of the content-addressed blob
+        self._blob_uploads: dict[str, asyncio.Future[bool]] = {}
+
+    def _get_queue(self) -> asyncio.Queue[ArtifactUpload]:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            # the workers are bound to the event loop, start them lazily in the running loop
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._pending = {}
+            self._semaphores = {}
+            self._blob_uploads = {}
+            self._workers = [loop.create_task(self._run_worker(self._queue)) for _ in range(self.num_workers)]
+        return self._queue
+
+    async def enqueue(
+        self,
+        artifact: Artifact,
+        data: bytes | None = None,
+        path: str | None = None,
+        deduplicate: bool = False,
+    ) -> asyncio.Future[None]:
+        """
+        Queue the data of an artifact to be stored.
+        :return: a future resolved once the artifact is stored. It never raises, failures are logged.
+        """
+        queue = self._get_queue()
+        upload = ArtifactUpload(
+            future=asyncio.get_running_loop().create_future(),
+            artifact=artifact,
+            data=data,
+            path=path,
+            deduplicate=deduplicate,
+        )
+        self._pending[upload.artifact_id] = upload.future
+        if queue.full():
+            self.metrics.backpressure_waits += 1
+            LOG.warning(
+                "Artifact upload queue is full, waiting for the workers to catch up",
+                artifact_id=upload.artifact_id,
+                queue_size=self.queue_size,
+            )
+        await queue.put(upload)
+        self.metrics.enqueued += 1
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, queue.qsize())
+        return upload.future
+
+    async def wait_for_artifact(self, artifact_id: str) -> None:
+        """
+        Wait until the artifact, if it's still in the pipeline, is stored.
+        """
+        future = self._pending.get(artifact_id)
+        if future is not None:
+            await asyncio.shield(future)
+
+    async def close(self) -> None:
+        """
+        Wait for the queued artifacts and stop the workers.
+        """
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._queue = None
+        self._workers = []
+
+    def get_metrics(self) -> ArtifactUploadMetrics:
+        metrics = self.metrics.model_copy()
+        metrics.queue_depth = self._queue.qsize() if self._queue else 0
+        return metrics
+
+    async def _run_worker(self, queue: asyncio.Queue[ArtifactUpload]) -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._process_batch(batch)
+            except Exception:
+                LOG.exception("Failed to process artifact upload batch", batch_size=len(batch))
+                for upload in batch:
+                    self._resolve(upload, stored=False)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _process_batch(self, batch: list[ArtifactUpload]) -> None:
+        self.metrics.batches += 1
+        storage = app.STORAGE
+        semaphore = self._get_semaphore(storage)
+        await asyncio.gather(*[self._store(storage, semaphore, upload) for upload in batch])
+
+    def _get_semaphore(self, storage: BaseStorage) -> asyncio.Semaphore:
+        key = type(storage).__name__
+        if key not in self._semaphores:
+            self._semaphores[key] = asyncio.Semaphore(storage.get_upload_concurrency())
+        return self._semaphores[key]
+
+    async def _store(self, storage: BaseStorage, semaphore: asyncio.Semaphore, upload: ArtifactUpload) -> None:
+        stored = False
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                if upload.deduplicate and upload.data is not None:
+                    await self._store_blob(storage, upload.artifact, upload.data)
+                elif upload.data is not None:
+                    await storage.store_artifact(upload.artifact, upload.data)
+                elif upload.path is not None:
+                    await storage.store_artifact_from_path(upload.artifact, upload.path)
+                stored = True
+            except Exception:
+                LOG.exception("Failed to store artifact", artifact_id=upload.artifact_id)
+            finally:
+                duration = time.monotonic() - start
+                self.metrics.upload_seconds_total += duration
+                self.metrics.upload_seconds_max = max(self.metrics.upload_seconds_max, duration)
+        self._resolve(upload, stored=stored)
+
+    async def _store_blob(self, storage: BaseStorage, artifact: Artifact, data: bytes) -> None:
+        uri = artifact.uri
+        in_flight = self._blob_uploads.get(uri)
+        if uri in self._stored_blob_uris or (in_flight is not None and await asyncio.shield(in_flight)):
+            self._record_deduplicated(data)
+            return
+
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._blob_uploads[uri] = future
+        try:
+            # the blob may have been stored by another process or before a restart
+            if await storage.artifact_uri_exists(uri):
+                self._record_deduplicated(data)
+            else:
+                await storage.store_artifact(artifact, data)
+            self._stored_blob_uris[uri] = True
+            future.set_result(True)
+        except BaseException:
+            future.set_result(False)
+            raise
+        finally:
+            del self._blob_uploads[uri]
+
+    def _record_deduplicated(self, data: bytes) -> None:
+        self.metrics.deduplicated += 1
+        self.metrics.deduplicated_bytes += len(data)
+
+    def _resolve(self, upload: ArtifactUpload, stored: bool) -> None:
+        if upload.future.done():
+            return
+        if stored:
+            self.metrics.stored += 1
+        else:
+            self.metrics.failed += 1
+        latency = time.monotonic() - upload.enqueued_at
+        self.metrics.latency_seconds_total += latency
+        self.metrics.latency_seconds_max = max(self.metrics.latency_seconds_max, latency)
+        upload.future.set_result(None)
+        if self._pending.get(upload.artifact_id) is upload.future:
+            del self._pending[upload.artifact_id]
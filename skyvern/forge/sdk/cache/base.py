@@ -1,12 +1,43 @@
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import timedelta
-from typing import Any, Union
+from typing import Any, Awaitable, Callable, Union
+
+from pydantic import BaseModel
+
+from skyvern.exceptions import CacheLoadCancelled
 
 CACHE_EXPIRE_TIME = timedelta(weeks=4)
 MAX_CACHE_ITEM = 1000
 
 
+class CacheStats(BaseModel):
+    """
+    evictions counts the keys dropped because the cache was full or they expired. RedisCache doesn't count them, the
+    server drops the keys on its own.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def get_expire_seconds(ex: Union[int, timedelta, None]) -> float | None:
+    """
+    :return: the ttl in seconds, None means the key never expires
+    """
+    if ex is None:
+        return None
+    if isinstance(ex, timedelta):
+        return ex.total_seconds()
+    return float(ex)
+
+
 class BaseCache(ABC):
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+        self._loading: dict[str, asyncio.Future] = {}
+
     @abstractmethod
     async def set(self, key: str, value: Any, ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
         pass
@@ -14,3 +45,60 @@ class BaseCache(ABC):
     @abstractmethod
     async def get(self, key: str) -> Any:
         pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    async def mget(self, keys: list[str]) -> list[Any]:
+        return [await self.get(key) for key in keys]
+
+    async def mset(self, mapping: dict[str, Any], ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
+        for key, value in mapping.items():
+            await self.set(key, value, ex=ex)
+
+    async def get_or_set(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME,
+    ) -> Any:
+        """
+        Get the value of the key, or load and cache it on a miss.
+        Concurrent misses on the same key in this process share one load. None values are not cached. If the task
+        running the load is cancelled, the ones waiting for it run the load again.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        loading = self._loading.get(key)
+        if loading is not None:
+            try:
+                return await asyncio.shield(loading)
+            except CacheLoadCancelled:
+                return await self.get_or_set(key, load, ex=ex)
+
+        loading = asyncio.get_running_loop().create_future()
+        self._loading[key] = loading
+        try:
+            value = await load()
+            if value is not None:
+                await self.set(key, value, ex=ex)
+            loading.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            # the cancellation is the loading task's, not the waiters'
+            loading.set_exception(CacheLoadCancelled(key))
+            loading.exception()
+            raise
+        except Exception as e:
+            loading.set_exception(e)
+            # mark the exception as retrieved, in case no one else is waiting for it
+            loading.exception()
+            raise
+        finally:
+            self._loading.pop(key, None)
+
+    def get_stats(self) -> CacheStats:
+        return self.stats.model_copy()
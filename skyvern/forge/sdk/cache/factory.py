@@ -1,9 +1,20 @@
+from typing import Callable
+
+from skyvern.exceptions import UnknownCacheType
 from skyvern.forge.sdk.cache.base import BaseCache
 from skyvern.forge.sdk.cache.local import LocalCache
+from skyvern.forge.sdk.cache.redis_cache import RedisCache
+from skyvern.forge.sdk.settings_manager import SettingsManager
+
+CacheCreator = Callable[[], BaseCache]
 
 
 class CacheFactory:
     __cache: BaseCache = LocalCache()
+    _creators: dict[str, CacheCreator] = {
+        "local": lambda: LocalCache(max_items=SettingsManager.get_settings().CACHE_MAX_ITEMS),
+        "redis": lambda: RedisCache(redis_url=SettingsManager.get_settings().CACHE_REDIS_URL),
+    }
 
     @staticmethod
     def set_cache(cache: BaseCache) -> None:
@@ -12,3 +23,14 @@ class CacheFactory:
     @staticmethod
     def get_cache() -> BaseCache:
         return CacheFactory.__cache
+
+    @classmethod
+    def register_type(cls, cache_type: str, creator: CacheCreator) -> None:
+        cls._creators[cache_type] = creator
+
+    @classmethod
+    def create_cache(cls, cache_type: str) -> BaseCache:
+        creator = cls._creators.get(cache_type)
+        if not creator:
+            raise UnknownCacheType(cache_type)
+        return creator()
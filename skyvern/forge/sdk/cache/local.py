@@ -1,20 +1,51 @@
+import time
 from datetime import timedelta
 from typing import Any, Union
 
-from cachetools import TTLCache
+from cachetools import TLRUCache
 
-from skyvern.forge.sdk.cache.base import CACHE_EXPIRE_TIME, MAX_CACHE_ITEM, BaseCache
+from skyvern.forge.sdk.cache.base import CACHE_EXPIRE_TIME, MAX_CACHE_ITEM, BaseCache, CacheStats, get_expire_seconds
+
+
+def _time_to_use(key: str, item: tuple[Any, float | None], now: float) -> float:
+    _, expire_seconds = item
+    if expire_seconds is None:
+        return float("inf")
+    return now + expire_seconds
+
+
+class _StatsTLRUCache(TLRUCache):
+    def __init__(self, maxsize: int, stats: CacheStats) -> None:
+        super().__init__(maxsize=maxsize, ttu=_time_to_use, timer=time.monotonic)
+        self.stats = stats
+
+    def popitem(self) -> tuple[Any, Any]:
+        # only called when the cache is full
+        self.stats.evictions += 1
+        return super().popitem()
+
+    def expire(self, time: float | None = None) -> list[tuple[Any, Any]]:
+        # the expired keys are dropped lazily, on the next write
+        expired = super().expire(time)
+        self.stats.evictions += len(expired)
+        return expired
 
 
 class LocalCache(BaseCache):
-    def __init__(self) -> None:
-        self.cache: TTLCache = TTLCache(maxsize=MAX_CACHE_ITEM, ttl=CACHE_EXPIRE_TIME.total_seconds())
+    def __init__(self, max_items: int = MAX_CACHE_ITEM) -> None:
+        super().__init__()
+        self.cache: TLRUCache = _StatsTLRUCache(maxsize=max_items, stats=self.stats)
 
     async def get(self, key: str) -> Any:
         if key not in self.cache:
+            self.stats.misses += 1
             return None
-        value = self.cache[key]
+        self.stats.hits += 1
+        value, _ = self.cache[key]
         return value
 
     async def set(self, key: str, value: Any, ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
-        self.cache[key] = value
+        self.cache[key] = (value, get_expire_seconds(ex))
+
+    async def delete(self, key: str) -> None:
+        self.cache.pop(key, None)
@@ -0,0 +1,67 @@
+import pickle
+from datetime import timedelta
+from typing import Any, Union
+
+import structlog
+from redis.asyncio import Redis
+
+from skyvern.forge.sdk.cache.base import CACHE_EXPIRE_TIME, BaseCache, get_expire_seconds
+
+LOG = structlog.get_logger()
+
+
+class RedisCache(BaseCache):
+    """
+    Cache shared by all the processes through a server speaking the Redis protocol.
+    Values are pickled, so only point it to a trusted server.
+    """
+
+    def __init__(self, redis_url: str, key_prefix: str = "skyvern:cache:") -> None:
+        super().__init__()
+        self.key_prefix = key_prefix
+        self.client = Redis.from_url(redis_url)
+
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}"
+
+    @staticmethod
+    def _expire_ms(ex: Union[int, timedelta, None]) -> int | None:
+        expire_seconds = get_expire_seconds(ex)
+        if expire_seconds is None:
+            return None
+        return max(int(expire_seconds * 1000), 1)
+
+    def _loads(self, raw: bytes | None) -> Any:
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return pickle.loads(raw)
+
+    async def get(self, key: str) -> Any:
+        return self._loads(await self.client.get(self._key(key)))
+
+    async def set(self, key: str, value: Any, ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
+        await self.client.set(self._key(key), pickle.dumps(value), px=self._expire_ms(ex))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self._key(key))
+
+    async def mget(self, keys: list[str]) -> list[Any]:
+        if not keys:
+            return []
+        raw_values = await self.client.mget([self._key(key) for key in keys])
+        return [self._loads(raw) for raw in raw_values]
+
+    async def mset(self, mapping: dict[str, Any], ex: Union[int, timedelta, None] = CACHE_EXPIRE_TIME) -> None:
+        if not mapping:
+            return
+        # MSET doesn't support the expiration, pipeline the SETs in one round trip instead
+        expire_ms = self._expire_ms(ex)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(self._key(key), pickle.dumps(value), px=expire_ms)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self.client.aclose()
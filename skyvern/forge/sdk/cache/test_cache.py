@@ -0,0 +1,171 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+from skyvern.forge.sdk.cache.local import LocalCache
+from skyvern.forge.sdk.cache.redis_cache import RedisCache
+
+
+class FakeRedisServer:
+    """
+    A tiny in-memory server speaking the subset of the Redis protocol used by RedisCache.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+        self.server: asyncio.Server | None = None
+        self.port = 0
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def _get(self, key: bytes) -> bytes | None:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expire_at = item
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    @staticmethod
+    def _bulk(value: bytes | None) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def _execute(self, command: list[bytes]) -> bytes:
+        name = command[0].upper()
+        if name == b"GET":
+            return self._bulk(self._get(command[1]))
+        if name == b"MGET":
+            return b"*%d\r\n" % (len(command) - 1) + b"".join(self._bulk(self._get(key)) for key in command[1:])
+        if name == b"SET":
+            expire_at = None
+            if len(command) >= 5 and command[3].upper() == b"PX":
+                expire_at = time.monotonic() + int(command[4]) / 1000
+            self.data[command[1]] = (command[2], expire_at)
+            return b"+OK\r\n"
+        if name == b"DEL":
+            deleted = sum(1 for key in command[1:] if self.data.pop(key, None) is not None)
+            return b":%d\r\n" % deleted
+        if name == b"PING":
+            return b"+PONG\r\n"
+        return b"+OK\r\n"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                assert line.startswith(b"*")
+                command = []
+                for _ in range(int(line[1:])):
+                    length = int((await reader.readline())[1:])
+                    command.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(self._execute(command))
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+@pytest_asyncio.fixture
+async def redis_cache() -> AsyncGenerator[RedisCache, None]:
+    server = FakeRedisServer()
+    await server.start()
+    cache = RedisCache(redis_url=f"redis://127.0.0.1:{server.port}/0")
+    yield cache
+    await cache.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_local_cache_honours_ttl() -> None:
+    cache = LocalCache()
+    await cache.set("short", "value", ex=timedelta(milliseconds=50))
+    await cache.set("forever", "value", ex=None)
+    assert await cache.get("short") == "value"
+    await asyncio.sleep(0.1)
+    assert await cache.get("short") is None
+    assert await cache.get("forever") == "value"
+    stats = cache.get_stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 1, 0)
+    # the expired key is dropped on the next write
+    await cache.set("other", "value")
+    assert cache.get_stats().evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_local_cache_counts_evictions() -> None:
+    cache = LocalCache(max_items=2)
+    await cache.mset({"a": 1, "b": 2, "c": 3})
+    assert await cache.mget(["a", "b", "c"]) == [None, 2, 3]
+    assert cache.get_stats().evictions == 1
+    await cache.delete("b")
+    assert await cache.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_is_single_flight() -> None:
+    cache = LocalCache()
+    calls = 0
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "loaded"
+
+    results = await asyncio.gather(*(cache.get_or_set("key", load) for _ in range(10)))
+    assert results == ["loaded"] * 10
+    assert calls == 1
+    assert await cache.get_or_set("key", load) == "loaded"
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_waiters_load_again_when_the_load_is_cancelled() -> None:
+    cache = LocalCache()
+    calls = 0
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return f"loaded {calls}"
+
+    loading = asyncio.create_task(cache.get_or_set("key", load))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(cache.get_or_set("key", load)) for _ in range(3)]
+    await asyncio.sleep(0)
+    loading.cancel()
+
+    assert await asyncio.gather(*waiters) == ["loaded 2"] * 3
+    assert loading.cancelled()
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_cache(redis_cache: RedisCache) -> None:
+    await redis_cache.set("key", {"shape": "circle"})
+    assert await redis_cache.get("key") == {"shape": "circle"}
+    assert await redis_cache.get("missing") is None
+
+    await redis_cache.mset({"a": 1, "b": 2}, ex=timedelta(milliseconds=50))
+    assert await redis_cache.mget(["a", "b", "missing"]) == [1, 2, None]
+    await asyncio.sleep(0.1)
+    assert await redis_cache.mget(["a", "b"]) == [None, None]
+
+    await redis_cache.delete("key")
+    assert await redis_cache.get("key") is None
+    stats = redis_cache.get_stats()
+    assert (stats.hits, stats.misses) == (3, 5)
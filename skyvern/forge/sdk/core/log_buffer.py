@@ -0,0 +1,93 @@
+"""
+The log entries of a run, indexed by the entities they belong to (step, task, workflow run block, workflow run and
+task v2) so the log artifacts of an entity are built from its own entries instead of a scan of the whole run.
+"""
+
+import json
+import tempfile
+from typing import IO, Any
+
+from skyvern.config import settings
+from skyvern.forge.skyvern_json_encoder import SkyvernJSONLogEncoder
+
+INDEXED_KEYS = ("step_id", "task_id", "workflow_run_block_id", "workflow_run_id", "task_v2_id")
+
+
+class LogBuffer:
+    """
+    Entries that don't belong to any entity are dropped since no log artifact would include them. Past max_entries,
+    the older half of the entries in memory is spilled to a temporary file and read back when an entity is saved.
+    Once an entity is released, its index is dropped and the entries no other entity refers to are freed.
+    """
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self.max_entries = max_entries if max_entries is not None else settings.LOG_BUFFER_MAX_ENTRIES
+        self._next_seq = 0
+        self._entries: dict[int, dict[str, Any]] = {}
+        # seq -> (offset, length) of the entry in the spill file
+        self._spilled: dict[int, tuple[int, int]] = {}
+        self._spill_file: IO[bytes] | None = None
+        self._index: dict[str, dict[str, list[int]]] = {key: {} for key in INDEXED_KEYS}
+        self._refs: dict[int, int] = {}
+        self._released: dict[str, set[str]] = {key: set() for key in INDEXED_KEYS}
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    @property
+    def spilled_count(self) -> int:
+        return len(self._spilled)
+
+    def append(self, entry: dict[str, Any]) -> None:
+        seq = self._next_seq
+        refs = 0
+        for key in INDEXED_KEYS:
+            entity_id = entry.get(key)
+            if not entity_id or entity_id in self._released[key]:
+                continue
+            self._index[key].setdefault(entity_id, []).append(seq)
+            refs += 1
+        if refs == 0:
+            return
+
+        self._next_seq += 1
+        self._refs[seq] = refs
+        self._entries[seq] = entry
+        if len(self._entries) > self.max_entries:
+            self._spill()
+
+    def get(self, key: str, entity_id: str) -> list[dict[str, Any]]:
+        return [self._load(seq) for seq in self._index[key].get(entity_id, [])]
+
+    def is_released(self, key: str, entity_id: str) -> bool:
+        return entity_id in self._released[key]
+
+    def release(self, key: str, entity_id: str) -> None:
+        """
+        Drop the index of an entity whose logs are final. Entries logged for it afterwards are not indexed anymore.
+        """
+        self._released[key].add(entity_id)
+        for seq in self._index[key].pop(entity_id, []):
+            self._refs[seq] -= 1
+            if self._refs[seq] == 0:
+                del self._refs[seq]
+                self._entries.pop(seq, None)
+                self._spilled.pop(seq, None)
+
+    def _spill(self) -> None:
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix="skyvern-log-")
+        self._spill_file.seek(0, 2)
+        to_spill = list(self._entries)[: len(self._entries) // 2 or 1]
+        for seq in to_spill:
+            data = json.dumps(self._entries.pop(seq), cls=SkyvernJSONLogEncoder).encode()
+            self._spilled[seq] = (self._spill_file.tell(), len(data))
+            self._spill_file.write(data)
+
+    def _load(self, seq: int) -> dict[str, Any]:
+        if seq in self._entries:
+            return self._entries[seq]
+        assert self._spill_file is not None
+        offset, length = self._spilled[seq]
+        self._spill_file.seek(offset)
+        return json.loads(self._spill_file.read(length))
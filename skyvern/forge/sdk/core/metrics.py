@@ -0,0 +1,25 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+LATENCY_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class Histogram(BaseModel):
+    # upper bounds of the buckets, values above the last one go to the overflow bucket
+    buckets: list[float]
+    counts: list[int] = Field(default_factory=list)
+    count: int = 0
+    total: float = 0
+    max: float = 0
+
+    def model_post_init(self, __context: Any) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
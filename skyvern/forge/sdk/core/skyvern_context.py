@@ -1,9 +1,15 @@
 from contextvars import ContextVar
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
 from playwright.async_api import Frame
 
+from skyvern.forge.sdk.core.log_buffer import LogBuffer
+
+if TYPE_CHECKING:
+    from skyvern.webeye.actions.write_buffer import ActionWriteBuffer
+
 
 @dataclass
 class SkyvernContext:
@@ -20,12 +26,17 @@ class SkyvernContext:
     tz_info: ZoneInfo | None = None
     run_id: str | None = None
     totp_codes: dict[str, str | None] = field(default_factory=dict)
-    log: list[dict] = field(default_factory=list)
+    log: LogBuffer = field(default_factory=LogBuffer)
     hashed_href_map: dict[str, str] = field(default_factory=dict)
     refresh_working_page: bool = False
     frame_index_map: dict[Frame, int] = field(default_factory=dict)
     dropped_css_svg_element_map: dict[str, bool] = field(default_factory=dict)
     max_screenshot_scrolls: int | None = None
+    # the post action capture of the run, see skyvern.forge.post_action_capture
+    last_scrolling_screenshot_ms: float | None = None
+    last_action_html_hash: str | None = None
+    # the actions of the running step, written when the step ends
+    action_write_buffer: "ActionWriteBuffer | None" = None
 
     def __repr__(self) -> str:
         return f"SkyvernContext(request_id={self.request_id}, organization_id={self.organization_id}, task_id={self.task_id}, workflow_id={self.workflow_id}, workflow_run_id={self.workflow_run_id}, task_v2_id={self.task_v2_id}, max_steps_override={self.max_steps_override}, run_id={self.run_id})"
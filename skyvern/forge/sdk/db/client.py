@@ -1,8 +1,10 @@
 import json
+from contextlib import AbstractAsyncContextManager
 from datetime import datetime, timedelta
 from typing import Any, List, Sequence
 
 import structlog
+from pydantic import BaseModel
 from sqlalchemy import and_, delete, distinct, func, or_, pool, select, tuple_, update
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
@@ -12,8 +14,10 @@ from skyvern.exceptions import WorkflowParameterNotFound, WorkflowRunNotFound
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType
 from skyvern.forge.sdk.db.enums import OrganizationAuthTokenType, TaskType
 from skyvern.forge.sdk.db.exceptions import NotFoundError
+from skyvern.forge.sdk.db.instrumentation import DBMetrics, instrument_db_methods, instrument_engine
 from skyvern.forge.sdk.db.models import (
     ActionModel,
+    ActionPlanModel,
     AISuggestionModel,
     ArtifactModel,
     AWSSecretParameterModel,
@@ -42,6 +46,7 @@ from skyvern.forge.sdk.db.models import (
     WorkflowRunOutputParameterModel,
     WorkflowRunParameterModel,
 )
+from skyvern.forge.sdk.db.session import AgentDBSessionMaker, UnitOfWork
 from skyvern.forge.sdk.db.utils import (
     _custom_json_serializer,
     convert_to_artifact,
@@ -63,6 +68,14 @@ from skyvern.forge.sdk.db.utils import (
 )
 from skyvern.forge.sdk.log_artifacts import save_workflow_run_logs
 from skyvern.forge.sdk.models import Step, StepStatus
+from skyvern.forge.sdk.pubsub.base import (
+    browser_session_topic,
+    runnable_browser_session_topic,
+    task_topic,
+    workflow_run_topic,
+)
+from skyvern.forge.sdk.pubsub.factory import PubSubFactory
+from skyvern.forge.sdk.schemas.action_plans import ActionPlan
 from skyvern.forge.sdk.schemas.ai_suggestions import AISuggestion
 from skyvern.forge.sdk.schemas.credentials import Credential, CredentialType
 from skyvern.forge.sdk.schemas.organization_bitwarden_collections import OrganizationBitwardenCollection
@@ -103,11 +116,35 @@ LOG = structlog.get_logger()
 DB_CONNECT_ARGS: dict[str, Any] = {}
 
 if "postgresql+psycopg" in settings.DATABASE_STRING:
-    DB_CONNECT_ARGS = {"options": f"-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT_MS}"}
+    DB_CONNECT_ARGS = {
+        "options": f"-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT_MS}",
+        "prepare_threshold": settings.DATABASE_PREPARE_THRESHOLD,
+    }
 elif "postgresql+asyncpg" in settings.DATABASE_STRING:
-    DB_CONNECT_ARGS = {"server_settings": {"statement_timeout": str(settings.DATABASE_STATEMENT_TIMEOUT_MS)}}
+    DB_CONNECT_ARGS = {
+        "server_settings": {"statement_timeout": str(settings.DATABASE_STATEMENT_TIMEOUT_MS)},
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+    }
+
+
+def get_engine_pool_args(database_string: str) -> dict[str, Any]:
+    if settings.DISABLE_CONNECTION_POOL:
+        return {"poolclass": pool.NullPool}
+    pool_args: dict[str, Any] = {
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+    }
+    if not database_string.startswith("sqlite"):
+        # sqlite doesn't use a QueuePool
+        pool_args.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        )
+    return pool_args
 
 
+@instrument_db_methods
 class AgentDB:
     def __init__(self, database_string: str, debug_enabled: bool = False, db_engine: AsyncEngine | None = None) -> None:
         super().__init__()
@@ -117,12 +154,43 @@ class AgentDB:
                 database_string,
                 json_serializer=_custom_json_serializer,
                 connect_args=DB_CONNECT_ARGS,
-                poolclass=pool.NullPool if settings.DISABLE_CONNECTION_POOL else None,
+                **get_engine_pool_args(database_string),
             )
             if db_engine is None
             else db_engine
         )
-        self.Session = async_sessionmaker(bind=self.engine)
+        self.metrics = DBMetrics()
+        instrument_engine(self.engine, self.metrics, settings.DATABASE_SLOW_QUERY_THRESHOLD_MS)
+        self.Session = AgentDBSessionMaker(async_sessionmaker(bind=self.engine))
+
+    def unit_of_work(self) -> AbstractAsyncContextManager[UnitOfWork]:
+        """
+        Batch the writes of the block into one transaction:
+
+            async with app.DATABASE.unit_of_work():
+                await app.DATABASE.update_step(...)
+                await app.DATABASE.update_task(...)
+
+        The AgentDB calls made by the current task share one session, their commits only flush and the transaction
+        is committed when the block exits, or rolled back if it raises.
+        """
+        return self.Session.unit_of_work()
+
+    def get_metrics(self) -> DBMetrics:
+        return self.metrics.model_copy(deep=True)
+
+    async def _publish(self, topics: list[str], model: BaseModel) -> None:
+        pubsub = PubSubFactory.get_pubsub()
+        await self.Session.after_commit(lambda: pubsub.publish_model(topics, model))
+
+    async def _publish_persistent_browser_session(
+        self, browser_session: PersistentBrowserSession, previous_runnable_id: str | None = None
+    ) -> None:
+        topics = [browser_session_topic(browser_session.persistent_browser_session_id)]
+        for runnable_id in {browser_session.runnable_id, previous_runnable_id}:
+            if runnable_id:
+                topics.append(runnable_browser_session_topic(runnable_id))
+        await self._publish(topics, browser_session)
 
     async def create_task(
         self,
@@ -654,6 +722,7 @@ class AgentDB:
                     updated_task = await self.get_task(task_id, organization_id=organization_id)
                     if not updated_task:
                         raise NotFoundError("Task not found")
+                    await self._publish([task_topic(task_id)], updated_task)
                     return updated_task
                 else:
                     raise NotFoundError("Task not found")
@@ -1605,8 +1674,10 @@ class AgentDB:
                     workflow_run.finished_at = datetime.utcnow()
                 await session.commit()
                 await session.refresh(workflow_run)
-                await save_workflow_run_logs(workflow_run_id)
-                return convert_to_workflow_run(workflow_run)
+                await save_workflow_run_logs(workflow_run_id, release=status.is_final())
+                updated_workflow_run = convert_to_workflow_run(workflow_run)
+                await self._publish([workflow_run_topic(workflow_run_id)], updated_workflow_run)
+                return updated_workflow_run
             else:
                 raise WorkflowRunNotFound(workflow_run_id)
 
@@ -2368,32 +2439,44 @@ class AgentDB:
             await session.refresh(new_totp_code)
             return TOTPCode.model_validate(new_totp_code)
 
+    @staticmethod
+    def _to_action_model(action: Action) -> ActionModel:
+        return ActionModel(
+            action_type=action.action_type,
+            source_action_id=action.source_action_id,
+            organization_id=action.organization_id,
+            workflow_run_id=action.workflow_run_id,
+            task_id=action.task_id,
+            step_id=action.step_id,
+            step_order=action.step_order,
+            action_order=action.action_order,
+            status=action.status,
+            reasoning=action.reasoning,
+            intention=action.intention,
+            response=action.response,
+            element_id=action.element_id,
+            skyvern_element_hash=action.skyvern_element_hash,
+            skyvern_element_data=action.skyvern_element_data,
+            action_json=action.model_dump(),
+            confidence_float=action.confidence_float,
+        )
+
     async def create_action(self, action: Action) -> Action:
         async with self.Session() as session:
-            new_action = ActionModel(
-                action_type=action.action_type,
-                source_action_id=action.source_action_id,
-                organization_id=action.organization_id,
-                workflow_run_id=action.workflow_run_id,
-                task_id=action.task_id,
-                step_id=action.step_id,
-                step_order=action.step_order,
-                action_order=action.action_order,
-                status=action.status,
-                reasoning=action.reasoning,
-                intention=action.intention,
-                response=action.response,
-                element_id=action.element_id,
-                skyvern_element_hash=action.skyvern_element_hash,
-                skyvern_element_data=action.skyvern_element_data,
-                action_json=action.model_dump(),
-                confidence_float=action.confidence_float,
-            )
+            new_action = self._to_action_model(action)
             session.add(new_action)
             await session.commit()
             await session.refresh(new_action)
             return Action.model_validate(new_action)
 
+    async def create_actions(self, actions: list[Action]) -> None:
+        """
+        Insert the actions in one transaction.
+        """
+        async with self.Session() as session:
+            session.add_all([self._to_action_model(action) for action in actions])
+            await session.commit()
+
     async def retrieve_action_plan(self, task: Task) -> list[Action]:
         async with self.Session() as session:
             subquery = (
@@ -2415,6 +2498,60 @@ class AgentDB:
             actions = (await session.scalars(query)).all()
             return [Action.model_validate(action) for action in actions]
 
+    async def get_action_plan(self, organization_id: str, url_pattern_hash: str, goal_hash: str) -> ActionPlan | None:
+        async with self.Session() as session:
+            action_plan = (
+                await session.scalars(
+                    select(ActionPlanModel)
+                    .filter_by(organization_id=organization_id)
+                    .filter_by(url_pattern_hash=url_pattern_hash)
+                    .filter_by(goal_hash=goal_hash)
+                )
+            ).first()
+            return ActionPlan.model_validate(action_plan) if action_plan else None
+
+    async def upsert_action_plan(
+        self,
+        organization_id: str,
+        url_pattern: str,
+        url_pattern_hash: str,
+        goal_hash: str,
+        task_id: str,
+        actions: list[Action],
+    ) -> None:
+        """
+        Store the actions of a task as the action plan of its url pattern and goal, replacing the previous plan.
+        """
+        element_hashes = [action.skyvern_element_hash for action in actions]
+        actions_json = [action.model_dump(mode="json") for action in actions]
+        async with self.Session() as session:
+            action_plan = (
+                await session.scalars(
+                    select(ActionPlanModel)
+                    .filter_by(organization_id=organization_id)
+                    .filter_by(url_pattern_hash=url_pattern_hash)
+                    .filter_by(goal_hash=goal_hash)
+                )
+            ).first()
+            if action_plan:
+                action_plan.url_pattern = url_pattern
+                action_plan.task_id = task_id
+                action_plan.element_hashes = element_hashes
+                action_plan.actions = actions_json
+            else:
+                session.add(
+                    ActionPlanModel(
+                        organization_id=organization_id,
+                        url_pattern=url_pattern,
+                        url_pattern_hash=url_pattern_hash,
+                        goal_hash=goal_hash,
+                        task_id=task_id,
+                        element_hashes=element_hashes,
+                        actions=actions_json,
+                    )
+                )
+            await session.commit()
+
     async def get_previous_actions_for_task(self, task_id: str) -> list[Action]:
         async with self.Session() as session:
             query = (
@@ -2998,7 +3135,9 @@ class AgentDB:
                 session.add(browser_session)
                 await session.commit()
                 await session.refresh(browser_session)
-                return PersistentBrowserSession.model_validate(browser_session)
+                created_browser_session = PersistentBrowserSession.model_validate(browser_session)
+                await self._publish_persistent_browser_session(created_browser_session)
+                return created_browser_session
         except SQLAlchemyError:
             LOG.error("SQLAlchemyError", exc_info=True)
             raise
@@ -3033,6 +3172,9 @@ class AgentDB:
                     persistent_browser_session.started_at = datetime.utcnow()
                     await session.commit()
                     await session.refresh(persistent_browser_session)
+                    await self._publish_persistent_browser_session(
+                        PersistentBrowserSession.model_validate(persistent_browser_session)
+                    )
                 else:
                     raise NotFoundError(f"PersistentBrowserSession {browser_session_id} not found")
         except NotFoundError:
@@ -3060,6 +3202,9 @@ class AgentDB:
                     persistent_browser_session.deleted_at = datetime.utcnow()
                     await session.commit()
                     await session.refresh(persistent_browser_session)
+                    await self._publish_persistent_browser_session(
+                        PersistentBrowserSession.model_validate(persistent_browser_session)
+                    )
                 else:
                     raise NotFoundError(f"PersistentBrowserSession {session_id} not found")
         except NotFoundError:
@@ -3091,6 +3236,9 @@ class AgentDB:
                     persistent_browser_session.runnable_id = runnable_id
                     await session.commit()
                     await session.refresh(persistent_browser_session)
+                    await self._publish_persistent_browser_session(
+                        PersistentBrowserSession.model_validate(persistent_browser_session)
+                    )
                 else:
                     raise NotFoundError(f"PersistentBrowserSession {session_id} not found")
         except NotFoundError:
@@ -3120,11 +3268,14 @@ class AgentDB:
                     )
                 ).first()
                 if persistent_browser_session:
+                    previous_runnable_id = persistent_browser_session.runnable_id
                     persistent_browser_session.runnable_type = None
                     persistent_browser_session.runnable_id = None
                     await session.commit()
                     await session.refresh(persistent_browser_session)
-                    return PersistentBrowserSession.model_validate(persistent_browser_session)
+                    released_browser_session = PersistentBrowserSession.model_validate(persistent_browser_session)
+                    await self._publish_persistent_browser_session(released_browser_session, previous_runnable_id)
+                    return released_browser_session
                 else:
                     raise NotFoundError(f"PersistentBrowserSession {session_id} not found")
         except SQLAlchemyError:
@@ -3153,7 +3304,9 @@ class AgentDB:
                     persistent_browser_session.completed_at = datetime.utcnow()
                     await session.commit()
                     await session.refresh(persistent_browser_session)
-                    return PersistentBrowserSession.model_validate(persistent_browser_session)
+                    closed_browser_session = PersistentBrowserSession.model_validate(persistent_browser_session)
+                    await self._publish_persistent_browser_session(closed_browser_session)
+                    return closed_browser_session
                 raise NotFoundError(f"PersistentBrowserSession {session_id} not found")
         except NotFoundError:
             LOG.error("NotFoundError", exc_info=True)
@@ -28,6 +28,7 @@ _worker_hash = None
 
 # prefix
 ACTION_PREFIX = "act"
+ACTION_PLAN_PREFIX = "ap"
 AI_SUGGESTION_PREFIX = "as"
 ARTIFACT_PREFIX = "a"
 AWS_SECRET_PARAMETER_PREFIX = "asp"
@@ -182,6 +183,11 @@ def generate_task_run_id() -> str:
     return f"{TASK_RUN_PREFIX}_{int_id}"
 
 
+def generate_action_plan_id() -> str:
+    int_id = generate_id()
+    return f"{ACTION_PLAN_PREFIX}_{int_id}"
+
+
 def generate_credential_parameter_id() -> str:
     int_id = generate_id()
     return f"{CREDENTIAL_PARAMETER_PREFIX}_{int_id}"
@@ -0,0 +1,131 @@
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, TypeVar
+
+import structlog
+from pydantic import BaseModel, Field
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from skyvern.forge.sdk.core.metrics import LATENCY_BUCKETS_MS, Histogram
+
+LOG = structlog.get_logger()
+
+ROW_COUNT_BUCKETS = [0, 1, 10, 100, 1000, 10000]
+SLOW_QUERY_STATEMENT_MAX_LENGTH = 2000
+
+_current_db_method: ContextVar[str | None] = ContextVar("current_db_method", default=None)
+
+T = TypeVar("T")
+
+
+class DBMethodMetrics(BaseModel):
+    calls: int = 0
+    errors: int = 0
+    queries: int = 0
+    slow_queries: int = 0
+    latency_ms: Histogram = Field(default_factory=lambda: Histogram(buckets=LATENCY_BUCKETS_MS))
+    # number of rows returned by the method
+    row_count: Histogram = Field(default_factory=lambda: Histogram(buckets=ROW_COUNT_BUCKETS))
+
+
+class DBMetrics(BaseModel):
+    methods: dict[str, DBMethodMetrics] = Field(default_factory=dict)
+
+    def get_method_metrics(self, method: str) -> DBMethodMetrics:
+        if method not in self.methods:
+            self.methods[method] = DBMethodMetrics()
+        return self.methods[method]
+
+
+def _count_rows(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple, set, dict)):
+        return len(result)
+    return 1
+
+
+def instrument_db_methods(cls: type[T]) -> type[T]:
+    """
+    Record the latency and the returned row count of every public coroutine method of the class in self.metrics,
+    and attribute the queries they run to them.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _instrument_db_method(name, method))
+    return cls
+
+
+def _instrument_db_method(name: str, method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        metrics = self.metrics.get_method_metrics(name)
+        metrics.calls += 1
+        token = _current_db_method.set(name)
+        start = time.perf_counter()
+        try:
+            result = await method(self, *args, **kwargs)
+        except BaseException:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.latency_ms.observe((time.perf_counter() - start) * 1000)
+            _current_db_method.reset(token)
+        metrics.row_count.observe(_count_rows(result))
+        return result
+
+    return wrapper
+
+
+def instrument_engine(engine: AsyncEngine, metrics: DBMetrics, slow_query_threshold_ms: int | None) -> None:
+    """
+    Count the queries of each AgentDB method and log the ones slower than slow_query_threshold_ms.
+    """
+
+    def before_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def after_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        duration_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        method = _current_db_method.get()
+        method_metrics = metrics.get_method_metrics(method or "unknown")
+        method_metrics.queries += 1
+        if slow_query_threshold_ms is None or duration_ms < slow_query_threshold_ms:
+            return
+        method_metrics.slow_queries += 1
+        LOG.warning(
+            "Slow database query",
+            db_method=method,
+            duration_ms=duration_ms,
+            rowcount=cursor.rowcount,
+            statement=statement[:SLOW_QUERY_STATEMENT_MAX_LENGTH],
+        )
+
+    def handle_error(exception_context: Any) -> None:
+        # the query failed, drop its start time
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
@@ -21,6 +21,7 @@ from sqlalchemy.orm import DeclarativeBase
 from skyvern.forge.sdk.db.enums import OrganizationAuthTokenType, TaskType
 from skyvern.forge.sdk.db.id import (
     generate_action_id,
+    generate_action_plan_id,
     generate_ai_suggestion_id,
     generate_artifact_id,
     generate_aws_secret_parameter_id,
@@ -181,6 +182,8 @@ class ArtifactModel(Base):
     __table_args__ = (
         Index("org_task_step_index", "organization_id", "task_id", "step_id"),
         Index("artifacts_org_created_at_index", "organization_id", "created_at"),
+        # content-addressed artifacts share the uri, see BaseStorage.build_content_addressed_uri
+        Index("artifacts_uri_index", "uri"),
     )
 
     artifact_id = Column(String, primary_key=True, default=generate_artifact_id)
@@ -724,6 +727,29 @@ class TaskRunModel(Base):
     modified_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, nullable=False)
 
 
+class ActionPlanModel(Base):
+    """
+    The actions of the last completed task for a url pattern and a navigation goal, reused by the tasks with the same
+    pattern and goal when their block caches actions.
+    """
+
+    __tablename__ = "action_plans"
+    __table_args__ = (
+        Index("action_plan_org_url_goal_index", "organization_id", "url_pattern_hash", "goal_hash", unique=True),
+    )
+
+    action_plan_id = Column(String, primary_key=True, default=generate_action_plan_id)
+    organization_id = Column(String, nullable=False)
+    url_pattern = Column(String, nullable=False)
+    url_pattern_hash = Column(String, nullable=False)
+    goal_hash = Column(String, nullable=False)
+    task_id = Column(String, nullable=False)
+    element_hashes = Column(JSON, nullable=False)
+    actions = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    modified_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, nullable=False)
+
+
 class OrganizationBitwardenCollectionModel(Base):
     __tablename__ = "organization_bitwarden_collections"
 
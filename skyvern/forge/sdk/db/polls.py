@@ -3,6 +3,9 @@ import asyncio
 from structlog import get_logger
 
 from skyvern.forge.sdk.db.client import AgentDB
+from skyvern.forge.sdk.pubsub.base import browser_session_topic
+from skyvern.forge.sdk.pubsub.factory import PubSubFactory
+from skyvern.forge.sdk.pubsub.watcher import StateWatcher
 from skyvern.forge.sdk.schemas.persistent_browser_sessions import PersistentBrowserSession
 
 LOG = get_logger(__name__)
@@ -13,7 +16,7 @@ async def wait_on_persistent_browser_address(
     session_id: str,
     organization_id: str,
     timeout: int = 600,
-    poll_interval: float = 2,
+    poll_interval: float | None = None,
 ) -> str | None:
     persistent_browser_session = await await_browser_session(db, session_id, organization_id, timeout, poll_interval)
     return persistent_browser_session.browser_address if persistent_browser_session else None
@@ -24,25 +27,36 @@ async def await_browser_session(
     session_id: str,
     organization_id: str,
     timeout: int = 600,
-    poll_interval: float = 2,
+    poll_interval: float | None = None,
 ) -> PersistentBrowserSession | None:
+    """
+    Wait for the browser address of the session to be published. The session is only re-read from the database
+    when no update was published for poll_interval seconds (PUBSUB_FALLBACK_REFRESH_SECONDS by default).
+    """
     try:
         async with asyncio.timeout(timeout):
-            while True:
-                persistent_browser_session = await db.get_persistent_browser_session(session_id, organization_id)
-                if persistent_browser_session is None:
-                    raise Exception(f"Persistent browser session not found for {session_id}")
-
-                LOG.info(
-                    "Checking browser address",
-                    session_id=session_id,
-                    address=persistent_browser_session.browser_address,
+            async with PubSubFactory.get_pubsub().subscribe(browser_session_topic(session_id)) as subscription:
+                watcher = StateWatcher(
+                    subscription,
+                    PersistentBrowserSession,
+                    lambda: db.get_persistent_browser_session(session_id, organization_id),
+                    refresh_seconds=poll_interval,
                 )
+                persistent_browser_session = await watcher.refresh()
+                while True:
+                    if persistent_browser_session is None or persistent_browser_session.deleted_at is not None:
+                        raise Exception(f"Persistent browser session not found for {session_id}")
 
-                if persistent_browser_session.browser_address:
-                    return persistent_browser_session
+                    LOG.info(
+                        "Checking browser address",
+                        session_id=session_id,
+                        address=persistent_browser_session.browser_address,
+                    )
 
-                await asyncio.sleep(poll_interval)
+                    if persistent_browser_session.browser_address:
+                        return persistent_browser_session
+
+                    persistent_browser_session = await watcher.wait(timeout=watcher.refresh_seconds)
     except asyncio.TimeoutError:
         LOG.warning(f"Browser address not found for persistent browser session {session_id}")
 
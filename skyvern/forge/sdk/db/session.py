@@ -0,0 +1,126 @@
+import asyncio
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from contextvars import ContextVar
+from types import TracebackType
+from typing import Any, AsyncIterator, Awaitable, Callable, cast
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+LOG = structlog.get_logger()
+
+
+class UnitOfWork:
+    def __init__(self, session_maker: "AgentDBSessionMaker", session: AsyncSession) -> None:
+        self.session_maker = session_maker
+        self.session = session
+        # only the task that opened the unit of work joins it, tasks spawned inside it use their own sessions
+        self.owner = asyncio.current_task()
+        self.active = True
+        # number of commits turned into flushes
+        self.flushes = 0
+        self.after_commit_callbacks: list[Callable[[], Awaitable[None]]] = []
+
+
+_current_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar("current_unit_of_work", default=None)
+
+
+class _UnitOfWorkSession:
+    """
+    The session of the unit of work as seen by an AgentDB method: commit() only flushes, the unit of work commits
+    once at the end.
+    """
+
+    def __init__(self, unit_of_work: UnitOfWork) -> None:
+        self._unit_of_work = unit_of_work
+
+    async def commit(self) -> None:
+        self._unit_of_work.flushes += 1
+        await self._unit_of_work.session.flush()
+
+    async def close(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._unit_of_work.session, name)
+
+
+class _UnitOfWorkSessionContext:
+    def __init__(self, unit_of_work: UnitOfWork) -> None:
+        self._unit_of_work = unit_of_work
+
+    async def __aenter__(self) -> AsyncSession:
+        return cast(AsyncSession, _UnitOfWorkSession(self._unit_of_work))
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        # errors propagate to the unit of work, which rolls back
+        return None
+
+
+class AgentDBSessionMaker:
+    """
+    Creates the sessions of the AgentDB methods. Inside unit_of_work() the methods called by the same task share one
+    session and one transaction instead of checking out a connection per query.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        self.session_maker = session_maker
+
+    def __call__(self) -> AbstractAsyncContextManager[AsyncSession]:
+        unit_of_work = self._get_current_unit_of_work()
+        if unit_of_work is not None:
+            return _UnitOfWorkSessionContext(unit_of_work)
+        return self.session_maker()
+
+    def _get_current_unit_of_work(self) -> UnitOfWork | None:
+        unit_of_work = _current_unit_of_work.get()
+        if (
+            unit_of_work is None
+            or not unit_of_work.active
+            or unit_of_work.session_maker is not self
+            or unit_of_work.owner is not asyncio.current_task()
+        ):
+            return None
+        return unit_of_work
+
+    async def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        Run the callback once the current writes are committed: now, or when the unit of work commits.
+        """
+        unit_of_work = self._get_current_unit_of_work()
+        if unit_of_work is not None:
+            unit_of_work.after_commit_callbacks.append(callback)
+            return
+        await callback()
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[UnitOfWork]:
+        """
+        Run the AgentDB calls of the block in one transaction, committed when the block exits and rolled back if it
+        raises. A nested unit of work joins the outer one.
+        """
+        current = self._get_current_unit_of_work()
+        if current is not None:
+            yield current
+            return
+
+        async with self.session_maker() as session:
+            unit_of_work = UnitOfWork(self, session)
+            token = _current_unit_of_work.set(unit_of_work)
+            try:
+                yield unit_of_work
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+            finally:
+                unit_of_work.active = False
+                _current_unit_of_work.reset(token)
+
+        for callback in unit_of_work.after_commit_callbacks:
+            await callback()
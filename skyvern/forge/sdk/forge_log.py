@@ -72,6 +72,9 @@ def skyvern_logs_processor(logger: logging.Logger, method_name: str, event_dict:
     """
     if method_name not in ["info", "warning", "error", "critical", "exception"]:
         return event_dict
+    # the buffer only feeds the log artifacts
+    if not settings.ENABLE_LOG_ARTIFACTS:
+        return event_dict
 
     context = skyvern_context.current()
     if context:
@@ -27,15 +27,33 @@ def primary_key_from_log_entity_type(log_entity_type: LogEntityType) -> str:
         raise ValueError(f"Invalid log entity type: {log_entity_type}")
 
 
-async def save_step_logs(step_id: str) -> None:
+def _collect_entity_log(key: str, entity_id: str) -> tuple[list[dict] | None, str | None]:
+    """
+    Return the log entries of the entity from the run's log buffer, or None if its final logs were already saved.
+    """
+    context = skyvern_context.ensure_context()
+    if context.log.is_released(key, entity_id):
+        return None, context.organization_id
+    return context.log.get(key, entity_id), context.organization_id
+
+
+def _release_entity_log(key: str, entity_id: str) -> None:
+    context = skyvern_context.current()
+    if context:
+        context.log.release(key, entity_id)
+
+
+async def save_step_logs(step_id: str, release: bool = False) -> None:
+    """
+    Save the log artifacts of the step. With release, the logs are final: the step's entries are dropped from the
+    buffer once saved.
+    """
     if not settings.ENABLE_LOG_ARTIFACTS:
         return
 
-    context = skyvern_context.ensure_context()
-    log = context.log
-    organization_id = context.organization_id
-
-    current_step_log = [entry for entry in log if entry.get("step_id", "") == step_id]
+    current_step_log, organization_id = _collect_entity_log("step_id", step_id)
+    if current_step_log is None:
+        return
 
     await _save_log_artifacts(
         log=current_step_log,
@@ -44,17 +62,17 @@ async def save_step_logs(step_id: str) -> None:
         organization_id=organization_id,
         step_id=step_id,
     )
+    if release:
+        _release_entity_log("step_id", step_id)
 
 
-async def save_task_logs(task_id: str) -> None:
+async def save_task_logs(task_id: str, release: bool = False) -> None:
     if not settings.ENABLE_LOG_ARTIFACTS:
         return
 
-    context = skyvern_context.ensure_context()
-    log = context.log
-    organization_id = context.organization_id
-
-    current_task_log = [entry for entry in log if entry.get("task_id", "") == task_id]
+    current_task_log, organization_id = _collect_entity_log("task_id", task_id)
+    if current_task_log is None:
+        return
 
     await _save_log_artifacts(
         log=current_task_log,
@@ -63,17 +81,17 @@ async def save_task_logs(task_id: str) -> None:
         organization_id=organization_id,
         task_id=task_id,
     )
+    if release:
+        _release_entity_log("task_id", task_id)
 
 
-async def save_workflow_run_logs(workflow_run_id: str) -> None:
+async def save_workflow_run_logs(workflow_run_id: str, release: bool = False) -> None:
     if not settings.ENABLE_LOG_ARTIFACTS:
         return
 
-    context = skyvern_context.ensure_context()
-    log = context.log
-    organization_id = context.organization_id
-
-    current_workflow_run_log = [entry for entry in log if entry.get("workflow_run_id", "") == workflow_run_id]
+    current_workflow_run_log, organization_id = _collect_entity_log("workflow_run_id", workflow_run_id)
+    if current_workflow_run_log is None:
+        return
 
     await _save_log_artifacts(
         log=current_workflow_run_log,
@@ -82,18 +100,19 @@ async def save_workflow_run_logs(workflow_run_id: str) -> None:
         organization_id=organization_id,
         workflow_run_id=workflow_run_id,
     )
+    if release:
+        _release_entity_log("workflow_run_id", workflow_run_id)
 
 
-async def save_workflow_run_block_logs(workflow_run_block_id: str) -> None:
+async def save_workflow_run_block_logs(workflow_run_block_id: str, release: bool = False) -> None:
     if not settings.ENABLE_LOG_ARTIFACTS:
         return
 
-    context = skyvern_context.ensure_context()
-    log = context.log
-    organization_id = context.organization_id
-    current_workflow_run_block_log = [
-        entry for entry in log if entry.get("workflow_run_block_id", "") == workflow_run_block_id
-    ]
+    current_workflow_run_block_log, organization_id = _collect_entity_log(
+        "workflow_run_block_id", workflow_run_block_id
+    )
+    if current_workflow_run_block_log is None:
+        return
 
     await _save_log_artifacts(
         log=current_workflow_run_block_log,
@@ -102,6 +121,8 @@ async def save_workflow_run_block_logs(workflow_run_block_id: str) -> None:
         organization_id=organization_id,
         workflow_run_block_id=workflow_run_block_id,
     )
+    if release:
+        _release_entity_log("workflow_run_block_id", workflow_run_block_id)
 
 
 async def _save_log_artifacts(
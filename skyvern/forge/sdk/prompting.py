@@ -20,17 +20,51 @@ class PromptEngine:
 
 import glob
 import os
+import time
 from difflib import get_close_matches
 from pathlib import Path
 from typing import Any, List
 
 import structlog
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, nodes
+from pydantic import BaseModel, Field
 
+from skyvern.config import settings
 from skyvern.constants import SKYVERN_DIR
+from skyvern.forge.sdk.core.metrics import LATENCY_BUCKETS_MS, Histogram
 
 LOG = structlog.get_logger()
 
+OUTPUT_CHARS_BUCKETS = [1000, 5000, 10000, 50000, 100000, 250000, 500000, 1000000]
+
+
+class PromptRenderMetrics(BaseModel):
+    renders: int = 0
+    errors: int = 0
+    render_ms: Histogram = Field(default_factory=lambda: Histogram(buckets=LATENCY_BUCKETS_MS))
+    output_chars: Histogram = Field(default_factory=lambda: Histogram(buckets=OUTPUT_CHARS_BUCKETS))
+
+
+class PromptParts(BaseModel):
+    # the rendered prompt up to the first variable of the template, the same for every render
+    static_prefix: str
+    dynamic_suffix: str
+
+
+def get_static_prefix(env: Environment, source: str) -> str:
+    """
+    The text the template outputs before anything that depends on its variables.
+    """
+    prefix: list[str] = []
+    for node in env.parse(source).body:
+        if not isinstance(node, nodes.Output):
+            break
+        for child in node.nodes:
+            if not isinstance(child, nodes.TemplateData):
+                return "".join(prefix)
+            prefix.append(child.data)
+    return "".join(prefix)
+
 
 class PromptEngine:
     """
@@ -57,7 +91,14 @@ class PromptEngine:
 
             self.model = self.get_closest_match(self.model, model_names)
 
-            self.env = Environment(loader=FileSystemLoader(models_dir))
+            self.env = Environment(
+                loader=FileSystemLoader(models_dir),
+                bytecode_cache=FileSystemBytecodeCache() if settings.PROMPT_BYTECODE_CACHE_ENABLED else None,
+                # the templates ship with the code, only watch them for changes while developing
+                auto_reload=settings.DEBUG_MODE,
+            )
+            self.static_prefixes: dict[str, str] = {}
+            self.metrics: dict[str, PromptRenderMetrics] = {}
         except Exception:
             LOG.error("Error initializing PromptEngine.", model=model, exc_info=True)
             raise
@@ -86,6 +127,80 @@ class PromptEngine:
             )
             raise
 
+    def precompile(self) -> int:
+        """
+        Compile all the templates of the model and find their static prefixes, so the first render of each template
+        doesn't pay for it. The compiled templates are also written to the bytecode cache for the next processes.
+
+        Returns:
+            int: The number of compiled templates.
+        """
+        start = time.monotonic()
+        template_names = self.env.list_templates(
+            filter_func=lambda name: name.startswith(f"{self.model}/") and name.endswith(".j2")
+        )
+        for template_name in template_names:
+            self.env.get_template(template_name)
+            self.get_static_prefix(template_name.removeprefix(f"{self.model}/").removesuffix(".j2"))
+        LOG.info(
+            "Precompiled the prompt templates",
+            model=self.model,
+            templates=len(template_names),
+            duration_ms=(time.monotonic() - start) * 1000,
+        )
+        return len(template_names)
+
+    def get_static_prefix(self, template: str) -> str:
+        """
+        Get the part of the template that renders the same whatever the arguments.
+
+        Args:
+            template (str): The name of the template.
+
+        Returns:
+            str: The static prefix of the template.
+        """
+        if template not in self.static_prefixes:
+            assert self.env.loader is not None
+            source, _, _ = self.env.loader.get_source(self.env, f"{self.model}/{template}.j2")
+            self.static_prefixes[template] = get_static_prefix(self.env, source)
+        return self.static_prefixes[template]
+
+    def find_static_prefix(self, prompt: str) -> str:
+        """
+        Find the longest static prefix of the known templates the rendered prompt starts with, e.g. to put a prompt
+        cache breakpoint after it.
+
+        Args:
+            prompt (str): A rendered prompt.
+
+        Returns:
+            str: The static prefix, empty if the prompt doesn't come from a known template.
+        """
+        return max(
+            (prefix for prefix in self.static_prefixes.values() if prefix and prompt.startswith(prefix)),
+            key=len,
+            default="",
+        )
+
+    def get_render_metrics(self) -> dict[str, PromptRenderMetrics]:
+        return {template: metrics.model_copy(deep=True) for template, metrics in self.metrics.items()}
+
+    def load_prompt_parts(self, template: str, **kwargs: Any) -> PromptParts:
+        """
+        Load and populate the specified template, split into its static prefix and the rest.
+
+        Args:
+            template (str): The name of the template to load.
+            **kwargs: The arguments to populate the template with.
+
+        Returns:
+            PromptParts: The populated template.
+        """
+        prompt = self.load_prompt(template, **kwargs)
+        static_prefix = self.get_static_prefix(template)
+        return PromptParts(static_prefix=static_prefix, dynamic_suffix=prompt.removeprefix(static_prefix))
+
     def load_prompt(self, template: str, **kwargs: Any) -> str:
         """
         Load and populate the specified template.
@@ -97,11 +212,18 @@ class PromptEngine:
         Returns:
             str: The populated template.
         """
+        metrics = self.metrics.setdefault(template, PromptRenderMetrics())
+        start = time.monotonic()
         try:
             template = "/".join([self.model, template])
             jinja_template = self.env.get_template(f"{template}.j2")
-            return jinja_template.render(**kwargs)
+            prompt = jinja_template.render(**kwargs)
+            metrics.renders += 1
+            metrics.render_ms.observe((time.monotonic() - start) * 1000)
+            metrics.output_chars.observe(len(prompt))
+            return prompt
         except Exception:
+            metrics.errors += 1
             LOG.error(
                 "Failed to load prompt.",
                 template=template,
@@ -0,0 +1,196 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+from types import TracebackType
+from typing import Any, AsyncIterator
+
+import structlog
+from pydantic import BaseModel, Field
+
+LOG = structlog.get_logger()
+
+MAX_PENDING_EVENTS = 100
+
+
+def task_topic(task_id: str) -> str:
+    return f"task:{task_id}"
+
+
+def workflow_run_topic(workflow_run_id: str) -> str:
+    return f"workflow_run:{workflow_run_id}"
+
+
+def browser_session_topic(browser_session_id: str) -> str:
+    return f"browser_session:{browser_session_id}"
+
+
+def runnable_browser_session_topic(runnable_id: str) -> str:
+    """
+    The browser session occupied by a task or a workflow run.
+    """
+    return f"runnable_browser_session:{runnable_id}"
+
+
+class Event(BaseModel):
+    topic: str
+    # the json dump of the updated entity
+    payload: dict[str, Any]
+    published_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PubSubStats(BaseModel):
+    published: int = 0
+    delivered: int = 0
+    # events replaced by a newer event of the same topic before the subscriber read them
+    coalesced: int = 0
+    # events dropped because the subscriber fell more than MAX_PENDING_EVENTS behind
+    dropped: int = 0
+    subscribers: int = 0
+
+
+class Subscription:
+    """
+    The events of a set of topics, buffered until the subscriber reads them. With coalesce, only the latest event of
+    each topic is kept: a subscriber that only cares about the current state of an entity never falls behind.
+    """
+
+    def __init__(self, pubsub: "BasePubSub", topics: list[str], coalesce: bool = True) -> None:
+        self.pubsub = pubsub
+        self.topics = topics
+        self.coalesce = coalesce
+        self._loop = asyncio.get_running_loop()
+        self._latest: dict[str, Event] = {}
+        self._queue: deque[Event] = deque()
+        self._ready = asyncio.Event()
+
+    async def __aenter__(self) -> "Subscription":
+        await self.pubsub.add_subscription(self)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.pubsub.remove_subscription(self)
+
+    def deliver(self, event: Event) -> None:
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is not self._loop:
+            # published from another thread or event loop
+            self._loop.call_soon_threadsafe(self._deliver, event)
+            return
+        self._deliver(event)
+
+    def _deliver(self, event: Event) -> None:
+        stats = self.pubsub.stats
+        stats.delivered += 1
+        if self.coalesce:
+            if event.topic in self._latest:
+                stats.coalesced += 1
+            self._latest[event.topic] = event
+        else:
+            if len(self._queue) >= MAX_PENDING_EVENTS:
+                self._queue.popleft()
+                stats.dropped += 1
+            self._queue.append(event)
+        self._ready.set()
+
+    def _drain(self) -> list[Event]:
+        if self.coalesce:
+            events = sorted(self._latest.values(), key=lambda event: event.published_at)
+            self._latest = {}
+        else:
+            events = list(self._queue)
+            self._queue.clear()
+        self._ready.clear()
+        return events
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait until there are events to read.
+        :return: False if the timeout expired first
+        """
+        if self._ready.is_set():
+            return True
+        try:
+            async with asyncio.timeout(timeout):
+                await self._ready.wait()
+        except TimeoutError:
+            return False
+        return True
+
+    async def get(self, timeout: float | None = None) -> list[Event]:
+        """
+        :return: the pending events, oldest first, or an empty list if none arrived before the timeout
+        """
+        if not await self.wait(timeout):
+            return []
+        return self._drain()
+
+    async def __aiter__(self) -> AsyncIterator[Event]:
+        while True:
+            for event in await self.get():
+                yield event
+
+
+class BasePubSub(ABC):
+    def __init__(self) -> None:
+        self.stats = PubSubStats()
+        # topic -> subscriptions
+        self._subscriptions: dict[str, set[Subscription]] = {}
+
+    @abstractmethod
+    async def publish(self, topic: str, payload: dict[str, Any]) -> None:
+        pass
+
+    def subscribe(self, *topics: str, coalesce: bool = True) -> Subscription:
+        """
+        async with pubsub.subscribe(task_topic(task_id)) as subscription:
+            events = await subscription.get(timeout=2)
+        """
+        return Subscription(self, list(topics), coalesce=coalesce)
+
+    async def add_subscription(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            self._subscriptions.setdefault(topic, set()).add(subscription)
+        self.stats.subscribers += 1
+
+    async def remove_subscription(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            subscriptions = self._subscriptions.get(topic)
+            if subscriptions is None:
+                continue
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[topic]
+        self.stats.subscribers -= 1
+
+    def dispatch(self, event: Event) -> None:
+        """
+        Fan the event out to the subscriptions of this process.
+        """
+        for subscription in list(self._subscriptions.get(event.topic, ())):
+            subscription.deliver(event)
+
+    async def publish_model(self, topics: list[str], model: BaseModel) -> None:
+        """
+        Publish an updated entity. Failures are logged, a lost event never fails the update.
+        """
+        try:
+            payload = model.model_dump(mode="json")
+            for topic in topics:
+                await self.publish(topic, payload)
+        except Exception:
+            LOG.warning("Failed to publish event", topics=topics, exc_info=True)
+
+    def get_stats(self) -> PubSubStats:
+        return self.stats.model_copy()
+
+    async def close(self) -> None:
+        pass
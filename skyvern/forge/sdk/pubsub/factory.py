@@ -0,0 +1,36 @@
+from typing import Callable
+
+from skyvern.exceptions import UnknownPubSubType
+from skyvern.forge.sdk.pubsub.base import BasePubSub
+from skyvern.forge.sdk.pubsub.local import LocalPubSub
+from skyvern.forge.sdk.pubsub.redis_pubsub import RedisPubSub
+from skyvern.forge.sdk.settings_manager import SettingsManager
+
+PubSubCreator = Callable[[], BasePubSub]
+
+
+class PubSubFactory:
+    __pubsub: BasePubSub = LocalPubSub()
+    _creators: dict[str, PubSubCreator] = {
+        "local": LocalPubSub,
+        "redis": lambda: RedisPubSub(redis_url=SettingsManager.get_settings().PUBSUB_REDIS_URL),
+    }
+
+    @staticmethod
+    def set_pubsub(pubsub: BasePubSub) -> None:
+        PubSubFactory.__pubsub = pubsub
+
+    @staticmethod
+    def get_pubsub() -> BasePubSub:
+        return PubSubFactory.__pubsub
+
+    @classmethod
+    def register_type(cls, pubsub_type: str, creator: PubSubCreator) -> None:
+        cls._creators[pubsub_type] = creator
+
+    @classmethod
+    def create_pubsub(cls, pubsub_type: str) -> BasePubSub:
+        creator = cls._creators.get(pubsub_type)
+        if not creator:
+            raise UnknownPubSubType(pubsub_type)
+        return creator()
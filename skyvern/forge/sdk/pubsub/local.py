@@ -0,0 +1,13 @@
+from typing import Any
+
+from skyvern.forge.sdk.pubsub.base import BasePubSub, Event
+
+
+class LocalPubSub(BasePubSub):
+    """
+    Delivers the events to the subscribers of this process only.
+    """
+
+    async def publish(self, topic: str, payload: dict[str, Any]) -> None:
+        self.stats.published += 1
+        self.dispatch(Event(topic=topic, payload=payload))
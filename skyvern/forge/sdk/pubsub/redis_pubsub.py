@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any
+
+import structlog
+from redis.asyncio import Redis
+
+from skyvern.forge.sdk.pubsub.base import BasePubSub, Event, Subscription
+
+LOG = structlog.get_logger()
+
+
+class RedisPubSub(BasePubSub):
+    """
+    Delivers the events to the subscribers of every process through the pub/sub of a server speaking the Redis
+    protocol. Each process holds one server subscription while it has subscribers, and fans the events out locally.
+    """
+
+    def __init__(self, redis_url: str, channel_prefix: str = "skyvern:events:") -> None:
+        super().__init__()
+        self.channel_prefix = channel_prefix
+        self.client = Redis.from_url(redis_url)
+        self._listener: asyncio.Task[None] | None = None
+
+    async def publish(self, topic: str, payload: dict[str, Any]) -> None:
+        self.stats.published += 1
+        event = Event(topic=topic, payload=payload)
+        await self.client.publish(f"{self.channel_prefix}{topic}", event.model_dump_json())
+
+    async def add_subscription(self, subscription: Subscription) -> None:
+        await super().add_subscription(subscription)
+        if self._listener is None or self._listener.done():
+            ready: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._listener = asyncio.create_task(self._listen(ready))
+            # don't miss the events published right after subscribing
+            await ready
+
+    async def remove_subscription(self, subscription: Subscription) -> None:
+        await super().remove_subscription(subscription)
+        if not self._subscriptions and self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    async def _listen(self, ready: asyncio.Future[None]) -> None:
+        pubsub = self.client.pubsub()
+        try:
+            await pubsub.psubscribe(f"{self.channel_prefix}*")
+            ready.set_result(None)
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+                if message is None:
+                    continue
+                try:
+                    event = Event.model_validate_json(message["data"])
+                except Exception:
+                    LOG.warning("Failed to parse event", channel=message.get("channel"), exc_info=True)
+                    continue
+                self.dispatch(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # the subscribers fall back to refreshing the state periodically
+            LOG.exception("Event listener failed")
+        finally:
+            if not ready.done():
+                ready.set_result(None)
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await self.client.aclose()
@@ -0,0 +1,50 @@
+import time
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from pydantic import BaseModel
+
+from skyvern.config import settings
+from skyvern.forge.sdk.pubsub.base import Subscription
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class StateWatcher(Generic[ModelT]):
+    """
+    The latest state of an entity, taken from the events of its topic. The state is only read from the database at
+    start, and when no event arrived for refresh_seconds in case an update was published where the bus can't reach.
+    """
+
+    def __init__(
+        self,
+        subscription: Subscription,
+        model_type: type[ModelT],
+        load: Callable[[], Awaitable[ModelT | None]],
+        refresh_seconds: float | None = None,
+    ) -> None:
+        self.subscription = subscription
+        self.model_type = model_type
+        self.load = load
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None else settings.PUBSUB_FALLBACK_REFRESH_SECONDS
+        )
+        self.state: ModelT | None = None
+        self._last_update_time = 0.0
+
+    async def refresh(self) -> ModelT | None:
+        self.state = await self.load()
+        self._last_update_time = time.monotonic()
+        return self.state
+
+    async def wait(self, timeout: float) -> ModelT | None:
+        """
+        Wait up to timeout seconds for an update.
+        :return: the latest state
+        """
+        events = await self.subscription.get(timeout=timeout)
+        if events:
+            self.state = self.model_type.model_validate(events[-1].payload)
+            self._last_update_time = time.monotonic()
+        elif time.monotonic() - self._last_update_time >= self.refresh_seconds:
+            await self.refresh()
+        return self.state
@@ -1561,10 +1561,51 @@ async def get_workflow_run_with_workflow_id(
 async def get_workflow_run_timeline(
     workflow_run_id: str,
     page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1),
+    page_size: int | None = Query(
+        None, ge=1, description="The number of top level timeline entries per page. All of them without it."
+    ),
+    expand_loops: bool = Query(
+        True,
+        description="Include the iterations of the loop blocks. Without it, they're fetched with the timeline of the"
+        " loop block.",
+    ),
+    current_org: Organization = Depends(org_auth_service.get_current_org),
+) -> list[WorkflowRunTimeline]:
+    timeline = await _flatten_workflow_run_timeline(
+        current_org.organization_id, workflow_run_id, expand_loops=expand_loops
+    )
+    return _paginate_timeline(timeline, page, page_size)
+
+
+@legacy_base_router.get(
+    "/workflows/{workflow_id}/runs/{workflow_run_id}/timeline/{workflow_run_block_id}",
+    tags=["agent"],
+    openapi_extra={
+        "x-fern-sdk-method-name": "get_workflow_run_block_timeline",
+    },
+)
+@legacy_base_router.get(
+    "/workflows/{workflow_id}/runs/{workflow_run_id}/timeline/{workflow_run_block_id}/",
+    include_in_schema=False,
+)
+async def get_workflow_run_block_timeline(
+    workflow_run_id: str,
+    workflow_run_block_id: str,
+    page: int = Query(1, ge=1),
+    page_size: int | None = Query(None, ge=1),
+    expand_loops: bool = Query(False),
     current_org: Organization = Depends(org_auth_service.get_current_org),
 ) -> list[WorkflowRunTimeline]:
-    return await _flatten_workflow_run_timeline(current_org.organization_id, workflow_run_id)
+    """
+    Get the timeline of the children of a workflow run block, e.g. the iterations of a loop block.
+    """
+    timeline = await app.WORKFLOW_SERVICE.get_workflow_run_timeline(
+        workflow_run_id=workflow_run_id,
+        organization_id=current_org.organization_id,
+        parent_workflow_run_block_id=workflow_run_block_id,
+        expand_loops=expand_loops,
+    )
+    return _paginate_timeline(timeline, page, page_size)
 
 
 @legacy_base_router.get(
@@ -1958,7 +1999,17 @@ async def get_task_v2(
     return task_v2.model_dump(by_alias=True)
 
 
-async def _flatten_workflow_run_timeline(organization_id: str, workflow_run_id: str) -> list[WorkflowRunTimeline]:
+def _paginate_timeline(
+    timeline: list[WorkflowRunTimeline], page: int, page_size: int | None
+) -> list[WorkflowRunTimeline]:
+    if page_size is None:
+        return timeline
+    return timeline[(page - 1) * page_size : page * page_size]
+
+
+async def _flatten_workflow_run_timeline(
+    organization_id: str, workflow_run_id: str, expand_loops: bool = True
+) -> list[WorkflowRunTimeline]:
     """
     Get the timeline workflow runs including the nested workflow runs in a flattened list
     """
@@ -1972,6 +2023,7 @@ async def _flatten_workflow_run_timeline(organization_id: str, workflow_run_id:
     workflow_run_block_timeline = await app.WORKFLOW_SERVICE.get_workflow_run_timeline(
         workflow_run_id=workflow_run_id,
         organization_id=organization_id,
+        expand_loops=expand_loops,
     )
     # loop through the run block timeline, find the task_v2 blocks, flatten the timeline for task_v2
     final_workflow_run_block_timeline = []
@@ -1994,6 +2046,7 @@ async def _flatten_workflow_run_timeline(organization_id: str, workflow_run_id:
         workflow_blocks = await _flatten_workflow_run_timeline(
             organization_id=organization_id,
             workflow_run_id=timeline.block.block_workflow_run_id,
+            expand_loops=expand_loops,
         )
         final_workflow_run_block_timeline.extend(workflow_blocks)
 
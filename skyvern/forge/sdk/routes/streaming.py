@@ -1,4 +1,3 @@
-import asyncio
 import base64
 from datetime import datetime
 
@@ -8,10 +7,12 @@ from pydantic import ValidationError
 from websockets.exceptions import ConnectionClosedOK
 
 from skyvern.forge import app
+from skyvern.forge.sdk.pubsub.base import task_topic, workflow_run_topic
+from skyvern.forge.sdk.pubsub.watcher import StateWatcher
 from skyvern.forge.sdk.routes.routers import legacy_base_router
-from skyvern.forge.sdk.schemas.tasks import TaskStatus
+from skyvern.forge.sdk.schemas.tasks import Task, TaskStatus
 from skyvern.forge.sdk.services.org_auth_service import get_current_org
-from skyvern.forge.sdk.workflow.models.workflow import WorkflowRunStatus
+from skyvern.forge.sdk.workflow.models.workflow import WorkflowRun, WorkflowRunStatus
 
 LOG = structlog.get_logger()
 STREAMING_TIMEOUT = 300
@@ -49,61 +50,71 @@ async def task_stream(
     last_activity_timestamp = datetime.utcnow()
 
     try:
-        while True:
-            # if no activity for 5 minutes, close the connection
-            if (datetime.utcnow() - last_activity_timestamp).total_seconds() > STREAMING_TIMEOUT:
-                LOG.info(
-                    "No activity for 5 minutes. Closing connection", task_id=task_id, organization_id=organization_id
-                )
-                await websocket.send_json(
-                    {
-                        "task_id": task_id,
-                        "status": "timeout",
-                    }
-                )
-                return
-
-            task = await app.DATABASE.get_task(task_id=task_id, organization_id=organization_id)
-            if not task:
-                LOG.info("Task not found. Closing connection", task_id=task_id, organization_id=organization_id)
-                await websocket.send_json(
-                    {
-                        "task_id": task_id,
-                        "status": "not_found",
-                    }
-                )
-                return
-            if task.status.is_final():
-                LOG.info(
-                    "Task is in a final state. Closing connection",
-                    task_status=task.status,
-                    task_id=task_id,
-                    organization_id=organization_id,
-                )
-                await websocket.send_json(
-                    {
-                        "task_id": task_id,
-                        "status": task.status,
-                    }
-                )
-                return
-
-            if task.status == TaskStatus.running:
-                file_name = f"{task_id}.png"
-                if task.workflow_run_id:
-                    file_name = f"{task.workflow_run_id}.png"
-                screenshot = await app.STORAGE.get_streaming_file(organization_id, file_name)
-                if screenshot:
-                    encoded_screenshot = base64.b64encode(screenshot).decode("utf-8")
+        async with app.PUBSUB.subscribe(task_topic(task_id)) as subscription:
+            watcher = StateWatcher(
+                subscription,
+                Task,
+                lambda: app.DATABASE.get_task(task_id=task_id, organization_id=organization_id),
+            )
+            await watcher.refresh()
+            while True:
+                # if no activity for 5 minutes, close the connection
+                if (datetime.utcnow() - last_activity_timestamp).total_seconds() > STREAMING_TIMEOUT:
+                    LOG.info(
+                        "No activity for 5 minutes. Closing connection",
+                        task_id=task_id,
+                        organization_id=organization_id,
+                    )
+                    await websocket.send_json(
+                        {
+                            "task_id": task_id,
+                            "status": "timeout",
+                        }
+                    )
+                    return
+
+                task = watcher.state
+                if not task:
+                    LOG.info("Task not found. Closing connection", task_id=task_id, organization_id=organization_id)
+                    await websocket.send_json(
+                        {
+                            "task_id": task_id,
+                            "status": "not_found",
+                        }
+                    )
+                    return
+                if task.status.is_final():
+                    LOG.info(
+                        "Task is in a final state. Closing connection",
+                        task_status=task.status,
+                        task_id=task_id,
+                        organization_id=organization_id,
+                    )
                     await websocket.send_json(
                         {
                             "task_id": task_id,
                             "status": task.status,
-                            "screenshot": encoded_screenshot,
                         }
                     )
-                    last_activity_timestamp = datetime.utcnow()
-            await asyncio.sleep(2)
+                    return
+
+                if task.status == TaskStatus.running:
+                    file_name = f"{task_id}.png"
+                    if task.workflow_run_id:
+                        file_name = f"{task.workflow_run_id}.png"
+                    screenshot = await app.STORAGE.get_streaming_file(organization_id, file_name)
+                    if screenshot:
+                        encoded_screenshot = base64.b64encode(screenshot).decode("utf-8")
+                        await websocket.send_json(
+                            {
+                                "task_id": task_id,
+                                "status": task.status,
+                                "screenshot": encoded_screenshot,
+                            }
+                        )
+                        last_activity_timestamp = datetime.utcnow()
+                # wait for a status update, or for the next screenshot
+                await watcher.wait(timeout=2)
 
     except ValidationError as e:
         await websocket.send_text(f"Invalid data: {e}")
@@ -155,72 +166,80 @@ async def workflow_run_streaming(
     last_activity_timestamp = datetime.utcnow()
 
     try:
-        while True:
-            # if no activity for 5 minutes, close the connection
-            if (datetime.utcnow() - last_activity_timestamp).total_seconds() > STREAMING_TIMEOUT:
-                LOG.info(
-                    "WofklowRun Streaming: No activity for 5 minutes. Closing connection",
+        async with app.PUBSUB.subscribe(workflow_run_topic(workflow_run_id)) as subscription:
+            watcher = StateWatcher(
+                subscription,
+                WorkflowRun,
+                lambda: app.DATABASE.get_workflow_run(
                     workflow_run_id=workflow_run_id,
                     organization_id=organization_id,
-                )
-                await websocket.send_json(
-                    {
-                        "workflow_run_id": workflow_run_id,
-                        "status": "timeout",
-                    }
-                )
-                return
-
-            workflow_run = await app.DATABASE.get_workflow_run(
-                workflow_run_id=workflow_run_id,
-                organization_id=organization_id,
+                ),
             )
-            if not workflow_run or workflow_run.organization_id != organization_id:
-                LOG.info(
-                    "WofklowRun Streaming: Workflow not found",
-                    workflow_run_id=workflow_run_id,
-                    organization_id=organization_id,
-                )
-                await websocket.send_json(
-                    {
-                        "workflow_run_id": workflow_run_id,
-                        "status": "not_found",
-                    }
-                )
-                return
-            if workflow_run.status in [
-                WorkflowRunStatus.completed,
-                WorkflowRunStatus.failed,
-                WorkflowRunStatus.terminated,
-            ]:
-                LOG.info(
-                    "Workflow run is in a final state. Closing connection",
-                    workflow_run_status=workflow_run.status,
-                    workflow_run_id=workflow_run_id,
-                    organization_id=organization_id,
-                )
-                await websocket.send_json(
-                    {
-                        "workflow_run_id": workflow_run_id,
-                        "status": workflow_run.status,
-                    }
-                )
-                return
-
-            if workflow_run.status == WorkflowRunStatus.running:
-                file_name = f"{workflow_run_id}.png"
-                screenshot = await app.STORAGE.get_streaming_file(organization_id, file_name)
-                if screenshot:
-                    encoded_screenshot = base64.b64encode(screenshot).decode("utf-8")
+            await watcher.refresh()
+            while True:
+                # if no activity for 5 minutes, close the connection
+                if (datetime.utcnow() - last_activity_timestamp).total_seconds() > STREAMING_TIMEOUT:
+                    LOG.info(
+                        "WofklowRun Streaming: No activity for 5 minutes. Closing connection",
+                        workflow_run_id=workflow_run_id,
+                        organization_id=organization_id,
+                    )
+                    await websocket.send_json(
+                        {
+                            "workflow_run_id": workflow_run_id,
+                            "status": "timeout",
+                        }
+                    )
+                    return
+
+                workflow_run = watcher.state
+                if not workflow_run or workflow_run.organization_id != organization_id:
+                    LOG.info(
+                        "WofklowRun Streaming: Workflow not found",
+                        workflow_run_id=workflow_run_id,
+                        organization_id=organization_id,
+                    )
+                    await websocket.send_json(
+                        {
+                            "workflow_run_id": workflow_run_id,
+                            "status": "not_found",
+                        }
+                    )
+                    return
+                if workflow_run.status in [
+                    WorkflowRunStatus.completed,
+                    WorkflowRunStatus.failed,
+                    WorkflowRunStatus.terminated,
+                ]:
+                    LOG.info(
+                        "Workflow run is in a final state. Closing connection",
+                        workflow_run_status=workflow_run.status,
+                        workflow_run_id=workflow_run_id,
+                        organization_id=organization_id,
+                    )
                     await websocket.send_json(
                         {
                             "workflow_run_id": workflow_run_id,
                             "status": workflow_run.status,
-                            "screenshot": encoded_screenshot,
                         }
                     )
-                    last_activity_timestamp = datetime.utcnow()
-            await asyncio.sleep(2)
+                    return
+
+                if workflow_run.status == WorkflowRunStatus.running:
+                    file_name = f"{workflow_run_id}.png"
+                    screenshot = await app.STORAGE.get_streaming_file(organization_id, file_name)
+                    if screenshot:
+                        encoded_screenshot = base64.b64encode(screenshot).decode("utf-8")
+                        await websocket.send_json(
+                            {
+                                "workflow_run_id": workflow_run_id,
+                                "status": workflow_run.status,
+                                "screenshot": encoded_screenshot,
+                            }
+                        )
+                        last_activity_timestamp = datetime.utcnow()
+                # wait for a status update, or for the next screenshot
+                await watcher.wait(timeout=2)
 
     except ValidationError as e:
         await websocket.send_text(f"Invalid data: {e}")
@@ -1,40 +1,47 @@
-import asyncio
+import time
 from datetime import datetime
+from typing import Any
 
 import structlog
 
 import skyvern.forge.sdk.routes.streaming_clients as sc
 from skyvern.config import settings
 from skyvern.forge import app
-from skyvern.forge.sdk.schemas.persistent_browser_sessions import AddressablePersistentBrowserSession
+from skyvern.forge.sdk.pubsub.base import (
+    Event,
+    Subscription,
+    browser_session_topic,
+    runnable_browser_session_topic,
+    task_topic,
+    workflow_run_topic,
+)
+from skyvern.forge.sdk.schemas.persistent_browser_sessions import (
+    AddressablePersistentBrowserSession,
+    PersistentBrowserSession,
+)
 from skyvern.forge.sdk.schemas.tasks import Task, TaskStatus
 from skyvern.forge.sdk.workflow.models.workflow import WorkflowRun, WorkflowRunStatus
 
 LOG = structlog.get_logger()
 
+ACTIVE_TASK_STATUSES = [TaskStatus.created, TaskStatus.queued, TaskStatus.running]
+ACTIVE_WORKFLOW_RUN_STATUSES = [WorkflowRunStatus.created, WorkflowRunStatus.queued, WorkflowRunStatus.running]
 
-async def verify_browser_session(
+
+async def load_browser_session(browser_session_id: str, organization_id: str) -> PersistentBrowserSession | None:
+    return await app.DATABASE.get_persistent_browser_session(browser_session_id, organization_id)
+
+
+async def check_browser_session(
     browser_session_id: str,
     organization_id: str,
+    browser_session: PersistentBrowserSession | None,
 ) -> AddressablePersistentBrowserSession | None:
     """
-    Verify the browser session exists, and is usable.
+    Check the browser session exists, and is usable.
     """
 
-    if settings.ENV == "local":
-        dummy_browser_session = AddressablePersistentBrowserSession(
-            persistent_browser_session_id=browser_session_id,
-            organization_id=organization_id,
-            browser_address="0.0.0.0:9223",
-            created_at=datetime.now(),
-            modified_at=datetime.now(),
-        )
-
-        return dummy_browser_session
-
-    browser_session = await app.DATABASE.get_persistent_browser_session(browser_session_id, organization_id)
-
-    if not browser_session:
+    if not browser_session or browser_session.deleted_at:
         LOG.info(
             "No browser session found.",
             browser_session_id=browser_session_id,
@@ -75,16 +82,63 @@ async def verify_browser_session(
     return addressable_browser_session
 
 
-async def verify_task(
-    task_id: str, organization_id: str
-) -> tuple[Task | None, AddressablePersistentBrowserSession | None]:
+async def verify_browser_session(
+    browser_session_id: str,
+    organization_id: str,
+) -> AddressablePersistentBrowserSession | None:
     """
-    Verify the task is running, and that it has a browser session associated
-    with it.
+    Verify the browser session exists, and is usable.
+    """
+
+    if settings.ENV == "local":
+        dummy_browser_session = AddressablePersistentBrowserSession(
+            persistent_browser_session_id=browser_session_id,
+            organization_id=organization_id,
+            browser_address="0.0.0.0:9223",
+            created_at=datetime.now(),
+            modified_at=datetime.now(),
+        )
+
+        return dummy_browser_session
+
+    browser_session = await load_browser_session(browser_session_id, organization_id)
+    return await check_browser_session(browser_session_id, organization_id, browser_session)
+
+
+def runnable_browser_session(runnable_id: str, payload: dict[str, Any]) -> PersistentBrowserSession | None:
+    """
+    The browser session of an event of runnable_browser_session_topic, or None if the session was released or closed.
     """
+    browser_session = PersistentBrowserSession.model_validate(payload)
+    if browser_session.runnable_id != runnable_id or browser_session.completed_at or browser_session.deleted_at:
+        return None
+    return browser_session
+
 
+async def load_task(task_id: str, organization_id: str) -> tuple[Task | None, PersistentBrowserSession | None]:
     task = await app.DATABASE.get_task(task_id=task_id, organization_id=organization_id)
 
+    if not task or task.status not in ACTIVE_TASK_STATUSES:
+        return task, None
+
+    browser_session = await app.PERSISTENT_SESSIONS_MANAGER.get_session_by_runnable_id(
+        organization_id=organization_id,
+        runnable_id=task_id,
+    )
+    return task, browser_session
+
+
+def check_task(
+    task_id: str,
+    organization_id: str,
+    task: Task | None,
+    browser_session: PersistentBrowserSession | None,
+) -> tuple[Task | None, AddressablePersistentBrowserSession | None]:
+    """
+    Check the task is running, and that it has a browser session associated
+    with it.
+    """
+
     if not task:
         LOG.info("Task not found.", task_id=task_id, organization_id=organization_id)
         return None, None
@@ -94,7 +148,7 @@ async def verify_task(
 
         return None, None
 
-    if task.status not in [TaskStatus.created, TaskStatus.queued, TaskStatus.running]:
+    if task.status not in ACTIVE_TASK_STATUSES:
         LOG.info(
             "Task is not created, queued, or running.",
             task_status=task.status,
@@ -104,11 +158,6 @@ async def verify_task(
 
         return None, None
 
-    browser_session = await app.PERSISTENT_SESSIONS_MANAGER.get_session_by_runnable_id(
-        organization_id=organization_id,
-        runnable_id=task_id,
-    )
-
     if not browser_session:
         LOG.info("No browser session found for task.", task_id=task_id, organization_id=organization_id)
         return task, None
@@ -130,41 +179,47 @@ async def verify_task(
     return task, addressable_browser_session
 
 
-async def verify_workflow_run(
-    workflow_run_id: str,
-    organization_id: str,
-) -> tuple[WorkflowRun | None, AddressablePersistentBrowserSession | None]:
+async def verify_task(
+    task_id: str, organization_id: str
+) -> tuple[Task | None, AddressablePersistentBrowserSession | None]:
     """
-    Verify the workflow run is running, and that it has a browser session associated
+    Verify the task is running, and that it has a browser session associated
     with it.
     """
 
-    if settings.ENV == "local":
-        dummy_workflow_run = WorkflowRun(
-            workflow_id="123",
-            workflow_permanent_id="wpid_123",
-            workflow_run_id=workflow_run_id,
-            organization_id=organization_id,
-            status=WorkflowRunStatus.running,
-            created_at=datetime.now(),
-            modified_at=datetime.now(),
-        )
-
-        dummy_browser_session = AddressablePersistentBrowserSession(
-            persistent_browser_session_id=workflow_run_id,
-            organization_id=organization_id,
-            browser_address="0.0.0.0:9223",
-            created_at=datetime.now(),
-            modified_at=datetime.now(),
-        )
+    task, browser_session = await load_task(task_id, organization_id)
+    return check_task(task_id, organization_id, task, browser_session)
 
-        return dummy_workflow_run, dummy_browser_session
 
+async def load_workflow_run(
+    workflow_run_id: str, organization_id: str
+) -> tuple[WorkflowRun | None, PersistentBrowserSession | None]:
     workflow_run = await app.DATABASE.get_workflow_run(
         workflow_run_id=workflow_run_id,
         organization_id=organization_id,
     )
 
+    if not workflow_run or workflow_run.status not in ACTIVE_WORKFLOW_RUN_STATUSES:
+        return workflow_run, None
+
+    browser_session = await app.PERSISTENT_SESSIONS_MANAGER.get_session_by_runnable_id(
+        organization_id=organization_id,
+        runnable_id=workflow_run_id,
+    )
+    return workflow_run, browser_session
+
+
+async def check_workflow_run(
+    workflow_run_id: str,
+    organization_id: str,
+    workflow_run: WorkflowRun | None,
+    browser_session: PersistentBrowserSession | None,
+) -> tuple[WorkflowRun | None, AddressablePersistentBrowserSession | None]:
+    """
+    Check the workflow run is running, and that it has a browser session associated
+    with it.
+    """
+
     if not workflow_run:
         LOG.info("Workflow run not found.", workflow_run_id=workflow_run_id, organization_id=organization_id)
         return None, None
@@ -179,7 +234,7 @@ async def verify_workflow_run(
 
         return None, None
 
-    if workflow_run.status not in [WorkflowRunStatus.created, WorkflowRunStatus.queued, WorkflowRunStatus.running]:
+    if workflow_run.status not in ACTIVE_WORKFLOW_RUN_STATUSES:
         LOG.info(
             "Workflow run is not running.",
             workflow_run_status=workflow_run.status,
@@ -189,11 +244,6 @@ async def verify_workflow_run(
 
         return None, None
 
-    browser_session = await app.PERSISTENT_SESSIONS_MANAGER.get_session_by_runnable_id(
-        organization_id=organization_id,
-        runnable_id=workflow_run_id,
-    )
-
     if not browser_session:
         LOG.info(
             "No browser session found for workflow run.",
@@ -233,51 +283,167 @@ async def verify_workflow_run(
     return workflow_run, addressable_browser_session
 
 
-async def loop_verify_browser_session(verifiable: sc.CommandChannel | sc.Streaming) -> None:
+async def verify_workflow_run(
+    workflow_run_id: str,
+    organization_id: str,
+) -> tuple[WorkflowRun | None, AddressablePersistentBrowserSession | None]:
     """
-    Loop until the browser session is cleared or the websocket is closed.
+    Verify the workflow run is running, and that it has a browser session associated
+    with it.
     """
 
-    while verifiable.browser_session and verifiable.is_open:
-        browser_session = await verify_browser_session(
-            browser_session_id=verifiable.browser_session.persistent_browser_session_id,
-            organization_id=verifiable.organization_id,
+    if settings.ENV == "local":
+        dummy_workflow_run = WorkflowRun(
+            workflow_id="123",
+            workflow_permanent_id="wpid_123",
+            workflow_run_id=workflow_run_id,
+            organization_id=organization_id,
+            status=WorkflowRunStatus.running,
+            created_at=datetime.now(),
+            modified_at=datetime.now(),
+        )
+
+        dummy_browser_session = AddressablePersistentBrowserSession(
+            persistent_browser_session_id=workflow_run_id,
+            organization_id=organization_id,
+            browser_address="0.0.0.0:9223",
+            created_at=datetime.now(),
+            modified_at=datetime.now(),
         )
 
-        verifiable.browser_session = browser_session
+        return dummy_workflow_run, dummy_browser_session
+
+    workflow_run, browser_session = await load_workflow_run(workflow_run_id, organization_id)
+    return await check_workflow_run(workflow_run_id, organization_id, workflow_run, browser_session)
+
+
+async def wait_for_update(
+    subscription: Subscription, verifiable: sc.CommandChannel | sc.Streaming
+) -> list[Event] | None:
+    """
+    Wait until an update is published, the websocket is closed or it's time for the fallback refresh.
+    :return: the published events, or None when the state is to be read again from the database
+    """
+
+    deadline = time.monotonic() + settings.PUBSUB_FALLBACK_REFRESH_SECONDS
+
+    while verifiable.is_open:
+        if time.monotonic() >= deadline:
+            return None
+        events = await subscription.get(timeout=2)
+        if events:
+            return events
+
+    return []
+
+
+async def loop_verify_browser_session(verifiable: sc.CommandChannel | sc.Streaming) -> None:
+    """
+    Loop until the browser session is cleared or the websocket is closed. The browser session is read from the
+    database once, then taken from the published updates.
+    """
+
+    if not verifiable.browser_session:
+        return
+
+    browser_session_id = verifiable.browser_session.persistent_browser_session_id
 
-        await asyncio.sleep(2)
+    if settings.ENV == "local":
+        verifiable.browser_session = await verify_browser_session(browser_session_id, verifiable.organization_id)
+        return
+
+    async with app.PUBSUB.subscribe(browser_session_topic(browser_session_id)) as subscription:
+        browser_session = await load_browser_session(browser_session_id, verifiable.organization_id)
+
+        while True:
+            verifiable.browser_session = await check_browser_session(
+                browser_session_id, verifiable.organization_id, browser_session
+            )
+
+            if not verifiable.browser_session or not verifiable.is_open:
+                return
+
+            events = await wait_for_update(subscription, verifiable)
+
+            if events is None:
+                browser_session = await load_browser_session(browser_session_id, verifiable.organization_id)
+            elif events:
+                browser_session = PersistentBrowserSession.model_validate(events[-1].payload)
 
 
 async def loop_verify_task(streaming: sc.Streaming) -> None:
     """
-    Loop until the task is cleared or the websocket is closed.
+    Loop until the task is cleared or the websocket is closed. The task and its browser session are read from the
+    database once, then taken from the published updates.
     """
 
-    while streaming.task and streaming.is_open:
-        task, browser_session = await verify_task(
-            task_id=streaming.task.task_id,
-            organization_id=streaming.organization_id,
-        )
+    if not streaming.task:
+        return
+
+    task_id = streaming.task.task_id
+
+    async with app.PUBSUB.subscribe(task_topic(task_id), runnable_browser_session_topic(task_id)) as subscription:
+        task, browser_session = await load_task(task_id, streaming.organization_id)
+
+        while True:
+            streaming.task, streaming.browser_session = check_task(
+                task_id, streaming.organization_id, task, browser_session
+            )
+
+            if not streaming.task or not streaming.is_open:
+                return
+
+            events = await wait_for_update(subscription, streaming)
 
-        streaming.task = task
-        streaming.browser_session = browser_session
+            if events is None:
+                task, browser_session = await load_task(task_id, streaming.organization_id)
+                continue
 
-        await asyncio.sleep(2)
+            for event in events:
+                if event.topic == task_topic(task_id):
+                    task = Task.model_validate(event.payload)
+                else:
+                    browser_session = runnable_browser_session(task_id, event.payload)
 
 
 async def loop_verify_workflow_run(verifiable: sc.CommandChannel | sc.Streaming) -> None:
     """
-    Loop until the workflow run is cleared or the websocket is closed.
+    Loop until the workflow run is cleared or the websocket is closed. The workflow run and its browser session are
+    read from the database once, then taken from the published updates.
     """
 
-    while verifiable.workflow_run and verifiable.is_open:
-        workflow_run, browser_session = await verify_workflow_run(
-            workflow_run_id=verifiable.workflow_run.workflow_run_id,
-            organization_id=verifiable.organization_id,
+    if not verifiable.workflow_run:
+        return
+
+    workflow_run_id = verifiable.workflow_run.workflow_run_id
+
+    if settings.ENV == "local":
+        verifiable.workflow_run, verifiable.browser_session = await verify_workflow_run(
+            workflow_run_id, verifiable.organization_id
         )
+        return
+
+    async with app.PUBSUB.subscribe(
+        workflow_run_topic(workflow_run_id), runnable_browser_session_topic(workflow_run_id)
+    ) as subscription:
+        workflow_run, browser_session = await load_workflow_run(workflow_run_id, verifiable.organization_id)
+
+        while True:
+            verifiable.workflow_run, verifiable.browser_session = await check_workflow_run(
+                workflow_run_id, verifiable.organization_id, workflow_run, browser_session
+            )
+
+            if not verifiable.workflow_run or not verifiable.is_open:
+                return
+
+            events = await wait_for_update(subscription, verifiable)
 
-        verifiable.workflow_run = workflow_run
-        verifiable.browser_session = browser_session
+            if events is None:
+                workflow_run, browser_session = await load_workflow_run(workflow_run_id, verifiable.organization_id)
+                continue
 
-        await asyncio.sleep(2)
+            for event in events:
+                if event.topic == workflow_run_topic(workflow_run_id):
+                    workflow_run = WorkflowRun.model_validate(event.payload)
+                else:
+                    browser_session = runnable_browser_session(workflow_run_id, event.payload)
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from skyvern.webeye.actions.actions import Action
+
+
+class ActionPlan(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    action_plan_id: str
+    organization_id: str
+    url_pattern: str
+    url_pattern_hash: str
+    goal_hash: str
+    task_id: str
+    # the skyvern_element_hash of every action, None for the actions without an element
+    element_hashes: list[str | None]
+    actions: list[Action]
+    created_at: datetime
+    modified_at: datetime
@@ -63,5 +63,7 @@ class WorkflowRunTimeline(BaseModel):
     block: WorkflowRunBlock | None = None
     thought: Thought | None = None
     children: list[WorkflowRunTimeline] = []
+    # the number of children, including the ones left out of a collapsed loop block
+    children_count: int = 0
     created_at: datetime
     modified_at: datetime
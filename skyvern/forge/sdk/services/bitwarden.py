@@ -3,8 +3,9 @@ import json
 import os
 import re
 import urllib.parse
+from contextlib import asynccontextmanager
 from enum import IntEnum, StrEnum
-from typing import Tuple
+from typing import Any, AsyncIterator, Tuple
 
 import structlog
 import tldextract
@@ -13,6 +14,7 @@ from pydantic import BaseModel
 from skyvern.config import settings
 from skyvern.exceptions import (
     BitwardenAccessDeniedError,
+    BitwardenBaseError,
     BitwardenCreateCollectionError,
     BitwardenCreateCreditCardItemError,
     BitwardenCreateLoginItemError,
@@ -25,16 +27,16 @@ from skyvern.exceptions import (
     BitwardenUnlockError,
 )
 from skyvern.forge.sdk.api.aws import aws_client
-from skyvern.forge.sdk.core.aiohttp_helper import aiohttp_delete, aiohttp_get_json, aiohttp_post
 from skyvern.forge.sdk.schemas.credentials import (
     CredentialItem,
     CredentialType,
     CreditCardCredential,
     PasswordCredential,
 )
+from skyvern.forge.sdk.services.bitwarden_broker import BitwardenServeSession, BitwardenVault, bitwarden_session_broker
 
 LOG = structlog.get_logger()
-BITWARDEN_SERVER_BASE_URL = f"{settings.BITWARDEN_SERVER}:{settings.BITWARDEN_SERVER_PORT or 8002}"
+_cli_session_lock = asyncio.Lock()
 
 
 class BitwardenItemType(IntEnum):
@@ -135,6 +137,50 @@ class RunCommandResult(BaseModel):
     returncode: int
 
 
+class BitwardenCLIVault:
+    """
+    The vault through the CLI commands of an unlocked CLI session.
+    """
+
+    def __init__(self, session_key: str, timeout: int = 60) -> None:
+        self.session_key = session_key
+        self.timeout = timeout
+
+    async def get_item(self, item_id: str) -> dict[str, Any]:
+        command = ["bw", "get", "item", item_id, "--session", self.session_key]
+        item_result = await BitwardenService.run_command(command)
+        if item_result.stderr:
+            raise BitwardenGetItemError(f"Failed to get the bitwarden item {item_id}. Error: {item_result.stderr}")
+        try:
+            return json.loads(item_result.stdout)
+        except json.JSONDecodeError:
+            raise BitwardenGetItemError(f"Failed to parse item JSON for item ID: {item_id}")
+
+    async def list_items(
+        self,
+        search: str | None = None,
+        organization_id: str | None = None,
+        collection_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        list_command = ["bw", "list", "items"]
+        if search:
+            list_command.extend(["--search", search])
+        list_command.extend(["--session", self.session_key])
+        if collection_id:
+            list_command.extend(["--collectionid", collection_id])
+        if organization_id:
+            list_command.extend(["--organizationid", organization_id])
+        items_result = await BitwardenService.run_command(list_command, timeout=self.timeout)
+
+        if items_result.stderr and "Event post failed" not in items_result.stderr:
+            raise BitwardenListItemsError(items_result.stderr)
+
+        try:
+            return json.loads(items_result.stdout)
+        except json.JSONDecodeError:
+            raise BitwardenListItemsError("Failed to parse items JSON. Output: " + items_result.stdout)
+
+
 class BitwardenService:
     @staticmethod
     async def run_command(
@@ -194,6 +240,7 @@ class BitwardenService:
         item_id: str | None = None,
         max_retries: int = settings.BITWARDEN_MAX_RETRIES,
         timeout: int = settings.BITWARDEN_TIMEOUT_SECONDS,
+        session_key: str | None = None,
     ) -> dict[str, str]:
         """
         Get the secret value from the Bitwarden CLI.
@@ -217,6 +264,7 @@ class BitwardenService:
                         collection_id=collection_id,
                         item_id=item_id,
                         timeout=timeout,
+                        session_key=session_key,
                     )
             except BitwardenAccessDeniedError as e:
                 raise e
@@ -276,26 +324,16 @@ class BitwardenService:
         collection_id: str | None = None,
         item_id: str | None = None,
         timeout: int = 60,
+        session_key: str | None = None,
     ) -> dict[str, str]:
         """
         Get the secret value from the Bitwarden CLI.
         """
-        try:
-            await BitwardenService.login(client_id, client_secret)
-            await BitwardenService.sync()
-            session_key = await BitwardenService.unlock(master_password)
-
+        async with BitwardenService.vault(
+            client_id, client_secret, master_password, session_key, timeout=timeout
+        ) as vault:
             if item_id:  # if item_id provided, get single item by item id
-                command = ["bw", "get", "item", item_id, "--session", session_key]
-                item_result = await BitwardenService.run_command(command)
-                if item_result.stderr:
-                    raise BitwardenGetItemError(
-                        f"Failed to get the bitwarden item {item_id}. Error: {item_result.stderr}"
-                    )
-                try:
-                    item = json.loads(item_result.stdout)
-                except json.JSONDecodeError:
-                    raise BitwardenGetItemError(f"Failed to parse item JSON for item ID: {item_id}")
+                item = await vault.get_item(item_id)
 
                 login = item["login"]
                 totp = BitwardenService.extract_totp_secret(login.get("totp", ""))
@@ -312,37 +350,18 @@ class BitwardenService:
             # Extract the domain from the URL and search for items in Bitwarden with that domain
             extract_url = tldextract.extract(url)
             domain = extract_url.domain
-            list_command = [
-                "bw",
-                "list",
-                "items",
-                "--search",
-                domain,
-                "--session",
-                session_key,
-            ]
             if bw_organization_id:
                 LOG.info(
                     "Organization ID is provided, filtering items by organization ID",
                     bw_organization_id=bw_organization_id,
                 )
-                list_command.extend(["--organizationid", bw_organization_id])
+                items = await vault.list_items(domain, organization_id=bw_organization_id)
             elif collection_id:
                 LOG.info("Collection ID is provided, filtering items by collection ID", collection_id=collection_id)
-                list_command.extend(["--collectionid", collection_id])
+                items = await vault.list_items(domain, collection_id=collection_id)
             else:
                 LOG.error("No collection ID or organization ID provided -- this is required")
                 raise BitwardenListItemsError("No collection ID or organization ID provided -- this is required")
-            items_result = await BitwardenService.run_command(list_command, timeout=timeout)
-
-            if items_result.stderr and "Event post failed" not in items_result.stderr:
-                raise BitwardenListItemsError(items_result.stderr)
-
-            # Parse the items and extract credentials
-            try:
-                items = json.loads(items_result.stdout)
-            except json.JSONDecodeError:
-                raise BitwardenListItemsError("Failed to parse items JSON. Output: " + items_result.stdout)
 
             # Since Bitwarden can't AND multiple filters, we only use organization id in the list command
             # but we still need to filter the items by collection id here
@@ -394,9 +413,6 @@ class BitwardenService:
                             return single_result.credential
             LOG.warning("No credential in Bitwarden matches the rule, returning the first match")
             return bitwarden_result[0].credential
-        finally:
-            # Step 4: Log out
-            await BitwardenService.logout()
 
     @staticmethod
     async def get_sensitive_information_from_identity(
@@ -411,6 +427,7 @@ class BitwardenService:
         remaining_retries: int = settings.BITWARDEN_MAX_RETRIES,
         timeout: int = settings.BITWARDEN_TIMEOUT_SECONDS,
         fail_reasons: list[str] = [],
+        session_key: str | None = None,
     ) -> dict[str, str]:
         """
         Get the secret value from the Bitwarden CLI.
@@ -428,6 +445,7 @@ class BitwardenService:
                     collection_id=collection_id,
                     identity_key=identity_key,
                     identity_fields=identity_fields,
+                    session_key=session_key,
                 )
         except BitwardenAccessDeniedError as e:
             raise e
@@ -452,6 +470,7 @@ class BitwardenService:
                 # Double the timeout for the next retry
                 timeout=timeout * 2,
                 fail_reasons=fail_reasons + [f"{type(e).__name__}: {str(e)}"],
+                session_key=session_key,
             )
 
     @staticmethod
@@ -464,39 +483,19 @@ class BitwardenService:
         identity_fields: list[str],
         bw_organization_id: str | None,
         bw_collection_ids: list[str] | None,
+        session_key: str | None = None,
     ) -> dict[str, str]:
         """
         Get the sensitive information from the Bitwarden CLI.
         """
-        try:
-            await BitwardenService.login(client_id, client_secret)
-            await BitwardenService.sync()
-            session_key = await BitwardenService.unlock(master_password)
-
+        async with BitwardenService.vault(client_id, client_secret, master_password, session_key) as vault:
             if not bw_organization_id and not collection_id:
                 raise BitwardenAccessDeniedError()
 
             # Step 3: Retrieve the items
-            list_command = [
-                "bw",
-                "list",
-                "items",
-                "--search",
-                identity_key,
-                "--session",
-                session_key,
-                "--collectionid",
-                collection_id,
-            ]
-            if bw_organization_id:
-                list_command.extend(["--organizationid", bw_organization_id])
-            items_result = await BitwardenService.run_command(list_command)
-
-            # Parse the items and extract sensitive information
-            try:
-                items = json.loads(items_result.stdout)
-            except json.JSONDecodeError:
-                raise BitwardenListItemsError("Failed to parse items JSON. Output: " + items_result.stdout)
+            items = await vault.list_items(
+                identity_key, organization_id=bw_organization_id, collection_id=collection_id
+            )
             if not items:
                 raise BitwardenListItemsError(
                     f"No items found in Bitwarden for identity key: {identity_key} in collection with ID: {collection_id}"
@@ -529,9 +528,46 @@ class BitwardenService:
 
             return sensitive_information
 
-        finally:
-            # Step 4: Log out
-            await BitwardenService.logout()
+    @staticmethod
+    @asynccontextmanager
+    async def cli_session(
+        client_id: str, client_secret: str, master_password: str, session_key: str | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Log in, sync and unlock the vault, yield the session key and log out. The CLI keeps one login for the whole
+        process, so the sessions are taken one at a time. With a session key, the session is already open and reused.
+        """
+        if session_key is not None:
+            yield session_key
+            return
+
+        async with _cli_session_lock:
+            try:
+                await BitwardenService.login(client_id, client_secret)
+                await BitwardenService.sync()
+                yield await BitwardenService.unlock(master_password)
+            finally:
+                await BitwardenService.logout()
+
+    @staticmethod
+    @asynccontextmanager
+    async def vault(
+        client_id: str,
+        client_secret: str,
+        master_password: str,
+        session_key: str | None = None,
+        timeout: int = 60,
+    ) -> AsyncIterator[BitwardenVault]:
+        """
+        The vault of the credentials: the long-lived session of the broker when BITWARDEN_SESSION_BROKER_ENABLED is
+        set, otherwise the CLI commands of a CLI session.
+        """
+        if session_key is None and settings.BITWARDEN_SESSION_BROKER_ENABLED:
+            yield await bitwarden_session_broker.get_session(client_id, client_secret, master_password)
+            return
+
+        async with BitwardenService.cli_session(client_id, client_secret, master_password, session_key) as session_key:
+            yield BitwardenCLIVault(session_key, timeout=timeout)
 
     @staticmethod
     async def login(client_id: str, client_secret: str) -> None:
@@ -613,37 +649,19 @@ class BitwardenService:
         bw_collection_ids: list[str] | None,
         collection_id: str,
         item_id: str,
+        session_key: str | None = None,
     ) -> dict[str, str]:
         """
         Get the credit card data from the Bitwarden CLI.
         """
-        try:
-            await BitwardenService.login(client_id, client_secret)
-            await BitwardenService.sync()
-            session_key = await BitwardenService.unlock(master_password)
-
-            # Step 3: Get the item
-            get_command = [
-                "bw",
-                "get",
-                "item",
-                item_id,
-                "--session",
-                session_key,
-            ]
-
+        async with BitwardenService.vault(client_id, client_secret, master_password, session_key) as vault:
             # Bitwarden CLI doesn't support filtering by organization ID or collection ID for credit card data so we just raise an error if no collection ID or organization ID is provided
             if not bw_organization_id and not collection_id:
                 LOG.error("No collection ID or organization ID provided -- this is required")
                 raise BitwardenAccessDeniedError()
 
-            item_result = await BitwardenService.run_command(get_command)
-
-            # Parse the item and extract credit card data
-            try:
-                item = json.loads(item_result.stdout)
-            except json.JSONDecodeError:
-                raise BitwardenListItemsError(f"Failed to parse item JSON for item ID: {item_id}")
+            # Step 3: Get the item
+            item = await vault.get_item(item_id)
 
             if not item:
                 raise BitwardenListItemsError(f"No item found in Bitwarden for item ID: {item_id}")
@@ -676,9 +694,6 @@ class BitwardenService:
             }
 
             return mapped_credit_card_data
-        finally:
-            # Step 4: Log out
-            await BitwardenService.logout()
 
     @staticmethod
     async def get_credit_card_data(
@@ -691,6 +706,7 @@ class BitwardenService:
         item_id: str,
         remaining_retries: int = settings.BITWARDEN_MAX_RETRIES,
         fail_reasons: list[str] = [],
+        session_key: str | None = None,
     ) -> dict[str, str]:
         """
         Get the credit card data from the Bitwarden CLI.
@@ -705,6 +721,7 @@ class BitwardenService:
                     bw_collection_ids=bw_collection_ids,
                     collection_id=collection_id,
                     item_id=item_id,
+                    session_key=session_key,
                 )
         except BitwardenAccessDeniedError as e:
             raise e
@@ -726,22 +743,19 @@ class BitwardenService:
                 item_id=item_id,
                 remaining_retries=remaining_retries,
                 fail_reasons=fail_reasons + [f"{type(e).__name__}: {str(e)}"],
+                session_key=session_key,
             )
 
     @staticmethod
-    async def _unlock_using_server(master_password: str) -> None:
-        status_response = await aiohttp_get_json(f"{BITWARDEN_SERVER_BASE_URL}/status")
-        status = status_response["data"]["template"]["status"]
-        if status != "unlocked":
-            await aiohttp_post(f"{BITWARDEN_SERVER_BASE_URL}/unlock", data={"password": master_password})
+    async def _unlock_using_server(master_password: str) -> BitwardenServeSession:
+        session = bitwarden_session_broker.get_server_session(master_password)
+        await session.ensure_unlocked()
+        return session
 
     @staticmethod
-    async def _get_login_item_by_id_using_server(item_id: str) -> PasswordCredential:
-        response = await aiohttp_get_json(f"{BITWARDEN_SERVER_BASE_URL}/object/item/{item_id}")
-        if not response or response.get("success") is False:
-            raise BitwardenGetItemError(f"Failed to get login item by ID: {item_id}")
-
-        login = response["data"]["login"]
+    async def _get_login_item_by_id_using_server(session: BitwardenServeSession, item_id: str) -> PasswordCredential:
+        item = await session.get_item(item_id)
+        login = item["login"]
         totp = BitwardenService.extract_totp_secret(login.get("totp", ""))
         if not login:
             raise BitwardenGetItemError(f"Item with ID: {item_id} is not a login item")
@@ -754,16 +768,14 @@ class BitwardenService:
 
     @staticmethod
     async def _create_login_item_using_server(
+        session: BitwardenServeSession,
         bw_organization_id: str,
         collection_id: str,
         name: str,
         credential: PasswordCredential,
     ) -> str:
-        item_template = await aiohttp_get_json(f"{BITWARDEN_SERVER_BASE_URL}/object/template/item")
-        login_template = await aiohttp_get_json(f"{BITWARDEN_SERVER_BASE_URL}/object/template/item.login")
-
-        item_template = item_template["data"]["template"]
-        login_template = login_template["data"]["template"]
+        item_template = await session.get_template("item")
+        login_template = await session.get_template("item.login")
 
         login_template["username"] = credential.username
         login_template["password"] = credential.password
@@ -775,24 +787,23 @@ class BitwardenService:
         item_template["collectionIds"] = [collection_id]
         item_template["organizationId"] = bw_organization_id
 
-        response = await aiohttp_post(f"{BITWARDEN_SERVER_BASE_URL}/object/item", data=item_template)
+        response = await session.request("POST", "/object/item", data=item_template)
         if not response or response.get("success") is False:
             raise BitwardenCreateLoginItemError("Failed to create login item")
 
+        session.invalidate(response["data"]["id"])
         return response["data"]["id"]
 
     @staticmethod
     async def _create_credit_card_item_using_server(
+        session: BitwardenServeSession,
         bw_organization_id: str,
         collection_id: str,
         name: str,
         credential: CreditCardCredential,
     ) -> str:
-        item_template = await aiohttp_get_json(f"{BITWARDEN_SERVER_BASE_URL}/object/template/item")
-        credit_card_template = await aiohttp_get_json(f"{BITWARDEN_SERVER_BASE_URL}/object/template/item.card")
-
-        item_template = item_template["data"]["template"]
-        credit_card_template = credit_card_template["data"]["template"]
+        item_template = await session.get_template("item")
+        credit_card_template = await session.get_template("item.card")
 
         credit_card_template["cardholderName"] = credential.card_holder_name
         credit_card_template["number"] = credential.card_number
@@ -807,10 +818,11 @@ class BitwardenService:
         item_template["collectionIds"] = [collection_id]
         item_template["organizationId"] = bw_organization_id
 
-        response = await aiohttp_post(f"{BITWARDEN_SERVER_BASE_URL}/object/item", data=item_template)
+        response = await session.request("POST", "/object/item", data=item_template)
         if not response or response.get("success") is False:
             raise BitwardenCreateCreditCardItemError("Failed to create credit card item")
 
+        session.invalidate(response["data"]["id"])
         return response["data"]["id"]
 
     @staticmethod
@@ -822,9 +834,10 @@ class BitwardenService:
         try:
             master_password, bw_organization_id, _, _ = await BitwardenService._get_skyvern_auth_secrets()
 
-            await BitwardenService._unlock_using_server(master_password)
+            session = await BitwardenService._unlock_using_server(master_password)
             if isinstance(credential, PasswordCredential):
                 return await BitwardenService._create_login_item_using_server(
+                    session=session,
                     bw_organization_id=bw_organization_id,
                     collection_id=collection_id,
                     name=name,
@@ -832,6 +845,7 @@ class BitwardenService:
                 )
             else:
                 return await BitwardenService._create_credit_card_item_using_server(
+                    session=session,
                     bw_organization_id=bw_organization_id,
                     collection_id=collection_id,
                     name=name,
@@ -886,22 +900,25 @@ class BitwardenService:
         try:
             master_password, bw_organization_id, _, _ = await BitwardenService._get_skyvern_auth_secrets()
 
-            await BitwardenService._unlock_using_server(master_password)
-            return await BitwardenService._create_collection_using_server(bw_organization_id, name)
+            session = await BitwardenService._unlock_using_server(master_password)
+            return await BitwardenService._create_collection_using_server(session, bw_organization_id, name)
 
         except Exception as e:
             raise e
 
     @staticmethod
-    async def _create_collection_using_server(bw_organization_id: str, name: str) -> str:
-        collection_template_response = await aiohttp_get_json(f"{BITWARDEN_SERVER_BASE_URL}/object/template/collection")
-        collection_template = collection_template_response["data"]["template"]
+    async def _create_collection_using_server(
+        session: BitwardenServeSession, bw_organization_id: str, name: str
+    ) -> str:
+        collection_template = await session.get_template("collection")
 
         collection_template["name"] = name
         collection_template["organizationId"] = bw_organization_id
 
-        response = await aiohttp_post(
-            f"{BITWARDEN_SERVER_BASE_URL}/object/org-collection?organizationId={bw_organization_id}",
+        response = await session.request(
+            "POST",
+            "/object/org-collection",
+            params={"organizationId": bw_organization_id},
             data=collection_template,
         )
         if not response or response.get("success") is False:
@@ -925,20 +942,17 @@ class BitwardenService:
     ) -> list[CredentialItem]:
         try:
             master_password, _, _, _ = await BitwardenService._get_skyvern_auth_secrets()
-            await BitwardenService._unlock_using_server(master_password)
-            return await BitwardenService._get_items_by_item_ids_using_server(item_ids)
+            session = await BitwardenService._unlock_using_server(master_password)
+            return await BitwardenService._get_items_by_item_ids_using_server(session, item_ids)
         except Exception as e:
             raise e
 
     @staticmethod
-    async def _get_items_by_item_ids_using_server(item_ids: list[str]) -> list[CredentialItem]:
-        responses = await asyncio.gather(
-            *[aiohttp_get_json(f"{BITWARDEN_SERVER_BASE_URL}/object/item/{item_id}") for item_id in item_ids]
-        )
-        if not responses or any(response.get("success") is False for response in responses):
-            raise BitwardenGetItemError("Failed to get collection items")
-
-        return [get_list_response_item_from_bitwarden_item(response["data"]) for response in responses]
+    async def _get_items_by_item_ids_using_server(
+        session: BitwardenServeSession, item_ids: list[str]
+    ) -> list[CredentialItem]:
+        items = await asyncio.gather(*[session.get_item(item_id) for item_id in item_ids])
+        return [get_list_response_item_from_bitwarden_item(item) for item in items]
 
     @staticmethod
     async def get_collection_items(
@@ -946,20 +960,17 @@ class BitwardenService:
     ) -> list[CredentialItem]:
         try:
             master_password, _, _, _ = await BitwardenService._get_skyvern_auth_secrets()
-            await BitwardenService._unlock_using_server(master_password)
-            return await BitwardenService._get_collection_items_using_server(collection_id)
+            session = await BitwardenService._unlock_using_server(master_password)
+            return await BitwardenService._get_collection_items_using_server(session, collection_id)
         except Exception as e:
             raise e
 
     @staticmethod
-    async def _get_collection_items_using_server(collection_id: str) -> list[CredentialItem]:
-        response = await aiohttp_get_json(f"{BITWARDEN_SERVER_BASE_URL}/list/object/items?collectionId={collection_id}")
-        if not response or response.get("success") is False:
-            raise BitwardenGetItemError("Failed to get collection items")
-
-        items = response["data"]["data"]
-        items = map(lambda item: get_list_response_item_from_bitwarden_item(item), items)
-        return list(items)
+    async def _get_collection_items_using_server(
+        session: BitwardenServeSession, collection_id: str
+    ) -> list[CredentialItem]:
+        items = await session.list_items(collection_id=collection_id)
+        return [get_list_response_item_from_bitwarden_item(item) for item in items]
 
     @staticmethod
     async def get_credential_item(
@@ -967,20 +978,18 @@ class BitwardenService:
     ) -> CredentialItem:
         try:
             master_password, _, _, _ = await BitwardenService._get_skyvern_auth_secrets()
-            await BitwardenService._unlock_using_server(master_password)
-            return await BitwardenService._get_credential_item_by_id_using_server(item_id)
+            session = await BitwardenService._unlock_using_server(master_password)
+            return await BitwardenService._get_credential_item_by_id_using_server(session, item_id)
         except Exception as e:
             raise e
 
     @staticmethod
-    async def _get_credential_item_by_id_using_server(item_id: str) -> CredentialItem:
-        response = await aiohttp_get_json(f"{BITWARDEN_SERVER_BASE_URL}/object/item/{item_id}")
-        if not response or response.get("success") is False:
-            raise BitwardenGetItemError(f"Failed to get credential item by ID: {item_id}")
+    async def _get_credential_item_by_id_using_server(session: BitwardenServeSession, item_id: str) -> CredentialItem:
+        item = await session.get_item(item_id)
 
-        if response["data"]["type"] == BitwardenItemType.LOGIN:
-            login_item = response["data"]["login"]
-            name = response["data"]["name"]
+        if item["type"] == BitwardenItemType.LOGIN:
+            login_item = item["login"]
+            name = item["name"]
             return CredentialItem(
                 item_id=item_id,
                 credential_type=CredentialType.PASSWORD,
@@ -991,9 +1000,9 @@ class BitwardenService:
                     totp=login_item["totp"],
                 ),
             )
-        elif response["data"]["type"] == BitwardenItemType.CREDIT_CARD:
-            credit_card_item = response["data"]["card"]
-            name = response["data"]["name"]
+        elif item["type"] == BitwardenItemType.CREDIT_CARD:
+            credit_card_item = item["card"]
+            name = item["name"]
             return CredentialItem(
                 item_id=item_id,
                 credential_type=CredentialType.CREDIT_CARD,
@@ -1008,7 +1017,7 @@ class BitwardenService:
                 ),
             )
         else:
-            raise BitwardenGetItemError(f"Unsupported item type: {response['data']['type']}")
+            raise BitwardenGetItemError(f"Unsupported item type: {item['type']}")
 
     @staticmethod
     async def delete_credential_item(
@@ -1016,11 +1025,14 @@ class BitwardenService:
     ) -> None:
         try:
             master_password, _, _, _ = await BitwardenService._get_skyvern_auth_secrets()
-            await BitwardenService._unlock_using_server(master_password)
-            await BitwardenService._delete_credential_item_using_server(item_id)
+            session = await BitwardenService._unlock_using_server(master_password)
+            await BitwardenService._delete_credential_item_using_server(session, item_id)
         except Exception as e:
             raise e
 
     @staticmethod
-    async def _delete_credential_item_using_server(item_id: str) -> None:
-        await aiohttp_delete(f"{BITWARDEN_SERVER_BASE_URL}/object/item/{item_id}")
+    async def _delete_credential_item_using_server(session: BitwardenServeSession, item_id: str) -> None:
+        response = await session.request("DELETE", f"/object/item/{item_id}")
+        session.invalidate(item_id)
+        if response.get("success") is False:
+            raise BitwardenBaseError(f"Failed to delete item {item_id}. Error: {response.get('message')}")
@@ -0,0 +1,380 @@
+"""
+Long-lived Bitwarden sessions over the Vault Management API of `bw serve`. A `bw serve` process is unlocked once and
+serves every lookup of its vault over HTTP, instead of a `bw login`, `bw sync`, `bw unlock` and `bw logout`
+subprocess per lookup.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import shutil
+import socket
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Protocol
+
+import aiohttp
+import structlog
+
+from skyvern.config import settings
+from skyvern.exceptions import BitwardenGetItemError, BitwardenListItemsError, BitwardenLoginError, BitwardenUnlockError
+
+LOG = structlog.get_logger()
+
+
+class BitwardenVault(Protocol):
+    async def get_item(self, item_id: str) -> dict[str, Any]: ...
+
+    async def list_items(
+        self,
+        search: str | None = None,
+        organization_id: str | None = None,
+        collection_id: str | None = None,
+    ) -> list[dict[str, Any]]: ...
+
+
+def _is_locked(response: dict[str, Any]) -> bool:
+    return response.get("success") is False and "locked" in str(response.get("message", "")).lower()
+
+
+class BitwardenServeSession:
+    """
+    The unlocked vault of one `bw serve` process. The items, item lists and templates are cached for
+    BITWARDEN_ITEM_CACHE_TTL_SECONDS and the concurrent lookups of the same key share one request. The writes go
+    through request() and must call invalidate().
+
+    With sync_interval_seconds, a cache miss syncs the vault first if the last sync is older than that, so the changes
+    made in the vault by others are seen.
+
+    The HTTP session is bound to the event loop it was opened in, so another loop opens its own.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        master_password: str,
+        item_cache_ttl_seconds: float | None = None,
+        sync_interval_seconds: float | None = None,
+        process: asyncio.subprocess.Process | None = None,
+        appdata_dir: str | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.master_password = master_password
+        self.item_cache_ttl_seconds = (
+            item_cache_ttl_seconds if item_cache_ttl_seconds is not None else settings.BITWARDEN_ITEM_CACHE_TTL_SECONDS
+        )
+        self.sync_interval_seconds = sync_interval_seconds
+        # the number of requests sent to the server
+        self.requests = 0
+        self._process = process
+        self._appdata_dir = appdata_dir
+        self._http: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._unlocked = False
+        self._unlock_lock = asyncio.Lock()
+        self._sync_lock = asyncio.Lock()
+        self._last_sync_time: float | None = None
+        self._cache: dict[tuple, tuple[float, Any]] = {}
+        self._in_flight: dict[tuple, asyncio.Future[Any]] = {}
+        # bumped by invalidate() so the lookups in flight don't cache what they read before
+        self._generation = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is None or self._process.returncode is None
+
+    def _get_http(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.closed or self._loop is not loop:
+            # a session of a closed loop can't be closed anymore, it's dropped
+            self._http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=settings.BITWARDEN_TIMEOUT_SECONDS))
+            self._loop = loop
+            self._unlock_lock = asyncio.Lock()
+            self._sync_lock = asyncio.Lock()
+            self._in_flight = {}
+        return self._http
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str] | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        http = self._get_http()
+        self.requests += 1
+        async with http.request(method, f"{self.base_url}{path}", params=params, json=data) as response:
+            text = await response.text()
+        try:
+            body = json.loads(text)
+        except ValueError:
+            body = {"success": False, "message": text}
+        if not isinstance(body, dict):
+            return {"success": False, "message": str(body)}
+        return body
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str] | None = None,
+        data: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        await self.ensure_unlocked()
+        response = await self._send(method, path, params=params, data=data)
+        if _is_locked(response):
+            # the vault was locked meanwhile, e.g. by a lock from another client of the server
+            self._unlocked = False
+            await self.ensure_unlocked()
+            response = await self._send(method, path, params=params, data=data)
+        return response
+
+    async def ensure_unlocked(self) -> None:
+        if self._unlocked:
+            return
+        self._get_http()
+        async with self._unlock_lock:
+            if self._unlocked:
+                return
+            status_response = await self._send("GET", "/status")
+            status = status_response.get("data", {}).get("template", {}).get("status")
+            if status != "unlocked":
+                unlock_response = await self._send("POST", "/unlock", data={"password": self.master_password})
+                if unlock_response.get("success") is False:
+                    raise BitwardenUnlockError(f"Failed to unlock the vault: {unlock_response.get('message')}")
+            self._unlocked = True
+
+    async def wait_until_ready(self, timeout: float) -> None:
+        async with asyncio.timeout(timeout):
+            while True:
+                if not self.is_running:
+                    raise BitwardenLoginError("bw serve exited before it was ready")
+                try:
+                    await self._send("GET", "/status")
+                    return
+                except aiohttp.ClientError:
+                    await asyncio.sleep(0.2)
+
+    async def _cached(self, key: tuple, load: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return copy.deepcopy(cached[1])
+
+        self._get_http()
+        await self._sync_if_stale()
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(self._load(key, load))
+            self._in_flight[key] = in_flight
+            in_flight.add_done_callback(
+                lambda done: self._in_flight.pop(key) if self._in_flight.get(key) is done else None
+            )
+        return copy.deepcopy(await asyncio.shield(in_flight))
+
+    async def _load(self, key: tuple, load: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generation
+        value = await load()
+        if generation == self._generation:
+            self._cache[key] = (time.monotonic() + self.item_cache_ttl_seconds, value)
+        return value
+
+    def invalidate(self, item_id: str | None = None) -> None:
+        """
+        Drop the cached item and every cached item list, or the whole cache without an item id.
+        """
+        self._generation += 1
+        self._in_flight = {}
+        if item_id is None:
+            self._cache = {key: value for key, value in self._cache.items() if key[0] == "template"}
+            return
+        self._cache.pop(("item", item_id), None)
+        self._cache = {key: value for key, value in self._cache.items() if key[0] != "items"}
+
+    async def get_item(self, item_id: str) -> dict[str, Any]:
+        async def load() -> dict[str, Any]:
+            response = await self.request("GET", f"/object/item/{item_id}")
+            if response.get("success") is False or not response.get("data"):
+                raise BitwardenGetItemError(
+                    f"Failed to get the bitwarden item {item_id}. Error: {response.get('message')}"
+                )
+            return response["data"]
+
+        return await self._cached(("item", item_id), load)
+
+    async def list_items(
+        self,
+        search: str | None = None,
+        organization_id: str | None = None,
+        collection_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        params = {
+            name: value
+            for name, value in (
+                ("search", search),
+                ("organizationId", organization_id),
+                ("collectionId", collection_id),
+            )
+            if value
+        }
+
+        async def load() -> list[dict[str, Any]]:
+            response = await self.request("GET", "/list/object/items", params=params)
+            if response.get("success") is False or "data" not in response:
+                raise BitwardenListItemsError(f"Failed to list items. Error: {response.get('message')}")
+            return response["data"]["data"]
+
+        return await self._cached(("items", tuple(sorted(params.items()))), load)
+
+    async def get_template(self, name: str) -> dict[str, Any]:
+        async def load() -> dict[str, Any]:
+            response = await self.request("GET", f"/object/template/{name}")
+            return response["data"]["template"]
+
+        return await self._cached(("template", name), load)
+
+    def _is_sync_stale(self) -> bool:
+        if self.sync_interval_seconds is None:
+            return False
+        return self._last_sync_time is None or time.monotonic() - self._last_sync_time >= self.sync_interval_seconds
+
+    async def _sync_if_stale(self) -> None:
+        if not self._is_sync_stale():
+            return
+        async with self._sync_lock:
+            # synced by a concurrent lookup meanwhile
+            if self._is_sync_stale():
+                await self.sync()
+
+    async def sync(self) -> None:
+        response = await self.request("POST", "/sync")
+        if response.get("success") is False:
+            LOG.warning("Failed to sync the Bitwarden vault", message=response.get("message"))
+        self._last_sync_time = time.monotonic()
+        self.invalidate()
+
+    async def close(self) -> None:
+        if self._http is not None and self._loop is asyncio.get_running_loop():
+            await self._http.close()
+        self._http = None
+        if self._process is not None and self._process.returncode is None:
+            self._process.terminate()
+            try:
+                async with asyncio.timeout(5):
+                    await self._process.wait()
+            except TimeoutError:
+                self._process.kill()
+        if self._appdata_dir:
+            shutil.rmtree(self._appdata_dir, ignore_errors=True)
+
+
+def _get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class BitwardenSessionBroker:
+    """
+    One unlocked session per Bitwarden server and per set of credentials, shared by the lookups of the process.
+
+    The sessions of a set of credentials are `bw serve` processes started by the broker, each with its own CLI data
+    directory so their logins don't collide. The server session talks to the `bw serve` at BITWARDEN_SERVER.
+    """
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, BitwardenServeSession] = {}
+        self._start_lock: asyncio.Lock | None = None
+        self._start_lock_loop: asyncio.AbstractEventLoop | None = None
+
+    def get_server_session(self, master_password: str) -> BitwardenServeSession:
+        base_url = f"{settings.BITWARDEN_SERVER}:{settings.BITWARDEN_SERVER_PORT or 8002}"
+        session = self._sessions.get(base_url)
+        if session is None or session.master_password != master_password:
+            session = BitwardenServeSession(base_url, master_password)
+            self._sessions[base_url] = session
+        return session
+
+    async def get_session(self, client_id: str, client_secret: str, master_password: str) -> BitwardenServeSession:
+        key = hashlib.sha256(f"{client_id}\n{client_secret}\n{master_password}".encode()).hexdigest()
+        session = self._sessions.get(key)
+        if session and session.is_running:
+            return session
+
+        loop = asyncio.get_running_loop()
+        if self._start_lock is None or self._start_lock_loop is not loop:
+            self._start_lock = asyncio.Lock()
+            self._start_lock_loop = loop
+        async with self._start_lock:
+            session = self._sessions.get(key)
+            if session and session.is_running:
+                return session
+            if session:
+                LOG.warning("bw serve exited, starting it again")
+                await session.close()
+            session = await self.start_session(client_id, client_secret, master_password)
+            self._sessions[key] = session
+            return session
+
+    async def start_session(self, client_id: str, client_secret: str, master_password: str) -> BitwardenServeSession:
+        """
+        Log in with the API key in a CLI data directory of its own, start `bw serve` on a free local port, unlock and
+        sync the vault.
+        """
+        appdata_dir = tempfile.mkdtemp(prefix="skyvern-bw-")
+        env = {**os.environ, "NODE_NO_WARNINGS": "1", "BITWARDENCLI_APPDATA_DIR": appdata_dir}
+        session: BitwardenServeSession | None = None
+        try:
+            login = await asyncio.create_subprocess_exec(
+                "bw",
+                "login",
+                "--apikey",
+                env={**env, "BW_CLIENTID": client_id, "BW_CLIENTSECRET": client_secret},
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await login.communicate()
+            if login.returncode != 0:
+                raise BitwardenLoginError(f"Failed to log in. stderr: {stderr.decode()}")
+
+            port = _get_free_port()
+            process = await asyncio.create_subprocess_exec(
+                "bw",
+                "serve",
+                "--hostname",
+                "127.0.0.1",
+                "--port",
+                str(port),
+                env=env,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            session = BitwardenServeSession(
+                f"http://127.0.0.1:{port}",
+                master_password,
+                sync_interval_seconds=settings.BITWARDEN_SYNC_INTERVAL_SECONDS,
+                process=process,
+                appdata_dir=appdata_dir,
+            )
+            await session.wait_until_ready(settings.BITWARDEN_TIMEOUT_SECONDS)
+            await session.sync()
+            LOG.info("Started a Bitwarden session", port=port)
+            return session
+        except BaseException:
+            if session is not None:
+                await session.close()
+            else:
+                shutil.rmtree(appdata_dir, ignore_errors=True)
+            raise
+
+    async def close(self) -> None:
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            try:
+                await session.close()
+            except Exception:
+                LOG.warning("Failed to close a Bitwarden session", exc_info=True)
+
+
+bitwarden_session_broker = BitwardenSessionBroker()
@@ -1,6 +1,9 @@
+import asyncio
 import copy
+import time
 import uuid
-from typing import TYPE_CHECKING, Any, Self
+from functools import partial
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Coroutine, Self, Sequence
 
 import structlog
 from onepassword.client import Client as OnePasswordClient
@@ -42,6 +45,22 @@ if TYPE_CHECKING:
 LOG = structlog.get_logger()
 
 BlockMetadata = dict[str, str | int | float | bool | dict | list]
+# the secret parameters resolved by one lookup
+SecretLookup = tuple[list[Parameter], Callable[[], Awaitable[None]]]
+
+
+async def _run_all(coroutines: list[Coroutine[Any, Any, None]]) -> None:
+    """
+    Run the coroutines concurrently. The first failure cancels the others and is raised as is.
+    """
+    tasks = [asyncio.create_task(coroutine) for coroutine in coroutines]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
 
 
 class WorkflowRunContext:
@@ -63,11 +82,10 @@ class WorkflowRunContext:
     ) -> Self:
         # key is label name
         workflow_run_context = cls(aws_client=aws_client)
+        credential_id_parameters: list[tuple[WorkflowParameter, Any]] = []
         for parameter, run_parameter in workflow_parameter_tuples:
             if parameter.workflow_parameter_type == WorkflowParameterType.CREDENTIAL_ID:
-                await workflow_run_context.register_secret_workflow_parameter_value(
-                    parameter, run_parameter.value, organization
-                )
+                credential_id_parameters.append((parameter, run_parameter.value))
                 continue
             if parameter.key in workflow_run_context.parameters:
                 prev_value = workflow_run_context.parameters[parameter.key]
@@ -84,25 +102,7 @@ class WorkflowRunContext:
                 raise OutputParameterKeyCollisionError(output_parameter.key)
             workflow_run_context.parameters[output_parameter.key] = output_parameter
 
-        for secrete_parameter in secret_parameters:
-            if isinstance(secrete_parameter, AWSSecretParameter):
-                await workflow_run_context.register_aws_secret_parameter_value(secrete_parameter)
-            elif isinstance(secrete_parameter, CredentialParameter):
-                await workflow_run_context.register_credential_parameter_value(secrete_parameter, organization)
-            elif isinstance(secrete_parameter, OnePasswordCredentialParameter):
-                await workflow_run_context.register_onepassword_credential_parameter_value(secrete_parameter)
-            elif isinstance(secrete_parameter, BitwardenLoginCredentialParameter):
-                await workflow_run_context.register_bitwarden_login_credential_parameter_value(
-                    secrete_parameter, organization
-                )
-            elif isinstance(secrete_parameter, BitwardenCreditCardDataParameter):
-                await workflow_run_context.register_bitwarden_credit_card_data_parameter_value(
-                    secrete_parameter, organization
-                )
-            elif isinstance(secrete_parameter, BitwardenSensitiveInformationParameter):
-                await workflow_run_context.register_bitwarden_sensitive_information_parameter_value(
-                    secrete_parameter, organization
-                )
+        await workflow_run_context.resolve_secret_parameters(organization, credential_id_parameters, secret_parameters)
 
         for context_parameter in context_parameters:
             # All context parameters will be registered with the context manager during initialization but the values
@@ -118,6 +118,138 @@ class WorkflowRunContext:
         self.values: dict[str, Any] = {}
         self.secrets: dict[str, Any] = {}
         self._aws_client = aws_client
+        # the Bitwarden client id, client secret and master password by their AWS secret keys
+        self._bitwarden_credentials: dict[tuple[str, str, str], tuple[str, str, str]] = {}
+
+    async def resolve_secret_parameters(
+        self,
+        organization: Organization,
+        credential_id_parameters: list[tuple[WorkflowParameter, Any]],
+        secret_parameters: Sequence[Parameter],
+    ) -> None:
+        """
+        Resolve the secret parameters concurrently, at most WORKFLOW_SECRET_RESOLUTION_CONCURRENCY at a time. A secret
+        parameter that refers to the key of another one (e.g. a credential id taken from an AWS secret) waits for it.
+        The Bitwarden lookups against the same vault share one CLI session.
+        """
+        semaphore = asyncio.Semaphore(settings.WORKFLOW_SECRET_RESOLUTION_CONCURRENCY)
+        lookups: list[SecretLookup] = [
+            ([parameter], partial(self.register_secret_workflow_parameter_value, parameter, value, organization))
+            for parameter, value in credential_id_parameters
+        ]
+
+        pending = list(secret_parameters)
+        while lookups or pending:
+            pending_keys = {parameter.key for parameter in pending}
+            ready = [
+                parameter
+                for parameter in pending
+                if not (self._referenced_parameter_keys(parameter) & (pending_keys - {parameter.key}))
+            ]
+            # a reference cycle can't be resolved in order, keep the order of the workflow definition
+            ready = ready or pending
+            pending = [parameter for parameter in pending if parameter not in ready]
+            lookups.extend(await self._plan_secret_lookups(organization, ready))
+            await _run_all([self._resolve_timed(semaphore, parameters, lookup) for parameters, lookup in lookups])
+            lookups = []
+
+    @staticmethod
+    def _referenced_parameter_keys(parameter: Parameter) -> set[str]:
+        return {value for value in parameter.model_dump().values() if isinstance(value, str)}
+
+    async def _plan_secret_lookups(self, organization: Organization, parameters: list[Parameter]) -> list[SecretLookup]:
+        lookups: list[SecretLookup] = []
+        bitwarden_parameters: list[
+            BitwardenLoginCredentialParameter
+            | BitwardenSensitiveInformationParameter
+            | BitwardenCreditCardDataParameter
+        ] = []
+        for parameter in parameters:
+            if isinstance(
+                parameter,
+                (
+                    BitwardenLoginCredentialParameter,
+                    BitwardenSensitiveInformationParameter,
+                    BitwardenCreditCardDataParameter,
+                ),
+            ):
+                bitwarden_parameters.append(parameter)
+            else:
+                lookups.append(([parameter], partial(self._register_secret_parameter_value, parameter, organization)))
+
+        # read the credentials of each vault once
+        parameter_by_secret_keys = {
+            self._bitwarden_aws_secret_keys(parameter): parameter for parameter in bitwarden_parameters
+        }
+        await asyncio.gather(
+            *(self._get_bitwarden_credentials(parameter) for parameter in parameter_by_secret_keys.values())
+        )
+        vaults: dict[tuple[str, str, str], list[Parameter]] = {}
+        for parameter in bitwarden_parameters:
+            vault_credentials = await self._get_bitwarden_credentials(parameter)
+            vaults.setdefault(vault_credentials, []).append(parameter)
+        for vault_credentials, vault_parameters in vaults.items():
+            lookups.append(
+                (
+                    vault_parameters,
+                    partial(
+                        self._register_bitwarden_vault_parameter_values,
+                        vault_credentials,
+                        vault_parameters,
+                        organization,
+                    ),
+                )
+            )
+        return lookups
+
+    async def _register_bitwarden_vault_parameter_values(
+        self,
+        vault_credentials: tuple[str, str, str],
+        parameters: list[Parameter],
+        organization: Organization,
+    ) -> None:
+        if len(parameters) == 1 or settings.BITWARDEN_SESSION_BROKER_ENABLED:
+            # the lookups through the broker already share its long-lived session
+            await _run_all([self._register_secret_parameter_value(parameter, organization) for parameter in parameters])
+            return
+        async with BitwardenService.cli_session(*vault_credentials) as session_key:
+            for parameter in parameters:
+                await self._register_secret_parameter_value(parameter, organization, session_key=session_key)
+
+    async def _register_secret_parameter_value(
+        self,
+        parameter: Parameter,
+        organization: Organization,
+        session_key: str | None = None,
+    ) -> None:
+        if isinstance(parameter, AWSSecretParameter):
+            await self.register_aws_secret_parameter_value(parameter)
+        elif isinstance(parameter, CredentialParameter):
+            await self.register_credential_parameter_value(parameter, organization)
+        elif isinstance(parameter, OnePasswordCredentialParameter):
+            await self.register_onepassword_credential_parameter_value(parameter)
+        elif isinstance(parameter, BitwardenLoginCredentialParameter):
+            await self.register_bitwarden_login_credential_parameter_value(parameter, organization, session_key)
+        elif isinstance(parameter, BitwardenCreditCardDataParameter):
+            await self.register_bitwarden_credit_card_data_parameter_value(parameter, organization, session_key)
+        elif isinstance(parameter, BitwardenSensitiveInformationParameter):
+            await self.register_bitwarden_sensitive_information_parameter_value(parameter, organization, session_key)
+
+    @staticmethod
+    async def _resolve_timed(
+        semaphore: asyncio.Semaphore,
+        parameters: list[Parameter],
+        lookup: Callable[[], Awaitable[None]],
+    ) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await lookup()
+            LOG.info(
+                "Resolved secret parameters",
+                parameter_keys=[parameter.key for parameter in parameters],
+                parameter_types=[parameter.parameter_type for parameter in parameters],
+                duration_ms=round((time.perf_counter() - start) * 1000, 2),
+            )
 
     def get_parameter(self, key: str) -> Parameter:
         return self.parameters[key]
@@ -359,11 +491,28 @@ class WorkflowRunContext:
                 self.secrets[secret_id] = field.value
                 self.values[parameter.key][key] = secret_id
 
-    async def register_bitwarden_login_credential_parameter_value(
+    @staticmethod
+    def _bitwarden_aws_secret_keys(
+        parameter: BitwardenLoginCredentialParameter
+        | BitwardenSensitiveInformationParameter
+        | BitwardenCreditCardDataParameter,
+    ) -> tuple[str, str, str]:
+        return (
+            parameter.bitwarden_client_id_aws_secret_key,
+            parameter.bitwarden_client_secret_aws_secret_key,
+            parameter.bitwarden_master_password_aws_secret_key,
+        )
+
+    async def _get_bitwarden_credentials(
         self,
-        parameter: BitwardenLoginCredentialParameter,
-        organization: Organization,
-    ) -> None:
+        parameter: BitwardenLoginCredentialParameter
+        | BitwardenSensitiveInformationParameter
+        | BitwardenCreditCardDataParameter,
+    ) -> tuple[str, str, str]:
+        aws_secret_keys = self._bitwarden_aws_secret_keys(parameter)
+        if aws_secret_keys in self._bitwarden_credentials:
+            return self._bitwarden_credentials[aws_secret_keys]
+
         try:
             # Get the Bitwarden login credentials from AWS secrets
             client_id = settings.BITWARDEN_CLIENT_ID or await self._aws_client.get_secret(
@@ -386,6 +535,17 @@ class WorkflowRunContext:
         if not master_password:
             raise ValueError("Bitwarden master password not found")
 
+        self._bitwarden_credentials[aws_secret_keys] = (client_id, client_secret, master_password)
+        return client_id, client_secret, master_password
+
+    async def register_bitwarden_login_credential_parameter_value(
+        self,
+        parameter: BitwardenLoginCredentialParameter,
+        organization: Organization,
+        session_key: str | None = None,
+    ) -> None:
+        client_id, client_secret, master_password = await self._get_bitwarden_credentials(parameter)
+
         if (
             parameter.url_parameter_key
             and self.has_parameter(parameter.url_parameter_key)
@@ -427,6 +587,7 @@ class WorkflowRunContext:
                 url,
                 collection_id=collection_id,
                 item_id=item_id,
+                session_key=session_key,
             )
             if secret_credentials:
                 self.secrets[BitwardenConstants.BW_ORGANIZATION_ID] = organization.bw_organization_id
@@ -466,28 +627,9 @@ class WorkflowRunContext:
         self,
         parameter: BitwardenSensitiveInformationParameter,
         organization: Organization,
+        session_key: str | None = None,
     ) -> None:
-        try:
-            # Get the Bitwarden login credentials from AWS secrets
-            client_id = settings.BITWARDEN_CLIENT_ID or await self._aws_client.get_secret(
-                parameter.bitwarden_client_id_aws_secret_key
-            )
-            client_secret = settings.BITWARDEN_CLIENT_SECRET or await self._aws_client.get_secret(
-                parameter.bitwarden_client_secret_aws_secret_key
-            )
-            master_password = settings.BITWARDEN_MASTER_PASSWORD or await self._aws_client.get_secret(
-                parameter.bitwarden_master_password_aws_secret_key
-            )
-        except Exception as e:
-            LOG.error(f"Failed to get Bitwarden login credentials from AWS secrets. Error: {e}")
-            raise e
-
-        if not client_id:
-            raise ValueError("Bitwarden client ID not found")
-        if not client_secret:
-            raise ValueError("Bitwarden client secret not found")
-        if not master_password:
-            raise ValueError("Bitwarden master password not found")
+        client_id, client_secret, master_password = await self._get_bitwarden_credentials(parameter)
 
         bitwarden_identity_key = parameter.bitwarden_identity_key
         if self.has_parameter(parameter.bitwarden_identity_key) and self.has_value(parameter.bitwarden_identity_key):
@@ -507,6 +649,7 @@ class WorkflowRunContext:
                 collection_id,
                 bitwarden_identity_key,
                 parameter.bitwarden_identity_fields,
+                session_key=session_key,
             )
             if sensitive_values:
                 self.secrets[BitwardenConstants.BW_ORGANIZATION_ID] = organization.bw_organization_id
@@ -533,28 +676,9 @@ class WorkflowRunContext:
         self,
         parameter: BitwardenCreditCardDataParameter,
         organization: Organization,
+        session_key: str | None = None,
     ) -> None:
-        try:
-            # Get the Bitwarden login credentials from AWS secrets
-            client_id = settings.BITWARDEN_CLIENT_ID or await self._aws_client.get_secret(
-                parameter.bitwarden_client_id_aws_secret_key
-            )
-            client_secret = settings.BITWARDEN_CLIENT_SECRET or await self._aws_client.get_secret(
-                parameter.bitwarden_client_secret_aws_secret_key
-            )
-            master_password = settings.BITWARDEN_MASTER_PASSWORD or await self._aws_client.get_secret(
-                parameter.bitwarden_master_password_aws_secret_key
-            )
-        except Exception as e:
-            LOG.error(f"Failed to get Bitwarden login credentials from AWS secrets. Error: {e}")
-            raise e
-
-        if not client_id:
-            raise ValueError("Bitwarden client ID not found")
-        if not client_secret:
-            raise ValueError("Bitwarden client secret not found")
-        if not master_password:
-            raise ValueError("Bitwarden master password not found")
+        client_id, client_secret, master_password = await self._get_bitwarden_credentials(parameter)
 
         if self.has_parameter(parameter.bitwarden_item_id) and self.has_value(parameter.bitwarden_item_id):
             item_id = self.values[parameter.bitwarden_item_id]
@@ -575,6 +699,7 @@ class WorkflowRunContext:
                 organization.bw_collection_ids,
                 collection_id,
                 item_id,
+                session_key=session_key,
             )
             if not credit_card_data:
                 raise ValueError("Credit card data not found in Bitwarden")
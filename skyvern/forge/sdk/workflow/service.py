@@ -17,6 +17,7 @@ from skyvern.exceptions import (
     MissingValueForParameter,
     SkyvernException,
     WorkflowNotFound,
+    WorkflowRunBlockNotFound,
     WorkflowRunNotFound,
 )
 from skyvern.forge import app
@@ -29,7 +30,7 @@ from skyvern.forge.sdk.models import Step, StepStatus
 from skyvern.forge.sdk.schemas.files import FileInfo
 from skyvern.forge.sdk.schemas.organizations import Organization
 from skyvern.forge.sdk.schemas.tasks import Task
-from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock, WorkflowRunTimeline, WorkflowRunTimelineType
+from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock, WorkflowRunTimeline
 from skyvern.forge.sdk.trace import TraceManager
 from skyvern.forge.sdk.workflow.exceptions import (
     ContextParameterSourceNotDefined,
@@ -97,6 +98,7 @@ from skyvern.forge.sdk.workflow.models.yaml import (
     WorkflowCreateYAMLRequest,
     WorkflowDefinitionYAML,
 )
+from skyvern.forge.sdk.workflow.timeline import build_workflow_run_timeline, iter_timeline_blocks
 from skyvern.schemas.runs import ProxyLocation, RunStatus, RunType, WorkflowRunRequest, WorkflowRunResponse
 from skyvern.webeye.browser_factory import BrowserState
 
@@ -1277,6 +1279,9 @@ class WorkflowService:
                     browser_state.browser_artifacts.browser_session_dir,
                 )
                 LOG.info("Persisted browser session for workflow run", workflow_run_id=workflow_run.workflow_run_id)
+        else:
+            # the recording can't be finalized without the browser
+            await app.ARTIFACT_MANAGER.abort_recording_uploads(task_ids=all_workflow_task_ids)
 
         await app.ARTIFACT_MANAGER.wait_for_upload_aiotasks(all_workflow_task_ids)
 
@@ -1409,18 +1414,25 @@ class WorkflowService:
     async def persist_video_data(
         self, browser_state: BrowserState, workflow: Workflow, workflow_run: WorkflowRun
     ) -> None:
-        # Create recording artifact after closing the browser, so we can get an accurate recording
+        # Complete the recording artifact after closing the browser, so we can get an accurate recording
         video_artifacts = await app.BROWSER_MANAGER.get_video_artifacts(
             workflow_id=workflow.workflow_id,
             workflow_run_id=workflow_run.workflow_run_id,
             browser_state=browser_state,
         )
         for video_artifact in video_artifacts:
-            await app.ARTIFACT_MANAGER.update_artifact_data(
-                artifact_id=video_artifact.video_artifact_id,
-                organization_id=workflow_run.organization_id,
-                data=video_artifact.video_data,
-            )
+            try:
+                await app.ARTIFACT_MANAGER.finalize_recording(
+                    artifact_id=video_artifact.video_artifact_id,
+                    organization_id=workflow_run.organization_id,
+                    path=video_artifact.video_path,
+                )
+            except Exception:
+                LOG.exception(
+                    "Failed to upload the recording",
+                    workflow_run_id=workflow_run.workflow_run_id,
+                    artifact_id=video_artifact.video_artifact_id,
+                )
 
     async def persist_har_data(
         self,
@@ -2166,51 +2178,37 @@ class WorkflowService:
         self,
         workflow_run_id: str,
         organization_id: str | None = None,
+        parent_workflow_run_block_id: str | None = None,
+        expand_loops: bool = True,
     ) -> list[WorkflowRunTimeline]:
         """
-        build the tree structure of the workflow run timeline
+        build the tree structure of the workflow run timeline, or of the children of parent_workflow_run_block_id.
+        without expand_loops, the iterations of the loop blocks are left out and can be fetched with the loop block as
+        the parent.
         """
         workflow_run_blocks = await app.DATABASE.get_workflow_run_blocks(
             workflow_run_id=workflow_run_id,
             organization_id=organization_id,
         )
-        # get all the actions for all workflow run blocks
-        task_ids = [block.task_id for block in workflow_run_blocks if block.task_id]
+        if parent_workflow_run_block_id and not any(
+            block.workflow_run_block_id == parent_workflow_run_block_id for block in workflow_run_blocks
+        ):
+            raise WorkflowRunBlockNotFound(parent_workflow_run_block_id)
+        timeline = build_workflow_run_timeline(
+            workflow_run_blocks,
+            parent_workflow_run_block_id=parent_workflow_run_block_id,
+            expand_loops=expand_loops,
+        )
+
+        # get the actions of the task blocks in the timeline
         task_id_to_block: dict[str, WorkflowRunBlock] = {
-            block.task_id: block for block in workflow_run_blocks if block.task_id
+            block.task_id: block for block in iter_timeline_blocks(timeline) if block.task_id
         }
-        actions = await app.DATABASE.get_tasks_actions(task_ids=task_ids, organization_id=organization_id)
+        if not task_id_to_block:
+            return timeline
+        actions = await app.DATABASE.get_tasks_actions(task_ids=list(task_id_to_block), organization_id=organization_id)
         for action in actions:
             if not action.task_id:
                 continue
-            task_block = task_id_to_block[action.task_id]
-            task_block.actions.append(action)
-
-        result = []
-        block_map: dict[str, WorkflowRunTimeline] = {}
-        counter = 0
-        while workflow_run_blocks:
-            counter += 1
-            block = workflow_run_blocks.pop(0)
-            workflow_run_timeline = WorkflowRunTimeline(
-                type=WorkflowRunTimelineType.block,
-                block=block,
-                created_at=block.created_at,
-                modified_at=block.modified_at,
-            )
-            if block.parent_workflow_run_block_id:
-                if block.parent_workflow_run_block_id in block_map:
-                    block_map[block.parent_workflow_run_block_id].children.append(workflow_run_timeline)
-                    block_map[block.workflow_run_block_id] = workflow_run_timeline
-                else:
-                    # put the block back to the queue
-                    workflow_run_blocks.append(block)
-            else:
-                result.append(workflow_run_timeline)
-                block_map[block.workflow_run_block_id] = workflow_run_timeline
-
-            if counter > 1000:
-                LOG.error("Too many blocks in the workflow run", workflow_run_id=workflow_run_id)
-                break
-
-        return result
+            task_id_to_block[action.task_id].actions.append(action)
+        return timeline
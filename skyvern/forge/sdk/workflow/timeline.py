@@ -0,0 +1,78 @@
+"""
+The tree of the blocks of a workflow run, built in one pass from an index of the blocks by parent.
+"""
+
+from collections import defaultdict
+from typing import Iterator
+
+import structlog
+
+from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock, WorkflowRunTimeline, WorkflowRunTimelineType
+from skyvern.forge.sdk.workflow.models.block import BlockType
+
+LOG = structlog.get_logger()
+
+
+def _timeline_node(block: WorkflowRunBlock, children_count: int) -> WorkflowRunTimeline:
+    return WorkflowRunTimeline(
+        type=WorkflowRunTimelineType.block,
+        block=block,
+        children_count=children_count,
+        created_at=block.created_at,
+        modified_at=block.modified_at,
+    )
+
+
+def build_workflow_run_timeline(
+    workflow_run_blocks: list[WorkflowRunBlock],
+    parent_workflow_run_block_id: str | None = None,
+    expand_loops: bool = True,
+) -> list[WorkflowRunTimeline]:
+    """
+    Build the timeline of the children of parent_workflow_run_block_id, or of the top level blocks without it. The
+    children keep the order of workflow_run_blocks.
+
+    Without expand_loops, the iterations of the loop blocks are left out. Their children_count tells how many there
+    are, so they can be fetched with the loop block as the parent.
+    """
+    block_ids = {block.workflow_run_block_id for block in workflow_run_blocks}
+    children_by_parent: dict[str | None, list[WorkflowRunBlock]] = defaultdict(list)
+    orphans = 0
+    for block in workflow_run_blocks:
+        parent_id = block.parent_workflow_run_block_id
+        if parent_id and parent_id not in block_ids:
+            orphans += 1
+            continue
+        children_by_parent[parent_id].append(block)
+    if orphans:
+        LOG.warning(
+            "Workflow run blocks whose parent block doesn't exist are left out of the timeline",
+            orphan_count=orphans,
+        )
+
+    def nodes(parent_id: str | None) -> list[WorkflowRunTimeline]:
+        return [
+            _timeline_node(block, len(children_by_parent.get(block.workflow_run_block_id, [])))
+            for block in children_by_parent.get(parent_id, [])
+        ]
+
+    timeline = nodes(parent_workflow_run_block_id)
+    # the tree is walked with a stack, nested loops can be deeper than the recursion limit
+    stack = list(timeline)
+    while stack:
+        node = stack.pop()
+        assert node.block is not None
+        if not node.children_count or (not expand_loops and node.block.block_type == BlockType.FOR_LOOP):
+            continue
+        node.children = nodes(node.block.workflow_run_block_id)
+        stack.extend(node.children)
+    return timeline
+
+
+def iter_timeline_blocks(timeline: list[WorkflowRunTimeline]) -> Iterator[WorkflowRunBlock]:
+    stack = list(timeline)
+    while stack:
+        node = stack.pop()
+        if node.block:
+            yield node.block
+        stack.extend(node.children)
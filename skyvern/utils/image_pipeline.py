@@ -0,0 +1,96 @@
+"""
+The CPU bound screenshot work (PNG decoding, stitching, resizing and encoding) as array operations on a dedicated
+thread pool. Pillow and NumPy release the GIL while they decode, copy, resample and compress, so the frames of a
+page are processed in parallel and the event loop keeps serving the other tasks of the worker.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, TypeVar
+
+import numpy as np
+from PIL import Image
+
+from skyvern.config import settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_image_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.IMAGE_PIPELINE_WORKERS, thread_name_prefix="image")
+    return _executor
+
+
+async def run_in_image_executor(func: Callable[..., T], *args: object) -> T:
+    return await asyncio.get_running_loop().run_in_executor(get_image_executor(), func, *args)
+
+
+def decode_frame(image: bytes) -> np.ndarray:
+    """
+    Decode an image into a height x width x 3 RGB array.
+    """
+    with Image.open(BytesIO(image)) as img:
+        return np.asarray(img.convert("RGB"))
+
+
+def encode_png(frame: np.ndarray) -> bytes:
+    buffer = BytesIO()
+    Image.fromarray(frame).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def stitch_frames(frames: list[np.ndarray], positions: list[int]) -> np.ndarray:
+    """
+    Stitch the frames of the scrolled viewports vertically, cutting the top of each frame that overlaps the previous
+    one according to the scroll positions. Narrower frames are padded with white.
+    """
+    if not frames:
+        raise ValueError("no images to merge")
+    if len(frames) != len(positions):
+        raise ValueError("images and positions length mismatch")
+
+    if len(frames) == 1:
+        return frames[0]
+
+    width = max(frame.shape[1] for frame in frames)
+    height = frames[0].shape[0] + positions[-1] - positions[0]
+    merged = np.full((height, width, 3), 255, dtype=np.uint8)
+
+    current_y = 0
+    for i, frame in enumerate(frames):
+        overlap = frame.shape[0] - (positions[i] - positions[i - 1]) if i > 0 else 0
+        visible = frame[max(overlap, 0) :]
+        rows = min(visible.shape[0], height - current_y)
+        if rows > 0:
+            merged[current_y : current_y + rows, : visible.shape[1]] = visible[:rows]
+        current_y += visible.shape[0]
+    return merged
+
+
+def resize_frame(frame: np.ndarray, width: int, height: int) -> np.ndarray:
+    return np.asarray(Image.fromarray(frame).resize((width, height), Image.Resampling.LANCZOS))
+
+
+def merge_screenshots(screenshots: list[bytes], positions: list[int]) -> bytes:
+    return encode_png(stitch_frames([decode_frame(screenshot) for screenshot in screenshots], positions))
+
+
+async def merge_screenshots_async(screenshots: list[bytes], positions: list[int]) -> bytes:
+    frames = await asyncio.gather(*(run_in_image_executor(decode_frame, screenshot) for screenshot in screenshots))
+    return await run_in_image_executor(lambda: encode_png(stitch_frames(list(frames), positions)))
+
+
+def resize_screenshot(screenshot: bytes, width: int, height: int) -> bytes:
+    return encode_png(resize_frame(decode_frame(screenshot), width, height))
+
+
+async def map_screenshots_async(func: Callable[[bytes], bytes], screenshots: list[bytes]) -> list[bytes]:
+    """
+    Apply func to every screenshot in parallel on the image thread pool.
+    """
+    return list(await asyncio.gather(*(run_in_image_executor(func, screenshot) for screenshot in screenshots)))
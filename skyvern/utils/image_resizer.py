@@ -1,8 +1,12 @@
 import io
+from enum import StrEnum
+from functools import partial
 from typing import TypedDict
 
 from PIL import Image
 
+from skyvern.utils.image_pipeline import map_screenshots_async, resize_screenshot
+
 
 class Resolution(TypedDict):
     width: int
@@ -16,6 +20,44 @@ MAX_SCALING_TARGETS_ANTHROPIC_CUA: dict[str, Resolution] = {
 }
 
 
+class ScreenshotFormat(StrEnum):
+    PNG = "png"
+    JPEG = "jpeg"
+    WEBP = "webp"
+
+
+def get_image_media_type(image: bytes) -> str:
+    if image.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if image[:4] == b"RIFF" and image[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
+
+def encode_screenshot(screenshot: bytes, image_format: ScreenshotFormat, quality: int) -> bytes:
+    """
+    Re-encode a PNG screenshot with a lossy format, which is several times smaller for the LLM.
+    """
+    if image_format == ScreenshotFormat.PNG:
+        return screenshot
+    with Image.open(io.BytesIO(screenshot)) as img:
+        img_byte_arr = io.BytesIO()
+        # neither format needs the alpha channel of the screenshot
+        img.convert("RGB").save(img_byte_arr, format=image_format.upper(), quality=quality)
+        return img_byte_arr.getvalue()
+
+
+async def encode_screenshots_async(
+    screenshots: list[bytes], image_format: ScreenshotFormat, quality: int
+) -> list[bytes]:
+    if image_format == ScreenshotFormat.PNG or not screenshots:
+        return screenshots
+    # decoding and encoding the images is CPU bound, keep it off the event loop
+    return await map_screenshots_async(
+        partial(encode_screenshot, image_format=image_format, quality=quality), screenshots
+    )
+
+
 def get_resize_target_dimension(
     window_size: Resolution, max_scaling_targets: dict[str, Resolution] = MAX_SCALING_TARGETS_ANTHROPIC_CUA
 ) -> Resolution:
@@ -33,21 +75,16 @@ def resize_screenshots(screenshots: list[bytes], target_dimension: Resolution) -
     The image scaling logic is originated from anthropic's quickstart guide:
     https://github.com/anthropics/anthropic-quickstarts/blob/81c4085944abb1734db411f05290b538fdc46dcd/computer-use-demo/computer_use_demo/tools/computer.py#L49-L60
     """
-    new_screenshots = []
-    for screenshot in screenshots:
-        # Convert bytes to PIL Image
-        img = Image.open(io.BytesIO(screenshot))
-
-        # Resize image to target dimensions
-        resized_img = img.resize((target_dimension["width"], target_dimension["height"]), Image.Resampling.LANCZOS)
+    return [
+        resize_screenshot(screenshot, target_dimension["width"], target_dimension["height"])
+        for screenshot in screenshots
+    ]
 
-        # Convert back to bytes
-        img_byte_arr = io.BytesIO()
-        resized_img.save(img_byte_arr, format="PNG")
-        img_byte = img_byte_arr.getvalue()
 
-        new_screenshots.append(img_byte)
-    return new_screenshots
+async def resize_screenshots_async(screenshots: list[bytes], target_dimension: Resolution) -> list[bytes]:
+    return await map_screenshots_async(
+        partial(resize_screenshot, width=target_dimension["width"], height=target_dimension["height"]), screenshots
+    )
 
 
 def scale_coordinates(
@@ -23,6 +23,20 @@ class CheckPhoneNumberFormatResponse(BaseModel):
 HTMLTreeStr = str
 
 
+def estimate_prompt_tokens(
+    prompt_engine: PromptEngine,
+    template_name: str,
+    element_tree_token_counts: list[int],
+    **kwargs: Any,
+) -> int:
+    """
+    Estimate the token count of the prompt without rendering and tokenizing the whole element tree again.
+    Only the template without the elements is tokenized, the element tree costs are counted at scraping time.
+    """
+    prompt_without_elements = prompt_engine.load_prompt(template_name, elements="", **kwargs)
+    return count_tokens(prompt_without_elements) + sum(element_tree_token_counts)
+
+
 def load_prompt_with_elements(
     element_tree_builder: ElementTreeBuilder,
     prompt_engine: PromptEngine,
@@ -30,42 +44,57 @@ def load_prompt_with_elements(
     html_need_skyvern_attrs: bool = True,
     **kwargs: Any,
 ) -> str:
-    elements = element_tree_builder.build_element_tree(html_need_skyvern_attrs=html_need_skyvern_attrs)
-    prompt = prompt_engine.load_prompt(
-        template_name,
-        elements=elements,
-        **kwargs,
+    element_tree_token_counts = element_tree_builder.get_element_tree_token_counts()
+    if not element_tree_builder.support_economy_elements_tree() or element_tree_token_counts is None:
+        # there's no smaller element tree to fall back to, no need to count the tokens
+        elements = element_tree_builder.build_element_tree(html_need_skyvern_attrs=html_need_skyvern_attrs)
+        return prompt_engine.load_prompt(template_name, elements=elements, **kwargs)
+
+    token_count = estimate_prompt_tokens(prompt_engine, template_name, element_tree_token_counts, **kwargs)
+    if token_count <= DEFAULT_MAX_TOKENS:
+        LOG.info(
+            "Prompt token estimate",
+            template_name=template_name,
+            token_count=token_count,
+            element_tree="full",
+        )
+        elements = element_tree_builder.build_element_tree(html_need_skyvern_attrs=html_need_skyvern_attrs)
+        return prompt_engine.load_prompt(template_name, elements=elements, **kwargs)
+
+    # get rid of all the secondary elements like SVG, etc
+    economy_token_counts = element_tree_builder.get_economy_element_tree_token_counts() or []
+    economy_token_count = token_count - sum(element_tree_token_counts) + sum(economy_token_counts)
+    LOG.warning(
+        "Prompt is longer than the max tokens. Going to use the economy elements tree.",
+        template_name=template_name,
+        token_count=token_count,
+        economy_token_count=economy_token_count,
+        max_tokens=DEFAULT_MAX_TOKENS,
     )
-    token_count = count_tokens(prompt)
-    if token_count > DEFAULT_MAX_TOKENS and element_tree_builder.support_economy_elements_tree():
-        # get rid of all the secondary elements like SVG, etc
+    if economy_token_count <= DEFAULT_MAX_TOKENS:
         economy_elements_tree = element_tree_builder.build_economy_elements_tree(
             html_need_skyvern_attrs=html_need_skyvern_attrs
         )
-        prompt = prompt_engine.load_prompt(template_name, elements=economy_elements_tree, **kwargs)
-        economy_token_count = count_tokens(prompt)
-        LOG.warning(
-            "Prompt is longer than the max tokens. Going to use the economy elements tree.",
-            template_name=template_name,
-            token_count=token_count,
-            economy_token_count=economy_token_count,
-            max_tokens=DEFAULT_MAX_TOKENS,
-        )
-        if economy_token_count > DEFAULT_MAX_TOKENS:
-            # !!! HACK alert
-            # dump the last 1/3 of the html context and keep the first 2/3 of the html context
-            economy_elements_tree_dumped = element_tree_builder.build_economy_elements_tree(
-                html_need_skyvern_attrs=html_need_skyvern_attrs,
-                percent_to_keep=2 / 3,
-            )
-            prompt = prompt_engine.load_prompt(template_name, elements=economy_elements_tree_dumped, **kwargs)
-            token_count_after_dump = count_tokens(prompt)
-            LOG.warning(
-                "Prompt is still longer than the max tokens. Will only keep the first 2/3 of the html context.",
-                template_name=template_name,
-                token_count=token_count,
-                economy_token_count=economy_token_count,
-                token_count_after_dump=token_count_after_dump,
-                max_tokens=DEFAULT_MAX_TOKENS,
-            )
-    return prompt
+        return prompt_engine.load_prompt(template_name, elements=economy_elements_tree, **kwargs)
+
+    # !!! HACK alert
+    # dump the last 1/3 of the html context and keep the first 2/3 of the html context
+    percent_to_keep = 2 / 3
+    token_count_after_dump = (
+        economy_token_count
+        - sum(economy_token_counts)
+        + sum(economy_token_counts[: int(len(economy_token_counts) * percent_to_keep)])
+    )
+    LOG.warning(
+        "Prompt is still longer than the max tokens. Will only keep the first 2/3 of the html context.",
+        template_name=template_name,
+        token_count=token_count,
+        economy_token_count=economy_token_count,
+        token_count_after_dump=token_count_after_dump,
+        max_tokens=DEFAULT_MAX_TOKENS,
+    )
+    economy_elements_tree_dumped = element_tree_builder.build_economy_elements_tree(
+        html_need_skyvern_attrs=html_need_skyvern_attrs,
+        percent_to_keep=percent_to_keep,
+    )
+    return prompt_engine.load_prompt(template_name, elements=economy_elements_tree_dumped, **kwargs)
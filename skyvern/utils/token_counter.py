@@ -1,5 +1,18 @@
+from functools import lru_cache
+
 import tiktoken
 
+DEFAULT_TOKEN_COUNTER_MODEL = "gpt-4o"
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str = DEFAULT_TOKEN_COUNTER_MODEL) -> tiktoken.Encoding:
+    # tiktoken.encoding_for_model() resolves the encoding on every call, keep one encoder per model
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
 
-def count_tokens(text: str) -> int:
-    return len(tiktoken.encoding_for_model("gpt-4o").encode(text))
+def count_tokens(text: str, model: str = DEFAULT_TOKEN_COUNTER_MODEL) -> int:
+    return len(get_encoding(model).encode(text))
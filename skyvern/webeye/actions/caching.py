@@ -1,8 +1,14 @@
+import hashlib
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
 import structlog
+from pydantic import BaseModel
 
+from skyvern.config import settings
 from skyvern.exceptions import CachedActionPlanError
 from skyvern.forge import app
 from skyvern.forge.prompts import prompt_engine
+from skyvern.forge.sdk.core.hashing import generate_url_hash
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.schemas.tasks import Task
 from skyvern.webeye.actions.action_types import ActionType
@@ -12,22 +18,117 @@ from skyvern.webeye.scraper.scraper import ScrapedPage
 LOG = structlog.get_logger()
 
 
+class ActionPlanStats(BaseModel):
+    # plans found in the action plan index, or in the tasks table when the index didn't have one yet
+    index_hits: int = 0
+    fallback_hits: int = 0
+    misses: int = 0
+    # steps that ran cached actions instead of asking the LLM for them
+    llm_calls_saved: int = 0
+
+
+action_plan_stats = ActionPlanStats()
+
+
+def get_action_plan_stats() -> ActionPlanStats:
+    return action_plan_stats.model_copy()
+
+
+def normalize_url_pattern(url: str) -> str:
+    """
+    The url without its query values, fragment and trailing slash, e.g. https://example.com/search?page=*&q=* for
+    https://Example.com/search/?q=shoes&page=2#top. The query keys are kept: they usually select another page.
+    """
+    parsed = urlsplit(url.strip())
+    query_keys = sorted({key for key, _ in parse_qsl(parsed.query, keep_blank_values=True)})
+    query = "&".join(f"{key}=*" for key in query_keys)
+    return urlunsplit((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path.rstrip("/") or "/", query, ""))
+
+
+def generate_goal_hash(navigation_goal: str | None) -> str:
+    return hashlib.sha256((navigation_goal or "").encode()).hexdigest()
+
+
+async def record_action_plan(task: Task) -> None:
+    """
+    Index the actions of a completed task as the plan of its url pattern and navigation goal.
+    """
+    try:
+        actions = await app.DATABASE.get_previous_actions_for_task(task_id=task.task_id)
+        if not actions:
+            return
+        url_pattern = normalize_url_pattern(task.url)
+        await app.DATABASE.upsert_action_plan(
+            organization_id=task.organization_id,
+            url_pattern=url_pattern,
+            url_pattern_hash=generate_url_hash(url_pattern),
+            goal_hash=generate_goal_hash(task.navigation_goal),
+            task_id=task.task_id,
+            actions=actions,
+        )
+    except Exception:
+        LOG.warning("Failed to record the action plan", task_id=task.task_id, exc_info=True)
+
+
 async def retrieve_action_plan(task: Task, step: Step, scraped_page: ScrapedPage) -> list[Action]:
     try:
-        return await _retrieve_action_plan(task, step, scraped_page)
+        actions = await _retrieve_action_plan(task, step, scraped_page)
     except Exception as e:
         LOG.exception("Failed to retrieve action plan", exception=e)
         return []
+    if actions:
+        action_plan_stats.llm_calls_saved += 1
+        LOG.info("Using the cached action plan", task_id=task.task_id, **action_plan_stats.model_dump())
+    return actions
+
+
+async def _get_cached_actions(task: Task) -> tuple[list[Action], list[str | None]]:
+    """
+    Returns:
+        tuple[list[Action], list[str | None]]: The cached actions and their element hashes.
+    """
+    url_pattern = normalize_url_pattern(task.url)
+    url_pattern_hash = generate_url_hash(url_pattern)
+    goal_hash = generate_goal_hash(task.navigation_goal)
+    if settings.ACTION_PLAN_INDEX_ENABLED:
+        action_plan = await app.DATABASE.get_action_plan(
+            organization_id=task.organization_id, url_pattern_hash=url_pattern_hash, goal_hash=goal_hash
+        )
+        if action_plan:
+            action_plan_stats.index_hits += 1
+            return action_plan.actions, action_plan.element_hashes
+
+    cached_actions = await app.DATABASE.retrieve_action_plan(task=task)
+    if not cached_actions:
+        action_plan_stats.misses += 1
+        return [], []
+    action_plan_stats.fallback_hits += 1
+    if settings.ACTION_PLAN_INDEX_ENABLED and cached_actions[0].task_id:
+        # index the plan of the tasks completed before the index existed
+        await app.DATABASE.upsert_action_plan(
+            organization_id=task.organization_id,
+            url_pattern=url_pattern,
+            url_pattern_hash=url_pattern_hash,
+            goal_hash=goal_hash,
+            task_id=cached_actions[0].task_id,
+            actions=cached_actions,
+        )
+    return cached_actions, [action.skyvern_element_hash for action in cached_actions]
 
 
 async def _retrieve_action_plan(task: Task, step: Step, scraped_page: ScrapedPage) -> list[Action]:
     # V0: use the previous action plan if there is a completed task with the same url and navigation goal
     # get completed task with the same url and navigation goal
     # TODO(kerem): don't use step_order, get all the previous actions instead
-    cached_actions = await app.DATABASE.retrieve_action_plan(task=task)
+    cached_actions, element_hashes = await _get_cached_actions(task)
     if not cached_actions:
         LOG.info("No cached actions found for the task, fallback to no-cache mode")
         return []
+    if all(element_hashes) and not any(
+        element_hash in scraped_page.hash_to_element_ids for element_hash in element_hashes
+    ):
+        LOG.info("None of the elements of the cached actions is on the page, fallback to no-cache mode")
+        return []
 
     # Get the existing actions for this task from the database. Then find the actions that are already executed by looking at
     # the source_action_id field for this task's actions.
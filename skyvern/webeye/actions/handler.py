@@ -74,7 +74,7 @@ from skyvern.forge.sdk.services.credentials import OnePasswordConstants
 from skyvern.forge.sdk.trace import TraceManager
 from skyvern.services.task_v1_service import is_cua_task
 from skyvern.utils.prompt_engine import CheckPhoneNumberFormatResponse, load_prompt_with_elements
-from skyvern.webeye.actions import actions, handler_utils
+from skyvern.webeye.actions import actions, handler_utils, write_buffer
 from skyvern.webeye.actions.action_types import ActionType
 from skyvern.webeye.actions.actions import (
     Action,
@@ -96,9 +96,9 @@ from skyvern.webeye.scraper.scraper import (
     ElementTreeBuilder,
     IncrementalScrapePage,
     ScrapedPage,
+    build_trimmed_element_tree,
     hash_element,
     json_to_html,
-    trim_element_tree,
 )
 from skyvern.webeye.utils.dom import COMMON_INPUT_TAGS, DomUtil, InteractiveElement, SkyvernElement
 from skyvern.webeye.utils.page import SkyvernFrame
@@ -438,7 +438,7 @@ class ActionHandler:
                 if not actions_result:
                     LOG.warning("Action failed to execute, setting status to failed", action=action)
                 action.status = ActionStatus.failed
-            await app.DATABASE.create_action(action=action)
+            await write_buffer.create_action(action)
 
         return actions_result
 
@@ -2234,9 +2234,9 @@ async def choose_auto_completion_dropdown(
 
         if len(confirmed_preserved_list) > 0:
             confirmed_preserved_list = await app.AGENT_FUNCTION.cleanup_element_tree_factory(task=task, step=step)(
-                skyvern_frame.get_frame(), skyvern_frame.get_frame().url, copy.deepcopy(confirmed_preserved_list)
+                skyvern_frame.get_frame(), skyvern_frame.get_frame().url, confirmed_preserved_list
             )
-            confirmed_preserved_list = trim_element_tree(copy.deepcopy(confirmed_preserved_list))
+            confirmed_preserved_list = build_trimmed_element_tree(confirmed_preserved_list)
 
         incremental_element.extend(confirmed_preserved_list)
 
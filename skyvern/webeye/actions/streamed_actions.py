@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable
+
+import structlog
+
+from skyvern.forge.sdk.models import Step
+from skyvern.forge.sdk.schemas.tasks import Task
+from skyvern.webeye.actions.action_types import ActionType
+from skyvern.webeye.actions.actions import Action, WebAction
+from skyvern.webeye.actions.parse_actions import parse_actions
+from skyvern.webeye.scraper.scraper import ScrapedPage
+
+LOG = structlog.get_logger()
+
+
+class StreamedActions:
+    """
+    The actions of an LLM response handed out one by one as soon as they are streamed in, so the first actions of a
+    step run while the LLM is still writing the others.
+
+    WAIT actions are held back until the response is complete, they only run when there's no other action, like in a
+    step that waits for the whole response. The actions the incremental parser couldn't parse, e.g. a cut off JSON
+    repaired by parse_api_response, are handed out from the complete response.
+    """
+
+    def __init__(self, task: Task, step: Step, scraped_page: ScrapedPage) -> None:
+        self.task = task
+        self.step = step
+        self.scraped_page = scraped_page
+        self.raw_actions: list[dict[str, Any]] = []
+        self.actions: list[Action] = []
+        self.json_response: dict[str, Any] | None = None
+        self._llm_call: asyncio.Task[None] | None = None
+        self._changed = asyncio.Event()
+
+    def on_streamed_action(self, raw_action: dict[str, Any]) -> None:
+        self._add(raw_action)
+
+    def _add(self, raw_action: dict[str, Any]) -> None:
+        action_order = len(self.raw_actions)
+        self.raw_actions.append(raw_action)
+        for action in parse_actions(self.task, self.step.step_id, self.step.order, self.scraped_page, [raw_action]):
+            action.action_order = action_order
+            self.actions.append(action)
+        self._changed.set()
+
+    def start(self, llm_call: Awaitable[dict[str, Any]]) -> None:
+        self._llm_call = asyncio.create_task(self._run(llm_call))
+
+    async def _run(self, llm_call: Awaitable[dict[str, Any]]) -> None:
+        try:
+            json_response = await llm_call
+            streamed = len(self.raw_actions)
+            for raw_action in json_response.get("actions", [])[streamed:]:
+                self._add(raw_action)
+            if len(self.raw_actions) > streamed:
+                LOG.info(
+                    "Added the actions the streamed response parsing missed",
+                    streamed_actions=streamed,
+                    total_actions=len(self.raw_actions),
+                )
+            self.json_response = json_response
+        finally:
+            self._changed.set()
+
+    @property
+    def done(self) -> bool:
+        return self._llm_call is not None and self._llm_call.done()
+
+    async def __aiter__(self) -> AsyncIterator[Action]:
+        assert self._llm_call is not None
+        index = 0
+        handed_out = False
+        while True:
+            while index < len(self.actions):
+                action = self.actions[index]
+                index += 1
+                if action.action_type == ActionType.WAIT:
+                    continue
+                handed_out = True
+                yield action
+            if self.done:
+                break
+            self._changed.clear()
+            await self._changed.wait()
+
+        # raise the error of the LLM call, if any
+        await self._llm_call
+        if not handed_out:
+            for action in self.actions:
+                yield action
+
+    async def complete(self) -> list[Action]:
+        """
+        Wait for the whole response.
+
+        Returns:
+            list[Action]: The actions the step runs: all of them but the WAIT actions, unless they are all WAIT actions.
+        """
+        assert self._llm_call is not None
+        await self._llm_call
+        actions = [action for action in self.actions if action.action_type != ActionType.WAIT]
+        return actions or self.actions
+
+    async def get_later_action_on_element(self, action: Action) -> Action | None:
+        """
+        Wait for the whole response and find the next action on the same element.
+        """
+        if not isinstance(action, WebAction) or action.action_order is None:
+            return None
+        for later_action in await self.complete():
+            if (
+                isinstance(later_action, WebAction)
+                and later_action.element_id == action.element_id
+                and later_action.action_order is not None
+                and later_action.action_order > action.action_order
+            ):
+                return later_action
+        return None
+
+    def cancel(self) -> None:
+        if self._llm_call is not None and not self._llm_call.done():
+            self._llm_call.cancel()
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import structlog
+
+from skyvern.config import settings
+from skyvern.forge import app
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.webeye.actions.actions import Action
+
+LOG = structlog.get_logger()
+
+
+class ActionWriteBuffer:
+    """
+    Collects the handled actions of a step and inserts them in one transaction when the step ends, or earlier when
+    max_size actions are waiting or the oldest has waited max_age_seconds.
+    """
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        max_age_seconds: float | None = None,
+    ) -> None:
+        self.max_size = max_size if max_size is not None else settings.ACTION_WRITE_BUFFER_MAX_SIZE
+        self.max_age_seconds = (
+            max_age_seconds if max_age_seconds is not None else settings.ACTION_WRITE_BUFFER_MAX_AGE_SECONDS
+        )
+        self.pending: list[Action] = []
+        self.oldest_at: float | None = None
+        self.lock = asyncio.Lock()
+
+    async def add(self, action: Action) -> None:
+        # the caller keeps mutating the action, store it as it is now
+        self.pending.append(action.model_copy(deep=True))
+        if self.oldest_at is None:
+            self.oldest_at = time.monotonic()
+        if len(self.pending) >= self.max_size or time.monotonic() - self.oldest_at >= self.max_age_seconds:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self.lock:
+            actions, self.pending, self.oldest_at = self.pending, [], None
+            if not actions:
+                return
+            try:
+                await app.DATABASE.create_actions(actions)
+                return
+            except Exception:
+                LOG.warning("Failed to insert the actions in one batch, inserting them one by one", exc_info=True)
+            # one bad action shouldn't lose the others of the step
+            for action in actions:
+                try:
+                    await app.DATABASE.create_action(action=action)
+                except Exception:
+                    LOG.exception("Failed to create action", action=action)
+
+
+async def create_action(action: Action) -> None:
+    """
+    Store the action in the write buffer of the current step, or write it right away outside a step.
+    """
+    context = skyvern_context.current()
+    if context and context.action_write_buffer:
+        await context.action_write_buffer.add(action)
+        return
+    await app.DATABASE.create_action(action=action)
+
+
+async def flush_action_writes() -> None:
+    context = skyvern_context.current()
+    if context and context.action_write_buffer:
+        # the step may be cancelled while its actions are written
+        await asyncio.shield(context.action_write_buffer.flush())
@@ -43,28 +43,38 @@ LOG = structlog.get_logger()
 BrowserCleanupFunc = Callable[[], None] | None
 
 
+def create_browser_console_log_file(browser_artifacts: BrowserArtifacts) -> bool:
+    if browser_artifacts.browser_console_log_path is not None:
+        return True
+    log_path = f"{settings.LOG_PATH}/{datetime.utcnow().strftime('%Y-%m-%d')}/{uuid.uuid4()}.log"
+    try:
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        # create the empty log file
+        with open(log_path, "w") as _:
+            pass
+    except Exception:
+        LOG.warning(
+            "Failed to create browser log file",
+            log_path=log_path,
+            exc_info=True,
+        )
+        return False
+    browser_artifacts.browser_console_log_path = log_path
+    return True
+
+
+def format_browser_console_log(msg: ConsoleMessage) -> str:
+    current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    key_values = " ".join([f"{key}={value}" for key, value in msg.location.items()])
+    return f"{current_time}[{msg.type}]{msg.text} {key_values}\n"
+
+
 def set_browser_console_log(browser_context: BrowserContext, browser_artifacts: BrowserArtifacts) -> None:
-    if browser_artifacts.browser_console_log_path is None:
-        log_path = f"{settings.LOG_PATH}/{datetime.utcnow().strftime('%Y-%m-%d')}/{uuid.uuid4()}.log"
-        try:
-            os.makedirs(os.path.dirname(log_path), exist_ok=True)
-            # create the empty log file
-            with open(log_path, "w") as _:
-                pass
-        except Exception:
-            LOG.warning(
-                "Failed to create browser log file",
-                log_path=log_path,
-                exc_info=True,
-            )
-            return
-        browser_artifacts.browser_console_log_path = log_path
+    if not create_browser_console_log_file(browser_artifacts):
+        return
 
     async def browser_console_log(msg: ConsoleMessage) -> None:
-        current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-        key_values = " ".join([f"{key}={value}" for key, value in msg.location.items()])
-        format_log = f"{current_time}[{msg.type}]{msg.text} {key_values}\n"
-        await browser_artifacts.append_browser_console_log(format_log)
+        await browser_artifacts.append_browser_console_log(format_browser_console_log(msg))
 
     LOG.info("browser console log is saved", log_path=browser_artifacts.browser_console_log_path)
     browser_context.on("console", browser_console_log)
@@ -286,7 +296,6 @@ class BrowserContextFactory:
 class VideoArtifact(BaseModel):
     video_path: str | None = None
     video_artifact_id: str | None = None
-    video_data: bytes = b""
 
 
 class BrowserArtifacts(BaseModel):
@@ -635,8 +644,7 @@ class BrowserState:
                 browser_context,
                 browser_artifacts,
                 browser_cleanup,
-            ) = await BrowserContextFactory.create_browser_context(
-                self.pw,
+            ) = await self._create_browser_context(
                 url=url,
                 proxy_location=proxy_location,
                 task_id=task_id,
@@ -657,6 +665,25 @@ class BrowserState:
             if url:
                 await self.navigate_to_url(page=page, url=url)
 
+    async def _create_browser_context(
+        self,
+        url: str | None = None,
+        proxy_location: ProxyLocation | None = None,
+        task_id: str | None = None,
+        workflow_run_id: str | None = None,
+        organization_id: str | None = None,
+        extra_http_headers: dict[str, str] | None = None,
+    ) -> tuple[BrowserContext, BrowserArtifacts, BrowserCleanupFunc]:
+        return await BrowserContextFactory.create_browser_context(
+            self.pw,
+            url=url,
+            proxy_location=proxy_location,
+            task_id=task_id,
+            workflow_run_id=workflow_run_id,
+            organization_id=organization_id,
+            extra_http_headers=extra_http_headers,
+        )
+
     async def navigate_to_url(self, page: Page, url: str, retry_times: int = NAVIGATION_MAX_RETRY_TIME) -> None:
         try:
             for retry_time in range(retry_times):
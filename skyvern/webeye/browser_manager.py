@@ -5,12 +5,14 @@ import os
 import structlog
 from playwright.async_api import async_playwright
 
+from skyvern.config import settings
 from skyvern.exceptions import MissingBrowserState
 from skyvern.forge import app
 from skyvern.forge.sdk.schemas.tasks import Task
 from skyvern.forge.sdk.workflow.models.workflow import WorkflowRun
 from skyvern.schemas.runs import ProxyLocation
 from skyvern.webeye.browser_factory import BrowserContextFactory, BrowserState, VideoArtifact
+from skyvern.webeye.browser_pool import POOLED_BROWSER_TYPES, BrowserPool, PooledBrowserState
 
 LOG = structlog.get_logger()
 
@@ -18,12 +20,21 @@ LOG = structlog.get_logger()
 class BrowserManager:
     instance = None
     pages: dict[str, BrowserState] = dict()
+    browser_pool: BrowserPool | None = None
 
     def __new__(cls) -> BrowserManager:
         if cls.instance is None:
             cls.instance = super().__new__(cls)
         return cls.instance
 
+    @classmethod
+    def get_browser_pool(cls) -> BrowserPool | None:
+        if not settings.BROWSER_POOL_ENABLED or settings.BROWSER_TYPE not in POOLED_BROWSER_TYPES:
+            return None
+        if cls.browser_pool is None:
+            cls.browser_pool = BrowserPool.from_settings()
+        return cls.browser_pool
+
     @staticmethod
     async def _create_browser_state(
         proxy_location: ProxyLocation | None = None,
@@ -33,6 +44,13 @@ class BrowserManager:
         organization_id: str | None = None,
         extra_http_headers: dict[str, str] | None = None,
     ) -> BrowserState:
+        browser_pool = BrowserManager.get_browser_pool()
+        if browser_pool is not None:
+            pooled_context = await browser_pool.acquire(
+                proxy_location=proxy_location, extra_http_headers=extra_http_headers
+            )
+            return PooledBrowserState(browser_pool, pooled_context)
+
         pw = await async_playwright().start()
         (
             browser_context,
@@ -235,12 +253,6 @@ class BrowserManager:
             )
             return []
 
-        for i, video_artifact in enumerate(browser_state.browser_artifacts.video_artifacts):
-            path = video_artifact.video_path
-            if path and os.path.exists(path=path):
-                with open(path, "rb") as f:
-                    browser_state.browser_artifacts.video_artifacts[i].video_data = f.read()
-
         return browser_state.browser_artifacts.video_artifacts
 
     async def get_har_data(
@@ -287,6 +299,8 @@ class BrowserManager:
         for browser_state in cls.pages.values():
             await browser_state.close()
         cls.pages = dict()
+        if cls.browser_pool is not None:
+            await cls.browser_pool.close()
         LOG.info("BrowserManger is closed")
 
     async def cleanup_for_task(
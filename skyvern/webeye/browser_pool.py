@@ -0,0 +1,496 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlparse
+
+import structlog
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    ConsoleMessage,
+    Download,
+    Frame,
+    Page,
+    Playwright,
+    async_playwright,
+)
+from pydantic import BaseModel
+
+from skyvern.config import settings
+from skyvern.forge.sdk.api.files import make_temp_directory
+from skyvern.forge.sdk.core.skyvern_context import ensure_context
+from skyvern.schemas.runs import ProxyLocation, get_tzinfo_from_proxy
+from skyvern.webeye.browser_factory import (
+    BrowserArtifacts,
+    BrowserCleanupFunc,
+    BrowserContextFactory,
+    BrowserState,
+    create_browser_console_log_file,
+    format_browser_console_log,
+    initialize_download_dir,
+)
+
+LOG = structlog.get_logger()
+
+# the browser types launched by playwright, the pool can't share a browser it connects to over CDP
+POOLED_BROWSER_TYPES = {"chromium-headless", "chromium-headful"}
+
+# the options of build_browser_args passed to chromium.launch(), the others are options of the context
+BROWSER_LAUNCH_ARGS = {"args", "ignore_default_args"}
+
+# proxy location, sorted extra http headers
+BrowserPoolKey = tuple[str | None, tuple[tuple[str, str], ...]]
+
+
+def build_pool_key(
+    proxy_location: ProxyLocation | None = None, extra_http_headers: dict[str, str] | None = None
+) -> BrowserPoolKey:
+    return (str(proxy_location) if proxy_location else None, tuple(sorted((extra_http_headers or {}).items())))
+
+
+class BrowserPoolStats(BaseModel):
+    browsers_launched: int = 0
+    browsers_retired: int = 0
+    contexts_created: int = 0
+    contexts_closed: int = 0
+    # runs served by a warm context
+    warm_hits: int = 0
+    # runs that had to wait for a new context
+    cold_acquires: int = 0
+    recycled: int = 0
+    # acquires that waited because every browser was full
+    waits: int = 0
+    idle_contexts: int = 0
+
+
+@dataclass
+class PooledBrowser:
+    browser: Browser
+    # contexts open or being created in the browser
+    num_contexts: int = 0
+    # runs served by the contexts of the browser
+    uses: int = 0
+    # no new context once retired, the browser is closed with its last context
+    retired: bool = False
+
+
+@dataclass
+class PooledContext:
+    context: BrowserContext
+    browser: PooledBrowser
+    key: BrowserPoolKey
+    uses: int = 0
+    # origins the pages navigated to, their storage is cleared on recycling
+    origins: set[str] = field(default_factory=set)
+    # the artifacts and the download directory of the run holding the context
+    browser_artifacts: BrowserArtifacts = field(default_factory=BrowserArtifacts)
+    download_dir: str | None = None
+
+
+class BrowserPool:
+    """
+    One playwright driver shared by the runs of the worker, a few launched browsers and isolated contexts in them.
+    Idle contexts are kept warm per proxy location and headers. A released context is recycled: its pages are closed
+    and its cookies, permissions and storage are cleared, then it's handed to the next run with the same key.
+    """
+
+    def __init__(
+        self,
+        max_browsers: int,
+        max_contexts_per_browser: int,
+        warm_contexts: int,
+        browser_max_uses: int,
+        context_max_uses: int,
+        headless: bool = True,
+        start_playwright: Callable[[], Awaitable[Playwright]] | None = None,
+    ) -> None:
+        self.max_browsers = max_browsers
+        self.max_contexts_per_browser = max_contexts_per_browser
+        self.warm_contexts = warm_contexts
+        self.browser_max_uses = browser_max_uses
+        self.context_max_uses = context_max_uses
+        self.headless = headless
+        self._start_playwright = start_playwright or self._start_default_playwright
+        self.stats = BrowserPoolStats()
+        self.playwright: Playwright | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._condition = asyncio.Condition()
+        self._browsers: list[PooledBrowser] = []
+        self._launching = 0
+        self._idle: dict[BrowserPoolKey, list[PooledContext]] = {}
+        self._warm_tasks: set[asyncio.Task[None]] = set()
+
+    @classmethod
+    def from_settings(cls) -> BrowserPool:
+        return cls(
+            max_browsers=settings.BROWSER_POOL_MAX_BROWSERS,
+            max_contexts_per_browser=settings.BROWSER_POOL_MAX_CONTEXTS_PER_BROWSER,
+            warm_contexts=settings.BROWSER_POOL_WARM_CONTEXTS,
+            browser_max_uses=settings.BROWSER_POOL_BROWSER_MAX_USES,
+            context_max_uses=settings.BROWSER_POOL_CONTEXT_MAX_USES,
+            headless=settings.BROWSER_TYPE == "chromium-headless",
+        )
+
+    @staticmethod
+    async def _start_default_playwright() -> Playwright:
+        return await async_playwright().start()
+
+    def _check_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # the playwright objects are bound to the event loop that created them
+        self._loop = loop
+        self.playwright = None
+        self._condition = asyncio.Condition()
+        self._browsers = []
+        self._launching = 0
+        self._idle = {}
+        self._warm_tasks = set()
+
+    async def get_playwright(self) -> Playwright:
+        self._check_loop()
+        async with self._condition:
+            if self.playwright is None:
+                self.playwright = await self._start_playwright()
+        return self.playwright
+
+    def get_stats(self) -> BrowserPoolStats:
+        stats = self.stats.model_copy()
+        stats.idle_contexts = sum(len(contexts) for contexts in self._idle.values())
+        return stats
+
+    async def acquire(
+        self,
+        proxy_location: ProxyLocation | None = None,
+        extra_http_headers: dict[str, str] | None = None,
+    ) -> PooledContext:
+        """
+        Lease a context for a run: a warm one with the same key if there's one, a new one otherwise. Waits while every
+        browser is full of busy contexts.
+        """
+        playwright = await self.get_playwright()
+        key = build_pool_key(proxy_location, extra_http_headers)
+        pooled_context: PooledContext | None = None
+        browser: PooledBrowser | None = None
+        launch = False
+        async with self._condition:
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    pooled_context = idle.pop()
+                    if pooled_context.browser.retired or not pooled_context.browser.browser.is_connected():
+                        await self._close_context(pooled_context, notify=False)
+                        pooled_context = None
+                        continue
+                    self.stats.warm_hits += 1
+                    break
+                # browsers that crashed and have no context left to close
+                self._browsers = [
+                    pooled_browser
+                    for pooled_browser in self._browsers
+                    if pooled_browser.browser.is_connected() or pooled_browser.num_contexts > 0
+                ]
+                browser = self._reserve_context_slot()
+                if browser is not None:
+                    break
+                if len(self._browsers) + self._launching < self.max_browsers:
+                    self._launching += 1
+                    launch = True
+                    break
+                if await self._close_idle_context_of_other_key(key):
+                    continue
+                self.stats.waits += 1
+                await self._condition.wait()
+
+        if pooled_context is None:
+            self.stats.cold_acquires += 1
+            if launch:
+                browser = await self._launch_browser(playwright)
+            assert browser is not None
+            try:
+                pooled_context = await self._create_context(browser, key, proxy_location, extra_http_headers)
+            except Exception:
+                async with self._condition:
+                    browser.num_contexts -= 1
+                    self._condition.notify_all()
+                raise
+
+        self._lease(pooled_context, proxy_location)
+        self._schedule_warm_up(proxy_location, extra_http_headers)
+        return pooled_context
+
+    def _reserve_context_slot(self) -> PooledBrowser | None:
+        for browser in self._browsers:
+            if browser.retired or not browser.browser.is_connected():
+                continue
+            if browser.num_contexts < self.max_contexts_per_browser:
+                browser.num_contexts += 1
+                return browser
+        return None
+
+    async def _close_idle_context_of_other_key(self, key: BrowserPoolKey) -> bool:
+        for other_key, contexts in self._idle.items():
+            if other_key != key and contexts:
+                await self._close_context(contexts.pop(), notify=False)
+                return True
+        return False
+
+    async def _launch_browser(self, playwright: Playwright) -> PooledBrowser:
+        try:
+            launch_args = {
+                key: value
+                for key, value in BrowserContextFactory.build_browser_args().items()
+                if key in BROWSER_LAUNCH_ARGS
+            }
+            browser = await playwright.chromium.launch(
+                headless=self.headless,
+                downloads_path=make_temp_directory(prefix="skyvern_downloads_"),
+                **launch_args,
+            )
+        except BaseException:
+            async with self._condition:
+                self._launching -= 1
+                self._condition.notify_all()
+            raise
+        pooled_browser = PooledBrowser(browser=browser, num_contexts=1)
+        async with self._condition:
+            self._launching -= 1
+            self._browsers.append(pooled_browser)
+        self.stats.browsers_launched += 1
+        LOG.info("Launched pooled browser", num_browsers=len(self._browsers))
+        return pooled_browser
+
+    async def _create_context(
+        self,
+        browser: PooledBrowser,
+        key: BrowserPoolKey,
+        proxy_location: ProxyLocation | None,
+        extra_http_headers: dict[str, str] | None,
+    ) -> PooledContext:
+        context_args: dict[str, Any] = {
+            key: value
+            for key, value in BrowserContextFactory.build_browser_args(
+                proxy_location=proxy_location, extra_http_headers=extra_http_headers
+            ).items()
+            if key not in BROWSER_LAUNCH_ARGS and key != "record_har_path"
+        }
+        context = await browser.browser.new_context(accept_downloads=True, **context_args)
+        pooled_context = PooledContext(context=context, browser=browser, key=key)
+        self._add_listeners(pooled_context)
+        self.stats.contexts_created += 1
+        return pooled_context
+
+    @staticmethod
+    def _add_listeners(pooled_context: PooledContext) -> None:
+        # registered once per context, they follow the run holding the context
+        async def on_console(msg: ConsoleMessage) -> None:
+            await pooled_context.browser_artifacts.append_browser_console_log(format_browser_console_log(msg))
+
+        async def on_download(download: Download) -> None:
+            if pooled_context.download_dir is None:
+                return
+            try:
+                await download.save_as(os.path.join(pooled_context.download_dir, download.suggested_filename))
+            except Exception:
+                LOG.exception("Failed to save the download of a pooled browser context", url=download.url)
+
+        def on_frame_navigated(frame: Frame) -> None:
+            parsed_url = urlparse(frame.url)
+            if parsed_url.scheme in ("http", "https"):
+                pooled_context.origins.add(f"{parsed_url.scheme}://{parsed_url.netloc}")
+
+        def on_page(page: Page) -> None:
+            page.on("download", on_download)
+            page.on("framenavigated", on_frame_navigated)
+
+        pooled_context.context.on("console", on_console)
+        pooled_context.context.on("page", on_page)
+
+    def _lease(self, pooled_context: PooledContext, proxy_location: ProxyLocation | None) -> None:
+        pooled_context.uses += 1
+        browser = pooled_context.browser
+        browser.uses += 1
+        if browser.uses >= self.browser_max_uses:
+            browser.retired = True
+        pooled_context.browser_artifacts = BrowserContextFactory.build_browser_artifacts()
+        create_browser_console_log_file(pooled_context.browser_artifacts)
+        pooled_context.download_dir = initialize_download_dir()
+        if proxy_location is not None:
+            ensure_context().tz_info = get_tzinfo_from_proxy(proxy_location)
+
+    def _schedule_warm_up(
+        self, proxy_location: ProxyLocation | None, extra_http_headers: dict[str, str] | None
+    ) -> None:
+        if self.warm_contexts <= 0:
+            return
+        task = asyncio.create_task(self.warm_up(proxy_location, extra_http_headers))
+        self._warm_tasks.add(task)
+        task.add_done_callback(self._warm_tasks.discard)
+
+    async def warm_up(
+        self,
+        proxy_location: ProxyLocation | None = None,
+        extra_http_headers: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Create contexts for the key until warm_contexts of them are idle, without evicting the other keys.
+        """
+        playwright = await self.get_playwright()
+        key = build_pool_key(proxy_location, extra_http_headers)
+        while True:
+            launch = False
+            async with self._condition:
+                if len(self._idle.get(key, [])) >= self.warm_contexts:
+                    return
+                browser = self._reserve_context_slot()
+                if browser is None:
+                    if len(self._browsers) + self._launching >= self.max_browsers:
+                        return
+                    self._launching += 1
+                    launch = True
+            try:
+                if launch:
+                    browser = await self._launch_browser(playwright)
+                assert browser is not None
+                pooled_context = await self._create_context(browser, key, proxy_location, extra_http_headers)
+            except Exception:
+                LOG.warning("Failed to warm up a browser context", exc_info=True)
+                if browser is not None:
+                    async with self._condition:
+                        browser.num_contexts -= 1
+                return
+            async with self._condition:
+                self._idle.setdefault(key, []).append(pooled_context)
+                self._condition.notify_all()
+
+    async def release(self, pooled_context: PooledContext, reuse: bool = True) -> None:
+        """
+        Give the context back after a run. It's recycled for the next run with the same key, or closed when it can't
+        be reused, has served context_max_uses runs, its browser is retired or enough contexts of the key are idle.
+        """
+        browser = pooled_context.browser
+        reusable = (
+            reuse
+            and not browser.retired
+            and browser.browser.is_connected()
+            and pooled_context.uses < self.context_max_uses
+            and len(self._idle.get(pooled_context.key, [])) < self.warm_contexts
+        )
+        if reusable:
+            try:
+                await self._recycle(pooled_context)
+            except Exception:
+                LOG.warning("Failed to recycle the browser context, closing it", exc_info=True)
+                reusable = False
+
+        async with self._condition:
+            if reusable:
+                self._idle.setdefault(pooled_context.key, []).append(pooled_context)
+                self.stats.recycled += 1
+                self._condition.notify_all()
+            else:
+                await self._close_context(pooled_context)
+
+    async def _recycle(self, pooled_context: PooledContext) -> None:
+        context = pooled_context.context
+        page = context.pages[0] if context.pages else await context.new_page()
+        cdp_session = await context.new_cdp_session(page)
+        for origin in pooled_context.origins:
+            await cdp_session.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        # the pool key doesn't include the organization, the HTTP cache of the context is shared by the next run of any
+        # organization and the private responses cached for this one mustn't be served to it
+        await cdp_session.send("Network.clearBrowserCache")
+        await cdp_session.detach()
+        await context.clear_cookies()
+        await context.clear_permissions()
+        for page in context.pages:
+            await page.close()
+        pooled_context.origins.clear()
+        pooled_context.browser_artifacts = BrowserArtifacts()
+        pooled_context.download_dir = None
+
+    async def _close_context(self, pooled_context: PooledContext, notify: bool = True) -> None:
+        # called with the condition locked
+        browser = pooled_context.browser
+        try:
+            await pooled_context.context.close()
+        except Exception:
+            LOG.warning("Failed to close the pooled browser context", exc_info=True)
+        self.stats.contexts_closed += 1
+        browser.num_contexts -= 1
+        if browser.num_contexts <= 0 and (browser.retired or not browser.browser.is_connected()):
+            self._browsers.remove(browser)
+            self.stats.browsers_retired += 1
+            try:
+                await browser.browser.close()
+            except Exception:
+                LOG.warning("Failed to close the retired pooled browser", exc_info=True)
+            LOG.info("Closed retired pooled browser", uses=browser.uses)
+        if notify:
+            self._condition.notify_all()
+
+    async def close(self) -> None:
+        if self._loop is not asyncio.get_running_loop():
+            return
+        for task in list(self._warm_tasks):
+            task.cancel()
+        await asyncio.gather(*self._warm_tasks, return_exceptions=True)
+        async with self._condition:
+            for browser in self._browsers:
+                try:
+                    await browser.browser.close()
+                except Exception:
+                    LOG.warning("Failed to close the pooled browser", exc_info=True)
+            self._browsers = []
+            self._idle = {}
+            if self.playwright is not None:
+                await self.playwright.stop()
+                self.playwright = None
+
+
+class PooledBrowserState(BrowserState):
+    """
+    A browser state on a context leased from the pool. Closing it gives the context back instead of closing the
+    browser and stopping the shared playwright driver.
+    """
+
+    def __init__(self, pool: BrowserPool, pooled_context: PooledContext) -> None:
+        assert pool.playwright is not None
+        super().__init__(
+            pw=pool.playwright,
+            browser_context=pooled_context.context,
+            browser_artifacts=pooled_context.browser_artifacts,
+        )
+        self.pool = pool
+        self.pooled_context: PooledContext | None = pooled_context
+
+    async def _create_browser_context(
+        self,
+        url: str | None = None,
+        proxy_location: ProxyLocation | None = None,
+        task_id: str | None = None,
+        workflow_run_id: str | None = None,
+        organization_id: str | None = None,
+        extra_http_headers: dict[str, str] | None = None,
+    ) -> tuple[BrowserContext, BrowserArtifacts, BrowserCleanupFunc]:
+        # the previous context was closed, e.g. to retry with another proxy node
+        if self.pooled_context is not None:
+            await self.pool.release(self.pooled_context, reuse=False)
+        self.pooled_context = await self.pool.acquire(
+            proxy_location=proxy_location, extra_http_headers=extra_http_headers
+        )
+        return self.pooled_context.context, self.pooled_context.browser_artifacts, None
+
+    async def close(self, close_browser_on_completion: bool = True) -> None:
+        if not close_browser_on_completion or self.pooled_context is None:
+            return
+        LOG.info("Releasing the pooled browser context")
+        pooled_context = self.pooled_context
+        self.pooled_context = None
+        reuse = self.browser_context is pooled_context.context
+        self.browser_context = None
+        await self.pool.release(pooled_context, reuse=reuse)
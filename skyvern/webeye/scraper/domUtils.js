@@ -1457,6 +1457,8 @@ async function buildElementTree(
   full_tree = false,
   needContext = true,
   hoverStylesMap = undefined,
+  starterParentXpath = null,
+  starterNodeIndex = 1,
 ) {
   // Generate hover styles map at the start
   if (hoverStylesMap === undefined) {
@@ -1824,13 +1826,13 @@ async function buildElementTree(
     return trimmedResults;
   };
 
-  let current_xpath = null;
+  let current_xpath = starterParentXpath;
   if (starter === document.body) {
     current_xpath = "/html[1]";
   }
 
   // setup before parsing the dom
-  await processElement(starter, null, current_xpath, 1);
+  await processElement(starter, null, current_xpath, starterNodeIndex);
 
   for (var element of elements) {
     if (
@@ -2115,6 +2117,36 @@ async function safeScrollToTop(
   return window.scrollY;
 }
 
+// resolves true once the DOM has no mutation for quietMs, or false when timeoutMs is reached first
+function waitForDomStable(quietMs = 500, timeoutMs = 3000) {
+  return new Promise((resolve) => {
+    if (!document.documentElement) {
+      resolve(true);
+      return;
+    }
+    let quietTimer = null;
+    let timeoutTimer = null;
+    const observer = new MutationObserver(() => {
+      clearTimeout(quietTimer);
+      quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    const finish = (stable) => {
+      observer.disconnect();
+      clearTimeout(quietTimer);
+      clearTimeout(timeoutTimer);
+      resolve(stable);
+    };
+    observer.observe(document.documentElement, {
+      attributes: true,
+      childList: true,
+      characterData: true,
+      subtree: true,
+    });
+    quietTimer = setTimeout(() => finish(true), quietMs);
+    timeoutTimer = setTimeout(() => finish(false), timeoutMs);
+  });
+}
+
 function getScrollXY() {
   return [window.scrollX, window.scrollY];
 }
@@ -2683,6 +2715,170 @@ async function getIncrementElements(wait_until_finished = true) {
   return [Array.from(idToElement.values()), cleanedTreeList];
 }
 
+// get the xpath of the element in the same format as buildElementTree
+function getElementXpath(element) {
+  if (element === document.body) {
+    return '/html[1]/*[name()="body"][1]';
+  }
+  const parent = element.parentElement;
+  if (!parent) {
+    return null;
+  }
+  const parentXpath = getElementXpath(parent);
+  if (!parentXpath) {
+    return null;
+  }
+  const [tagName, index] = getElementNodeIndex(element);
+  return parentXpath + '/*[name()="' + tagName + '"][' + index + "]";
+}
+
+function getElementNodeIndex(element) {
+  const tagName = element.tagName.toLowerCase();
+  let index = 0;
+  for (const sibling of getChildElements(element.parentElement)) {
+    if (sibling.tagName?.toLowerCase() === tagName) {
+      index++;
+    }
+    if (sibling === element) {
+      break;
+    }
+  }
+  return [tagName, index];
+}
+
+if (window.globalDirtySubtreeIds === undefined) {
+  window.globalDirtySubtreeIds = null;
+  window.globalDirtySubtreeFull = false;
+}
+
+// mark the closest ancestor with unique_id as dirty, it will be rebuilt in the next incremental scraping.
+// if there's no such ancestor, the next scraping has to rebuild the whole tree
+function markSubtreeDirty(node) {
+  if (window.globalDirtySubtreeIds === null || window.globalDirtySubtreeFull) {
+    return;
+  }
+  let element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+  while (
+    element &&
+    element !== document.body &&
+    !element.hasAttribute("unique_id")
+  ) {
+    element = element.parentElement;
+  }
+  if (!element || element === document.body) {
+    window.globalDirtySubtreeFull = true;
+    return;
+  }
+  window.globalDirtySubtreeIds.add(element.getAttribute("unique_id"));
+}
+
+function handleDirtySubtreeMutations(mutationsList) {
+  for (const mutation of mutationsList) {
+    // ignore unique_id change, it's written by the scraping itself
+    if (mutation.attributeName === "unique_id") continue;
+    markSubtreeDirty(mutation.target);
+  }
+}
+
+async function startDirtySubtreeTracker() {
+  if (window.globalObserverForDirtySubtree === undefined) {
+    window.globalObserverForDirtySubtree = new MutationObserver(
+      handleDirtySubtreeMutations,
+    );
+    // input value changes don't trigger any DOM mutation
+    const markEventTargetDirty = (event) => markSubtreeDirty(event.target);
+    document.addEventListener("input", markEventTargetDirty, true);
+    document.addEventListener("change", markEventTargetDirty, true);
+  }
+  window.globalObserverForDirtySubtree.disconnect();
+  window.globalObserverForDirtySubtree.takeRecords();
+  window.globalDirtySubtreeIds = new Set();
+  window.globalDirtySubtreeFull = false;
+  window.globalObserverForDirtySubtree.observe(document.body, {
+    attributes: true,
+    childList: true,
+    subtree: true,
+    characterData: true,
+  });
+}
+
+// rebuild the element trees of the subtrees changed since the last call or startDirtySubtreeTracker().
+// return null if the page has to be fully scraped again.
+async function getDirtySubtrees(
+  frame = "main.frame",
+  frame_index = undefined,
+  maxSubtrees = 50,
+) {
+  if (
+    window.globalObserverForDirtySubtree === undefined ||
+    window.globalDirtySubtreeIds === null
+  ) {
+    return null;
+  }
+  handleDirtySubtreeMutations(
+    window.globalObserverForDirtySubtree.takeRecords(),
+  );
+  if (window.globalDirtySubtreeFull) {
+    return null;
+  }
+
+  // keep tracking the changes from now on for the next incremental scraping
+  const dirtyIds = window.globalDirtySubtreeIds;
+  window.globalDirtySubtreeIds = new Set();
+  const roots = [];
+  for (const dirtyId of dirtyIds) {
+    const domElement = document.querySelector(`[unique_id="${dirtyId}"]`);
+    // the removed element is covered by the mutation of its parent
+    if (!domElement) {
+      continue;
+    }
+    // an element at the root of a shadow DOM has no parent element to be rebuilt from: fall back to a full scrape
+    if (!domElement.parentElement) {
+      return null;
+    }
+    // skip the element if any ancestor is going to be rebuilt
+    let covered = false;
+    let ancestor = domElement.parentElement;
+    while (ancestor && ancestor !== document.body) {
+      if (dirtyIds.has(ancestor.getAttribute("unique_id"))) {
+        covered = true;
+        break;
+      }
+      ancestor = ancestor.parentElement;
+    }
+    if (!covered) {
+      roots.push([dirtyId, domElement]);
+    }
+  }
+  if (roots.length > maxSubtrees) {
+    return null;
+  }
+
+  if (
+    window.GlobalSkyvernFrameIndex === undefined &&
+    frame_index !== undefined
+  ) {
+    window.GlobalSkyvernFrameIndex = frame_index;
+  }
+  const hoverStylesMap = await getHoverStylesMap();
+  const subtrees = [];
+  for (const [dirtyId, domElement] of roots) {
+    const parentXpath = getElementXpath(domElement.parentElement);
+    const [_, nodeIndex] = getElementNodeIndex(domElement);
+    const [elements, tree] = await buildElementTree(
+      domElement,
+      frame,
+      false,
+      true,
+      hoverStylesMap,
+      parentXpath,
+      nodeIndex,
+    );
+    subtrees.push({ id: dirtyId, elements: elements, tree: tree });
+  }
+  return subtrees;
+}
+
 /**
 
 // How to run the code:
@@ -1,8 +1,9 @@
 import asyncio
 import copy
 import json
+import weakref
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import defaultdict, deque
 from enum import StrEnum
 from typing import Any, Awaitable, Callable, Self
 
@@ -21,9 +22,11 @@ from skyvern.forge.sdk.trace import TraceManager
 from skyvern.utils.image_resizer import Resolution
 from skyvern.utils.token_counter import count_tokens
 from skyvern.webeye.browser_factory import BrowserState
-from skyvern.webeye.utils.page import SkyvernFrame
+from skyvern.webeye.utils.frame_cache import FramePathCache
+from skyvern.webeye.utils.page import SkyvernFrame, wait_for_page_stable
 
 LOG = structlog.get_logger()
+# returns the cleaned up tree, the given tree must be left as it is: the scraped page keeps it as the raw tree
 CleanupElementTreeFunc = Callable[[Page | Frame, str, list[dict]], Awaitable[list[dict]]]
 ScrapeExcludeFunc = Callable[[Page, Frame], Awaitable[bool]]
 
@@ -101,7 +104,8 @@ def json_to_html(element: dict, need_skyvern_attrs: bool = True) -> str:
     if element is flagged as dropped, the html format is empty
     """
     tag = element["tagName"]
-    attributes: dict[str, Any] = copy.deepcopy(element.get("attributes", {}))
+    # attribute values are scalars, a shallow copy is enough to rewrite them
+    attributes: dict[str, Any] = dict(element.get("attributes", {}))
 
     interactable = element.get("interactable", False)
     if element.get("isDropped", False):
@@ -190,12 +194,17 @@ def hash_element(element: dict) -> str:
 
 def build_element_dict(
     elements: list[dict],
+    known_element_hashes: dict[str, str] | None = None,
 ) -> tuple[dict[str, str], dict[str, dict], dict[str, str], dict[str, str], dict[str, list[str]]]:
+    """
+    known_element_hashes: element hashes which are still valid from the previous scraping, skip hashing these elements
+    """
     id_to_css_dict: dict[str, str] = {}
     id_to_element_dict: dict[str, dict] = {}
     id_to_frame_dict: dict[str, str] = {}
     id_to_element_hash: dict[str, str] = {}
     hash_to_element_ids: dict[str, list[str]] = {}
+    known_element_hashes = known_element_hashes or {}
 
     for element in elements:
         element_id: str = element.get("id", "")
@@ -203,7 +212,7 @@ def build_element_dict(
         id_to_css_dict[element_id] = f"[{SKYVERN_ID_ATTR}='{element_id}']"
         id_to_element_dict[element_id] = element
         id_to_frame_dict[element_id] = element["frame"]
-        element_hash = hash_element(element)
+        element_hash = known_element_hashes.get(element_id) or hash_element(element)
         id_to_element_hash[element_id] = element_hash
         hash_to_element_ids[element_hash] = hash_to_element_ids.get(element_hash, []) + [element_id]
 
@@ -235,6 +244,22 @@ class ElementTreeBuilder(ABC):
     ) -> str:
         pass
 
+    def get_element_tree_token_counts(self) -> list[int] | None:
+        """
+        Token count of each root element in the HTML element tree. None if the builder doesn't support it.
+        """
+        return None
+
+    def get_economy_element_tree_token_counts(self) -> list[int] | None:
+        """
+        Token count of each root element in the HTML economy element tree. None if the builder doesn't support it.
+        """
+        return None
+
+
+def count_element_tree_tokens(element_tree: list[dict]) -> list[int]:
+    return [count_tokens(json_to_html(element)) for element in element_tree]
+
 
 class ScrapedPage(BaseModel, ElementTreeBuilder):
     """
@@ -258,6 +283,10 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
     element_tree_trimmed: list[dict]
     economy_element_tree: list[dict] | None = None
     last_used_element_tree: list[dict] | None = None
+    # token count of each root element of element_tree_trimmed and economy_element_tree in HTML format, counted on
+    # first use
+    element_tree_token_counts: list[int] | None = None
+    economy_element_tree_token_counts: list[int] | None = None
     screenshots: list[bytes]
     url: str
     html: str
@@ -266,6 +295,7 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
     _browser_state: BrowserState = PrivateAttr()
     _clean_up_func: CleanupElementTreeFunc = PrivateAttr()
     _scrape_exclude: ScrapeExcludeFunc | None = PrivateAttr(default=None)
+    _frame_path_cache: FramePathCache = PrivateAttr(default_factory=FramePathCache)
 
     def __init__(self, **data: Any) -> None:
         missing_attrs = [attr for attr in ["_browser_state", "_clean_up_func"] if attr not in data]
@@ -283,6 +313,10 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
         self._clean_up_func = clean_up_func
         self._scrape_exclude = scrape_exclude
 
+    @property
+    def frame_path_cache(self) -> FramePathCache:
+        return self._frame_path_cache
+
     def support_economy_elements_tree(self) -> bool:
         return True
 
@@ -310,19 +344,8 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
         """
         Economy elements tree doesn't include secondary elements like SVG, etc
         """
-        if not self.economy_element_tree:
-            economy_elements = []
-            copied_element_tree_trimmed = copy.deepcopy(self.element_tree_trimmed)
-
-            # Process each root element
-            for root_element in copied_element_tree_trimmed:
-                processed_element = self._process_element_for_economy_tree(root_element)
-                if processed_element:
-                    economy_elements.append(processed_element)
-
-            self.economy_element_tree = economy_elements
-
-        final_element_tree = self.economy_element_tree[: int(len(self.economy_element_tree) * percent_to_keep)]
+        economy_element_tree = self._get_economy_element_tree()
+        final_element_tree = economy_element_tree[: int(len(economy_element_tree) * percent_to_keep)]
         self.last_used_element_tree = final_element_tree
 
         if fmt == ElementTreeFormat.JSON:
@@ -335,23 +358,60 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
 
         raise UnknownElementTreeFormat(fmt=fmt)
 
+    def get_element_tree_token_counts(self) -> list[int]:
+        if self.element_tree_token_counts is None:
+            self.element_tree_token_counts = count_element_tree_tokens(self.element_tree_trimmed)
+        return self.element_tree_token_counts
+
+    def get_economy_element_tree_token_counts(self) -> list[int]:
+        if self.economy_element_tree_token_counts is None:
+            # the unchanged root elements are shared with the trimmed tree, reuse their token counts
+            known_token_counts = {
+                id(element): token_count
+                for element, token_count in zip(self.element_tree_trimmed, self.get_element_tree_token_counts())
+            }
+            token_counts = []
+            for element in self._get_economy_element_tree():
+                token_count = known_token_counts.get(id(element))
+                if token_count is None:
+                    token_count = count_tokens(json_to_html(element))
+                token_counts.append(token_count)
+            self.economy_element_tree_token_counts = token_counts
+        return self.economy_element_tree_token_counts
+
+    def _get_economy_element_tree(self) -> list[dict]:
+        if not self.economy_element_tree:
+            economy_elements = []
+
+            # Process each root element
+            for root_element in self.element_tree_trimmed:
+                processed_element = self._process_element_for_economy_tree(root_element)
+                if processed_element:
+                    economy_elements.append(processed_element)
+
+            self.economy_element_tree = economy_elements
+        return self.economy_element_tree
+
     def _process_element_for_economy_tree(self, element: dict) -> dict | None:
         """
-        Helper method to process an element for the economy tree using BFS.
-        Removes SVG elements and their children.
+        Helper method to process an element for the economy tree.
+        Removes SVG elements and their children. The trimmed tree is not modified, the economy tree shares the
+        subtrees without any SVG element with it, and only copies the elements whose children are changed.
         """
         # Skip SVG elements entirely
         if element.get("tagName", "").lower() == "svg":
             return None
 
-        # Process children using BFS
         if "children" in element:
             new_children = []
+            children_changed = False
             for child in element["children"]:
                 processed_child = self._process_element_for_economy_tree(child)
                 if processed_child:
                     new_children.append(processed_child)
-            element["children"] = new_children
+                children_changed = children_changed or processed_child is not child
+            if children_changed:
+                element = {**element, "children": new_children}
         return element
 
     async def refresh(self, draw_boxes: bool = True, scroll: bool = True) -> Self:
@@ -371,6 +431,9 @@ class ScrapedPage(BaseModel, ElementTreeBuilder):
         self.hash_to_element_ids = refreshed_page.hash_to_element_ids
         self.element_tree = refreshed_page.element_tree
         self.element_tree_trimmed = refreshed_page.element_tree_trimmed
+        self.economy_element_tree = None
+        self.element_tree_token_counts = refreshed_page.element_tree_token_counts
+        self.economy_element_tree_token_counts = None
         self.screenshots = refreshed_page.screenshots or self.screenshots
         self.html = refreshed_page.html
         self.extracted_text = refreshed_page.extracted_text
@@ -472,16 +535,20 @@ async def scrape_website(
         )
 
 
-async def get_frame_text(iframe: Frame) -> str:
+async def get_frame_text(iframe: Frame, semaphore: asyncio.Semaphore | None = None) -> str:
     """
-    Get all the visible text in the iframe.
+    Get all the visible text in the iframe. The child frames are read concurrently.
     :param iframe: Frame instance to get the text from.
+    :param semaphore: bounds the frames read at the same time, shared with the child frames.
     :return: All the visible text from the iframe.
     """
     js_script = "() => document.body.innerText"
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(SettingsManager.get_settings().SCRAPE_FRAME_CONCURRENCY)
 
     try:
-        text = await SkyvernFrame.evaluate(frame=iframe, expression=js_script)
+        async with semaphore:
+            text = await SkyvernFrame.evaluate(frame=iframe, expression=js_script)
     except Exception:
         LOG.warning(
             "failed to get text from iframe",
@@ -489,26 +556,31 @@ async def get_frame_text(iframe: Frame) -> str:
         )
         return ""
 
-    for child_frame in iframe.child_frames:
+    async def get_child_frame_text(child_frame: Frame) -> str:
         if child_frame.is_detached():
-            continue
+            return ""
 
         try:
-            child_frame_element = await child_frame.frame_element()
+            async with semaphore:
+                async with asyncio.timeout(SettingsManager.get_settings().SCRAPE_FRAME_TIMEOUT_MS / 1000):
+                    child_frame_element = await child_frame.frame_element()
+                    # it will get stuck when we `frame.evaluate()` on an invisible iframe
+                    is_visible = await child_frame_element.is_visible()
         except Exception:
             LOG.warning(
                 "Unable to get child_frame_element",
                 exc_info=True,
             )
-            continue
+            return ""
 
-        # it will get stuck when we `frame.evaluate()` on an invisible iframe
-        if not await child_frame_element.is_visible():
-            continue
+        if not is_visible:
+            return ""
 
-        text += await get_frame_text(child_frame)
+        return await get_frame_text(child_frame, semaphore)
 
-    return text
+    # joined in the order of the child frames, whichever finishes first
+    child_texts = await asyncio.gather(*[get_child_frame_text(child_frame) for child_frame in iframe.child_frames])
+    return text + "".join(child_texts)
 
 
 async def scrape_web_unsafe(
@@ -541,15 +613,32 @@ async def scrape_web_unsafe(
     # This also solves the issue where we can't scroll due to a popup.(e.g. geico first popup on the homepage after
     # clicking start my quote)
 
-    LOG.info("Waiting for 3 seconds before scraping the website.")
-    await asyncio.sleep(3)
+    LOG.info("Waiting for at most 3 seconds until the page is stable before scraping the website.")
+    await wait_for_page_stable(page=page, timeout_ms=3000)
 
-    elements, element_tree = await get_interactable_element_tree(page, scrape_exclude)
-    element_tree = await cleanup_element_tree(page, url, copy.deepcopy(element_tree))
-    element_tree_trimmed = trim_element_tree(copy.deepcopy(element_tree))
+    incremental_scraping = SettingsManager.get_settings().ENABLE_INCREMENTAL_SCRAPE
+    known_element_hashes: dict[str, str] | None = None
+    incremental_result = None
+    # pop the state out, so a failed scraping always leads to a full scraping next time
+    incremental_state = _incremental_scrape_states.pop(browser_state, None) if incremental_scraping else None
+    if incremental_state is not None:
+        incremental_result = await get_incremental_interactable_element_tree(incremental_state, page, scrape_exclude)
+
+    tracking_dirty_subtrees = incremental_result is not None
+    if incremental_result is not None:
+        elements, element_tree, known_element_hashes = incremental_result
+    else:
+        if incremental_scraping:
+            # start tracking before building the tree, so the changes during the scraping won't be missed
+            tracking_dirty_subtrees = await start_dirty_subtree_tracker(page)
+        elements, element_tree = await get_interactable_element_tree(page, scrape_exclude)
+    raw_element_tree = element_tree
+    element_tree = await cleanup_element_tree(page, url, element_tree)
+    element_tree_trimmed = build_trimmed_element_tree(element_tree)
 
     screenshots = []
     if take_screenshots:
+        # the HTML without the skyvern attributes, the prompts count theirs per element when they need it
         element_tree_trimmed_html_str = "".join(
             json_to_html(element, need_skyvern_attrs=False) for element in element_tree_trimmed
         )
@@ -565,7 +654,7 @@ async def scrape_web_unsafe(
             scroll=scroll,
         )
     id_to_css_dict, id_to_element_dict, id_to_frame_dict, id_to_element_hash, hash_to_element_ids = build_element_dict(
-        elements
+        elements, known_element_hashes=known_element_hashes
     )
 
     # if there are no elements, fail the scraping
@@ -588,6 +677,19 @@ async def scrape_web_unsafe(
             exc_info=True,
         )
 
+    if tracking_dirty_subtrees:
+        consecutive_count = 0
+        if incremental_state is not None and incremental_result is not None:
+            consecutive_count = incremental_state.consecutive_count + 1
+        save_incremental_scrape_state(
+            browser_state=browser_state,
+            page=page,
+            elements=elements,
+            element_tree=raw_element_tree,
+            id_to_element_hash=id_to_element_hash,
+            consecutive_count=consecutive_count,
+        )
+
     return ScrapedPage(
         elements=elements,
         id_to_css_dict=id_to_css_dict,
@@ -633,40 +735,61 @@ async def filter_frames(frames: list[Frame], scrape_exclude: ScrapeExcludeFunc |
     return filtered_frames
 
 
-async def add_frame_interactable_elements(
-    frame: Frame,
-    frame_index: int,
-    elements: list[dict],
-    element_tree: list[dict],
-) -> tuple[list[dict], list[dict]]:
+async def scrape_frame_interactable_elements(
+    frame: Frame, frame_index: int
+) -> tuple[str, list[dict], list[dict]] | None:
     """
-    Add the interactable element of the frame to the elements and element_tree.
+    Build the interactable elements and the element tree of the iframe.
+    :return: the unique_id of the iframe element, the elements and the element tree. None if the iframe is invisible.
     """
     try:
         frame_element = await frame.frame_element()
         # it will get stuck when we `frame.evaluate()` on an invisible iframe
         if not await frame_element.is_visible():
-            return elements, element_tree
+            return None
         unique_id = await frame_element.get_attribute("unique_id")
     except Exception:
         LOG.warning(
             "Unable to get unique_id from frame_element",
             exc_info=True,
         )
-        return elements, element_tree
+        return None
 
     skyvern_frame = await SkyvernFrame.create_instance(frame)
     frame_elements, frame_element_tree = await skyvern_frame.build_tree_from_body(
         frame_name=unique_id, frame_index=frame_index
     )
+    return unique_id, frame_elements, frame_element_tree
 
-    for element in elements:
-        if element["id"] == unique_id:
-            element["children"] = frame_element_tree
-
-    elements = elements + frame_elements
 
-    return elements, element_tree
+async def scrape_frames_interactable_elements(
+    frames: list[Frame],
+    frame_index_map: dict[Frame, int],
+) -> list[tuple[str, list[dict], list[dict]] | None]:
+    """
+    Scrape the iframes concurrently, at most SCRAPE_FRAME_CONCURRENCY at a time. A frame that takes longer than
+    SCRAPE_FRAME_TIMEOUT_MS is left out so it can't stall the whole scrape.
+    :return: the result of each frame, in the order of the frames.
+    """
+    semaphore = asyncio.Semaphore(SettingsManager.get_settings().SCRAPE_FRAME_CONCURRENCY)
+    timeout_ms = SettingsManager.get_settings().SCRAPE_FRAME_TIMEOUT_MS
+
+    async def scrape_frame(frame: Frame) -> tuple[str, list[dict], list[dict]] | None:
+        frame_index = frame_index_map[frame]
+        async with semaphore:
+            try:
+                async with asyncio.timeout(timeout_ms / 1000):
+                    return await scrape_frame_interactable_elements(frame, frame_index)
+            except (asyncio.TimeoutError, TimeoutError):
+                LOG.warning(
+                    "Timed out scraping the iframe, leaving it out",
+                    frame_url=frame.url,
+                    frame_index=frame_index,
+                    timeout_ms=timeout_ms,
+                )
+                return None
+
+    return await asyncio.gather(*[scrape_frame(frame) for frame in frames])
 
 
 @TraceManager.traced_async(ignore_input=True)
@@ -693,18 +816,211 @@ async def get_interactable_element_tree(
             frame_index = len(context.frame_index_map) + 1
             context.frame_index_map[frame] = frame_index
 
-    for frame in frames:
-        frame_index = context.frame_index_map[frame]
-        elements, element_tree = await add_frame_interactable_elements(
-            frame,
-            frame_index,
-            elements,
-            element_tree,
-        )
+    frame_results = await scrape_frames_interactable_elements(frames, context.frame_index_map)
+
+    # merged in the order of the frames, a parent frame before its children, as if they were scraped one by one
+    for frame_result in frame_results:
+        if frame_result is None:
+            continue
+        unique_id, frame_elements, frame_element_tree = frame_result
+        for element in elements:
+            if element["id"] == unique_id:
+                element["children"] = frame_element_tree
+        elements = elements + frame_elements
 
     return elements, element_tree
 
 
+class IncrementalScrapeState:
+    """
+    The raw (before cleanup) element tree of the latest scraping on a page.
+    The next scraping on the same page only rebuilds the subtrees changed since then and patches them into this tree.
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        url: str,
+        elements: list[dict],
+        element_tree: list[dict],
+        id_to_element_hash: dict[str, str],
+        consecutive_count: int,
+    ) -> None:
+        self.page = page
+        self.url = url
+        self.elements = elements
+        self.element_tree = element_tree
+        self.id_to_element_hash = id_to_element_hash
+        self.consecutive_count = consecutive_count
+
+
+_incremental_scrape_states: weakref.WeakKeyDictionary[BrowserState, IncrementalScrapeState] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _collect_element_ids(element: dict, element_ids: set[str]) -> None:
+    element_ids.add(element.get("id", ""))
+    for child in element.get("children", []):
+        _collect_element_ids(child, element_ids)
+
+
+def patch_element_tree(
+    elements: list[dict],
+    element_tree: list[dict],
+    id_to_element_hash: dict[str, str],
+    subtrees: list[dict],
+) -> tuple[list[dict], list[dict], dict[str, str]] | None:
+    """
+    Replace the dirty subtrees in the element tree with the rebuilt ones. The input elements and tree are not mutated,
+    only the ancestors of the dirty subtrees are copied.
+    :param subtrees: the rebuilt subtrees, each is {"id": dirty element id, "elements": [...], "tree": [...]}
+    :return: the patched elements, the patched element tree and the element hashes which are still valid.
+        None if any dirty element can't be found in the element tree.
+    """
+    rebuilt_subtrees = {subtree["id"]: subtree for subtree in subtrees}
+    pending_ids = set(rebuilt_subtrees.keys())
+    removed_ids: set[str] = set()
+    # the hash of an element covers all its children, so the hashes of the ancestors are stale as well
+    stale_ids: set[str] = set()
+    copied_elements: dict[str, dict] = {}
+
+    def patch_children(children: list[dict], ancestor_ids: list[str]) -> tuple[list[dict], bool]:
+        patched_children: list[dict] = []
+        changed = False
+        for child in children:
+            child_id = child.get("id", "")
+            if child_id in rebuilt_subtrees:
+                _collect_element_ids(child, removed_ids)
+                stale_ids.update(ancestor_ids)
+                pending_ids.discard(child_id)
+                patched_children.extend(rebuilt_subtrees[child_id]["tree"])
+                changed = True
+                continue
+
+            grand_children = child.get("children", [])
+            if grand_children:
+                ancestor_ids.append(child_id)
+                patched_grand_children, child_changed = patch_children(grand_children, ancestor_ids)
+                ancestor_ids.pop()
+                if child_changed:
+                    child = {**child, "children": patched_grand_children}
+                    copied_elements[child_id] = child
+                    changed = True
+            patched_children.append(child)
+        return patched_children, changed
+
+    patched_tree, _ = patch_children(element_tree, [])
+    if pending_ids:
+        LOG.info("Dirty elements not found in the previous element tree", element_ids=list(pending_ids))
+        return None
+
+    new_ids: set[str] = set()
+    for subtree in subtrees:
+        new_ids.update(element.get("id", "") for element in subtree["elements"])
+
+    # keep the DOM order by putting the rebuilt elements at the position of the dirty element
+    patched_elements: list[dict] = []
+    for element in elements:
+        element_id = element.get("id", "")
+        if element_id in rebuilt_subtrees:
+            patched_elements.extend(rebuilt_subtrees[element_id]["elements"])
+        elif element_id not in removed_ids and element_id not in new_ids:
+            patched_elements.append(copied_elements.get(element_id, element))
+
+    known_element_hashes = {
+        element_id: element_hash
+        for element_id, element_hash in id_to_element_hash.items()
+        if element_id not in removed_ids and element_id not in stale_ids and element_id not in new_ids
+    }
+    return patched_elements, patched_tree, known_element_hashes
+
+
+@TraceManager.traced_async(ignore_input=True)
+async def get_incremental_interactable_element_tree(
+    state: IncrementalScrapeState,
+    page: Page,
+    scrape_exclude: ScrapeExcludeFunc | None = None,
+) -> tuple[list[dict], list[dict], dict[str, str]] | None:
+    """
+    Get the element tree of the page by patching the previous scraping with the subtrees changed since then.
+    :return: Tuple containing the elements, the element tree and the element hashes which are still valid.
+        None if the page has to be fully scraped.
+    """
+    if state.page is not page or state.url != page.url:
+        return None
+
+    max_consecutive = SettingsManager.get_settings().INCREMENTAL_SCRAPE_MAX_CONSECUTIVE
+    if state.consecutive_count >= max_consecutive:
+        return None
+
+    # the observer only watches the DOM of the main frame: pages with iframes or shadow DOM are scraped in full
+    if any(element.get("shadowHost") or element.get("frame") != "main.frame" for element in state.elements):
+        return None
+    frames = await filter_frames(await get_all_children_frames(page), scrape_exclude)
+    if frames:
+        return None
+
+    try:
+        skyvern_page = await SkyvernFrame.create_instance(page)
+        subtrees = await skyvern_page.get_dirty_subtrees(
+            frame_name="main.frame",
+            frame_index=0,
+            max_subtrees=SettingsManager.get_settings().INCREMENTAL_SCRAPE_MAX_DIRTY_SUBTREES,
+        )
+    except Exception:
+        LOG.warning("Failed to get the dirty subtrees, going to scrape the whole page", exc_info=True)
+        return None
+
+    if subtrees is None:
+        return None
+
+    patched = patch_element_tree(
+        elements=state.elements,
+        element_tree=state.element_tree,
+        id_to_element_hash=state.id_to_element_hash,
+        subtrees=subtrees,
+    )
+    if patched is None:
+        return None
+
+    LOG.info(
+        "Patched the element tree with the dirty subtrees",
+        dirty_subtrees=len(subtrees),
+        elements=len(patched[0]),
+        reused_hashes=len(patched[2]),
+    )
+    return patched
+
+
+async def start_dirty_subtree_tracker(page: Page) -> bool:
+    try:
+        skyvern_page = await SkyvernFrame.create_instance(page)
+        await skyvern_page.start_dirty_subtree_tracker()
+    except Exception:
+        LOG.warning("Failed to start tracking the dirty subtrees, the next scraping will be a full one", exc_info=True)
+        return False
+    return True
+
+
+def save_incremental_scrape_state(
+    browser_state: BrowserState,
+    page: Page,
+    elements: list[dict],
+    element_tree: list[dict],
+    id_to_element_hash: dict[str, str],
+    consecutive_count: int,
+) -> None:
+    _incremental_scrape_states[browser_state] = IncrementalScrapeState(
+        page=page,
+        url=page.url,
+        elements=elements,
+        element_tree=element_tree,
+        id_to_element_hash=id_to_element_hash,
+        consecutive_count=consecutive_count,
+    )
+
+
 class IncrementalScrapePage(ElementTreeBuilder):
     def __init__(self, skyvern_frame: SkyvernFrame) -> None:
         self.id_to_element_dict: dict[str, dict] = dict()
@@ -747,8 +1063,8 @@ class IncrementalScrapePage(ElementTreeBuilder):
 
         self.elements = incremental_elements
 
-        incremental_tree = await cleanup_element_tree(frame, frame.url, copy.deepcopy(incremental_tree))
-        trimmed_element_tree = trim_element_tree(copy.deepcopy(incremental_tree))
+        incremental_tree = await cleanup_element_tree(frame, frame.url, incremental_tree)
+        trimmed_element_tree = build_trimmed_element_tree(incremental_tree)
 
         self.element_tree = incremental_tree
         self.element_tree_trimmed = trimmed_element_tree
@@ -880,9 +1196,9 @@ def _should_keep_unique_id(element: dict) -> bool:
 
 
 def trim_element(element: dict) -> dict:
-    queue = [element]
+    queue = deque([element])
     while queue:
-        queue_ele = queue.pop(0)
+        queue_ele = queue.popleft()
         if "frame" in queue_ele:
             del queue_ele["frame"]
 
@@ -940,6 +1256,52 @@ def trim_element_tree(elements: list[dict]) -> list[dict]:
     return elements
 
 
+def build_trimmed_element(element: dict) -> dict:
+    """
+    Same result as trim_element(copy.deepcopy(element)), but built in a single pass without copying the dropped data.
+    The input element is not modified.
+    """
+    keep_all_attr = element.get("keepAllAttr", False)
+    trimmed: dict = {}
+    for key, value in element.items():
+        if key in ("frame", "frame_index", "keepAllAttr"):
+            continue
+
+        if key == "id" and not _should_keep_unique_id(element):
+            continue
+
+        if key == "attributes":
+            value = _trimmed_base64_data(value)
+            if value and not keep_all_attr:
+                value = _trimmed_attributes(value)
+            if not value:
+                continue
+            if "name" in value and len(value["name"]) > 500:
+                value["name"] = value["name"][:500]
+        elif key == "children":
+            if not value:
+                continue
+            value = [build_trimmed_element(child) for child in value]
+        elif key == "text":
+            if not str(value).strip():
+                continue
+        elif key in ("beforePseudoText", "afterPseudoText"):
+            if not value:
+                continue
+        elif isinstance(value, (dict, list)):
+            value = copy.deepcopy(value)
+
+        trimmed[key] = value
+    return trimmed
+
+
+def build_trimmed_element_tree(elements: list[dict]) -> list[dict]:
+    """
+    Same result as trim_element_tree(copy.deepcopy(elements)), the input tree is not modified.
+    """
+    return [build_trimmed_element(element) for element in elements]
+
+
 def _trimmed_base64_data(attributes: dict) -> dict:
     new_attributes: dict = {}
 
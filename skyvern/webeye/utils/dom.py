@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import copy
 import typing
 from enum import StrEnum
 from random import uniform
@@ -26,49 +25,83 @@ from skyvern.exceptions import (
     SkyvernException,
 )
 from skyvern.webeye.actions import handler_utils
-from skyvern.webeye.scraper.scraper import IncrementalScrapePage, ScrapedPage, json_to_html, trim_element
+from skyvern.webeye.scraper.scraper import IncrementalScrapePage, ScrapedPage, build_trimmed_element, json_to_html
 from skyvern.webeye.utils.page import SkyvernFrame
 
 LOG = structlog.get_logger()
 COMMON_INPUT_TAGS = {"input", "textarea", "select"}
 
 
-async def resolve_locator(scrape_page: ScrapedPage, page: Page, frame: str, css: str) -> tuple[Locator, Page | Frame]:
-    iframe_path: list[str] = []
-
-    while frame != "main.frame":
-        iframe_path.append(frame)
+async def _resolve_frame(scrape_page: ScrapedPage, page: Page, frame: str) -> tuple[Page | FrameLocator, Page | Frame]:
+    if frame == "main.frame":
+        return page, page
 
-        frame_element = scrape_page.id_to_element_dict.get(frame)
-        if frame_element is None:
-            raise MissingElement(element_id=frame)
+    cache = scrape_page.frame_path_cache
+    if resolved := cache.get(page, frame):
+        return resolved.frame_locator, resolved.frame
 
-        parent_frame = frame_element.get("frame")
-        if not parent_frame:
-            raise SkyvernException(f"element without frame: {frame_element}")
+    frame_element = scrape_page.id_to_element_dict.get(frame)
+    if frame_element is None:
+        raise MissingElement(element_id=frame)
 
-        frame = parent_frame
+    parent_frame = frame_element.get("frame")
+    if not parent_frame:
+        raise SkyvernException(f"element without frame: {frame_element}")
 
-    current_page: Page | FrameLocator = page
-    current_frame: Page | Frame = page
+    parent_page, current_frame = await _resolve_frame(scrape_page, page, parent_frame)
 
-    while len(iframe_path) > 0:
-        child_frame = iframe_path.pop()
+    frame_handler = await current_frame.query_selector(f"[{SKYVERN_ID_ATTR}='{frame}']")
+    if frame_handler is None:
+        raise NoneFrameError(frame_id=frame)
 
-        frame_handler = await current_frame.query_selector(f"[{SKYVERN_ID_ATTR}='{child_frame}']")
-        if frame_handler is None:
-            raise NoneFrameError(frame_id=child_frame)
+    content_frame = await frame_handler.content_frame()
+    if content_frame is None:
+        raise NoneFrameError(frame_id=frame)
 
-        content_frame = await frame_handler.content_frame()
-        if content_frame is None:
-            raise NoneFrameError(frame_id=child_frame)
-        current_frame = content_frame
+    frame_locator = parent_page.frame_locator(f"[{SKYVERN_ID_ATTR}='{frame}']")
+    cache.set(frame, frame_locator, content_frame)
+    return frame_locator, content_frame
 
-        current_page = current_page.frame_locator(f"[{SKYVERN_ID_ATTR}='{child_frame}']")
 
+async def resolve_locator(scrape_page: ScrapedPage, page: Page, frame: str, css: str) -> tuple[Locator, Page | Frame]:
+    current_page, current_frame = await _resolve_frame(scrape_page, page, frame)
     return current_page.locator(css), current_frame
 
 
+async def resolve_locators(
+    scrape_page: ScrapedPage, page: Page, element_ids: list[str]
+) -> dict[str, tuple[Locator, Page | Frame]]:
+    """
+    Resolve the locators of the elements at once, e.g. the elements of all the actions of a step. Each iframe is only
+    resolved once and the iframes of different frame chains are resolved concurrently. The elements that can't be
+    resolved are left out, resolve_locator raises the error again when they are used.
+    """
+    frames = {
+        frame for element_id in element_ids if (frame := scrape_page.id_to_frame_dict.get(element_id)) is not None
+    }
+    results = await asyncio.gather(
+        *[_resolve_frame(scrape_page, page, frame) for frame in frames], return_exceptions=True
+    )
+    failed_frames: set[str] = set()
+    for frame, result in zip(frames, results):
+        if isinstance(result, BaseException):
+            LOG.info("Failed to resolve frame", frame=frame, exc_info=result)
+            failed_frames.add(frame)
+
+    locators: dict[str, tuple[Locator, Page | Frame]] = {}
+    for element_id in element_ids:
+        frame = scrape_page.id_to_frame_dict.get(element_id)
+        css = scrape_page.id_to_css_dict.get(element_id)
+        if not frame or not css or frame in failed_frames:
+            continue
+        try:
+            locators[element_id] = await resolve_locator(scrape_page, page, frame, css)
+        except Exception:
+            # the frame went away since it was resolved
+            continue
+    return locators
+
+
 class InteractiveElement(StrEnum):
     A = "a"
     INPUT = "input"
@@ -139,7 +172,7 @@ class SkyvernElement:
     def build_HTML(self, need_trim_element: bool = True, need_skyvern_attrs: bool = True) -> str:
         element_dict = self.get_element_dict()
         if need_trim_element:
-            element_dict = trim_element(copy.deepcopy(element_dict))
+            element_dict = build_trimmed_element(element_dict)
 
         return json_to_html(element_dict, need_skyvern_attrs)
 
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+
+from playwright.async_api import Frame, FrameLocator, Page
+
+
+@dataclass
+class ResolvedFrame:
+    frame_locator: FrameLocator
+    frame: Frame
+    # the url of the frame when it was resolved, the skyvern ids of the frame are gone once it navigates
+    url: str
+
+
+class FramePathCache:
+    """
+    The iframes of a scraped page resolved to their live frame, so the actions of a step don't query every iframe of
+    the chain again. An entry is dropped when its frame is detached or has navigated, and the whole cache when it's
+    used with another page.
+    """
+
+    def __init__(self) -> None:
+        self.page: Page | None = None
+        self.frames: dict[str, ResolvedFrame] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, page: Page, frame_id: str) -> ResolvedFrame | None:
+        if self.page is not page:
+            self.page = page
+            self.frames.clear()
+
+        resolved = self.frames.get(frame_id)
+        if resolved is not None and (resolved.frame.is_detached() or resolved.frame.url != resolved.url):
+            del self.frames[frame_id]
+            resolved = None
+
+        if resolved is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return resolved
+
+    def set(self, frame_id: str, frame_locator: FrameLocator, frame: Frame) -> None:
+        self.frames[frame_id] = ResolvedFrame(frame_locator=frame_locator, frame=frame, url=frame.url)
@@ -9,12 +9,13 @@ from typing import Any
 import structlog
 from PIL import Image
 from playwright._impl._errors import TimeoutError
-from playwright.async_api import ElementHandle, Frame, Page
+from playwright.async_api import ElementHandle, FloatRect, Frame, Page, Request
 
 from skyvern.constants import PAGE_CONTENT_TIMEOUT, SKYVERN_DIR
 from skyvern.exceptions import FailedToTakeScreenshot
 from skyvern.forge.sdk.settings_manager import SettingsManager
 from skyvern.forge.sdk.trace import TraceManager
+from skyvern.utils.image_pipeline import merge_screenshots_async, run_in_image_executor
 
 LOG = structlog.get_logger()
 
@@ -45,6 +46,7 @@ async def _page_screenshot_helper(
     file_path: str | None = None,
     full_page: bool = False,
     timeout: float = SettingsManager.get_settings().BROWSER_SCREENSHOT_TIMEOUT_MS,
+    clip: FloatRect | None = None,
 ) -> bytes:
     try:
         return await page.screenshot(
@@ -52,6 +54,7 @@ async def _page_screenshot_helper(
             timeout=timeout,
             full_page=full_page,
             animations="disabled",
+            clip=clip,
         )
     except TimeoutError as timeout_error:
         LOG.info(
@@ -62,6 +65,7 @@ async def _page_screenshot_helper(
             timeout=timeout,
             full_page=full_page,
             animations="allow",
+            clip=clip,
         )
 
 
@@ -71,6 +75,7 @@ async def _current_viewpoint_screenshot_helper(
     full_page: bool = False,
     timeout: float = SettingsManager.get_settings().BROWSER_SCREENSHOT_TIMEOUT_MS,
     mode: ScreenshotMode = ScreenshotMode.DETAILED,
+    clip: FloatRect | None = None,
 ) -> bytes:
     if page.is_closed():
         raise FailedToTakeScreenshot(error_message="Page is closed")
@@ -82,10 +87,10 @@ async def _current_viewpoint_screenshot_helper(
         screenshot: bytes = b""
         if file_path:
             screenshot = await _page_screenshot_helper(
-                page=page, file_path=file_path, full_page=full_page, timeout=timeout
+                page=page, file_path=file_path, full_page=full_page, timeout=timeout, clip=clip
             )
         else:
-            screenshot = await _page_screenshot_helper(page=page, full_page=full_page, timeout=timeout)
+            screenshot = await _page_screenshot_helper(page=page, full_page=full_page, timeout=timeout, clip=clip)
         end_time = time.time()
         LOG.debug(
             "Screenshot taking time",
@@ -120,7 +125,12 @@ async def _scrolling_screenshots_helper(
 
     screenshots: list[bytes] = []
     positions: list[int] = []
-    if await skyvern_page.is_window_scrollable():
+    is_window_scrollable = await skyvern_page.is_window_scrollable()
+    if is_window_scrollable and SettingsManager.get_settings().SCREENSHOT_CAPTURE_STRATEGY == "full_page":
+        return await _full_page_screenshots_helper(
+            skyvern_page=skyvern_page, draw_boxes=draw_boxes, max_number=max_number, mode=mode
+        )
+    if is_window_scrollable:
         scroll_y_px_old = -30.0
         scroll_y_px = await skyvern_page.scroll_to_top(draw_boxes=draw_boxes, frame=frame, frame_index=frame_index)
         # Checking max number of screenshots to prevent infinite loop
@@ -149,8 +159,8 @@ async def _scrolling_screenshots_helper(
 
         if mode == ScreenshotMode.DETAILED:
             # wait until animation ends, which is triggered by scrolling
-            LOG.debug("Waiting for 2 seconds until animation ends.")
-            await asyncio.sleep(2)
+            LOG.debug("Waiting for at most 2 seconds until animation ends.")
+            await wait_for_page_stable(page=skyvern_page.frame, timeout_ms=2000)
     else:
         if draw_boxes:
             await skyvern_page.build_elements_and_draw_bounding_boxes(frame=frame, frame_index=frame_index)
@@ -166,40 +176,154 @@ async def _scrolling_screenshots_helper(
     return screenshots, positions
 
 
-def _merge_images_by_position(images: list[Image.Image], positions: list[int]) -> Image.Image:
-    """Merge screenshots vertically using scroll positions to remove overlaps."""
-    if not images:
-        raise ValueError("no images to merge")
-    if len(images) != len(positions):
-        raise ValueError("images and positions length mismatch")
+def _get_tile_positions(page_height: int, viewport_height: int, step: int, max_number: int) -> list[int]:
+    """
+    The scroll positions the scrolling screenshots would be taken at. The last one is clamped to the page bottom.
+    """
+    positions = [0]
+    while len(positions) < max_number and positions[-1] + viewport_height < page_height:
+        positions.append(min(positions[-1] + step, page_height - viewport_height))
+    return positions
+
+
+def _slice_screenshot(
+    screenshot: bytes, viewport_width: int, viewport_height: int, positions: list[int]
+) -> list[bytes]:
+    """
+    Slice a full page screenshot into the viewport sized screenshots taken at the scroll positions.
+    """
+    tiles: list[bytes] = []
+    with Image.open(BytesIO(screenshot)) as img:
+        # the screenshot is in device pixels, the positions are in CSS pixels
+        scale = img.width / viewport_width
+        for position in positions:
+            top = round(position * scale)
+            bottom = min(img.height, round((position + viewport_height) * scale))
+            buffer = BytesIO()
+            img.crop((0, top, img.width, bottom)).save(buffer, format="PNG")
+            tiles.append(buffer.getvalue())
+    return tiles
+
+
+async def _full_page_screenshots_helper(
+    skyvern_page: SkyvernFrame,
+    draw_boxes: bool = False,
+    max_number: int = SettingsManager.get_settings().MAX_NUM_SCREENSHOTS,
+    mode: ScreenshotMode = ScreenshotMode.DETAILED,
+) -> tuple[list[bytes], list[int]]:
+    """
+    Same output as the scrolling screenshots, but from one full page capture sliced into viewports in memory.
+    The bounding boxes are positioned relative to the document, so they are drawn once at the top.
+    """
+    assert isinstance(skyvern_page.frame, Page)
+    page = skyvern_page.frame
+    await skyvern_page.scroll_to_top(draw_boxes=draw_boxes, frame="main.frame", frame_index=0)
+    try:
+        viewport_width, viewport_height, page_height = await skyvern_page.evaluate(
+            frame=page,
+            expression="() => [window.innerWidth, window.innerHeight, document.documentElement.scrollHeight]",
+        )
+        # keep the same overlap as scrollToNextPage
+        step = viewport_height - 200 if mode == ScreenshotMode.DETAILED else viewport_height
+        positions = _get_tile_positions(page_height, viewport_height, max(step, 1), max_number)
+        screenshot = await _current_viewpoint_screenshot_helper(
+            page=page,
+            full_page=True,
+            mode=mode,
+            clip=FloatRect(x=0, y=0, width=viewport_width, height=positions[-1] + viewport_height),
+        )
+    finally:
+        if draw_boxes:
+            await skyvern_page.remove_bounding_boxes()
+
+    screenshots = await run_in_image_executor(_slice_screenshot, screenshot, viewport_width, viewport_height, positions)
+    return screenshots, positions
+
+
+# like networkidle2: a page that keeps a couple of requests open (long polling, analytics beacons) is still idle
+MAX_IDLE_INFLIGHT_REQUESTS = 2
 
-    if len(images) == 1:
-        return images[0]
 
-    max_width = max(img.width for img in images)
+class NetworkIdleTracker:
+    """
+    The requests of the page in flight, followed through its request events while the tracker is entered. The
+    requests started before that aren't seen.
+    """
 
-    merged_height = images[0].height
-    for i in range(1, len(images)):
-        merged_height += positions[i] - positions[i - 1]
+    def __init__(self, page: Page, max_inflight_requests: int = MAX_IDLE_INFLIGHT_REQUESTS) -> None:
+        self.page = page
+        self.max_inflight_requests = max_inflight_requests
+        self.inflight_requests: set[Request] = set()
+        self._changed = asyncio.Event()
 
-    merged_img = Image.new("RGB", (max_width, merged_height), color=(255, 255, 255))
+    def _on_request(self, request: Request) -> None:
+        self.inflight_requests.add(request)
+        self._changed.set()
 
-    current_y = 0
-    merged_img.paste(images[0], (0, current_y))
-    current_y += images[0].height
+    def _on_request_done(self, request: Request) -> None:
+        self.inflight_requests.discard(request)
+        self._changed.set()
 
-    for i in range(1, len(images)):
-        step = positions[i] - positions[i - 1]
-        overlap = images[i].height - step
-        if overlap > 0:
-            cropped = images[i].crop((0, overlap, images[i].width, images[i].height))
-        else:
-            cropped = images[i]
+    def __enter__(self) -> NetworkIdleTracker:
+        self.page.on("request", self._on_request)
+        self.page.on("requestfinished", self._on_request_done)
+        self.page.on("requestfailed", self._on_request_done)
+        return self
 
-        merged_img.paste(cropped, (0, current_y))
-        current_y += cropped.height
+    def __exit__(self, *args: Any) -> None:
+        self.page.remove_listener("request", self._on_request)
+        self.page.remove_listener("requestfinished", self._on_request_done)
+        self.page.remove_listener("requestfailed", self._on_request_done)
 
-    return merged_img
+    async def wait_for_idle(self, quiet_ms: float) -> None:
+        """
+        Wait until at most max_inflight_requests requests are in flight and no request started or ended for quiet_ms.
+        """
+        while True:
+            self._changed.clear()
+            if len(self.inflight_requests) > self.max_inflight_requests:
+                await self._changed.wait()
+                continue
+            try:
+                await asyncio.wait_for(self._changed.wait(), quiet_ms / 1000)
+            except asyncio.TimeoutError:
+                return
+
+
+async def wait_for_page_stable(page: Page | Frame, timeout_ms: float) -> None:
+    """
+    Wait until the network is idle and the DOM stops changing, for at most timeout_ms. For a frame, the DOM of the
+    frame is watched and the requests of the page it belongs to, a frame has no request events of its own.
+    """
+    if not SettingsManager.get_settings().ENABLE_PAGE_STABLE_WAIT:
+        await asyncio.sleep(timeout_ms / 1000)
+        return
+
+    start_time = time.monotonic()
+    stable = False
+    quiet_ms = SettingsManager.get_settings().PAGE_STABLE_QUIET_MS
+    try:
+        with NetworkIdleTracker(page.page if isinstance(page, Frame) else page) as network:
+            async with asyncio.timeout(timeout_ms / 1000):
+                skyvern_frame = await SkyvernFrame.create_instance(frame=page)
+                network_idle: None | BaseException
+                dom_stable: bool | BaseException
+                network_idle, dom_stable = await asyncio.gather(
+                    network.wait_for_idle(quiet_ms=quiet_ms),
+                    skyvern_frame.wait_for_dom_stable(quiet_ms=quiet_ms, timeout_ms=timeout_ms),
+                    return_exceptions=True,
+                )
+                stable = dom_stable is True and not isinstance(network_idle, BaseException)
+    except asyncio.TimeoutError:
+        pass
+    except Exception:
+        # the page is probably navigating, give it the rest of the time like the fixed wait did
+        LOG.debug("Failed to check whether the page is stable", exc_info=True)
+        remaining_seconds = timeout_ms / 1000 - (time.monotonic() - start_time)
+        if remaining_seconds > 0:
+            await asyncio.sleep(remaining_seconds)
+
+    LOG.debug("Waited for the page to be stable", stable=stable, duration=time.monotonic() - start_time)
 
 
 class SkyvernFrame:
@@ -259,20 +383,7 @@ class SkyvernFrame:
                 screenshots, positions = await _scrolling_screenshots_helper(
                     skyvern_page=skyvern_frame, mode=mode, max_number=scrolling_number
                 )
-                images = []
-
-                for screenshot in screenshots:
-                    with Image.open(BytesIO(screenshot)) as img:
-                        img.load()
-                        images.append(img)
-
-                merged_img = _merge_images_by_position(images, positions)
-
-                buffer = BytesIO()
-                merged_img.save(buffer, format="PNG")
-                buffer.seek(0)
-
-                img_data = buffer.read()
+                img_data = await merge_screenshots_async(screenshots, positions)
                 if file_path is not None:
                     with open(file_path, "wb") as f:
                         f.write(img_data)
@@ -420,6 +531,16 @@ class SkyvernFrame:
             arg=[frame, frame_index],
         )
 
+    async def wait_for_dom_stable(self, quiet_ms: float, timeout_ms: float) -> bool:
+        js_script = "([quiet_ms, timeout_ms]) => waitForDomStable(quiet_ms, timeout_ms)"
+        return await self.evaluate(
+            frame=self.frame,
+            expression=js_script,
+            arg=[quiet_ms, timeout_ms],
+            # leave time for the script to resolve by itself
+            timeout_ms=timeout_ms + 1000,
+        )
+
     async def is_window_scrollable(self) -> bool:
         js_script = "() => isWindowScrollable()"
         return await self.evaluate(frame=self.frame, expression=js_script)
@@ -470,3 +591,24 @@ class SkyvernFrame:
         return await self.evaluate(
             frame=self.frame, expression=js_script, timeout_ms=timeout_ms, arg=[wait_until_finished]
         )
+
+    async def start_dirty_subtree_tracker(self) -> None:
+        js_script = "async () => await startDirtySubtreeTracker()"
+        await self.evaluate(frame=self.frame, expression=js_script)
+
+    @TraceManager.traced_async()
+    async def get_dirty_subtrees(
+        self,
+        frame_name: str | None,
+        frame_index: int,
+        max_subtrees: int,
+        timeout_ms: float = SettingsManager.get_settings().BROWSER_SCRAPING_BUILDING_ELEMENT_TREE_TIMEOUT_MS,
+    ) -> list[dict] | None:
+        """
+        Rebuild the element trees of the subtrees changed since the last call or start_dirty_subtree_tracker().
+        :return: list of {"id", "elements", "tree"}, or None if the page has to be fully scraped again.
+        """
+        js_script = "async ([frame_name, frame_index, max_subtrees]) => await getDirtySubtrees(frame_name, frame_index, max_subtrees)"
+        return await self.evaluate(
+            frame=self.frame, expression=js_script, timeout_ms=timeout_ms, arg=[frame_name, frame_index, max_subtrees]
+        )
@@ -0,0 +1,90 @@
+"""
+Benchmark the time to first scrape of a run: from creating the browser state to the element tree of the first page,
+with a new playwright driver and browser per run vs the browser pool (needs `playwright install chromium`).
+
+    python -m tests.benchmarks.bench_browser_pool --runs 10 --concurrency 2
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import psutil
+
+from skyvern.config import settings
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.webeye.browser_manager import BrowserManager
+from skyvern.webeye.scraper.scraper import get_interactable_element_tree
+
+PAGE_HTML = "".join(
+    f"<section><h2>Section {i}</h2><input name='field{i}'><button>Submit {i}</button></section>" for i in range(50)
+)
+
+
+def _rss_mb() -> float:
+    # the worker and the driver and browser processes it spawned
+    process = psutil.Process()
+    processes = [process, *process.children(recursive=True)]
+    return sum(p.memory_info().rss for p in processes if p.is_running()) / 1024 / 1024
+
+
+async def _run() -> float:
+    skyvern_context.set(SkyvernContext(task_id=f"tsk_bench_{uuid.uuid4().hex}"))
+    start = time.perf_counter()
+    browser_state = await BrowserManager._create_browser_state()
+    assert browser_state.browser_context is not None
+    page = await browser_state.browser_context.new_page()
+    await page.set_content(f"<html><body>{PAGE_HTML}</body></html>")
+    await get_interactable_element_tree(page)
+    elapsed = time.perf_counter() - start
+    await browser_state.close()
+    skyvern_context.reset()
+    return elapsed
+
+
+async def bench(pooled: bool, runs: int, concurrency: int) -> None:
+    settings.BROWSER_POOL_ENABLED = pooled
+    semaphore = asyncio.Semaphore(concurrency)
+    peak_rss = 0.0
+
+    async def run() -> float:
+        nonlocal peak_rss
+        async with semaphore:
+            elapsed = await _run()
+            peak_rss = max(peak_rss, _rss_mb())
+            return elapsed
+
+    timings = await asyncio.gather(*[run() for _ in range(runs)])
+    name = "pooled" if pooled else "cold"
+    print(
+        f"  {name:>6}: first run {timings[0] * 1000:8.1f} ms, median {statistics.median(timings) * 1000:8.1f} ms,"
+        f" max {max(timings) * 1000:8.1f} ms, peak rss {peak_rss:8.1f} MiB"
+    )
+    if pooled:
+        pool = BrowserManager.get_browser_pool()
+        assert pool is not None
+        print(f"          {pool.get_stats().model_dump()}")
+        await pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=2)
+    args = parser.parse_args()
+
+    settings.BROWSER_TYPE = "chromium-headless"
+    print(f"time to first scrape, {args.runs} runs, {args.concurrency} concurrent:")
+
+    async def run_all() -> None:
+        await bench(pooled=False, runs=args.runs, concurrency=args.concurrency)
+        await bench(pooled=True, runs=args.runs, concurrency=args.concurrency)
+
+    asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark the element tree pipeline after the cleanup: the trimmed tree, the economy tree and the HTML rendering.
+Compares the deepcopy based pipeline with the single pass one, on wall time and peak memory (tracemalloc).
+
+    python -m tests.benchmarks.bench_element_tree_pipeline --elements 5000 10000 50000
+    python -m tests.benchmarks.bench_element_tree_pipeline --tree recorded_element_tree.json
+
+A recorded tree is the JSON dump of ScrapedPage.element_tree, e.g. from the scrape artifacts.
+"""
+
+import argparse
+import copy
+import json
+import time
+import tracemalloc
+from typing import Callable
+
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.webeye.scraper.scraper import build_trimmed_element_tree, json_to_html, trim_element_tree
+from tests.benchmarks.synthetic_dom import build_synthetic_element_tree
+
+
+def _remove_svg(element: dict) -> dict | None:
+    if element.get("tagName", "").lower() == "svg":
+        return None
+    if "children" in element:
+        element["children"] = [child for child in map(_remove_svg, element["children"]) if child]
+    return element
+
+
+def _deepcopy_pipeline(element_tree: list[dict]) -> int:
+    trimmed = trim_element_tree(copy.deepcopy(element_tree))
+    economy = [element for element in map(_remove_svg, copy.deepcopy(trimmed)) if element]
+    html = "".join(json_to_html(element) for element in trimmed)
+    html += "".join(json_to_html(element) for element in economy)
+    return len(html)
+
+
+def _single_pass_pipeline(element_tree: list[dict]) -> int:
+    trimmed = build_trimmed_element_tree(element_tree)
+
+    def economy_element(element: dict) -> dict | None:
+        if element.get("tagName", "").lower() == "svg":
+            return None
+        if "children" not in element:
+            return element
+        children = [child for child in map(economy_element, element["children"]) if child]
+        return {**element, "children": children}
+
+    economy = [element for element in map(economy_element, trimmed) if element]
+    html = "".join(json_to_html(element) for element in trimmed)
+    html += "".join(json_to_html(element) for element in economy)
+    return len(html)
+
+
+def _measure(pipeline: Callable[[list[dict]], int], element_tree: list[dict]) -> tuple[float, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    output_size = pipeline(element_tree)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1024 / 1024, output_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--elements", type=int, nargs="+", default=[5000, 10000, 50000])
+    parser.add_argument("--tree", type=str, nargs="*", default=[], help="recorded element tree JSON files")
+    args = parser.parse_args()
+
+    trees: list[tuple[str, list[dict]]] = []
+    for path in args.tree:
+        with open(path) as f:
+            trees.append((path, json.load(f)))
+    for num_elements in args.elements:
+        trees.append((f"synthetic-{num_elements}", build_synthetic_element_tree(num_elements)[1]))
+
+    skyvern_context.set(SkyvernContext())
+    print(f"{'tree':<24}{'pipeline':<14}{'time (ms)':>12}{'peak (MB)':>12}")
+    for name, element_tree in trees:
+        results = {}
+        for pipeline_name, pipeline in (("deepcopy", _deepcopy_pipeline), ("single-pass", _single_pass_pipeline)):
+            seconds, peak_mb, output_size = _measure(pipeline, element_tree)
+            results[pipeline_name] = output_size
+            print(f"{name:<24}{pipeline_name:<14}{seconds * 1000:>12.1f}{peak_mb:>12.1f}")
+        assert results["deepcopy"] == results["single-pass"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark merging and resizing realistic 1920x1080 captures: the previous Pillow code, one image after the other in
+a single thread, vs the image pipeline, which decodes once into arrays and works on the frames in parallel. The loop
+lag is the longest the event loop went without running a 1 ms ticker during the work.
+
+    python -m tests.benchmarks.bench_image_pipeline --captures 10 --runs 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from skyvern.utils.image_pipeline import get_image_executor, merge_screenshots_async
+from skyvern.utils.image_resizer import Resolution, resize_screenshots_async
+from tests.benchmarks.bench_screenshot_capture import VIEWPORT_HEIGHT, VIEWPORT_WIDTH, _synthetic_page, _to_png
+
+TARGET = Resolution(width=1366, height=768)
+
+
+def _legacy_merge(screenshots: list[bytes], positions: list[int]) -> bytes:
+    images = []
+    for screenshot in screenshots:
+        with Image.open(BytesIO(screenshot)) as img:
+            img.load()
+            images.append(img)
+    merged_img = Image.new("RGB", (VIEWPORT_WIDTH, images[0].height + positions[-1]), color=(255, 255, 255))
+    current_y = 0
+    for i, img in enumerate(images):
+        overlap = img.height - (positions[i] - positions[i - 1]) if i > 0 else 0
+        cropped = img.crop((0, overlap, img.width, img.height)) if overlap > 0 else img
+        merged_img.paste(cropped, (0, current_y))
+        current_y += cropped.height
+    buffer = BytesIO()
+    merged_img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _legacy_resize(screenshots: list[bytes]) -> list[bytes]:
+    resized = []
+    for screenshot in screenshots:
+        img = Image.open(BytesIO(screenshot)).resize((TARGET["width"], TARGET["height"]), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        img.save(buffer, format="PNG")
+        resized.append(buffer.getvalue())
+    return resized
+
+
+async def _measure(work) -> tuple[float, float]:  # type: ignore[no-untyped-def]
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            lags.append((now - last) * 1000)
+            last = now
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await work()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    stop.set()
+    await ticker_task
+    return elapsed_ms, max(lags)
+
+
+async def bench(num_captures: int, runs: int) -> None:
+    page_height = VIEWPORT_HEIGHT + (VIEWPORT_HEIGHT - 200) * (num_captures - 1)
+    page = _synthetic_page(VIEWPORT_WIDTH, page_height)
+    positions = [i * (VIEWPORT_HEIGHT - 200) for i in range(num_captures)]
+    captures = [_to_png(page.crop((0, y, VIEWPORT_WIDTH, y + VIEWPORT_HEIGHT))) for y in positions]
+    print(f"{num_captures} captures of {VIEWPORT_WIDTH}x{VIEWPORT_HEIGHT}, {get_image_executor()._max_workers} workers")
+
+    cases = {
+        "merge, previous (on the loop)": lambda: asyncio.sleep(0, _legacy_merge(captures, positions)),
+        "merge, previous (to_thread)": lambda: asyncio.to_thread(_legacy_merge, captures, positions),
+        "merge, pipeline": lambda: merge_screenshots_async(captures, positions),
+        "resize, previous (to_thread)": lambda: asyncio.to_thread(_legacy_resize, captures),
+        "resize, pipeline": lambda: resize_screenshots_async(captures, TARGET),
+    }
+    for name, work in cases.items():
+        results = [await _measure(work) for _ in range(runs)]
+        print(
+            f"  {name:<30} {statistics.median(elapsed for elapsed, _ in results):8.1f} ms,"
+            f" max loop lag {statistics.median(lag for _, lag in results):8.1f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--captures", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(bench(args.captures, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Benchmark a scraping step, full vs incremental, stage by stage: building the element tree, the element dict, the
+cleanup, the trimmed tree and the HTML and token counts the prompts are built from. Only the first two stages differ,
+the incremental scraping patches the previous element tree with the dirty subtrees and reuses the hashes of the clean
+elements, the rest runs on the whole tree either way.
+
+Without --browser, the tree is synthetic and the DOM walk isn't measured: the full tree is free and the incremental
+tree is only patched. With --browser, a synthetic page is scraped in Chromium, so the tree stage also covers
+buildTreeFromBody() vs getDirtySubtrees().
+
+    python -m tests.benchmarks.bench_incremental_scrape --elements 20000 --dirty-subtrees 3
+    python -m tests.benchmarks.bench_incremental_scrape --browser --elements 5000 --dirty-subtrees 3
+"""
+
+import argparse
+import asyncio
+import copy
+import random
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable
+
+from playwright.async_api import Frame, Page
+
+from skyvern.forge.agent_functions import AgentFunction
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.utils.token_counter import count_tokens
+from skyvern.webeye.scraper.scraper import (
+    build_element_dict,
+    build_trimmed_element_tree,
+    count_element_tree_tokens,
+    json_to_html,
+    patch_element_tree,
+)
+from skyvern.webeye.utils.page import SkyvernFrame
+from tests.benchmarks.synthetic_dom import build_synthetic_element_tree
+
+STAGES = ["tree", "element dict", "cleanup", "trimmed tree", "html + tokens"]
+
+
+class _NoMatchLocator:
+    async def count(self) -> int:
+        return 0
+
+
+class _DetachedFrame:
+    """
+    A frame where no element can be found, so the cleanup drops the SVGs instead of asking the LLM to describe them.
+    """
+
+    def locator(self, selector: str) -> _NoMatchLocator:
+        return _NoMatchLocator()
+
+
+async def _time(timings: dict[str, float], stage: str, call: Callable[[], Awaitable[Any]]) -> Any:
+    start = time.perf_counter()
+    result = await call()
+    timings[stage] += time.perf_counter() - start
+    return result
+
+
+async def _run_step(
+    timings: dict[str, float],
+    frame: Page | Frame,
+    build_tree: Callable[[], Awaitable[tuple[list[dict], list[dict], dict[str, str] | None]]],
+) -> tuple[list[dict], list[dict], dict[str, str]]:
+    """
+    The stages of scrape_web_unsafe after the page is stable and before the screenshots.
+    """
+    elements, element_tree, known_element_hashes = await _time(timings, "tree", build_tree)
+
+    async def element_dict() -> dict[str, str]:
+        return build_element_dict(elements, known_element_hashes=known_element_hashes)[3]
+
+    id_to_element_hash = await _time(timings, "element dict", element_dict)
+
+    cleanup = AgentFunction().cleanup_element_tree_factory()
+
+    async def cleanup_tree() -> list[dict]:
+        return await cleanup(frame, "https://example.com", element_tree)
+
+    cleaned_tree = await _time(timings, "cleanup", cleanup_tree)
+
+    async def trimmed_tree() -> list[dict]:
+        return build_trimmed_element_tree(cleaned_tree)
+
+    trimmed = await _time(timings, "trimmed tree", trimmed_tree)
+
+    async def html_and_tokens() -> None:
+        # the screenshot threshold and the prompt budget
+        count_tokens("".join(json_to_html(element, need_skyvern_attrs=False) for element in trimmed))
+        count_element_tree_tokens(trimmed)
+
+    await _time(timings, "html + tokens", html_and_tokens)
+    return elements, element_tree, id_to_element_hash
+
+
+def _print_timings(steps: int, timings: dict[str, dict[str, float]]) -> None:
+    totals = {name: sum(stage_timings.values()) for name, stage_timings in timings.items()}
+    print(f"{'ms/step':>16}" + "".join(f"{stage:>15}" for stage in STAGES) + f"{'total':>15}")
+    for name, stage_timings in timings.items():
+        print(
+            f"{name:>16}"
+            + "".join(f"{stage_timings[stage] / steps * 1000:15.1f}" for stage in STAGES)
+            + f"{totals[name] / steps * 1000:15.1f}"
+        )
+    saved = 1 - totals["incremental"] / totals["full"]
+    print(f"the incremental scraping saves {saved:.1%} of the step")
+
+
+def _flatten(element: dict) -> list[dict]:
+    elements = [element]
+    for child in element["children"]:
+        elements.extend(_flatten(child))
+    return elements
+
+
+def _pick_dirty_subtrees(elements: list[dict], num: int, rng: random.Random) -> list[dict]:
+    # leaf parents are the typical dirty subtrees, like a form field group or a dropdown
+    candidates = [element for element in elements if element["children"] and not element["children"][0]["children"]]
+    subtrees = []
+    for element in rng.sample(candidates, num):
+        rebuilt = copy.deepcopy(element)
+        rebuilt["text"] = "changed"
+        subtrees.append({"id": element["id"], "elements": _flatten(rebuilt), "tree": [rebuilt]})
+    return subtrees
+
+
+async def bench_synthetic(num_elements: int, dirty_subtrees: int, steps: int) -> None:
+    async def create_instance(frame: Page | Frame) -> SkyvernFrame:
+        return SkyvernFrame(frame=frame)
+
+    SkyvernFrame.create_instance = create_instance  # type: ignore[method-assign,assignment]
+    frame: Page = _DetachedFrame()  # type: ignore[assignment]
+
+    rng = random.Random(0)
+    elements, element_tree = build_synthetic_element_tree(num_elements)
+    _, _, _, id_to_element_hash, _ = build_element_dict(elements)
+
+    timings: dict[str, dict[str, float]] = {"full": defaultdict(float), "incremental": defaultdict(float)}
+    for _ in range(steps):
+        subtrees = _pick_dirty_subtrees(elements, dirty_subtrees, rng)
+
+        async def patch() -> tuple[list[dict], list[dict], dict[str, str]]:
+            patched = patch_element_tree(elements, element_tree, id_to_element_hash, subtrees)
+            assert patched is not None
+            return patched
+
+        incremental = await _run_step(timings["incremental"], frame, patch)
+        patched_elements, patched_tree = incremental[0], incremental[1]
+
+        async def full_tree() -> tuple[list[dict], list[dict], None]:
+            # built in the browser
+            return patched_elements, patched_tree, None
+
+        full = await _run_step(timings["full"], frame, full_tree)
+        assert incremental[2] == full[2]
+        elements, element_tree, id_to_element_hash = full
+
+    print(f"synthetic tree: elements={len(elements)} dirty_subtrees={dirty_subtrees} steps={steps}")
+    _print_timings(steps, timings)
+
+
+def _synthetic_html(num_elements: int) -> str:
+    # form field groups of 5 elements: a fieldset with a label, an input, a button and an svg icon
+    groups = "".join(
+        f"<fieldset id='group-{i}'><label>Field {i}</label><input name='field-{i}'>"
+        f"<button>Submit {i}</button><svg width='10' height='10'><circle r='4' cx='5' cy='5'/></svg></fieldset>"
+        for i in range(max(num_elements // 5, 1))
+    )
+    return f"<html><body><form>{groups}</form></body></html>"
+
+
+async def bench_browser(num_elements: int, dirty_subtrees: int, steps: int) -> None:
+    from playwright.async_api import async_playwright
+
+    rng = random.Random(0)
+    num_groups = max(num_elements // 5, 1)
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch()
+        page = await browser.new_page()
+        await page.set_content(_synthetic_html(num_elements))
+        skyvern_page = await SkyvernFrame.create_instance(page)
+
+        await skyvern_page.start_dirty_subtree_tracker()
+        elements, element_tree = await skyvern_page.build_tree_from_body(frame_name="main.frame", frame_index=0)
+        _, _, _, id_to_element_hash, _ = build_element_dict(elements)
+
+        timings: dict[str, dict[str, float]] = {"full": defaultdict(float), "incremental": defaultdict(float)}
+        for step in range(steps):
+            await page.evaluate(
+                "([groups, step]) => groups.forEach("
+                "(i) => document.querySelector(`#group-${i} label`).textContent = `changed ${step}`)",
+                [rng.sample(range(num_groups), dirty_subtrees), step],
+            )
+
+            async def dirty_subtrees_tree() -> tuple[list[dict], list[dict], dict[str, str]]:
+                subtrees = await skyvern_page.get_dirty_subtrees(
+                    frame_name="main.frame", frame_index=0, max_subtrees=dirty_subtrees
+                )
+                assert subtrees is not None
+                patched = patch_element_tree(elements, element_tree, id_to_element_hash, subtrees)
+                assert patched is not None
+                return patched
+
+            incremental = await _run_step(timings["incremental"], page, dirty_subtrees_tree)
+
+            async def full_tree() -> tuple[list[dict], list[dict], None]:
+                full_elements, full_element_tree = await skyvern_page.build_tree_from_body(
+                    frame_name="main.frame", frame_index=0
+                )
+                return full_elements, full_element_tree, None
+
+            full = await _run_step(timings["full"], page, full_tree)
+            assert len(incremental[0]) == len(full[0])
+            elements, element_tree, id_to_element_hash = full
+        await browser.close()
+
+    print(f"chromium page: elements={len(elements)} dirty_subtrees={dirty_subtrees} steps={steps}")
+    _print_timings(steps, timings)
+
+
+async def bench(args: argparse.Namespace) -> None:
+    skyvern_context.set(SkyvernContext())
+    try:
+        if args.browser:
+            await bench_browser(args.elements, args.dirty_subtrees, args.steps)
+        else:
+            await bench_synthetic(args.elements, args.dirty_subtrees, args.steps)
+    finally:
+        skyvern_context.reset()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--elements", type=int, default=20000)
+    parser.add_argument("--dirty-subtrees", type=int, default=3)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--browser", action="store_true")
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
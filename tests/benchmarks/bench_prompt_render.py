@@ -0,0 +1,82 @@
+"""
+Benchmark rendering the extract-action prompt with large element trees: the first render of a fresh engine (compile
+included) vs the renders of a precompiled engine, and how much of the prompt is the static prefix.
+
+    python -m tests.benchmarks.bench_prompt_render --elements 500 2000 8000 --runs 20
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime
+
+from skyvern.config import settings
+from skyvern.forge.sdk.prompting import PromptEngine
+
+
+def _elements(count: int) -> str:
+    return "\n".join(
+        f'<div id="{i}" class="row"><label>Field {i}</label><input id="in{i}" name="field_{i}" type="text" '
+        f'placeholder="Value {i}"><button id="b{i}">Save {i}</button></div>'
+        for i in range(count)
+    )
+
+
+def _render(engine: PromptEngine, elements: str) -> str:
+    return engine.load_prompt(
+        "extract-action",
+        navigation_goal="Fill in the form and submit it",
+        navigation_payload_str='{"name": "John Doe", "email": "john@example.com"}',
+        current_url="https://example.com/form",
+        elements=elements,
+        data_extraction_goal=None,
+        action_history="[]",
+        error_code_mapping_str=None,
+        local_datetime=datetime.now().isoformat(),
+        verification_code_check=False,
+        complete_criterion=None,
+        terminate_criterion=None,
+        long_context=False,
+    )
+
+
+def bench(element_count: int, runs: int) -> None:
+    elements = _elements(element_count)
+
+    settings.PROMPT_BYTECODE_CACHE_ENABLED = False
+    cold_engine = PromptEngine("skyvern")
+    start = time.perf_counter()
+    prompt = _render(cold_engine, elements)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    settings.PROMPT_BYTECODE_CACHE_ENABLED = True
+    engine = PromptEngine("skyvern")
+    start = time.perf_counter()
+    engine.precompile()
+    precompile_ms = (time.perf_counter() - start) * 1000
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _render(engine, elements)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    static_prefix = engine.find_static_prefix(prompt)
+    metrics = engine.get_render_metrics()["extract-action"]
+    print(
+        f"{element_count:>6} elements: {len(prompt) / 1024:8.1f} KiB, first render {cold_ms:7.2f} ms,"
+        f" precompiled median {statistics.median(timings):7.2f} ms (precompile all {precompile_ms:7.1f} ms),"
+        f" static prefix {len(static_prefix)} chars, max render {metrics.render_ms.max:7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--elements", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    for element_count in args.elements:
+        bench(element_count, args.runs)
+
+
+if __name__ == "__main__":
+    main()
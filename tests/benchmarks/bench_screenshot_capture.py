@@ -0,0 +1,141 @@
+"""
+Benchmark the bytes and the time per step of the screenshots sent to the LLM.
+
+The image side runs anywhere: slicing a full page capture vs encoding the scrolled viewports, and the size of the
+LLM images for each format.
+
+    python -m tests.benchmarks.bench_screenshot_capture --viewports 6
+
+With --browser, it also captures a synthetic page with both SCREENSHOT_CAPTURE_STRATEGY values in Chromium
+(needs `playwright install chromium`).
+
+    python -m tests.benchmarks.bench_screenshot_capture --browser
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from io import BytesIO
+
+from PIL import Image, ImageDraw, ImageFont
+
+from skyvern.config import settings
+from skyvern.utils.image_resizer import Resolution, ScreenshotFormat, encode_screenshot, resize_screenshots
+from skyvern.webeye.utils.page import _get_tile_positions, _slice_screenshot
+
+VIEWPORT_WIDTH = 1920
+VIEWPORT_HEIGHT = 1080
+
+
+def _synthetic_page(width: int, height: int, seed: int = 0) -> Image.Image:
+    # anti-aliased text lines and a few noisy "photos", which is what makes real screenshots expensive to compress
+    rng = random.Random(seed)
+    img = Image.new("RGB", (width, height), color=(255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    font = ImageFont.load_default(size=16)
+    for y in range(20, height - 20, 24):
+        if rng.random() < 0.05:
+            x = rng.randrange(width - 400)
+            photo = Image.effect_noise((400, 240), 64).convert("RGB")
+            img.paste(photo, (x, y))
+            continue
+        words = " ".join(rng.choice(["lorem", "ipsum", "dolor", "sit", "amet", "skyvern"]) for _ in range(30))
+        draw.text(
+            (rng.randrange(40), y), words, fill=(rng.randrange(80), rng.randrange(80), rng.randrange(80)), font=font
+        )
+    return img
+
+
+def _to_png(img: Image.Image) -> bytes:
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _timed(func, *args):  # type: ignore[no-untyped-def]
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def bench_images(num_viewports: int) -> None:
+    page_height = VIEWPORT_HEIGHT + (VIEWPORT_HEIGHT - 200) * (num_viewports - 1)
+    page = _synthetic_page(VIEWPORT_WIDTH, page_height)
+    positions = _get_tile_positions(page_height, VIEWPORT_HEIGHT, VIEWPORT_HEIGHT - 200, num_viewports)
+
+    # what the browser hands over: one PNG per scrolled viewport, or one full page PNG
+    viewport_pngs = [_to_png(page.crop((0, y, VIEWPORT_WIDTH, y + VIEWPORT_HEIGHT))) for y in positions]
+    full_page_png = _to_png(page)
+    tiles, slice_ms = _timed(_slice_screenshot, full_page_png, VIEWPORT_WIDTH, VIEWPORT_HEIGHT, positions)
+    print(f"page {VIEWPORT_WIDTH}x{page_height}, {len(positions)} viewports")
+    print(f"  slice full page capture into tiles: {slice_ms:8.1f} ms")
+
+    target = Resolution(width=1366, height=768)
+    resized, resize_ms = _timed(resize_screenshots, tiles, target)
+    print(f"  resize tiles to {target['width']}x{target['height']}:      {resize_ms:8.1f} ms")
+
+    print(f"  raw viewport PNGs: {sum(len(png) for png in viewport_pngs) / 1024:9.1f} KiB")
+    print("  LLM images per step:")
+    baseline = sum(len(png) for png in resized)
+    for image_format in ScreenshotFormat:
+        encoded, encode_ms = _timed(
+            lambda screenshots: [
+                encode_screenshot(screenshot, image_format, settings.LLM_SCREENSHOT_QUALITY)
+                for screenshot in screenshots
+            ],
+            resized,
+        )
+        total = sum(len(image) for image in encoded)
+        print(
+            f"    {image_format:>5}: {total / 1024:9.1f} KiB ({total / baseline:6.1%} of PNG),"
+            f" encode {encode_ms:7.1f} ms"
+        )
+
+
+async def bench_browser(num_viewports: int, steps: int) -> None:
+    from playwright.async_api import async_playwright
+
+    from skyvern.webeye.utils.page import SkyvernFrame
+
+    html = "".join(
+        f"<section style='height:{VIEWPORT_HEIGHT - 200}px;background:hsl({i * 40},60%,85%)'>"
+        f"<h1>Section {i}</h1><p>{'lorem ipsum ' * 200}</p><button>Button {i}</button></section>"
+        for i in range(num_viewports)
+    )
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch()
+        page = await browser.new_page(viewport={"width": VIEWPORT_WIDTH, "height": VIEWPORT_HEIGHT})
+        await page.set_content(f"<html><body style='margin:0'>{html}</body></html>")
+        for strategy in ("scroll", "full_page"):
+            settings.SCREENSHOT_CAPTURE_STRATEGY = strategy
+            start = time.perf_counter()
+            total_bytes = 0
+            for _ in range(steps):
+                screenshots = await SkyvernFrame.take_split_screenshots(
+                    page=page, draw_boxes=True, max_number=num_viewports
+                )
+                total_bytes += sum(len(screenshot) for screenshot in screenshots)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / steps
+            print(
+                f"  {strategy:>9}: {elapsed_ms:8.1f} ms/step, {total_bytes / steps / 1024:9.1f} KiB/step,"
+                f" {len(screenshots)} screenshots"
+            )
+        await browser.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--viewports", type=int, default=6)
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--browser", action="store_true")
+    args = parser.parse_args()
+
+    bench_images(args.viewports)
+    if args.browser:
+        print("browser capture:")
+        asyncio.run(bench_browser(args.viewports, args.steps))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark building the timeline of a workflow run with nested for loops: the one pass build from the parent index vs
+the previous build that re-queued the blocks whose parent wasn't built yet (with and without its cap of 1000
+iterations), and the collapsed timeline whose loop iterations are expanded lazily.
+
+    python -m tests.benchmarks.bench_workflow_run_timeline --iterations 100 1000 --nested 10 --runs 5
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock, WorkflowRunTimeline, WorkflowRunTimelineType
+from skyvern.forge.sdk.workflow.models.block import BlockType
+from skyvern.forge.sdk.workflow.timeline import build_workflow_run_timeline, iter_timeline_blocks
+
+NOW = datetime(2025, 1, 1)
+
+
+def _blocks(iterations: int, nested: int) -> list[WorkflowRunBlock]:
+    """
+    An outer loop whose iterations each run a task and an inner loop of `nested` tasks, newest first as they're read.
+    """
+    blocks: list[WorkflowRunBlock] = []
+
+    def add(parent_id: str | None, block_type: BlockType) -> str:
+        block_id = f"wrb_{len(blocks)}"
+        blocks.append(
+            WorkflowRunBlock(
+                workflow_run_block_id=block_id,
+                workflow_run_id="wr_1",
+                organization_id="o_1",
+                parent_workflow_run_block_id=parent_id,
+                block_type=block_type,
+                created_at=NOW + timedelta(milliseconds=len(blocks)),
+                modified_at=NOW + timedelta(milliseconds=len(blocks)),
+            )
+        )
+        return block_id
+
+    outer = add(None, BlockType.FOR_LOOP)
+    for _ in range(iterations):
+        add(outer, BlockType.TASK)
+        inner = add(outer, BlockType.FOR_LOOP)
+        for _ in range(nested):
+            add(inner, BlockType.TASK)
+    add(None, BlockType.TASK)
+    return list(reversed(blocks))
+
+
+def _legacy_build(
+    workflow_run_blocks: list[WorkflowRunBlock], max_iterations: int | None = 1000
+) -> list[WorkflowRunTimeline]:
+    result = []
+    block_map: dict[str, WorkflowRunTimeline] = {}
+    counter = 0
+    while workflow_run_blocks:
+        counter += 1
+        block = workflow_run_blocks.pop(0)
+        workflow_run_timeline = WorkflowRunTimeline(
+            type=WorkflowRunTimelineType.block,
+            block=block,
+            created_at=block.created_at,
+            modified_at=block.modified_at,
+        )
+        if block.parent_workflow_run_block_id:
+            if block.parent_workflow_run_block_id in block_map:
+                block_map[block.parent_workflow_run_block_id].children.append(workflow_run_timeline)
+                block_map[block.workflow_run_block_id] = workflow_run_timeline
+            else:
+                workflow_run_blocks.append(block)
+        else:
+            result.append(workflow_run_timeline)
+            block_map[block.workflow_run_block_id] = workflow_run_timeline
+        if max_iterations and counter > max_iterations:
+            break
+    return result
+
+
+def _time(build: Callable[[], list[WorkflowRunTimeline]], runs: int) -> tuple[float, list[WorkflowRunTimeline]]:
+    timings = []
+    timeline: list[WorkflowRunTimeline] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        timeline = build()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), timeline
+
+
+def bench(iterations: int, nested: int, runs: int) -> None:
+    blocks = _blocks(iterations, nested)
+    legacy_ms, legacy = _time(lambda: _legacy_build(list(blocks)), runs)
+    uncapped_ms, _ = _time(lambda: _legacy_build(list(blocks), max_iterations=None), runs)
+    full_ms, full = _time(lambda: build_workflow_run_timeline(blocks), runs)
+    collapsed_ms, collapsed = _time(lambda: build_workflow_run_timeline(blocks, expand_loops=False), runs)
+    loop_id = collapsed[-1].block.workflow_run_block_id if collapsed[-1].block else None
+    iterations_ms, _ = _time(
+        lambda: build_workflow_run_timeline(blocks, parent_workflow_run_block_id=loop_id, expand_loops=False), runs
+    )
+    print(
+        f"{len(blocks):>7} blocks: legacy {legacy_ms:8.2f} ms ({sum(1 for _ in iter_timeline_blocks(legacy))} kept),"
+        f" legacy without the cap {uncapped_ms:8.2f} ms,"
+        f" one pass {full_ms:8.2f} ms ({sum(1 for _ in iter_timeline_blocks(full))} kept),"
+        f" collapsed {collapsed_ms:7.2f} ms ({sum(1 for _ in iter_timeline_blocks(collapsed))} kept),"
+        f" loop iterations {iterations_ms:7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--nested", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    for iterations in args.iterations:
+        bench(iterations, args.nested, args.runs)
+
+
+if __name__ == "__main__":
+    main()
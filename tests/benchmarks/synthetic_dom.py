@@ -0,0 +1,68 @@
+"""
+Synthetic element trees in the same shape as buildTreeFromBody() in domUtils.js, for the benchmarks.
+"""
+
+import random
+import string
+
+TAG_NAMES = ["div", "span", "a", "button", "input", "label", "li", "ul", "p", "td", "tr", "svg", "path", "select"]
+
+
+def _element_id(index: int) -> str:
+    characters = string.ascii_uppercase + string.ascii_lowercase + string.digits
+    base = len(characters)
+    return "A" + "".join(characters[(index // base**i) % base] for i in (2, 1, 0))
+
+
+def build_element(element_id: str, tag_name: str, xpath: str, rng: random.Random, frame: str = "main.frame") -> dict:
+    attributes: dict = {"class": f"css-{rng.randint(0, 10**6)}", "unique_id": element_id}
+    if tag_name == "a":
+        attributes["href"] = "https://example.com/" + "x" * rng.randint(5, 200)
+    if tag_name == "input":
+        attributes.update({"type": "text", "name": f"field-{element_id}", "value": "", "required": rng.random() < 0.2})
+    if tag_name == "path":
+        attributes["d"] = "M" + " ".join(str(rng.randint(0, 100)) for _ in range(40))
+    element = {
+        "id": element_id,
+        "frame": frame,
+        "frame_index": 0,
+        "interactable": tag_name in {"a", "button", "input", "select"},
+        "tagName": tag_name,
+        "attributes": attributes,
+        "beforePseudoText": None,
+        "text": " ".join(rng.choice(["Name", "Email", "Submit", "Address", "Next", "Total", ""]) for _ in range(3)),
+        "afterPseudoText": None,
+        "children": [],
+        "rect": {"top": rng.randint(0, 5000), "left": rng.randint(0, 1920), "width": 100, "height": 20},
+        "purgeable": False,
+        "keepAllAttr": tag_name in {"svg", "path"},
+        "isSelectable": tag_name == "select",
+        "xpath": xpath,
+    }
+    if tag_name == "select":
+        element["options"] = [{"optionIndex": i, "text": f"option {i}"} for i in range(5)]
+    return element
+
+
+def build_synthetic_element_tree(
+    num_elements: int, fanout: int = 6, seed: int = 0, id_offset: int = 0
+) -> tuple[list[dict], list[dict]]:
+    """
+    :return: (elements, element_tree), the elements are the same objects as the tree nodes, like the JS output
+    """
+    rng = random.Random(seed)
+    elements: list[dict] = []
+    element_tree: list[dict] = []
+    queue: list[dict] = []
+    head = 0
+    while len(elements) < num_elements:
+        parent = queue[head] if head < len(queue) else None
+        siblings = parent["children"] if parent else element_tree
+        xpath = (parent["xpath"] if parent else "/html[1]") + f'/*[name()="div"][{len(siblings) + 1}]'
+        element = build_element(_element_id(id_offset + len(elements)), rng.choice(TAG_NAMES), xpath, rng)
+        siblings.append(element)
+        elements.append(element)
+        queue.append(element)
+        if parent is not None and len(parent["children"]) >= fanout:
+            head += 1
+    return elements, element_tree
@@ -0,0 +1,22 @@
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from skyvern.forge.sdk.db.client import AgentDB
+from skyvern.forge.sdk.db.models import Base
+
+ORGANIZATION_ID = "o_1"
+
+
+@pytest_asyncio.fixture
+async def agent_db(tmp_path: Path) -> AsyncIterator[AgentDB]:
+    """
+    An AgentDB on a SQLite database with all the tables, in the temporary directory of the test.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'skyvern.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield AgentDB(database_string="", db_engine=engine)
+    await engine.dispose()
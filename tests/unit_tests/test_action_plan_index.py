@@ -0,0 +1,132 @@
+import pytest
+
+from skyvern.forge import app
+from skyvern.forge.sdk.db.client import AgentDB
+from skyvern.forge.sdk.models import Step
+from skyvern.forge.sdk.schemas.tasks import Task, TaskStatus
+from skyvern.webeye.actions import caching
+from skyvern.webeye.actions.action_types import ActionType
+from skyvern.webeye.actions.actions import Action, ActionStatus
+from skyvern.webeye.actions.caching import ActionPlanStats, normalize_url_pattern, record_action_plan
+from skyvern.webeye.scraper.scraper import ScrapedPage
+from tests.unit_tests.conftest import ORGANIZATION_ID
+
+
+async def _create_task(agent_db: AgentDB, url: str, navigation_goal: str = "Search for shoes") -> tuple[Task, Step]:
+    task = await agent_db.create_task(
+        url=url,
+        title=None,
+        complete_criterion=None,
+        terminate_criterion=None,
+        navigation_goal=navigation_goal,
+        data_extraction_goal=None,
+        navigation_payload=None,
+        organization_id=ORGANIZATION_ID,
+    )
+    step = await agent_db.create_step(task_id=task.task_id, order=0, retry_index=0, organization_id=ORGANIZATION_ID)
+    return task, step
+
+
+def _scraped_page(hash_to_element_ids: dict[str, list[str]]) -> ScrapedPage:
+    return ScrapedPage(
+        elements=[],
+        id_to_element_dict={},
+        id_to_frame_dict={},
+        id_to_css_dict={},
+        id_to_element_hash={},
+        hash_to_element_ids=hash_to_element_ids,
+        element_tree=[],
+        element_tree_trimmed=[],
+        screenshots=[],
+        url="https://shop.example.com/search",
+        html="",
+        _browser_state=None,
+        _clean_up_func=None,
+        _scrape_exclude=None,
+    )
+
+
+def test_url_pattern_drops_the_query_values() -> None:
+    assert normalize_url_pattern("https://Shop.example.com/search/?q=shoes&page=2#top") == (
+        "https://shop.example.com/search?page=*&q=*"
+    )
+    assert normalize_url_pattern("https://shop.example.com/search?page=1&q=boots") == (
+        normalize_url_pattern("https://shop.example.com/search?q=shoes&page=2")
+    )
+    assert normalize_url_pattern("https://shop.example.com") == "https://shop.example.com/"
+
+
+@pytest.mark.asyncio
+async def test_plan_is_found_in_the_index_across_query_strings(
+    agent_db: AgentDB, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(app, "DATABASE", agent_db)
+    monkeypatch.setattr(caching, "action_plan_stats", ActionPlanStats())
+
+    completed_task, completed_step = await _create_task(agent_db, "https://shop.example.com/search?q=shoes")
+    await agent_db.create_actions(
+        [
+            Action(
+                action_type=ActionType.CLICK,
+                status=ActionStatus.completed,
+                organization_id=ORGANIZATION_ID,
+                task_id=completed_task.task_id,
+                step_id=completed_step.step_id,
+                step_order=0,
+                action_order=0,
+                element_id="AAAB",
+                skyvern_element_hash="search-button",
+            )
+        ]
+    )
+    await record_action_plan(completed_task)
+
+    task, step = await _create_task(agent_db, "https://shop.example.com/search?q=boots")
+    actions = await caching.retrieve_action_plan(task, step, _scraped_page({"search-button": ["AAAC"]}))
+    assert [(action.action_type, action.element_id, action.task_id) for action in actions] == [
+        (ActionType.CLICK, "AAAC", task.task_id)
+    ]
+    assert actions[0].source_action_id is not None
+
+    # the element isn't on the page, the previous actions of the task aren't even loaded
+    assert await caching.retrieve_action_plan(task, step, _scraped_page({})) == []
+
+    other_task, other_step = await _create_task(agent_db, "https://shop.example.com/search", navigation_goal="Sign up")
+    assert await caching.retrieve_action_plan(other_task, other_step, _scraped_page({"search-button": ["A"]})) == []
+
+    assert caching.get_action_plan_stats() == ActionPlanStats(
+        index_hits=2, fallback_hits=0, misses=1, llm_calls_saved=1
+    )
+
+
+@pytest.mark.asyncio
+async def test_plan_of_a_task_completed_before_the_index_is_indexed_on_first_use(
+    agent_db: AgentDB, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(app, "DATABASE", agent_db)
+    monkeypatch.setattr(caching, "action_plan_stats", ActionPlanStats())
+
+    url = "https://shop.example.com/search?q=shoes"
+    completed_task, completed_step = await _create_task(agent_db, url)
+    await agent_db.create_actions(
+        [
+            Action(
+                action_type=ActionType.CLICK,
+                status=ActionStatus.completed,
+                organization_id=ORGANIZATION_ID,
+                task_id=completed_task.task_id,
+                step_id=completed_step.step_id,
+                step_order=0,
+                action_order=0,
+                skyvern_element_hash="search-button",
+            )
+        ]
+    )
+    await agent_db.update_task(completed_task.task_id, organization_id=ORGANIZATION_ID, status=TaskStatus.completed)
+
+    for _ in range(2):
+        task, step = await _create_task(agent_db, url)
+        assert len(await caching.retrieve_action_plan(task, step, _scraped_page({"search-button": ["A"]}))) == 1
+    assert caching.get_action_plan_stats() == ActionPlanStats(
+        index_hits=1, fallback_hits=1, misses=0, llm_calls_saved=2
+    )
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from skyvern.forge import app
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.forge.sdk.db.client import AgentDB
+from skyvern.webeye.actions import write_buffer
+from skyvern.webeye.actions.action_types import ActionType
+from skyvern.webeye.actions.actions import Action, ActionStatus
+from skyvern.webeye.actions.write_buffer import ActionWriteBuffer
+from tests.unit_tests.conftest import ORGANIZATION_ID
+
+
+class FakeDatabase:
+    def __init__(self, fail_batch: bool = False, bad_order: int | None = None) -> None:
+        self.fail_batch = fail_batch
+        self.bad_order = bad_order
+        self.batches: list[list[Action]] = []
+        self.rows: list[Action] = []
+
+    async def create_actions(self, actions: list[Action]) -> None:
+        if self.fail_batch:
+            raise Exception("batch failed")
+        self.batches.append(actions)
+        self.rows.extend(actions)
+
+    async def create_action(self, action: Action) -> Action:
+        if action.action_order == self.bad_order:
+            raise Exception("row failed")
+        self.rows.append(action)
+        return action
+
+
+def _action(order: int) -> Action:
+    return Action(action_type=ActionType.CLICK, action_order=order, status=ActionStatus.completed)
+
+
+@pytest.mark.asyncio
+async def test_actions_are_written_in_one_batch_at_the_end_of_the_step(monkeypatch: pytest.MonkeyPatch) -> None:
+    database = FakeDatabase()
+    monkeypatch.setattr(app, "DATABASE", database)
+    buffer = ActionWriteBuffer(max_size=10, max_age_seconds=60)
+    skyvern_context.set(SkyvernContext(action_write_buffer=buffer))
+    try:
+        for order in range(3):
+            action = _action(order)
+            await write_buffer.create_action(action)
+            # later changes to the action are not written
+            action.status = ActionStatus.failed
+        assert database.rows == []
+
+        await write_buffer.flush_action_writes()
+        assert len(database.batches) == 1
+        assert [action.action_order for action in database.rows] == [0, 1, 2]
+        assert {action.status for action in database.rows} == {ActionStatus.completed}
+    finally:
+        skyvern_context.reset()
+
+    # outside a step the action is written right away
+    await write_buffer.create_action(_action(3))
+    assert len(database.rows) == 4
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_on_size_and_age(monkeypatch: pytest.MonkeyPatch) -> None:
+    database = FakeDatabase()
+    monkeypatch.setattr(app, "DATABASE", database)
+
+    buffer = ActionWriteBuffer(max_size=2, max_age_seconds=60)
+    for order in range(3):
+        await buffer.add(_action(order))
+    assert [len(batch) for batch in database.batches] == [2]
+
+    buffer = ActionWriteBuffer(max_size=10, max_age_seconds=0.01)
+    await buffer.add(_action(0))
+    await asyncio.sleep(0.02)
+    await buffer.add(_action(1))
+    assert [len(batch) for batch in database.batches] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_row_by_row(monkeypatch: pytest.MonkeyPatch) -> None:
+    database = FakeDatabase(fail_batch=True, bad_order=1)
+    monkeypatch.setattr(app, "DATABASE", database)
+    buffer = ActionWriteBuffer()
+    for order in range(3):
+        await buffer.add(_action(order))
+    await buffer.flush()
+    assert [action.action_order for action in database.rows] == [0, 2]
+    assert buffer.pending == []
+
+
+@pytest.mark.asyncio
+async def test_buffered_actions_are_inserted_in_the_database(
+    agent_db: AgentDB, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(app, "DATABASE", agent_db)
+    buffer = ActionWriteBuffer()
+    for order in range(3):
+        action = _action(order)
+        action.organization_id = ORGANIZATION_ID
+        action.task_id = "tsk_1"
+        action.step_id = "stp_1"
+        action.step_order = 0
+        await buffer.add(action)
+    await buffer.flush()
+
+    actions = await agent_db.get_task_actions("tsk_1", ORGANIZATION_ID)
+    assert sorted(action.action_order for action in actions) == [0, 1, 2]
@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import event
+from structlog.testing import capture_logs
+
+from skyvern.config import settings
+from skyvern.forge.sdk.db.client import AgentDB, get_engine_pool_args
+from skyvern.forge.sdk.models import Step
+from skyvern.forge.sdk.schemas.tasks import Task, TaskStatus
+from tests.unit_tests.conftest import ORGANIZATION_ID
+
+
+@pytest.fixture
+def slow_query_log(monkeypatch: pytest.MonkeyPatch) -> None:
+    # read when AgentDB instruments the engine, so it has to be set before the agent_db fixture
+    monkeypatch.setattr(settings, "DATABASE_SLOW_QUERY_THRESHOLD_MS", 0)
+
+
+async def _create_task_and_step(agent_db: AgentDB) -> tuple[Task, Step]:
+    task = await agent_db.create_task(
+        url="https://example.com",
+        title=None,
+        complete_criterion=None,
+        terminate_criterion=None,
+        navigation_goal="goal",
+        data_extraction_goal=None,
+        navigation_payload=None,
+        organization_id=ORGANIZATION_ID,
+    )
+    step = await agent_db.create_step(task_id=task.task_id, order=0, retry_index=0, organization_id=ORGANIZATION_ID)
+    return task, step
+
+
+def test_pool_args() -> None:
+    pool_args = get_engine_pool_args("postgresql+psycopg://skyvern@localhost/skyvern")
+    assert pool_args["pool_size"] == settings.DATABASE_POOL_SIZE
+    assert pool_args["max_overflow"] == settings.DATABASE_MAX_OVERFLOW
+    assert pool_args["pool_pre_ping"] == settings.DATABASE_POOL_PRE_PING
+    assert "pool_size" not in get_engine_pool_args("sqlite+aiosqlite:///skyvern.db")
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_uses_one_transaction(agent_db: AgentDB) -> None:
+    task, step = await _create_task_and_step(agent_db)
+    checkouts: list[object] = []
+    event.listen(agent_db.engine.sync_engine, "checkout", lambda *args: checkouts.append(args))
+
+    async with agent_db.unit_of_work() as unit_of_work:
+        await agent_db.update_step(
+            task_id=task.task_id, step_id=step.step_id, organization_id=ORGANIZATION_ID, is_last=True
+        )
+        await agent_db.update_task(task.task_id, organization_id=ORGANIZATION_ID, status=TaskStatus.completed)
+        # the writes are visible inside the unit of work
+        assert (await agent_db.get_task(task.task_id, ORGANIZATION_ID)).status == TaskStatus.completed  # type: ignore[union-attr]
+
+    assert len(checkouts) == 1
+    assert unit_of_work.flushes == 2
+    assert (await agent_db.get_task(task.task_id, ORGANIZATION_ID)).status == TaskStatus.completed  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_on_error(agent_db: AgentDB) -> None:
+    task, step = await _create_task_and_step(agent_db)
+
+    with pytest.raises(RuntimeError):
+        async with agent_db.unit_of_work():
+            await agent_db.update_step(
+                task_id=task.task_id, step_id=step.step_id, organization_id=ORGANIZATION_ID, is_last=True
+            )
+            await agent_db.update_task(task.task_id, organization_id=ORGANIZATION_ID, status=TaskStatus.failed)
+            raise RuntimeError("step failed")
+
+    refreshed_step = await agent_db.get_step(task.task_id, step.step_id, ORGANIZATION_ID)
+    assert refreshed_step is not None and not refreshed_step.is_last
+    assert (await agent_db.get_task(task.task_id, ORGANIZATION_ID)).status == TaskStatus.created  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("slow_query_log")
+async def test_method_metrics_and_slow_query_log(agent_db: AgentDB) -> None:
+    task, _ = await _create_task_and_step(agent_db)
+    await agent_db.create_step(task_id=task.task_id, order=1, retry_index=0, organization_id=ORGANIZATION_ID)
+
+    with capture_logs() as logs:
+        steps = await agent_db.get_task_steps(task.task_id, ORGANIZATION_ID)
+    assert len(steps) == 2
+
+    metrics = agent_db.get_metrics()
+    get_task_steps = metrics.methods["get_task_steps"]
+    assert (get_task_steps.calls, get_task_steps.errors, get_task_steps.queries) == (1, 0, 1)
+    assert get_task_steps.latency_ms.count == 1
+    # 2 rows fall in the (1, 10] bucket
+    assert get_task_steps.row_count.counts[2] == 1
+    assert metrics.methods["create_step"].calls == 2
+
+    slow_queries = [log for log in logs if log["event"] == "Slow database query"]
+    assert len(slow_queries) == 1
+    assert slow_queries[0]["db_method"] == "get_task_steps"
+    assert "FROM steps" in slow_queries[0]["statement"]
@@ -0,0 +1,30 @@
+import pytest
+
+from skyvern.forge.sdk.artifact.models import ArtifactType
+from skyvern.forge.sdk.db.client import AgentDB
+from tests.unit_tests.conftest import ORGANIZATION_ID
+
+BLOB_URI = "file:///tmp/o_1/blobs/ab/abcdef.png"
+
+
+async def _create_screenshot(agent_db: AgentDB, artifact_id: str, task_id: str, uri: str) -> None:
+    await agent_db.create_artifact(
+        artifact_id,
+        ArtifactType.SCREENSHOT_LLM,
+        uri,
+        organization_id=ORGANIZATION_ID,
+        task_id=task_id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_artifacts_of_other_tasks_keep_the_shared_blob(agent_db: AgentDB) -> None:
+    await _create_screenshot(agent_db, "a_1", "tsk_1", BLOB_URI)
+    await _create_screenshot(agent_db, "a_2", "tsk_1", "file:///tmp/o_1/tsk_1/a_2.png")
+    await _create_screenshot(agent_db, "a_3", "tsk_2", BLOB_URI)
+
+    # only the rows are deleted, the stored blobs are kept
+    await agent_db.delete_task_artifacts(organization_id=ORGANIZATION_ID, task_id="tsk_1")
+    assert await agent_db.get_artifact_by_id("a_1", ORGANIZATION_ID) is None
+    shared = await agent_db.get_artifact_by_id("a_3", ORGANIZATION_ID)
+    assert shared is not None and shared.uri == BLOB_URI
@@ -0,0 +1,168 @@
+import asyncio
+import functools
+from collections import defaultdict
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from skyvern.forge import app
+from skyvern.forge.sdk.artifact import manager
+from skyvern.forge.sdk.artifact.manager import ArtifactManager
+from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType
+from skyvern.forge.sdk.artifact.upload_pipeline import ArtifactUploadPipeline
+
+
+class FakeDatabase:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.artifact_ids: list[str] = []
+
+    async def create_artifact(self, artifact_id: str, artifact_type: str, uri: str, **kwargs: Any) -> Artifact:
+        if self.fail:
+            raise ValueError("invalid artifact")
+        self.artifact_ids.append(artifact_id)
+        return _artifact(artifact_id, uri=uri)
+
+
+class FakeStorage:
+    def __init__(self, concurrency: int, delay: float = 0.01) -> None:
+        self.concurrency = concurrency
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.stored: dict[str, bytes] = {}
+        self.stored_uris: list[str] = []
+
+    def get_upload_concurrency(self) -> int:
+        return self.concurrency
+
+    async def artifact_uri_exists(self, uri: str) -> bool:
+        return any(uri == stored_uri for stored_uri in self.stored_uris)
+
+    async def store_artifact(self, artifact: Artifact, data: bytes) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.stored[artifact.artifact_id] = data
+        self.stored_uris.append(artifact.uri)
+        self.in_flight -= 1
+
+
+def _artifact(artifact_id: str, uri: str | None = None) -> Artifact:
+    now = datetime.utcnow()
+    return Artifact(
+        artifact_id=artifact_id,
+        artifact_type=ArtifactType.LLM_PROMPT,
+        uri=uri or f"file:///tmp/{artifact_id}.txt",
+        organization_id="o_1",
+        created_at=now,
+        modified_at=now,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_limits_uploads(monkeypatch: pytest.MonkeyPatch) -> None:
+    storage = FakeStorage(concurrency=3)
+    monkeypatch.setattr(app, "STORAGE", storage)
+    pipeline = ArtifactUploadPipeline(queue_size=100, num_workers=2, batch_size=10)
+
+    futures = [await pipeline.enqueue(artifact=_artifact(f"a_{i}"), data=b"%d" % i) for i in range(40)]
+    await asyncio.gather(*futures)
+
+    assert storage.stored == {f"a_{i}": b"%d" % i for i in range(40)}
+    assert storage.max_in_flight <= 3
+    metrics = pipeline.get_metrics()
+    assert (metrics.enqueued, metrics.stored, metrics.failed, metrics.queue_depth) == (40, 40, 0, 0)
+    # producers didn't yield while enqueueing, so the workers took full batches
+    assert metrics.batches == 4
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_artifact_row_is_inserted_before_its_id_is_returned(monkeypatch: pytest.MonkeyPatch) -> None:
+    database = FakeDatabase()
+    monkeypatch.setattr(app, "DATABASE", database)
+    monkeypatch.setattr(app, "STORAGE", FakeStorage(concurrency=1))
+    artifact_manager = ArtifactManager()
+    artifact_manager.upload_aiotasks_map = defaultdict(list)
+    create_artifact = functools.partial(
+        artifact_manager._create_artifact,
+        aio_task_primary_key="tsk_1",
+        artifact_type=ArtifactType.HTML_SCRAPE,
+        uri="file:///tmp/a_0.txt",
+        organization_id="o_1",
+        data=b"x",
+    )
+
+    assert await create_artifact(artifact_id="a_0") == "a_0"
+    assert database.artifact_ids == ["a_0"]
+
+    # the insert failure reaches the caller, nothing is queued for upload
+    database.fail = True
+    with pytest.raises(ValueError):
+        await create_artifact(artifact_id="a_1")
+    await artifact_manager.wait_for_upload_aiotasks(["tsk_1"])
+    assert artifact_manager.upload_pipeline.get_metrics().enqueued == 1
+    await artifact_manager.upload_pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_applies_backpressure(monkeypatch: pytest.MonkeyPatch) -> None:
+    storage = FakeStorage(concurrency=1)
+    monkeypatch.setattr(app, "STORAGE", storage)
+    pipeline = ArtifactUploadPipeline(queue_size=2, num_workers=1, batch_size=1)
+
+    futures = [await pipeline.enqueue(artifact=_artifact(f"a_{i}"), data=b"x") for i in range(6)]
+    metrics = pipeline.get_metrics()
+    assert metrics.max_queue_depth <= 2
+    assert metrics.backpressure_waits > 0
+
+    await pipeline.wait_for_artifact("a_5")
+    assert futures[-1].done()
+    assert len(storage.stored) == 6
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stores_content_addressed_blobs_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    storage = FakeStorage(concurrency=4)
+    monkeypatch.setattr(app, "STORAGE", storage)
+    pipeline = ArtifactUploadPipeline(queue_size=100, num_workers=2, batch_size=5)
+
+    futures = [
+        await pipeline.enqueue(
+            artifact=_artifact(f"a_{i}", uri=f"file:///tmp/blobs/{i % 2}.txt"),
+            data=b"prompt %d" % (i % 2),
+            deduplicate=True,
+        )
+        for i in range(10)
+    ]
+    await asyncio.gather(*futures)
+
+    # the two distinct payloads are stored once each
+    assert sorted(storage.stored_uris) == ["file:///tmp/blobs/0.txt", "file:///tmp/blobs/1.txt"]
+    metrics = pipeline.get_metrics()
+    assert (metrics.stored, metrics.deduplicated) == (10, 8)
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_wait_leaves_the_uploads_running(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app, "STORAGE", FakeStorage(concurrency=1, delay=0.2))
+    timeout = asyncio.timeout
+    monkeypatch.setattr(manager.asyncio, "timeout", lambda delay: timeout(0.05))
+    artifact_manager = ArtifactManager()
+    artifact_manager.upload_aiotasks_map = defaultdict(list)
+    pipeline = artifact_manager.upload_pipeline = ArtifactUploadPipeline(queue_size=10, num_workers=1, batch_size=1)
+
+    future = await pipeline.enqueue(artifact=_artifact("a_0"), data=b"x")
+    artifact_manager.upload_aiotasks_map["tsk_1"].append(future)
+    await artifact_manager.wait_for_upload_aiotasks(["tsk_1"])
+    assert not future.done()
+
+    # the upload is still awaited and accounted for
+    await pipeline.wait_for_artifact("a_0")
+    assert pipeline.get_metrics().stored == 1
+    assert pipeline._pending == {}
+    await pipeline.close()
@@ -0,0 +1,234 @@
+import asyncio
+import uuid
+from collections import Counter
+from typing import Any, AsyncIterator
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from skyvern.config import settings
+from skyvern.exceptions import BitwardenGetItemError
+from skyvern.forge.sdk.schemas.credentials import PasswordCredential
+from skyvern.forge.sdk.services import bitwarden
+from skyvern.forge.sdk.services.bitwarden import BitwardenConstants, BitwardenService
+from skyvern.forge.sdk.services.bitwarden_broker import BitwardenServeSession, BitwardenSessionBroker
+
+MASTER_PASSWORD = "master password"
+ORGANIZATION_ID = "bw_org"
+
+
+class BitwardenServeStub:
+    """
+    The endpoints of the `bw serve` Vault Management API used by the service, with a vault in memory.
+    """
+
+    def __init__(self) -> None:
+        self.locked = True
+        self.requests: Counter[str] = Counter()
+        self.items: dict[str, dict[str, Any]] = {
+            "login_1": {
+                "id": "login_1",
+                "type": 1,
+                "name": "shop",
+                "organizationId": ORGANIZATION_ID,
+                "collectionIds": ["collection_1"],
+                "login": {
+                    "username": "john@example.com",
+                    "password": "secret",
+                    "totp": None,
+                    "uris": [{"uri": "https://shop.example.com/login"}],
+                },
+            },
+            "card_1": {
+                "id": "card_1",
+                "type": 3,
+                "name": "card",
+                "organizationId": ORGANIZATION_ID,
+                "collectionIds": ["collection_1"],
+                "card": {
+                    "cardholderName": "John",
+                    "number": "4242424242424242",
+                    "expMonth": "1",
+                    "expYear": "2030",
+                    "code": "123",
+                    "brand": "Visa",
+                },
+            },
+        }
+        self.app = web.Application(middlewares=[self.count])
+        self.app.add_routes(
+            [
+                web.get("/status", self.status),
+                web.post("/unlock", self.unlock),
+                web.post("/lock", self.lock),
+                web.post("/sync", self.sync),
+                web.get("/object/item/{item_id}", self.get_item),
+                web.post("/object/item", self.create_item),
+                web.delete("/object/item/{item_id}", self.delete_item),
+                web.get("/list/object/items", self.list_items),
+                web.get("/object/template/{name}", self.template),
+            ]
+        )
+
+    @web.middleware
+    async def count(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        self.requests[f"{request.method} {request.match_info.route.resource.canonical}"] += 1  # type: ignore[union-attr]
+        # the lookups of the test overlap while the request is served
+        await asyncio.sleep(0.01)
+        if self.locked and request.path not in ("/status", "/unlock", "/lock"):
+            return web.json_response({"success": False, "message": "Vault is locked."}, status=400)
+        return await handler(request)
+
+    async def status(self, request: web.Request) -> web.Response:
+        status = "locked" if self.locked else "unlocked"
+        return web.json_response({"success": True, "data": {"object": "template", "template": {"status": status}}})
+
+    async def unlock(self, request: web.Request) -> web.Response:
+        if (await request.json())["password"] != MASTER_PASSWORD:
+            return web.json_response({"success": False, "message": "Invalid master password."}, status=400)
+        self.locked = False
+        return web.json_response({"success": True, "data": {"raw": "session"}})
+
+    async def lock(self, request: web.Request) -> web.Response:
+        self.locked = True
+        return web.json_response({"success": True})
+
+    async def sync(self, request: web.Request) -> web.Response:
+        return web.json_response({"success": True})
+
+    async def get_item(self, request: web.Request) -> web.Response:
+        item = self.items.get(request.match_info["item_id"])
+        if item is None:
+            return web.json_response({"success": False, "message": "Not found."}, status=404)
+        return web.json_response({"success": True, "data": item})
+
+    async def create_item(self, request: web.Request) -> web.Response:
+        item = await request.json()
+        item["id"] = str(uuid.uuid4())
+        self.items[item["id"]] = item
+        return web.json_response({"success": True, "data": item})
+
+    async def delete_item(self, request: web.Request) -> web.Response:
+        self.items.pop(request.match_info["item_id"], None)
+        return web.json_response({"success": True})
+
+    async def list_items(self, request: web.Request) -> web.Response:
+        search = request.query.get("search")
+        collection_id = request.query.get("collectionId")
+        organization_id = request.query.get("organizationId")
+        items = [
+            item
+            for item in self.items.values()
+            if (not search or search in item["name"] or search in str(item.get("login", {}).get("uris")))
+            and (not collection_id or collection_id in item["collectionIds"])
+            and (not organization_id or organization_id == item["organizationId"])
+        ]
+        return web.json_response({"success": True, "data": {"object": "list", "data": items}})
+
+    async def template(self, request: web.Request) -> web.Response:
+        return web.json_response({"success": True, "data": {"object": "template", "template": {}}})
+
+
+@pytest_asyncio.fixture
+async def bw_serve(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[BitwardenServeStub]:
+    stub = BitwardenServeStub()
+    runner = web.AppRunner(stub.app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+    broker = BitwardenSessionBroker()
+    monkeypatch.setattr(bitwarden, "bitwarden_session_broker", broker)
+    monkeypatch.setattr(settings, "BITWARDEN_SERVER", "http://127.0.0.1")
+    monkeypatch.setattr(settings, "BITWARDEN_SERVER_PORT", port)
+    monkeypatch.setattr(settings, "SKYVERN_AUTH_BITWARDEN_MASTER_PASSWORD", MASTER_PASSWORD)
+    monkeypatch.setattr(settings, "SKYVERN_AUTH_BITWARDEN_ORGANIZATION_ID", ORGANIZATION_ID)
+    monkeypatch.setattr(settings, "SKYVERN_AUTH_BITWARDEN_CLIENT_ID", "client id")
+    monkeypatch.setattr(settings, "SKYVERN_AUTH_BITWARDEN_CLIENT_SECRET", "client secret")
+
+    async def start_session(client_id: str, client_secret: str, master_password: str) -> BitwardenServeSession:
+        return BitwardenServeSession(f"http://127.0.0.1:{port}", master_password)
+
+    monkeypatch.setattr(broker, "start_session", start_session)
+    yield stub
+    await broker.close()
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_unlock_and_one_request(bw_serve: BitwardenServeStub) -> None:
+    items = await asyncio.gather(*(BitwardenService.get_credential_item("login_1") for _ in range(5)))
+    assert {item.credential.model_dump()["username"] for item in items} == {"john@example.com"}
+    await BitwardenService.get_credential_item("login_1")
+
+    assert bw_serve.requests["POST /unlock"] == 1
+    assert bw_serve.requests["GET /object/item/{item_id}"] == 1
+
+    # a vault locked by another client of the server is unlocked again
+    bw_serve.locked = True
+    await BitwardenService.get_credential_item("card_1")
+    assert bw_serve.requests["POST /unlock"] == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_the_cached_lookups(bw_serve: BitwardenServeStub) -> None:
+    assert [item.item_id for item in await BitwardenService.get_collection_items("collection_1")] == [
+        "login_1",
+        "card_1",
+    ]
+    item_id = await BitwardenService.create_credential_item(
+        "collection_1", "new", PasswordCredential(username="jane@example.com", password="secret", totp=None)
+    )
+    assert len(await BitwardenService.get_collection_items("collection_1")) == 3
+
+    await BitwardenService.get_credential_item(item_id)
+    await BitwardenService.delete_credential_item(item_id)
+    with pytest.raises(BitwardenGetItemError):
+        await BitwardenService.get_credential_item(item_id)
+    # the item templates are read once
+    assert bw_serve.requests["GET /object/template/{name}"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cli_lookups_are_served_by_the_broker(
+    bw_serve: BitwardenServeStub, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def run_command(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("the bw CLI isn't used")
+
+    monkeypatch.setattr(BitwardenService, "run_command", run_command)
+    monkeypatch.setattr(settings, "BITWARDEN_SESSION_BROKER_ENABLED", True)
+
+    credentials = ("client id", "client secret", MASTER_PASSWORD, ORGANIZATION_ID, None)
+    by_url, by_item_id, card = await asyncio.gather(
+        BitwardenService.get_secret_value_from_url(*credentials, url="https://shop.example.com/login"),
+        BitwardenService.get_secret_value_from_url(*credentials, item_id="login_1"),
+        BitwardenService.get_credit_card_data(*credentials, collection_id="collection_1", item_id="card_1"),
+    )
+    assert by_url[BitwardenConstants.USERNAME] == by_item_id[BitwardenConstants.USERNAME] == "john@example.com"
+    assert card[BitwardenConstants.CREDIT_CARD_NUMBER] == "4242424242424242"
+    assert bw_serve.requests["POST /unlock"] == 1
+
+
+@pytest.mark.asyncio
+async def test_session_syncs_again_on_a_cache_miss_after_the_sync_interval(bw_serve: BitwardenServeStub) -> None:
+    session = BitwardenServeSession(
+        f"http://127.0.0.1:{settings.BITWARDEN_SERVER_PORT}",
+        MASTER_PASSWORD,
+        item_cache_ttl_seconds=0,
+        sync_interval_seconds=0.2,
+    )
+    try:
+        await asyncio.gather(session.get_item("login_1"), session.get_item("card_1"))
+        await session.get_item("login_1")
+        assert bw_serve.requests["POST /sync"] == 1
+
+        # the password was rotated in the vault
+        bw_serve.items["login_1"]["login"]["password"] = "rotated"
+        await asyncio.sleep(0.2)
+        assert (await session.get_item("login_1"))["login"]["password"] == "rotated"
+        assert bw_serve.requests["POST /sync"] == 2
+    finally:
+        await session.close()
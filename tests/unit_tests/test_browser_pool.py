@@ -0,0 +1,197 @@
+import asyncio
+from typing import Any, Callable
+
+import pytest
+
+from skyvern.config import settings
+from skyvern.webeye import browser_pool
+from skyvern.webeye.browser_pool import BrowserPool, PooledBrowserState
+
+
+class FakeCDPSession:
+    def __init__(self, context: "FakeContext") -> None:
+        self.context = context
+
+    async def send(self, method: str, params: dict[str, Any] | None = None) -> None:
+        if method == "Network.clearBrowserCache":
+            self.context.cache_cleared = True
+        else:
+            assert params is not None
+            self.context.cleared_origins.append(params["origin"])
+
+    async def detach(self) -> None:
+        pass
+
+
+class FakePage:
+    def __init__(self, context: "FakeContext") -> None:
+        self.context = context
+
+    def on(self, event: str, handler: Callable) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self, browser: "FakeBrowser", options: dict[str, Any]) -> None:
+        self.browser = browser
+        self.options = options
+        self.pages: list[FakePage] = []
+        self.cookies = ["session"]
+        self.cleared_origins: list[str] = []
+        self.cache_cleared = False
+        self.closed = False
+
+    def on(self, event: str, handler: Callable) -> None:
+        pass
+
+    async def new_page(self) -> FakePage:
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def new_cdp_session(self, page: FakePage) -> FakeCDPSession:
+        return FakeCDPSession(self)
+
+    async def clear_cookies(self) -> None:
+        self.cookies = []
+
+    async def clear_permissions(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.contexts: list[FakeContext] = []
+        self.closed = False
+
+    def is_connected(self) -> bool:
+        return not self.closed
+
+    async def new_context(self, **options: Any) -> FakeContext:
+        context = FakeContext(self, options)
+        self.contexts.append(context)
+        return context
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeChromium:
+    def __init__(self) -> None:
+        self.browsers: list[FakeBrowser] = []
+
+    async def launch(self, **options: Any) -> FakeBrowser:
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self) -> None:
+        self.chromium = FakeChromium()
+        self.stopped = False
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+def _pool(playwright: FakePlaywright, **kwargs: int) -> BrowserPool:
+    async def start_playwright() -> FakePlaywright:
+        return playwright
+
+    options = dict(
+        max_browsers=2, max_contexts_per_browser=2, warm_contexts=1, browser_max_uses=100, context_max_uses=100
+    )
+    options.update(kwargs)
+    return BrowserPool(start_playwright=start_playwright, **options)  # type: ignore[arg-type]
+
+
+@pytest.fixture(autouse=True)
+def _tmp_paths(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOG_PATH", str(tmp_path / "log"))
+    monkeypatch.setattr(settings, "VIDEO_PATH", str(tmp_path / "video"))
+    monkeypatch.setattr(settings, "TEMP_PATH", str(tmp_path / "temp"))
+    monkeypatch.setattr(browser_pool, "initialize_download_dir", lambda: str(tmp_path / "downloads"))
+
+
+@pytest.mark.asyncio
+async def test_contexts_are_warmed_and_recycled() -> None:
+    playwright = FakePlaywright()
+    pool = _pool(playwright)
+
+    first = await pool.acquire(extra_http_headers={"x-test": "1"})
+    await asyncio.gather(*pool._warm_tasks)
+    assert pool.get_stats().idle_contexts == 1
+    assert first.context.options["extra_http_headers"] == {"x-test": "1"}
+    assert "record_har_path" not in first.context.options
+
+    # the warm context serves the next run with the same key
+    second = await pool.acquire(extra_http_headers={"x-test": "1"})
+    assert second.context is not first.context
+    assert pool.stats.warm_hits == 1
+
+    await first.context.new_page()
+    first.origins.add("https://example.com")
+    context = first.context
+    await pool.release(first)
+    await asyncio.gather(*pool._warm_tasks)
+    assert context.cookies == [] and context.pages == []
+    assert context.cleared_origins == ["https://example.com"]
+    assert context.cache_cleared
+
+    third = await pool.acquire(extra_http_headers={"x-test": "1"})
+    assert third.context is context and third.uses == 2
+    # one driver and one browser for all of them
+    assert len(playwright.chromium.browsers) == 1
+    await pool.close()
+    assert playwright.stopped
+
+
+@pytest.mark.asyncio
+async def test_browser_is_retired_after_max_uses() -> None:
+    playwright = FakePlaywright()
+    pool = _pool(playwright, warm_contexts=0, browser_max_uses=2)
+
+    for _ in range(2):
+        await pool.release(await pool.acquire())
+    first_browser = playwright.chromium.browsers[0]
+    assert first_browser.closed
+    assert pool.stats.browsers_retired == 1
+
+    await pool.acquire()
+    assert len(playwright.chromium.browsers) == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_when_the_browsers_are_full() -> None:
+    playwright = FakePlaywright()
+    pool = _pool(playwright, max_browsers=1, max_contexts_per_browser=1, warm_contexts=0)
+
+    first = await pool.acquire()
+    waiting = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiting.done() and pool.stats.waits == 1
+
+    await pool.release(first)
+    second = await asyncio.wait_for(waiting, timeout=1)
+    assert second.browser is first.browser
+    assert len(playwright.chromium.browsers) == 1
+
+
+@pytest.mark.asyncio
+async def test_pooled_browser_state_releases_instead_of_stopping_the_driver() -> None:
+    playwright = FakePlaywright()
+    pool = _pool(playwright)
+
+    pooled_context = await pool.acquire()
+    browser_state = PooledBrowserState(pool, pooled_context)
+    await browser_state.close()
+    await browser_state.close()
+    assert not playwright.stopped
+    assert pool.stats.recycled == 1
@@ -0,0 +1,67 @@
+import copy
+
+import pytest
+from playwright.async_api import Frame, Page
+
+from skyvern.forge.agent_functions import AgentFunction
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+from skyvern.webeye.scraper.scraper import build_trimmed_element_tree, trim_element_tree
+from skyvern.webeye.utils.page import SkyvernFrame
+from tests.benchmarks.synthetic_dom import build_synthetic_element_tree
+
+
+def test_build_trimmed_element_tree_matches_trim_element_tree() -> None:
+    _, element_tree = build_synthetic_element_tree(500)
+    element_tree[0]["children"][0]["attributes"]["src"] = "data:image/png;base64,AAAA"
+    element_tree[0]["children"][1]["attributes"]["name"] = "n" * 600
+    original_tree = copy.deepcopy(element_tree)
+
+    trimmed = build_trimmed_element_tree(element_tree)
+
+    assert trimmed == trim_element_tree(copy.deepcopy(element_tree))
+    assert element_tree == original_tree
+
+
+def _element(element_id: str, tag_name: str, children: list[dict] | None = None) -> dict:
+    return {
+        "id": element_id,
+        "frame_index": 0,
+        "tagName": tag_name,
+        "attributes": {"unique_id": element_id},
+        "text": f"{tag_name} text",
+        "rect": {"x": 0, "y": 0, "width": 10, "height": 10},
+        "children": children or [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_cleanup_element_tree_leaves_the_scraped_tree_as_it_is(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def create_instance(frame: Page | Frame) -> SkyvernFrame:
+        return SkyvernFrame(frame=frame)
+
+    monkeypatch.setattr(SkyvernFrame, "create_instance", create_instance)
+    element_tree = [
+        _element("AAAA", "form", [_element("AAAB", "input"), _element("AAAC", "div", [_element("AAAD", "button")])]),
+        _element("AAAE", "select"),
+    ]
+    original_tree = copy.deepcopy(element_tree)
+
+    skyvern_context.set(SkyvernContext())
+    try:
+        cleaned_tree = await AgentFunction().cleanup_element_tree_factory()(
+            None,  # type: ignore[arg-type]
+            "https://example.com",
+            element_tree,
+        )
+    finally:
+        skyvern_context.reset()
+
+    assert element_tree == original_tree
+    expected_tree = copy.deepcopy(original_tree)
+    queue = list(expected_tree)
+    while queue:
+        element = queue.pop()
+        del element["rect"]
+        queue.extend(element["children"])
+    assert cleaned_tree == expected_tree
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from skyvern.config import settings
+from skyvern.webeye.scraper import scraper
+from skyvern.webeye.utils.page import SkyvernFrame
+
+
+class FakeFrameElement:
+    async def is_visible(self) -> bool:
+        return True
+
+
+class FakeFrame:
+    def __init__(self, name: str, seconds: float = 0.05, child_frames: list["FakeFrame"] | None = None) -> None:
+        self.name = name
+        self.url = f"https://example.com/{name}"
+        self.seconds = seconds
+        self.child_frames = child_frames or []
+
+    def is_detached(self) -> bool:
+        return False
+
+    async def frame_element(self) -> FakeFrameElement:
+        return FakeFrameElement()
+
+
+@pytest.fixture(autouse=True)
+def _frame_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SCRAPE_FRAME_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "SCRAPE_FRAME_TIMEOUT_MS", 200)
+
+
+@pytest.mark.asyncio
+async def test_frames_are_scraped_concurrently_in_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    running = 0
+    max_running = 0
+
+    async def scrape_frame_interactable_elements(frame: FakeFrame, frame_index: int) -> tuple[str, list, list]:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(frame.seconds)
+        running -= 1
+        return frame.name, [{"id": f"{frame.name}_element", "frame_index": frame_index}], []
+
+    monkeypatch.setattr(scraper, "scrape_frame_interactable_elements", scrape_frame_interactable_elements)
+    # the first frame is the slowest, a stuck frame is left out
+    frames = [FakeFrame("f0", seconds=0.1), FakeFrame("f1"), FakeFrame("f2"), FakeFrame("f3", seconds=10)]
+    frame_index_map: dict[Any, int] = {frame: index + 1 for index, frame in enumerate(frames)}
+
+    start = time.monotonic()
+    results = await scraper.scrape_frames_interactable_elements(frames, frame_index_map)  # type: ignore[arg-type]
+    assert time.monotonic() - start < 1
+    assert max_running == 2
+    assert [result[0] if result else None for result in results] == ["f0", "f1", "f2", None]
+    assert results[1] == ("f1", [{"id": "f1_element", "frame_index": 2}], [])
+
+
+@pytest.mark.asyncio
+async def test_frame_text_is_read_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def evaluate(frame: FakeFrame, expression: str, **kwargs: Any) -> str:
+        await asyncio.sleep(frame.seconds)
+        return f"[{frame.name}]"
+
+    monkeypatch.setattr(SkyvernFrame, "evaluate", staticmethod(evaluate))
+    main_frame = FakeFrame(
+        "main",
+        child_frames=[
+            FakeFrame("a", seconds=0.2, child_frames=[FakeFrame("a1")]),
+            FakeFrame("b"),
+        ],
+    )
+
+    start = time.monotonic()
+    text = await scraper.get_frame_text(main_frame)  # type: ignore[arg-type]
+    # main, then a and b together, then a1: 0.05 + 0.2 + 0.05 instead of 0.35
+    assert time.monotonic() - start < 0.34
+    assert text == "[main][a][a1][b]"
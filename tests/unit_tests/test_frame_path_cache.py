@@ -0,0 +1,120 @@
+from typing import Any
+
+import pytest
+
+from skyvern.webeye.scraper.scraper import ScrapedPage
+from skyvern.webeye.utils.dom import resolve_locator, resolve_locators
+
+
+class FakeFrameLocator:
+    def __init__(self, path: tuple[str, ...]) -> None:
+        self.path = path
+
+    def frame_locator(self, selector: str) -> "FakeFrameLocator":
+        return FakeFrameLocator((*self.path, selector))
+
+    def locator(self, css: str) -> tuple[tuple[str, ...], str]:
+        return self.path, css
+
+
+class FakeElementHandle:
+    def __init__(self, frame: "FakeFrame") -> None:
+        self.frame = frame
+
+    async def content_frame(self) -> "FakeFrame":
+        return self.frame
+
+
+class FakeFrame:
+    def __init__(self, children: dict[str, "FakeFrame"] | None = None) -> None:
+        self.children = children or {}
+        self.url = "https://example.com"
+        self.detached = False
+        self.queries = 0
+
+    def is_detached(self) -> bool:
+        return self.detached
+
+    async def query_selector(self, selector: str) -> FakeElementHandle | None:
+        self.queries += 1
+        child = self.children.get(selector)
+        return FakeElementHandle(child) if child else None
+
+
+class FakePage(FakeFrame, FakeFrameLocator):
+    def __init__(self, children: dict[str, FakeFrame]) -> None:
+        FakeFrame.__init__(self, children)
+        FakeFrameLocator.__init__(self, ())
+
+
+def _scraped_page() -> ScrapedPage:
+    # payment widget (f2) inside an embedded form (f1)
+    elements: dict[str, dict[str, Any]] = {
+        "f1": {"id": "f1", "frame": "main.frame"},
+        "f2": {"id": "f2", "frame": "f1"},
+        "card": {"id": "card", "frame": "f2"},
+        "cvc": {"id": "cvc", "frame": "f2"},
+        "submit": {"id": "submit", "frame": "main.frame"},
+    }
+    return ScrapedPage(
+        elements=list(elements.values()),
+        id_to_element_dict=elements,
+        id_to_frame_dict={element_id: element["frame"] for element_id, element in elements.items()},
+        id_to_css_dict={element_id: f"#{element_id}" for element_id in elements},
+        id_to_element_hash={},
+        hash_to_element_ids={},
+        element_tree=[],
+        element_tree_trimmed=[],
+        screenshots=[],
+        url="https://example.com",
+        html="",
+        _browser_state=None,
+        _clean_up_func=None,
+        _scrape_exclude=None,
+    )
+
+
+def _page() -> tuple[FakePage, FakeFrame, FakeFrame]:
+    f2 = FakeFrame()
+    f1 = FakeFrame({"[unique_id='f2']": f2})
+    return FakePage({"[unique_id='f1']": f1}), f1, f2
+
+
+@pytest.mark.asyncio
+async def test_frame_path_is_resolved_once_and_invalidated() -> None:
+    scraped_page = _scraped_page()
+    page, f1, f2 = _page()
+
+    for _ in range(3):
+        locator, frame = await resolve_locator(scraped_page, page, "f2", "#card")  # type: ignore[arg-type]
+        assert frame is f2
+        assert locator == (("[unique_id='f1']", "[unique_id='f2']"), "#card")
+    assert (page.queries, f1.queries) == (1, 1)
+    assert scraped_page.frame_path_cache.hits == 2
+
+    # a detached frame is resolved again, its parent comes from the cache
+    f2.detached = True
+    await resolve_locator(scraped_page, page, "f2", "#card")  # type: ignore[arg-type]
+    assert (page.queries, f1.queries) == (1, 2)
+
+    # a navigated frame is resolved again
+    f1.url = "https://example.com/next"
+    await resolve_locator(scraped_page, page, "f1", "#f2")  # type: ignore[arg-type]
+    assert page.queries == 2
+
+
+@pytest.mark.asyncio
+async def test_locators_of_a_step_are_resolved_together() -> None:
+    scraped_page = _scraped_page()
+    page, f1, f2 = _page()
+    f1.children = {}
+
+    locators = await resolve_locators(scraped_page, page, ["card", "cvc", "submit"])  # type: ignore[arg-type]
+    # f2 is gone, its elements are left out
+    assert list(locators) == ["submit"]
+
+    f1.children = {"[unique_id='f2']": f2}
+    locators = await resolve_locators(scraped_page, page, ["card", "cvc", "submit"])  # type: ignore[arg-type]
+    assert locators["card"][1] is f2 and locators["cvc"][1] is f2
+    assert locators["submit"] == (((), "#submit"), page)
+    assert f1.queries == 2
@@ -0,0 +1,58 @@
+import copy
+
+from skyvern.webeye.scraper.scraper import build_element_dict, patch_element_tree
+
+
+def _element(element_id: str, text: str = "", children: list[dict] | None = None) -> dict:
+    return {
+        "id": element_id,
+        "frame": "main.frame",
+        "tagName": "div",
+        "attributes": {"unique_id": element_id},
+        "text": text,
+        "children": children or [],
+    }
+
+
+def _build_page() -> tuple[list[dict], list[dict]]:
+    leaf_a = _element("AAAA", "a")
+    leaf_b = _element("AAAB", "b")
+    form = _element("AAAC", "form", [leaf_a, leaf_b])
+    sidebar = _element("AAAD", "sidebar", [_element("AAAE", "link")])
+    root = _element("AAAF", "root", [form, sidebar])
+    elements = [root, form, leaf_a, leaf_b, sidebar, sidebar["children"][0]]
+    return elements, [root]
+
+
+def test_patch_element_tree_replaces_dirty_subtree() -> None:
+    elements, element_tree = _build_page()
+    original_tree = copy.deepcopy(element_tree)
+    _, _, _, id_to_element_hash, _ = build_element_dict(elements)
+
+    new_leaf = _element("AAAG", "new")
+    rebuilt_form = _element("AAAC", "form", [_element("AAAA", "a"), new_leaf])
+    subtrees = [{"id": "AAAC", "elements": [rebuilt_form, *rebuilt_form["children"]], "tree": [rebuilt_form]}]
+
+    patched = patch_element_tree(elements, element_tree, id_to_element_hash, subtrees)
+    assert patched is not None
+    patched_elements, patched_tree, known_element_hashes = patched
+
+    # the input tree is untouched
+    assert element_tree == original_tree
+    assert [element["id"] for element in patched_elements] == ["AAAF", "AAAC", "AAAA", "AAAG", "AAAD", "AAAE"]
+    assert patched_tree[0]["children"][0] is rebuilt_form
+    # the ancestors and the rebuilt elements have to be hashed again, the others are reused
+    assert set(known_element_hashes) == {"AAAD", "AAAE"}
+
+    _, _, _, incremental_hashes, _ = build_element_dict(patched_elements, known_element_hashes)
+    _, _, _, full_hashes, _ = build_element_dict(patched_elements)
+    assert incremental_hashes == full_hashes
+    assert incremental_hashes["AAAD"] == id_to_element_hash["AAAD"]
+
+
+def test_patch_element_tree_with_unknown_dirty_element() -> None:
+    elements, element_tree = _build_page()
+    _, _, _, id_to_element_hash, _ = build_element_dict(elements)
+
+    subtrees = [{"id": "ZZZZ", "elements": [], "tree": []}]
+    assert patch_element_tree(elements, element_tree, id_to_element_hash, subtrees) is None
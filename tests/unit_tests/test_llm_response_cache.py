@@ -0,0 +1,201 @@
+import asyncio
+import json
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from litellm.utils import ModelResponse
+
+from skyvern.forge import app
+from skyvern.forge.prompts import prompt_engine
+from skyvern.forge.sdk.api.llm import api_handler_factory
+from skyvern.forge.sdk.api.llm.exceptions import LLMResponseNotRecordedError
+from skyvern.forge.sdk.api.llm.response_cache import LLMResponseCache, LLMResponseCacheMode
+from skyvern.forge.sdk.api.llm.ui_tars_llm_caller import UITarsLLMCaller
+
+
+class DummyArtifactManager:
+    async def create_llm_artifact(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+        return None
+
+
+class FakeUITarsResponse:
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+    def model_dump(self, exclude_none: bool = True) -> dict:
+        return {"choices": [{"message": {"role": "assistant", "content": self.content}}], "model": "ui-tars"}
+
+    def model_dump_json(self, indent: int = 2) -> str:
+        return json.dumps(self.model_dump(), indent=indent)
+
+
+def _response(content: str) -> ModelResponse:
+    return ModelResponse(
+        choices=[{"message": {"role": "assistant", "content": content}}],
+        model="test-model",
+        usage={"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    )
+
+
+def test_build_key_uses_screenshot_hashes() -> None:
+    def messages(image_url: str) -> list[dict]:
+        return [
+            {
+                "role": "user",
+                "content": [{"type": "text", "text": "hi"}, {"type": "image_url", "image_url": {"url": image_url}}],
+            }
+        ]
+
+    key = LLMResponseCache.build_key("m", messages("data:image/png;base64,AAA"), [b"png"], {"temperature": 0})
+    # the base64 payload isn't part of the key, the screenshot hash is
+    assert key == LLMResponseCache.build_key("m", messages("data:image/png;base64,BBB"), [b"png"], {"temperature": 0})
+    assert key != LLMResponseCache.build_key("m", messages("data:image/png;base64,AAA"), [b"jpg"], {"temperature": 0})
+    assert key != LLMResponseCache.build_key("other", messages("data:image/png;base64,AAA"), [b"png"])
+
+
+def _render_extract_action(element_id_prefix: str) -> list[dict]:
+    elements = "".join(
+        f'<input id="{element_id_prefix}AA{i}" name="field_{i}"><button id="{element_id_prefix}AB{i}">Save</button>'
+        for i in range(3)
+    )
+    prompt = prompt_engine.load_prompt(
+        "extract-action",
+        navigation_goal="Fill in the form",
+        navigation_payload_str="{}",
+        current_url="https://example.com/form",
+        elements=elements,
+        data_extraction_goal=None,
+        action_history="[]",
+        error_code_mapping_str=None,
+        local_datetime=datetime.now().isoformat(),
+        verification_code_check=False,
+        complete_criterion=None,
+        terminate_criterion=None,
+        long_context=False,
+    )
+    return [{"role": "user", "content": [{"type": "text", "text": prompt}]}]
+
+
+@pytest.mark.asyncio
+async def test_rendered_prompts_of_two_runs_share_a_key(tmp_path: Path) -> None:
+    # the datetime and the random first character of the element ids differ between the runs
+    recorded_messages = _render_extract_action("@")
+    await asyncio.sleep(0.001)
+    replayed_messages = _render_extract_action("#")
+    recorded_key = LLMResponseCache.build_key("m", recorded_messages)
+    assert recorded_key == LLMResponseCache.build_key("m", replayed_messages)
+
+    recorder = LLMResponseCache(mode=LLMResponseCacheMode.RECORD, cache_dir=str(tmp_path))
+    call = AsyncMock(return_value=_response('{"actions": [{"action_type": "CLICK", "id": "@AB1"}]}'))
+    await recorder.get_or_call(
+        recorded_key, "extract-action", call, element_ids=LLMResponseCache.get_element_ids(recorded_messages)
+    )
+
+    replayer = LLMResponseCache(mode=LLMResponseCacheMode.REPLAY, cache_dir=str(tmp_path))
+    response, cache_hit = await replayer.get_or_call(
+        LLMResponseCache.build_key("m", replayed_messages),
+        "extract-action",
+        call,
+        element_ids=LLMResponseCache.get_element_ids(replayed_messages),
+    )
+    assert cache_hit
+    # the replayed action targets the element of the current run
+    assert response.choices[0].message.content == '{"actions": [{"action_type": "CLICK", "id": "#AB1"}]}'
+
+
+@pytest.mark.asyncio
+async def test_cache_mode_serves_memory_and_disk_tiers(tmp_path: Path) -> None:
+    cache = LLMResponseCache(mode=LLMResponseCacheMode.CACHE, cache_dir=str(tmp_path), ttl_seconds=60)
+    call = AsyncMock(return_value=_response('{"a": 1}'))
+
+    response, cache_hit = await cache.get_or_call("k", "extract-actions", call)
+    assert not cache_hit
+    response, cache_hit = await cache.get_or_call("k", "extract-actions", call)
+    assert cache_hit
+    assert response.choices[0].message.content == '{"a": 1}'
+    call.assert_called_once()
+
+    # a new process only has the disk tier
+    cache = LLMResponseCache(mode=LLMResponseCacheMode.CACHE, cache_dir=str(tmp_path), ttl_seconds=60)
+    response, cache_hit = await cache.get_or_call("k", "extract-actions", call)
+    assert cache_hit
+    assert response.usage.prompt_tokens == 10
+    stats = cache.get_stats()
+    assert (stats.memory_hits, stats.disk_hits) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_cache_mode_applies_prompt_ttl(tmp_path: Path) -> None:
+    cache = LLMResponseCache(
+        mode=LLMResponseCacheMode.CACHE,
+        cache_dir=str(tmp_path),
+        ttl_seconds=60,
+        prompt_ttl_seconds={"check-user-goal": 0},
+    )
+    assert cache.get_ttl_seconds("extract-actions") == 60
+    await cache.set("k", "check-user-goal", _response("{}"))
+    await cache.memory.delete("k")
+    # expired on disk
+    assert await cache.get("k", "check-user-goal") is None
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path: Path) -> None:
+    recorder = LLMResponseCache(mode=LLMResponseCacheMode.RECORD, cache_dir=str(tmp_path), ttl_seconds=0)
+    call = AsyncMock(return_value=_response('{"b": 2}'))
+    await recorder.get_or_call("k", "extract-actions", call)
+    # record mode always calls the provider
+    await recorder.get_or_call("k", "extract-actions", call)
+    assert call.call_count == 2
+    assert (tmp_path / "extract-actions" / "k.json").exists()
+
+    replayer = LLMResponseCache(mode=LLMResponseCacheMode.REPLAY, cache_dir=str(tmp_path), ttl_seconds=0)
+    response, cache_hit = await replayer.get_or_call("k", "extract-actions", call)
+    assert cache_hit
+    assert response.choices[0].message.content == '{"b": 2}'
+    assert call.call_count == 2
+    with pytest.raises(LLMResponseNotRecordedError):
+        await replayer.get_or_call("missing", "extract-actions", call)
+
+
+@pytest.mark.asyncio
+async def test_handler_uses_response_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(app, "ARTIFACT_MANAGER", DummyArtifactManager())
+    monkeypatch.setattr(
+        app, "LLM_RESPONSE_CACHE", LLMResponseCache(mode=LLMResponseCacheMode.CACHE, cache_dir=str(tmp_path))
+    )
+    acompletion = AsyncMock(return_value=_response('{"result": "ok"}'))
+    monkeypatch.setattr(api_handler_factory.litellm, "acompletion", acompletion)
+
+    handler = api_handler_factory.LLMAPIHandlerFactory.get_llm_api_handler("test-provider/test-model")
+    assert await handler("hi", "extract-actions") == {"result": "ok"}
+    assert await handler("hi", "extract-actions") == {"result": "ok"}
+    acompletion.assert_called_once()
+
+    assert await handler("hello", "extract-actions") == {"result": "ok"}
+    assert acompletion.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_llm_callers_use_response_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(app, "ARTIFACT_MANAGER", DummyArtifactManager())
+    monkeypatch.setattr(
+        app, "LLM_RESPONSE_CACHE", LLMResponseCache(mode=LLMResponseCacheMode.CACHE, cache_dir=str(tmp_path))
+    )
+    acompletion = AsyncMock(return_value=_response('{"result": "ok"}'))
+    monkeypatch.setattr(api_handler_factory.litellm, "acompletion", acompletion)
+
+    caller = api_handler_factory.LLMCaller("test-provider/test-model")
+    assert await caller.call("hi", "extract-actions") == {"result": "ok"}
+    assert await caller.call("hi", "extract-actions") == {"result": "ok"}
+    acompletion.assert_called_once()
+
+    ui_tars_caller = UITarsLLMCaller("test-provider/UI_TARS")
+    call_ui_tars = AsyncMock(return_value=FakeUITarsResponse("click(start_box='(1,2)')"))
+    monkeypatch.setattr(ui_tars_caller, "_call_ui_tars", call_ui_tars)
+    for _ in range(2):
+        response = await ui_tars_caller.call("hi", "ui-tars", raw_response=True)
+        assert response["choices"][0]["message"]["content"] == "click(start_box='(1,2)')"
+    call_ui_tars.assert_called_once()
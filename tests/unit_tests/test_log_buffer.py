@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+
+from skyvern.config import settings
+from skyvern.forge.sdk import log_artifacts
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.log_buffer import LogBuffer
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+
+
+def test_entries_are_indexed_spilled_and_released() -> None:
+    buffer = LogBuffer(max_entries=4)
+    buffer.append({"event": "not part of any entity"})
+    for step in range(3):
+        for i in range(3):
+            buffer.append(
+                {
+                    "event": f"step {step} entry {i}",
+                    "step_id": f"stp_{step}",
+                    "workflow_run_id": "wr_1",
+                    "timestamp": datetime(2025, 1, 1, 0, step, i),
+                }
+            )
+
+    assert len(buffer) == 9
+    assert buffer.spilled_count > 0
+    assert [entry["event"] for entry in buffer.get("step_id", "stp_0")] == [f"step 0 entry {i}" for i in range(3)]
+    # spilled entries are read back as they are written to the log artifacts
+    assert buffer.get("step_id", "stp_0")[0]["timestamp"] == "2025-01-01 00:00:00"
+    assert len(buffer.get("workflow_run_id", "wr_1")) == 9
+
+    buffer.release("step_id", "stp_0")
+    assert buffer.get("step_id", "stp_0") == []
+    # the run still refers to the entries of the step
+    assert len(buffer) == 9
+    buffer.release("workflow_run_id", "wr_1")
+    assert len(buffer) == 6
+    buffer.release("step_id", "stp_1")
+    buffer.release("step_id", "stp_2")
+    assert len(buffer) == 0
+
+    buffer.append({"event": "late", "step_id": "stp_0"})
+    assert buffer.get("step_id", "stp_0") == []
+    assert len(buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_released_step_logs_are_saved_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    saved: list[list[dict]] = []
+
+    async def save_log_artifacts(*, log: list[dict], **kwargs: object) -> None:
+        saved.append(log)
+
+    monkeypatch.setattr(settings, "ENABLE_LOG_ARTIFACTS", True)
+    monkeypatch.setattr(log_artifacts, "_save_log_artifacts", save_log_artifacts)
+    context = SkyvernContext(organization_id="o_1")
+    skyvern_context.set(context)
+    try:
+        context.log.append({"event": "a", "step_id": "stp_1", "task_id": "tsk_1"})
+        context.log.append({"event": "b", "step_id": "stp_2", "task_id": "tsk_1"})
+
+        await log_artifacts.save_step_logs("stp_1", release=True)
+        await log_artifacts.save_step_logs("stp_1")
+        await log_artifacts.save_task_logs("tsk_1")
+    finally:
+        skyvern_context.reset()
+
+    assert [[entry["event"] for entry in log] for log in saved] == [["a"], ["a", "b"]]
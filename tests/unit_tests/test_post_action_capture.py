@@ -0,0 +1,134 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Generator
+
+import pytest
+
+from skyvern.forge import app, post_action_capture
+from skyvern.forge.post_action_capture import ScreenshotCaptureMode, capture_after_action
+from skyvern.forge.sdk.artifact.models import ArtifactType
+from skyvern.forge.sdk.core import skyvern_context
+from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
+
+
+class FakeArtifactManager:
+    def __init__(self) -> None:
+        self.artifacts: list[ArtifactType] = []
+        self.upload_aiotasks_map: dict[str, list[asyncio.Task]] = defaultdict(list)
+        self.streamed: list[str] = []
+
+    async def create_artifact(self, step: Any, artifact_type: ArtifactType, data: bytes) -> str:
+        self.artifacts.append(artifact_type)
+        return "a_1"
+
+    async def stream_recording(self, artifact_id: str, organization_id: str, path: str) -> None:
+        self.streamed.append(path)
+
+
+class FakeVideoArtifact:
+    video_artifact_id = "a_video"
+    video_path = "video.webm"
+
+
+class FakeBrowserManager:
+    async def get_video_artifacts(self, task_id: str, browser_state: Any) -> list[FakeVideoArtifact]:
+        return [FakeVideoArtifact()]
+
+
+class FakeBrowserState:
+    def __init__(self, scrolling_seconds: float, viewport_seconds: float = 0.01) -> None:
+        self.scrolling_seconds = scrolling_seconds
+        self.viewport_seconds = viewport_seconds
+        self.scrolling_numbers: list[int] = []
+        self.restored = False
+
+    async def must_get_working_page(self) -> object:
+        return object()
+
+    async def take_post_action_screenshot(self, scrolling_number: int, use_playwright_fullpage: bool) -> bytes:
+        self.scrolling_numbers.append(scrolling_number)
+        try:
+            await asyncio.sleep(self.scrolling_seconds if scrolling_number > 0 else self.viewport_seconds)
+        finally:
+            self.restored = True
+        return b"png"
+
+
+class FakeTask:
+    task_id = "tsk_1"
+    organization_id = "o_1"
+
+
+class FakeStep:
+    step_id = "stp_1"
+
+
+@pytest.fixture
+def artifact_manager(monkeypatch: pytest.MonkeyPatch) -> Generator[FakeArtifactManager, None, None]:
+    manager = FakeArtifactManager()
+    monkeypatch.setattr(app, "ARTIFACT_MANAGER", manager)
+    monkeypatch.setattr(app, "BROWSER_MANAGER", FakeBrowserManager())
+
+    async def wait_for_page_stable(page: Any, timeout_ms: float) -> bool:
+        return True
+
+    async def get_html(page: Any) -> str:
+        await asyncio.sleep(0.1)
+        return "<html></html>"
+
+    monkeypatch.setattr(post_action_capture, "wait_for_page_stable", wait_for_page_stable)
+    monkeypatch.setattr(post_action_capture, "_get_html", get_html)
+    skyvern_context.set(SkyvernContext(task_id=FakeTask.task_id))
+    yield manager
+    skyvern_context.reset()
+
+
+async def _capture(
+    browser_state: FakeBrowserState, budget_ms: float = 1000
+) -> post_action_capture.PostActionCaptureTimings:
+    return await capture_after_action(
+        task=FakeTask(),  # type: ignore[arg-type]
+        step=FakeStep(),  # type: ignore[arg-type]
+        browser_state=browser_state,  # type: ignore[arg-type]
+        scrolling_number=3,
+        use_playwright_fullpage=False,
+        delay_seconds=0,
+        budget_ms=budget_ms,
+    )
+
+
+@pytest.mark.asyncio
+async def test_screenshot_and_html_are_captured_concurrently(artifact_manager: FakeArtifactManager) -> None:
+    timings = await _capture(FakeBrowserState(scrolling_seconds=0.1))
+    # both take 100ms
+    assert timings.critical_path_ms < 180
+    assert artifact_manager.artifacts == [ArtifactType.SCREENSHOT_ACTION, ArtifactType.HTML_ACTION]
+    assert timings.skipped == [] and timings.saved_ms > 50
+
+    # the video is uploaded in the background
+    await asyncio.gather(*artifact_manager.upload_aiotasks_map[FakeTask.task_id])
+    assert artifact_manager.streamed == ["video.webm"]
+
+
+@pytest.mark.asyncio
+async def test_slow_scrolling_screenshot_is_skipped_then_downgraded(artifact_manager: FakeArtifactManager) -> None:
+    browser_state = FakeBrowserState(scrolling_seconds=0.5)
+    timings = await _capture(browser_state, budget_ms=200)
+    assert timings.skipped == ["screenshot"]
+    assert browser_state.restored
+    assert artifact_manager.artifacts == [ArtifactType.HTML_ACTION]
+
+    # a scrolling screenshot that was this slow once is taken as a viewport screenshot for the rest of the run
+    skyvern_context.ensure_context().last_scrolling_screenshot_ms = 500
+    timings = await _capture(browser_state, budget_ms=200)
+    assert timings.screenshot_mode == ScreenshotCaptureMode.viewport
+    assert browser_state.scrolling_numbers == [3, 0]
+    assert timings.skipped == []
+
+
+@pytest.mark.asyncio
+async def test_unchanged_html_is_stored_once(artifact_manager: FakeArtifactManager) -> None:
+    await _capture(FakeBrowserState(scrolling_seconds=0.01))
+    timings = await _capture(FakeBrowserState(scrolling_seconds=0.01))
+    assert timings.html_unchanged
+    assert artifact_manager.artifacts.count(ArtifactType.HTML_ACTION) == 1
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from skyvern.forge.prompts import prompt_engine
+from skyvern.forge.sdk.api.llm.utils import llm_messages_builder
+from skyvern.forge.sdk.prompting import PromptEngine
+
+
+def _engine(tmp_path: Path, templates: dict[str, str]) -> PromptEngine:
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    for name, source in templates.items():
+        (model_dir / f"{name}.j2").write_text(source)
+    return PromptEngine("model", prompts_dir=tmp_path)
+
+
+def test_templates_are_precompiled_with_their_static_prefix(tmp_path: Path) -> None:
+    engine = _engine(
+        tmp_path,
+        {
+            "goal": "Follow the rules.\nGoal: {{ goal }}\nStatic again.",
+            "branch": "Intro.\n{% if details %}Details: {{ details }}{% endif %}",
+            "static": "Nothing to fill in.",
+        },
+    )
+    assert engine.precompile() == 3
+    assert engine.static_prefixes == {
+        "goal": "Follow the rules.\nGoal: ",
+        "branch": "Intro.\n",
+        "static": "Nothing to fill in.",
+    }
+
+    parts = engine.load_prompt_parts("goal", goal="book a flight")
+    assert parts.static_prefix == "Follow the rules.\nGoal: "
+    assert parts.dynamic_suffix == "book a flight\nStatic again."
+    assert engine.find_static_prefix(engine.load_prompt("branch", details="x")) == "Intro.\n"
+    assert engine.find_static_prefix("Something else") == ""
+
+    metrics = engine.get_render_metrics()
+    assert metrics["goal"].renders == 1 and metrics["branch"].renders == 1
+    assert metrics["goal"].output_chars.total == len(parts.static_prefix + parts.dynamic_suffix)
+
+
+def test_every_skyvern_template_is_precompiled() -> None:
+    template_dir = Path(prompt_engine.env.loader.searchpath[0]) / prompt_engine.model  # type: ignore[union-attr]
+    assert set(prompt_engine.static_prefixes) == {path.stem for path in template_dir.glob("*.j2")}
+    assert prompt_engine.get_static_prefix("extract-action").startswith("Identify actions")
+
+
+@pytest.mark.asyncio
+async def test_static_prefix_is_a_cache_breakpoint() -> None:
+    messages = await llm_messages_builder("static dynamic", prompt_cache_prefix="static ")
+    assert messages[0]["content"] == [
+        {"type": "text", "text": "static ", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "dynamic"},
+    ]
+
+    messages = await llm_messages_builder("static dynamic")
+    assert messages[0]["content"] == [{"type": "text", "text": "static dynamic"}]
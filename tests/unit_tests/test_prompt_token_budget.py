@@ -0,0 +1,68 @@
+from typing import Any
+
+import pytest
+
+from skyvern.utils import prompt_engine
+from skyvern.utils.prompt_engine import load_prompt_with_elements
+from skyvern.utils.token_counter import count_tokens, get_encoding
+from skyvern.webeye.scraper.scraper import ElementTreeBuilder, ElementTreeFormat
+
+
+class FakePromptEngine:
+    def __init__(self) -> None:
+        self.rendered: list[str] = []
+
+    def load_prompt(self, template: str, **kwargs: Any) -> str:
+        self.rendered.append(kwargs["elements"])
+        return f"goal: {kwargs['goal']}\n{kwargs['elements']}"
+
+
+class FakeElementTreeBuilder(ElementTreeBuilder):
+    def __init__(self, full: list[str], economy: list[str]) -> None:
+        self.full = full
+        self.economy = economy
+
+    def support_economy_elements_tree(self) -> bool:
+        return True
+
+    def build_element_tree(
+        self, fmt: ElementTreeFormat = ElementTreeFormat.HTML, html_need_skyvern_attrs: bool = True
+    ) -> str:
+        return "".join(self.full)
+
+    def build_economy_elements_tree(
+        self,
+        fmt: ElementTreeFormat = ElementTreeFormat.HTML,
+        html_need_skyvern_attrs: bool = True,
+        percent_to_keep: float = 1,
+    ) -> str:
+        return "".join(self.economy[: int(len(self.economy) * percent_to_keep)])
+
+    def get_element_tree_token_counts(self) -> list[int]:
+        return [count_tokens(element) for element in self.full]
+
+    def get_economy_element_tree_token_counts(self) -> list[int]:
+        return [count_tokens(element) for element in self.economy]
+
+
+def test_encoding_is_cached() -> None:
+    assert get_encoding("gpt-4o") is get_encoding("gpt-4o")
+
+
+def test_picks_element_tree_by_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    full = ["<div>" + "word " * 100 + "</div>", "<svg>" + "path " * 100 + "</svg>"]
+    economy = ["<div>" + "word " * 100 + "</div>"]
+    builder = FakeElementTreeBuilder(full=full, economy=economy)
+
+    engine = FakePromptEngine()
+    monkeypatch.setattr(prompt_engine, "DEFAULT_MAX_TOKENS", 1000)
+    prompt = load_prompt_with_elements(builder, engine, "extract-action", goal="test")  # type: ignore[arg-type]
+    assert prompt.endswith("".join(full))
+    # the template is rendered once without the elements to count it, and once for the final prompt
+    assert engine.rendered == ["", "".join(full)]
+
+    engine = FakePromptEngine()
+    monkeypatch.setattr(prompt_engine, "DEFAULT_MAX_TOKENS", 150)
+    prompt = load_prompt_with_elements(builder, engine, "extract-action", goal="test")  # type: ignore[arg-type]
+    assert prompt.endswith("".join(economy))
+    assert engine.rendered == ["", "".join(economy)]
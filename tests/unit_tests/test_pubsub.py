@@ -0,0 +1,261 @@
+import asyncio
+import fnmatch
+from datetime import datetime
+
+import pytest
+
+from skyvern.forge import app
+from skyvern.forge.sdk.db.client import AgentDB
+from skyvern.forge.sdk.db.polls import await_browser_session
+from skyvern.forge.sdk.pubsub.base import browser_session_topic, runnable_browser_session_topic, task_topic
+from skyvern.forge.sdk.pubsub.factory import PubSubFactory
+from skyvern.forge.sdk.pubsub.local import LocalPubSub
+from skyvern.forge.sdk.pubsub.redis_pubsub import RedisPubSub
+from skyvern.forge.sdk.pubsub.watcher import StateWatcher
+from skyvern.forge.sdk.routes.streaming_verify import loop_verify_task
+from skyvern.forge.sdk.schemas.persistent_browser_sessions import PersistentBrowserSession
+from skyvern.forge.sdk.schemas.tasks import Task, TaskStatus
+from tests.unit_tests.conftest import ORGANIZATION_ID
+
+
+class FakeRedisPubSubServer:
+    """
+    A tiny server speaking the subset of the Redis protocol used by RedisPubSub.
+    """
+
+    def __init__(self) -> None:
+        self.subscribers: list[tuple[bytes, asyncio.StreamWriter]] = []
+        self.server: asyncio.Server | None = None
+        self.port = 0
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self.server:
+            self.server.close()
+
+    @staticmethod
+    def _bulk(value: bytes) -> bytes:
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def _execute(self, command: list[bytes], writer: asyncio.StreamWriter) -> bytes:
+        name = command[0].upper()
+        if name == b"PSUBSCRIBE":
+            self.subscribers.append((command[1], writer))
+            return b"*3\r\n" + self._bulk(b"psubscribe") + self._bulk(command[1]) + b":1\r\n"
+        if name == b"PUBLISH":
+            receivers = [
+                (pattern, subscriber)
+                for pattern, subscriber in self.subscribers
+                if fnmatch.fnmatchcase(command[1].decode(), pattern.decode())
+            ]
+            for pattern, subscriber in receivers:
+                subscriber.write(
+                    b"*4\r\n"
+                    + self._bulk(b"pmessage")
+                    + self._bulk(pattern)
+                    + self._bulk(command[1])
+                    + self._bulk(command[2])
+                )
+            return b":%d\r\n" % len(receivers)
+        return b"+OK\r\n"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                command = []
+                for _ in range(int(line[1:])):
+                    length = int((await reader.readline())[1:])
+                    command.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(self._execute(command, writer))
+                await writer.drain()
+        finally:
+            self.subscribers = [
+                (pattern, subscriber) for pattern, subscriber in self.subscribers if subscriber is not writer
+            ]
+            writer.close()
+
+
+def _browser_session(browser_address: str | None = None) -> PersistentBrowserSession:
+    return PersistentBrowserSession(
+        persistent_browser_session_id="pbs_1",
+        organization_id=ORGANIZATION_ID,
+        browser_address=browser_address,
+        created_at=datetime.utcnow(),
+        modified_at=datetime.utcnow(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_fan_out_and_coalescing() -> None:
+    pubsub = LocalPubSub()
+    async with pubsub.subscribe("topic") as latest, pubsub.subscribe("topic", coalesce=False) as every:
+        for i in range(3):
+            await pubsub.publish("topic", {"i": i})
+        await pubsub.publish("other", {"i": -1})
+
+        assert [event.payload["i"] for event in await latest.get(timeout=1)] == [2]
+        assert [event.payload["i"] for event in await every.get(timeout=1)] == [0, 1, 2]
+        assert await latest.get(timeout=0.01) == []
+
+    stats = pubsub.get_stats()
+    assert (stats.published, stats.delivered, stats.coalesced, stats.subscribers) == (4, 6, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_redis_pubsub_delivers_across_processes() -> None:
+    server = FakeRedisPubSubServer()
+    await server.start()
+    # two processes sharing the server
+    publisher = RedisPubSub(redis_url=f"redis://127.0.0.1:{server.port}/0")
+    subscriber = RedisPubSub(redis_url=f"redis://127.0.0.1:{server.port}/0")
+
+    async with subscriber.subscribe("topic") as first, subscriber.subscribe("topic") as second:
+        await publisher.publish("topic", {"status": "running"})
+        assert [event.payload for event in await first.get(timeout=5)] == [{"status": "running"}]
+        assert [event.payload for event in await second.get(timeout=5)] == [{"status": "running"}]
+        # one server subscription per process
+        assert len(server.subscribers) == 1
+
+    await publisher.close()
+    await subscriber.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_state_watcher_only_reads_the_database_on_fallback() -> None:
+    pubsub = LocalPubSub()
+    loads = 0
+
+    async def load() -> PersistentBrowserSession:
+        nonlocal loads
+        loads += 1
+        return _browser_session()
+
+    async with pubsub.subscribe(browser_session_topic("pbs_1")) as subscription:
+        watcher = StateWatcher(subscription, PersistentBrowserSession, load, refresh_seconds=60)
+        await watcher.refresh()
+        await pubsub.publish_model([browser_session_topic("pbs_1")], _browser_session("127.0.0.1:9222"))
+        state = await watcher.wait(timeout=1)
+        assert state is not None and state.browser_address == "127.0.0.1:9222"
+        assert await watcher.wait(timeout=0.01) == state
+        assert loads == 1
+
+        watcher.refresh_seconds = 0
+        state = await watcher.wait(timeout=0.01)
+        assert state is not None and state.browser_address is None
+        assert loads == 2
+
+
+@pytest.mark.asyncio
+async def test_await_browser_session_wakes_up_on_update(monkeypatch: pytest.MonkeyPatch) -> None:
+    pubsub = LocalPubSub()
+    monkeypatch.setattr(PubSubFactory, "get_pubsub", staticmethod(lambda: pubsub))
+
+    class FakeDatabase:
+        calls = 0
+
+        async def get_persistent_browser_session(
+            self, session_id: str, organization_id: str
+        ) -> PersistentBrowserSession:
+            self.calls += 1
+            return _browser_session()
+
+    db = FakeDatabase()
+
+    async def set_address() -> None:
+        await asyncio.sleep(0.05)
+        await pubsub.publish_model([browser_session_topic("pbs_1")], _browser_session("127.0.0.1:9222"))
+
+    setter = asyncio.create_task(set_address())
+    browser_session = await await_browser_session(db, "pbs_1", ORGANIZATION_ID, timeout=5, poll_interval=60)  # type: ignore[arg-type]
+    await setter
+
+    assert browser_session is not None and browser_session.browser_address == "127.0.0.1:9222"
+    assert db.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_loop_verify_task_follows_the_published_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    pubsub = LocalPubSub()
+    monkeypatch.setattr(app, "PUBSUB", pubsub)
+
+    def make_task(status: TaskStatus) -> Task:
+        return Task(
+            task_id="tsk_1",
+            organization_id=ORGANIZATION_ID,
+            url="https://example.com",
+            status=status,
+            created_at=datetime.utcnow(),
+            modified_at=datetime.utcnow(),
+        )
+
+    class FakeDatabase:
+        calls = 0
+
+        async def get_task(self, task_id: str, organization_id: str) -> Task:
+            self.calls += 1
+            return make_task(TaskStatus.running)
+
+    class FakeSessionsManager:
+        calls = 0
+
+        async def get_session_by_runnable_id(self, runnable_id: str, organization_id: str) -> None:
+            self.calls += 1
+            return None
+
+    class FakeStreaming:
+        organization_id = ORGANIZATION_ID
+        is_open = True
+        task: Task | None = make_task(TaskStatus.running)
+        browser_session: PersistentBrowserSession | None = None
+
+    db = FakeDatabase()
+    sessions_manager = FakeSessionsManager()
+    monkeypatch.setattr(app, "DATABASE", db)
+    monkeypatch.setattr(app, "PERSISTENT_SESSIONS_MANAGER", sessions_manager)
+    streaming = FakeStreaming()
+    loop = asyncio.create_task(loop_verify_task(streaming))  # type: ignore[arg-type]
+
+    occupied = _browser_session("127.0.0.1:9222").model_copy(update={"runnable_id": "tsk_1"})
+    while pubsub.stats.subscribers == 0:
+        await asyncio.sleep(0.01)
+    await pubsub.publish_model([runnable_browser_session_topic("tsk_1")], occupied)
+    while streaming.browser_session is None:
+        await asyncio.sleep(0.01)
+    assert streaming.browser_session.browser_address == "127.0.0.1:9222"
+
+    await pubsub.publish_model([task_topic("tsk_1")], make_task(TaskStatus.completed))
+    await asyncio.wait_for(loop, timeout=5)
+
+    assert streaming.task is None and streaming.browser_session is None
+    # only the first state is read from the database, the viewers don't query it on each update
+    assert (db.calls, sessions_manager.calls) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_agent_db_publishes_updates_after_commit(agent_db: AgentDB) -> None:
+    task = await agent_db.create_task(
+        url="https://example.com",
+        title=None,
+        complete_criterion=None,
+        terminate_criterion=None,
+        navigation_goal="goal",
+        data_extraction_goal=None,
+        navigation_payload=None,
+        organization_id=ORGANIZATION_ID,
+    )
+
+    async with PubSubFactory.get_pubsub().subscribe(task_topic(task.task_id)) as subscription:
+        await agent_db.update_task(task.task_id, organization_id=ORGANIZATION_ID, status=TaskStatus.running)
+        events = await subscription.get(timeout=1)
+        assert [event.payload["status"] for event in events] == ["running"]
+
+        async with agent_db.unit_of_work():
+            await agent_db.update_task(task.task_id, organization_id=ORGANIZATION_ID, status=TaskStatus.completed)
+            # not committed yet
+            assert await subscription.get(timeout=0.01) == []
+        events = await subscription.get(timeout=1)
+        assert [event.payload["status"] for event in events] == ["completed"]
@@ -0,0 +1,179 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Generator
+
+import boto3
+import pytest
+from moto.server import ThreadedMotoServer
+
+from skyvern.config import settings
+from skyvern.forge.sdk.api.aws import aws_client_manager
+from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType
+from skyvern.forge.sdk.artifact.recording import RecordingUpload
+from skyvern.forge.sdk.artifact.storage.local import LocalStorage
+from skyvern.forge.sdk.artifact.storage.s3 import S3_MIN_PART_SIZE, S3ArtifactStreamWriter, S3Storage
+
+TEST_BUCKET = "test-skyvern-bucket"
+
+
+def _artifact(uri: str) -> Artifact:
+    return Artifact(
+        artifact_id="a_1",
+        artifact_type=ArtifactType.RECORDING,
+        uri=uri,
+        organization_id="o_1",
+        created_at=datetime.utcnow(),
+        modified_at=datetime.utcnow(),
+    )
+
+
+def _append(path: Path, data: bytes) -> None:
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def _rewrite_header(path: Path) -> None:
+    # like the webm muxer writing the duration when the recording ends
+    with open(path, "r+b") as f:
+        f.write(b"HEADER")
+
+
+@pytest.fixture
+def moto_server(monkeypatch: pytest.MonkeyPatch) -> Generator[str, None, None]:
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    server = ThreadedMotoServer(port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.mark.asyncio
+async def test_local_recording_is_appended(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "ARTIFACT_STREAM_PART_SIZE", 16)
+    recording = tmp_path / "video.webm"
+    target = tmp_path / "artifacts" / "recording.webm"
+    upload = RecordingUpload(LocalStorage(), _artifact(f"file://{target}"), str(recording))
+
+    for i in range(10):
+        _append(recording, bytes([i]) * 100)
+        assert await upload.sync() == (i + 1) * 100
+        assert target.read_bytes() == recording.read_bytes()
+    # every byte was read once
+    assert upload.bytes_read == 1000
+
+    _append(recording, b"cues")
+    _rewrite_header(recording)
+    await upload.finalize()
+    assert target.read_bytes() == recording.read_bytes()
+    assert upload.bytes_read == 1004 + 16
+
+
+@pytest.mark.asyncio
+async def test_truncated_recording_restarts(tmp_path: Path) -> None:
+    recording = tmp_path / "video.webm"
+    target = tmp_path / "recording.webm"
+    upload = RecordingUpload(LocalStorage(), _artifact(f"file://{target}"), str(recording))
+
+    _append(recording, b"x" * 100)
+    await upload.sync()
+    recording.write_bytes(b"y" * 10)
+    await upload.finalize()
+    assert upload.restarts == 1
+    assert target.read_bytes() == b"y" * 10
+
+
+@pytest.mark.asyncio
+async def test_s3_recording_is_uploaded_in_parts(
+    tmp_path: Path, moto_server: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ARTIFACT_STREAM_PART_SIZE", S3_MIN_PART_SIZE)
+    s3 = boto3.client("s3", region_name=settings.AWS_REGION, endpoint_url=moto_server)
+    s3.create_bucket(Bucket=TEST_BUCKET)
+    recording = tmp_path / "video.webm"
+    upload = RecordingUpload(
+        S3Storage(bucket=TEST_BUCKET, endpoint_url=moto_server),
+        _artifact(f"s3://{TEST_BUCKET}/recording.webm"),
+        str(recording),
+        snapshot_interval=0,
+    )
+
+    chunk = b"v" * (S3_MIN_PART_SIZE // 2)
+    for _ in range(5):
+        _append(recording, chunk)
+        await upload.sync()
+    writer = upload.writer
+    assert isinstance(writer, S3ArtifactStreamWriter)
+    # the head (part 1) is held back, the rest went out as soon as it filled a part
+    assert list(writer.etags) == [2]
+    assert "Contents" not in s3.list_objects_v2(Bucket=TEST_BUCKET, Prefix="recording.webm")
+
+    _append(recording, b"cues")
+    _rewrite_header(recording)
+    await upload.finalize()
+    assert sorted(writer.etags) == [1, 2, 3]
+    body = s3.get_object(Bucket=TEST_BUCKET, Key="recording.webm")["Body"].read()
+    assert body == recording.read_bytes()
+    await aws_client_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_small_s3_recording_is_stored_with_one_put(tmp_path: Path, moto_server: str) -> None:
+    s3 = boto3.client("s3", region_name=settings.AWS_REGION, endpoint_url=moto_server)
+    s3.create_bucket(Bucket=TEST_BUCKET)
+    recording = tmp_path / "video.webm"
+    upload = RecordingUpload(
+        S3Storage(bucket=TEST_BUCKET, endpoint_url=moto_server),
+        _artifact(f"s3://{TEST_BUCKET}/small_recording.webm"),
+        str(recording),
+    )
+
+    _append(recording, b"v" * 1000)
+    await upload.sync()
+    _rewrite_header(recording)
+    await upload.finalize()
+    assert isinstance(upload.writer, S3ArtifactStreamWriter) and upload.writer.upload_id is None
+    body = s3.get_object(Bucket=TEST_BUCKET, Key="small_recording.webm")["Body"].read()
+    assert body == recording.read_bytes()
+    await aws_client_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_s3_recording_is_readable_while_running_and_aborted_on_failure(
+    tmp_path: Path, moto_server: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ARTIFACT_STREAM_PART_SIZE", S3_MIN_PART_SIZE)
+    s3 = boto3.client("s3", region_name=settings.AWS_REGION, endpoint_url=moto_server)
+    s3.create_bucket(Bucket=TEST_BUCKET)
+    recording = tmp_path / "video.webm"
+    upload = RecordingUpload(
+        S3Storage(bucket=TEST_BUCKET, endpoint_url=moto_server),
+        _artifact(f"s3://{TEST_BUCKET}/running_recording.webm"),
+        str(recording),
+        snapshot_interval=60,
+    )
+
+    _append(recording, b"v" * (S3_MIN_PART_SIZE * 2))
+    await upload.sync()
+    _append(recording, b"w" * 1000)
+    await upload.sync()
+    # one snapshot per interval, taken on the first sync
+    assert upload.snapshots == 1
+    body = s3.get_object(Bucket=TEST_BUCKET, Key="running_recording.webm")["Body"].read()
+    assert body == b"v" * (S3_MIN_PART_SIZE * 2)
+    assert s3.list_multipart_uploads(Bucket=TEST_BUCKET).get("Uploads")
+
+    writer = upload.writer
+    assert isinstance(writer, S3ArtifactStreamWriter)
+
+    async def complete_multipart_upload(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("complete failed")
+
+    monkeypatch.setattr(writer.async_client, "complete_multipart_upload", complete_multipart_upload)
+    with pytest.raises(RuntimeError):
+        await upload.finalize()
+    # the parts aren't left behind in the bucket
+    assert not s3.list_multipart_uploads(Bucket=TEST_BUCKET).get("Uploads")
+    assert upload.writer is None
+    await aws_client_manager.close()
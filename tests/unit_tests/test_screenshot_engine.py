@@ -0,0 +1,140 @@
+import asyncio
+import random
+from collections import defaultdict
+from io import BytesIO
+from typing import Any, Callable
+
+import pytest
+from PIL import Image, ImageChops
+
+from skyvern.config import settings
+from skyvern.forge.sdk.api.llm.utils import llm_messages_builder
+from skyvern.utils.image_pipeline import merge_screenshots, merge_screenshots_async
+from skyvern.utils.image_resizer import (
+    Resolution,
+    ScreenshotFormat,
+    encode_screenshot,
+    get_image_media_type,
+    resize_screenshots,
+    resize_screenshots_async,
+)
+from skyvern.webeye.utils.page import NetworkIdleTracker, _get_tile_positions, _slice_screenshot
+
+
+def _synthetic_page(width: int, height: int, seed: int = 0) -> Image.Image:
+    rng = random.Random(seed)
+    img = Image.new("RGB", (width, height), color=(255, 255, 255))
+    for _ in range(200):
+        x, y = rng.randrange(width), rng.randrange(height)
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        img.paste(color, (x, y, min(width, x + rng.randrange(10, 200)), min(height, y + rng.randrange(5, 40))))
+    return img
+
+
+def _to_png(img: Image.Image) -> bytes:
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_tile_positions_match_scrolling() -> None:
+    # the last scroll is clamped to the bottom of the page
+    assert _get_tile_positions(page_height=2500, viewport_height=1000, step=800, max_number=10) == [0, 800, 1500]
+    assert _get_tile_positions(page_height=2500, viewport_height=1000, step=800, max_number=2) == [0, 800]
+    assert _get_tile_positions(page_height=900, viewport_height=1000, step=800, max_number=10) == [0]
+
+
+@pytest.mark.parametrize("scale", [1, 2])
+def test_sliced_tiles_merge_back_to_the_page(scale: int) -> None:
+    viewport_width, viewport_height, page_height = 320, 240, 1000
+    page = _synthetic_page(viewport_width * scale, page_height * scale)
+    positions = _get_tile_positions(page_height, viewport_height, step=viewport_height - 40, max_number=10)
+
+    tiles = _slice_screenshot(_to_png(page), viewport_width, viewport_height, positions)
+
+    assert len(tiles) == len(positions) == 5
+    for tile in tiles:
+        with Image.open(BytesIO(tile)) as img:
+            assert img.size == (viewport_width * scale, viewport_height * scale)
+    if scale == 1:
+        with Image.open(BytesIO(merge_screenshots(tiles, positions))) as merged:
+            assert ImageChops.difference(merged.convert("RGB"), page).getbbox() is None
+
+
+@pytest.mark.asyncio
+async def test_parallel_pipeline_matches_the_sequential_one() -> None:
+    page = _synthetic_page(400, 700)
+    # a narrower last viewport is padded with white
+    tiles = [
+        _to_png(page.crop((0, 0, 400, 300))),
+        _to_png(page.crop((0, 250, 400, 550))),
+        _to_png(page.crop((0, 400, 300, 700))),
+    ]
+    positions = [0, 250, 400]
+    merged = await merge_screenshots_async(tiles, positions)
+    assert merged == merge_screenshots(tiles, positions)
+    with Image.open(BytesIO(merged)) as img:
+        expected = page.copy()
+        expected.paste((255, 255, 255), (300, 550, 400, 700))
+        assert ImageChops.difference(img.convert("RGB"), expected).getbbox() is None
+
+    target = Resolution(width=200, height=150)
+    resized = await resize_screenshots_async(tiles, target)
+    assert resized == resize_screenshots(tiles, target)
+    with Image.open(BytesIO(resized[0])) as img:
+        assert img.size == (200, 150)
+
+
+@pytest.mark.parametrize(
+    "image_format, media_type",
+    [(ScreenshotFormat.PNG, "image/png"), (ScreenshotFormat.JPEG, "image/jpeg"), (ScreenshotFormat.WEBP, "image/webp")],
+)
+def test_encode_screenshot(image_format: ScreenshotFormat, media_type: str) -> None:
+    screenshot = _to_png(_synthetic_page(640, 480).convert("RGBA"))
+    encoded = encode_screenshot(screenshot, image_format, quality=80)
+    assert get_image_media_type(encoded) == media_type
+    with Image.open(BytesIO(encoded)) as img:
+        assert img.size == (640, 480)
+
+
+@pytest.mark.asyncio
+async def test_llm_messages_use_the_screenshot_media_type(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LLM_SCREENSHOT_FORMAT", "jpeg")
+    messages = await llm_messages_builder("prompt", screenshots=[_to_png(_synthetic_page(64, 64))])
+    image_url = messages[0]["content"][1]["image_url"]["url"]
+    assert image_url.startswith("data:image/jpeg;base64,")
+
+
+class FakeRequestEventsPage:
+    def __init__(self) -> None:
+        self.listeners: dict[str, list[Callable[[Any], None]]] = defaultdict(list)
+
+    def on(self, event: str, listener: Callable[[Any], None]) -> None:
+        self.listeners[event].append(listener)
+
+    def remove_listener(self, event: str, listener: Callable[[Any], None]) -> None:
+        self.listeners[event].remove(listener)
+
+    def emit(self, event: str, request: object) -> None:
+        for listener in self.listeners[event]:
+            listener(request)
+
+
+@pytest.mark.asyncio
+async def test_network_idle_waits_for_the_requests_in_flight() -> None:
+    page = FakeRequestEventsPage()
+    requests = [object() for _ in range(3)]
+
+    with NetworkIdleTracker(page, max_inflight_requests=1) as network:  # type: ignore[arg-type]
+        for request in requests:
+            page.emit("request", request)
+        waiter = asyncio.create_task(network.wait_for_idle(quiet_ms=50))
+        await asyncio.sleep(0.1)
+        assert not waiter.done()
+
+        page.emit("requestfinished", requests[0])
+        page.emit("requestfailed", requests[1])
+        # a single long-lived request doesn't keep the page busy
+        await asyncio.wait_for(waiter, timeout=1)
+
+    assert not any(page.listeners.values())
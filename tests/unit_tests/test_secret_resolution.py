@@ -0,0 +1,155 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from skyvern.forge.sdk.schemas.organizations import Organization
+from skyvern.forge.sdk.services.bitwarden import BitwardenService, RunCommandResult
+from skyvern.forge.sdk.workflow.context_manager import WorkflowRunContext
+from skyvern.forge.sdk.workflow.models.parameter import (
+    AWSSecretParameter,
+    BitwardenCreditCardDataParameter,
+    BitwardenLoginCredentialParameter,
+)
+
+NOW = datetime(2025, 1, 1)
+ORGANIZATION = Organization(
+    organization_id="o_1",
+    organization_name="org",
+    bw_organization_id="bw_org",
+    created_at=NOW,
+    modified_at=NOW,
+)
+
+
+class FakeAWSClient:
+    def __init__(self) -> None:
+        self.running = 0
+        self.max_running = 0
+        self.lookups: list[str] = []
+
+    async def get_secret(self, secret_name: str) -> str:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        self.lookups.append(secret_name)
+        return f"value of {secret_name}"
+
+
+def _aws_secret(key: str, aws_key: str) -> AWSSecretParameter:
+    return AWSSecretParameter(
+        key=key, aws_secret_parameter_id=key, workflow_id="w_1", aws_key=aws_key, created_at=NOW, modified_at=NOW
+    )
+
+
+def _bitwarden_login(key: str, item_id: str) -> BitwardenLoginCredentialParameter:
+    return BitwardenLoginCredentialParameter(
+        key=key,
+        bitwarden_login_credential_parameter_id=key,
+        workflow_id="w_1",
+        bitwarden_client_id_aws_secret_key="bw_client_id",
+        bitwarden_client_secret_aws_secret_key="bw_client_secret",
+        bitwarden_master_password_aws_secret_key="bw_master_password",
+        bitwarden_item_id=item_id,
+        created_at=NOW,
+        modified_at=NOW,
+    )
+
+
+@pytest.fixture
+def bw_commands(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    commands: list[str] = []
+
+    async def run_command(
+        command: list[str], additional_env: dict[str, str] | None = None, timeout: int = 60
+    ) -> RunCommandResult:
+        commands.append(command[1])
+        await asyncio.sleep(0.01)
+        stdout = ""
+        if command[1] == "login":
+            stdout = "You are logged in!"
+        elif command[1] == "unlock":
+            stdout = 'Your vault is now unlocked!\n$ export BW_SESSION="session"'
+        elif command[1] == "get":
+            assert command[-2:] == ["--session", "session"]
+            if command[3] == "card":
+                card = {
+                    "cardholderName": "John",
+                    "number": "4242",
+                    "expMonth": "1",
+                    "expYear": "2030",
+                    "code": "123",
+                    "brand": "Visa",
+                }
+                stdout = json.dumps({"type": 3, "organizationId": "bw_org", "card": card})
+            else:
+                stdout = json.dumps({"login": {"username": f"user {command[3]}", "password": "pass"}})
+        return RunCommandResult(stdout=stdout, stderr="", returncode=0)
+
+    monkeypatch.setattr(BitwardenService, "run_command", run_command)
+    return commands
+
+
+@pytest.mark.asyncio
+async def test_lookups_against_one_vault_share_a_session(bw_commands: list[str]) -> None:
+    aws_client = FakeAWSClient()
+    card = BitwardenCreditCardDataParameter(
+        key="card",
+        bitwarden_credit_card_data_parameter_id="card",
+        workflow_id="w_1",
+        bitwarden_client_id_aws_secret_key="bw_client_id",
+        bitwarden_client_secret_aws_secret_key="bw_client_secret",
+        bitwarden_master_password_aws_secret_key="bw_master_password",
+        bitwarden_collection_id="collection",
+        bitwarden_item_id="card",
+        created_at=NOW,
+        modified_at=NOW,
+    )
+    context = await WorkflowRunContext.init(
+        aws_client,  # type: ignore[arg-type]
+        ORGANIZATION,
+        [],
+        [],
+        [],
+        [
+            _aws_secret("api_key", "aws_api_key"),
+            _aws_secret("token", "aws_token"),
+            _bitwarden_login("login_1", "item_1"),
+            _bitwarden_login("login_2", "item_2"),
+            card,  # type: ignore[list-item]
+        ],
+    )
+
+    assert bw_commands == ["login", "sync", "unlock", "get", "get", "get", "logout"]
+    # the vault credentials are read once for the three lookups
+    assert sorted(aws_client.lookups) == [
+        "aws_api_key",
+        "aws_token",
+        "bw_client_id",
+        "bw_client_secret",
+        "bw_master_password",
+    ]
+    assert aws_client.max_running > 1
+    assert context.get_original_secret_value_or_none(context.get_value("login_2")["username"]) == "user item_2"
+    assert context.get_original_secret_value_or_none(context.get_value("card")["card_number"]) == "4242"
+    assert context.get_original_secret_value_or_none(context.get_value("token")) == "value of aws_token"
+
+
+@pytest.mark.asyncio
+async def test_parameter_referencing_another_secret_waits_for_it(bw_commands: list[str]) -> None:
+    aws_client = FakeAWSClient()
+    context = await WorkflowRunContext.init(
+        aws_client,  # type: ignore[arg-type]
+        ORGANIZATION,
+        [],
+        [],
+        [],
+        [_bitwarden_login("login", "item_key"), _aws_secret("item_key", "aws_item_key")],
+    )
+
+    assert aws_client.lookups[0] == "aws_item_key"
+    # the item id is the value registered for the AWS secret parameter
+    assert context.get_value("login")["username"] in context.secrets
+    assert bw_commands == ["login", "sync", "unlock", "get", "logout"]
@@ -0,0 +1,137 @@
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from skyvern.forge.sdk.api.llm.streaming import IncrementalJSONArrayParser, acompletion_with_streamed_items
+from skyvern.webeye.actions.action_types import ActionType
+from skyvern.webeye.actions.streamed_actions import StreamedActions
+from skyvern.webeye.scraper.scraper import ScrapedPage
+
+
+class FakeTask:
+    organization_id = "o_1"
+    workflow_run_id = None
+    task_id = "tsk_1"
+    data_extraction_goal = None
+
+
+class FakeStep:
+    step_id = "stp_1"
+    order = 0
+
+
+def _scraped_page() -> ScrapedPage:
+    elements: dict[str, dict[str, Any]] = {
+        element_id: {"id": element_id, "tagName": "input"} for element_id in ("name", "email")
+    }
+    return ScrapedPage(
+        elements=list(elements.values()),
+        id_to_element_dict=elements,
+        id_to_frame_dict={},
+        id_to_css_dict={},
+        id_to_element_hash={},
+        hash_to_element_ids={},
+        element_tree=[],
+        element_tree_trimmed=[],
+        screenshots=[],
+        url="https://example.com",
+        html="",
+        _browser_state=None,
+        _clean_up_func=None,
+        _scrape_exclude=None,
+    )
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def test_items_are_parsed_as_the_response_streams_in() -> None:
+    response = (
+        "```json\n"
+        + json.dumps(
+            {
+                "user_goal_stage": 'fill "the" form [1/2]',
+                "actions": [
+                    {"action_type": "INPUT_TEXT", "id": "name", "text": "{John}"},
+                    {"action_type": "SELECT_OPTION", "option": {"labels": ["a", "b"]}},
+                ],
+            }
+        )
+        + "\n```"
+    )
+    parser = IncrementalJSONArrayParser("actions")
+    items_per_chunk = [parser.feed(chunk) for chunk in _chunks(response, 7)]
+    items = [item for chunk_items in items_per_chunk for item in chunk_items]
+    assert items == json.loads(response.strip("`json\n"))["actions"]
+    # the first item is handed out before the response is complete
+    assert items_per_chunk.index([items[0]]) < len(items_per_chunk) - 2
+
+    parser = IncrementalJSONArrayParser("actions")
+    items = parser.feed('{"actions": [{"id": "name"}, {"id": "email",}, {"id": "other"}]}')
+    assert items == [{"id": "name"}]
+    assert parser.stopped
+
+
+@pytest.mark.asyncio
+async def test_streamed_completion_returns_the_complete_response() -> None:
+    content = json.dumps({"actions": [{"action_type": "CLICK", "id": "name"}, {"action_type": "WAIT"}]})
+    streamed: list[dict[str, Any]] = []
+    response = await acompletion_with_streamed_items(
+        "actions",
+        streamed.append,
+        model="gpt-4o",
+        messages=[{"role": "user", "content": "act"}],
+        mock_response=content,
+    )
+    assert response.choices[0].message.content == content
+    assert streamed == json.loads(content)["actions"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_actions_run_before_the_response_is_complete() -> None:
+    streamed_actions = StreamedActions(FakeTask(), FakeStep(), _scraped_page())  # type: ignore[arg-type]
+    finish = asyncio.Event()
+
+    async def llm_call() -> dict[str, Any]:
+        streamed_actions.on_streamed_action({"action_type": "WAIT"})
+        streamed_actions.on_streamed_action({"action_type": "INPUT_TEXT", "id": "name", "text": "John"})
+        await finish.wait()
+        # the last action was cut off in the stream and repaired in the complete response
+        return {
+            "actions": [
+                {"action_type": "WAIT"},
+                {"action_type": "INPUT_TEXT", "id": "name", "text": "John"},
+                {"action_type": "CLICK", "id": "name"},
+            ]
+        }
+
+    streamed_actions.start(llm_call())
+    iterator = streamed_actions.__aiter__()
+    first = await iterator.__anext__()
+    assert first.action_type == ActionType.INPUT_TEXT and first.action_order == 1
+    assert not streamed_actions.done
+
+    finish.set()
+    rest = [action async for action in iterator]
+    assert [(action.action_type, action.action_order) for action in rest] == [(ActionType.CLICK, 2)]
+    assert await streamed_actions.get_later_action_on_element(first) == rest[0]
+    assert [action.action_type for action in await streamed_actions.complete()] == [
+        ActionType.INPUT_TEXT,
+        ActionType.CLICK,
+    ]
+    assert streamed_actions.json_response is not None
+
+
+@pytest.mark.asyncio
+async def test_wait_actions_run_when_there_is_nothing_else() -> None:
+    streamed_actions = StreamedActions(FakeTask(), FakeStep(), _scraped_page())  # type: ignore[arg-type]
+
+    async def llm_call() -> dict[str, Any]:
+        streamed_actions.on_streamed_action({"action_type": "WAIT"})
+        return {"actions": [{"action_type": "WAIT"}]}
+
+    streamed_actions.start(llm_call())
+    assert [action.action_type async for action in streamed_actions] == [ActionType.WAIT]
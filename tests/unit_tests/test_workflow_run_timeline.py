@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from skyvern.exceptions import WorkflowRunBlockNotFound
+from skyvern.forge import app
+from skyvern.forge.sdk.schemas.workflow_runs import WorkflowRunBlock, WorkflowRunTimeline
+from skyvern.forge.sdk.workflow.models.block import BlockType
+from skyvern.forge.sdk.workflow.service import WorkflowService
+from skyvern.forge.sdk.workflow.timeline import build_workflow_run_timeline
+from skyvern.webeye.actions.actions import ClickAction
+
+NOW = datetime(2025, 1, 1)
+
+
+def _block(
+    block_id: str,
+    parent_id: str | None = None,
+    block_type: BlockType = BlockType.TASK,
+    seq: int = 0,
+    task_id: str | None = None,
+) -> WorkflowRunBlock:
+    return WorkflowRunBlock(
+        workflow_run_block_id=block_id,
+        workflow_run_id="wr_1",
+        organization_id="o_1",
+        parent_workflow_run_block_id=parent_id,
+        block_type=block_type,
+        task_id=task_id,
+        created_at=NOW + timedelta(seconds=seq),
+        modified_at=NOW + timedelta(seconds=seq),
+    )
+
+
+def _loop_run() -> list[WorkflowRunBlock]:
+    blocks = [_block("loop", block_type=BlockType.FOR_LOOP, seq=0), _block("after", seq=100)]
+    for i in range(3):
+        blocks.append(_block(f"iteration_{i}", "loop", seq=1 + i * 2, task_id=f"tsk_{i}"))
+        blocks.append(_block(f"nested_loop_{i}", "loop", BlockType.FOR_LOOP, seq=2 + i * 2))
+        blocks.append(_block(f"nested_{i}", f"nested_loop_{i}", seq=3 + i * 2))
+    # the blocks are read newest first
+    return sorted(blocks, key=lambda block: block.created_at, reverse=True)
+
+
+def _ids(timeline: list[WorkflowRunTimeline]) -> list[str]:
+    return [node.block.workflow_run_block_id for node in timeline if node.block]
+
+
+def test_deep_and_wide_runs_are_built_whole() -> None:
+    # a chain deeper than the recursion limit, and more blocks than the old 1000 iteration cap
+    blocks = [_block("b_0", seq=0)] + [_block(f"b_{i}", f"b_{i - 1}", seq=i) for i in range(1, 3000)]
+    timeline = build_workflow_run_timeline(list(reversed(blocks)))
+
+    depth = 0
+    node = timeline[0]
+    while node.children:
+        assert node.children_count == 1
+        node = node.children[0]
+        depth += 1
+    assert depth == 2999
+
+    orphan = _block("orphan", "missing", seq=5000)
+    assert _ids(build_workflow_run_timeline(_loop_run() + [orphan])) == ["after", "loop"]
+
+
+def test_loops_are_expanded_lazily() -> None:
+    timeline = build_workflow_run_timeline(_loop_run())
+    loop = timeline[1]
+    assert _ids(loop.children) == [
+        "nested_loop_2",
+        "iteration_2",
+        "nested_loop_1",
+        "iteration_1",
+        "nested_loop_0",
+        "iteration_0",
+    ]
+    assert _ids(loop.children[0].children) == ["nested_2"]
+
+    collapsed = build_workflow_run_timeline(_loop_run(), expand_loops=False)
+    assert collapsed[1].children == []
+    assert collapsed[1].children_count == 6
+
+    iterations = build_workflow_run_timeline(_loop_run(), parent_workflow_run_block_id="loop", expand_loops=False)
+    assert _ids(iterations) == _ids(loop.children)
+    assert iterations[0].children == []
+    assert iterations[0].children_count == 1
+
+
+class FakeDatabase:
+    def __init__(self) -> None:
+        self.action_task_ids: list[list[str]] = []
+
+    async def get_workflow_run_blocks(self, workflow_run_id: str, organization_id: str | None = None) -> list:
+        return _loop_run()
+
+    async def get_tasks_actions(self, task_ids: list[str], organization_id: str | None = None) -> list:
+        self.action_task_ids.append(sorted(task_ids))
+        return [ClickAction(element_id="e", task_id=task_id) for task_id in task_ids]
+
+
+@pytest.mark.asyncio
+async def test_actions_are_read_for_the_blocks_in_the_timeline(monkeypatch: pytest.MonkeyPatch) -> None:
+    database = FakeDatabase()
+    monkeypatch.setattr(app, "DATABASE", database)
+    service = WorkflowService()
+
+    assert _ids(await service.get_workflow_run_timeline("wr_1", "o_1", expand_loops=False)) == ["after", "loop"]
+    assert database.action_task_ids == []
+
+    iterations = await service.get_workflow_run_timeline("wr_1", "o_1", parent_workflow_run_block_id="loop")
+    assert database.action_task_ids == [["tsk_0", "tsk_1", "tsk_2"]]
+    assert [len(node.block.actions) for node in iterations if node.block and node.block.task_id] == [1, 1, 1]
+
+    with pytest.raises(WorkflowRunBlockNotFound):
+        await service.get_workflow_run_timeline("wr_1", "o_1", parent_workflow_run_block_id="missing")